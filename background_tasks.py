@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+# Opóźnienie (ms) od ostatniej zmiany do uruchomienia obliczeń
+DEFAULT_DEBOUNCE_MS = 30
+
+# Maksymalny czas (ms) odkładania obliczeń przy ciągłym przesuwaniu suwaka
+DEFAULT_MAX_WAIT_MS = 150
+
+
+class _TaskSignals(QObject):
+    """Sygnały zadania (QRunnable nie jest obiektem QObject)"""
+
+    finished = pyqtSignal(int, object)  # generacja, wynik
+    failed = pyqtSignal(int, str)  # generacja, opis błędu
+
+
+class _TaskRunnable(QRunnable):
+    """Jednorazowe zadanie w puli wątków"""
+
+    def __init__(self, function, args, generation, signals):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.generation = generation
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = self.function(*self.args)
+        except Exception:
+            self.signals.failed.emit(self.generation, traceback.format_exc())
+            return
+        self.signals.finished.emit(self.generation, result)
+
+
+class DebouncedTask(QObject):
+    """
+    Obliczenia uruchamiane w tle po zmianie parametrów (np. suwaków)
+
+    Kolejne wywołania schedule() w krótkim czasie są łączone w jedno
+    (debounce), a przy ciągłych zmianach obliczenia startują co najwyżej
+    co max_wait_ms. Naraz liczone jest tylko jedno zadanie; parametry
+    zmienione w trakcie obliczeń czekają na jego koniec i wygrywa
+    ostatnia wartość. Wyniki zadań sprzed cancel() są pomijane.
+
+    Funkcja obliczeń działa w wątku roboczym, więc nie może odwoływać
+    się do widżetów - wszystkie dane wejściowe przekazuje się w schedule().
+    """
+
+    # Sygnały z wynikami (emitowane w wątku głównym)
+    result_ready = pyqtSignal(object)
+    task_failed = pyqtSignal(str)
+
+    def __init__(self, function, debounce_ms=DEFAULT_DEBOUNCE_MS, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 pool=None, parent=None):
+        """
+        Parametry:
+        - function: funkcja obliczeń wywoływana w wątku roboczym
+        - debounce_ms: opóźnienie od ostatniej zmiany
+        - max_wait_ms: maksymalne odłożenie obliczeń przy ciągłych zmianach
+        - pool: pula wątków (domyślnie QThreadPool.globalInstance())
+        """
+        super().__init__(parent)
+        self.function = function
+        self.debounce_ms = debounce_ms
+        self.max_wait_ms = max_wait_ms
+        self.pool = pool if pool is not None else QThreadPool.globalInstance()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._start_pending)
+
+        self.signals = _TaskSignals()
+        self.signals.finished.connect(self._task_finished)
+        self.signals.failed.connect(self._task_failed)
+
+        self.generation = 0
+        self.cancelled_generation = 0
+        self.pending_args = None
+        self.pending_since = None
+        self.running = False
+
+    def schedule(self, *args):
+        """Zaplanowanie obliczeń dla nowych parametrów (zastępuje wcześniej zaplanowane)"""
+        self.generation += 1
+        self.pending_args = args
+        now = time.monotonic()
+        if self.pending_since is None:
+            self.pending_since = now
+        waited_ms = (now - self.pending_since) * 1000
+        self.timer.start(int(max(0, min(self.debounce_ms, self.max_wait_ms - waited_ms))))
+
+    def cancel(self):
+        """Anulowanie zaplanowanych obliczeń i pominięcie wyniku trwającego zadania"""
+        self.cancelled_generation = self.generation
+        self.timer.stop()
+        self.pending_args = None
+        self.pending_since = None
+
+    def _start_pending(self):
+        if self.pending_args is None or self.running:
+            # Trwające zadanie uruchomi oczekujące po zakończeniu
+            return
+        args = self.pending_args
+        self.pending_args = None
+        self.pending_since = None
+        self.running = True
+        self.pool.start(_TaskRunnable(self.function, args, self.generation, self.signals))
+
+    def _task_finished(self, generation, result):
+        self.running = False
+        if generation > self.cancelled_generation:
+            self.result_ready.emit(result)
+        self._start_next()
+
+    def _task_failed(self, generation, message):
+        self.running = False
+        if generation > self.cancelled_generation:
+            self.task_failed.emit(message)
+        self._start_next()
+
+    def _start_next(self):
+        """Uruchomienie parametrów zmienionych w trakcie obliczeń (jeśli nie czekają na debounce)"""
+        if self.pending_args is not None and not self.timer.isActive():
+            self._start_pending()
@@ -2,14 +2,89 @@
 # -*- coding: utf-8 -*-
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton
-from PyQt5.QtWidgets import QSlider, QSpinBox, QTabWidget, QGridLayout
+from PyQt5.QtWidgets import QSlider, QSpinBox, QDoubleSpinBox, QTabWidget, QGridLayout
+from PyQt5.QtWidgets import QFileDialog, QInputDialog
 from PyQt5.QtCore import Qt
 import matplotlib
 matplotlib.use('Qt5Agg')
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
 import numpy as np
 
+from modules.dtype_policy import HistoryBuffer
+from modules.habitability_map import (UNION, INTERSECTION, MAX_MAP_RESOLUTION,
+                                      TEMPERATURE, PRESSURE, RADIATION, PH, AXES, ToleranceEnvelope)
+from modules.organism_store import OrganismStore, ToleranceIndex
+from modules.progressive_map import MapRefinementThread, map_preview
+from modules.background_tasks import DebouncedTask
+from modules.streaming_regression import RegressionAccumulator, MAX_DEGREE, csv_columns, statistics_with_sample
+
+# Tryby mapy habitabilności: nazwa w interfejsie -> (tryb łączenia, opis w tytule);
+# tryb None oznacza mapę wybranego organizmu
+MAP_MODES = {
+    "Wybrany organizm": (None, None),
+    "Dowolny organizm przeżywa": (UNION, "dowolnego organizmu"),
+    "Wszystkie organizmy przeżywają": (INTERSECTION, "wszystkich organizmów"),
+}
+
+# Przekroje obwiedni tolerancji: nazwa w interfejsie -> (oś X, oś Y)
+MAP_AXES = {
+    "Temperatura × Ciśnienie": (TEMPERATURE, PRESSURE),
+    "Temperatura × Promieniowanie": (TEMPERATURE, RADIATION),
+    "Temperatura × pH": (TEMPERATURE, PH),
+    "Ciśnienie × Promieniowanie": (PRESSURE, RADIATION),
+    "Ciśnienie × pH": (PRESSURE, PH),
+    "Promieniowanie × pH": (RADIATION, PH),
+}
+
+# Parametry analizy korelacji: nazwa w interfejsie -> (oś, zakres wartości, nazwa w tytule)
+CORRELATION_PARAMETERS = {
+    "Temperatura": (TEMPERATURE, (0, 150), "temperatury"),
+    "Ciśnienie": (PRESSURE, (0, 60), "ciśnienia"),
+    "Promieniowanie": (RADIATION, (0, 5000), "promieniowania"),
+    "pH": (PH, (0, 14), "pH"),
+}
+
+# Pozycja listy parametrów korelacji dla wczytanego pliku obserwacji
+OBSERVATIONS_PARAMETER = "Obserwacje z pliku"
+
+# Próg przeżywalności rysowany jako granica strefy habitabilności na mapie
+BOUNDARY_THRESHOLD = 0.5
+
+# Serie przeżywalności na wykresie symulacji (agregaty po wszystkich organizmach, %)
+VIABILITY_SERIES = ("Średnia przeżywalność", "Najwyższa przeżywalność", "Organizmy z przeżywalnością ≥ 50%")
+
+# Opisy osi na mapie habitabilności
+AXIS_LABELS = {
+    TEMPERATURE: 'Temperatura (K)',
+    PRESSURE: 'Ciśnienie (atm)',
+    RADIATION: 'Promieniowanie (Sv)',
+    PH: 'pH',
+}
+
+
+def map_boundary(envelope, x_axis, y_axis, fixed, organism=None, mode=UNION):
+    """Granica strefy przeżywalności >= BOUNDARY_THRESHOLD na przekroju mapy (śledzona adaptacyjnie)"""
+    return envelope.boundary(x_axis, y_axis, fixed, BOUNDARY_THRESHOLD, organism=organism, mode=mode)
+
+
+def viability_summary(viability):
+    """
+    Agregaty przeżywalności po organizmach w kolejności VIABILITY_SERIES
+
+    Parametry:
+    - viability: przeżywalność (%) organizmy × punkty (ToleranceIndex.viability)
+
+    Zwraca (średnia, maksimum, odsetek organizmów powyżej progu granicy mapy) - tablice po punktach
+    """
+    if len(viability) == 0:
+        empty = np.zeros(viability.shape[1])
+        return empty, empty, empty
+    return (viability.mean(axis=0), viability.max(axis=0),
+            100 * (viability >= 100 * BOUNDARY_THRESHOLD).mean(axis=0))
+
+
 class MatplotlibCanvas(FigureCanvas):
     """Klasa do osadzania wykresów matplotlib w interfejsie PyQt5"""
     
@@ -23,15 +98,30 @@ class MatplotlibCanvas(FigureCanvas):
         # Ustawienia wykresu
         self.fig.tight_layout()
         
-    def plot_correlation(self, x_data, y_data, x_label, y_label, title, color='b'):
-        """Rysowanie wykresu korelacji"""
+    def reset_axes(self):
+        """Wyczyszczenie rysunku razem z paskami kolorów"""
+        self.fig.clear()
+        self.axes = self.fig.add_subplot(111)
+        
+    def plot_correlation(self, x_data, y_data, x_label, y_label, title, color='b', fit=None):
+        """
+        Rysowanie wykresu korelacji
+        
+        Parametry:
+        - x_data, y_data: punkty do narysowania (dla dużych zbiorów - próbka)
+        - fit: wynik regresji (RegressionResult); linia trendu z pasmem ufności 95%
+        """
         self.axes.clear()
-        self.axes.scatter(x_data, y_data, color=color, alpha=0.7)
+        self.axes.scatter(x_data, y_data, color=color, alpha=0.7, s=10)
         
-        # Dodanie linii trendu
-        z = np.polyfit(x_data, y_data, 1)
-        p = np.poly1d(z)
-        self.axes.plot(x_data, p(x_data), "r--", alpha=0.7)
+        # Dodanie linii trendu z pasmem ufności
+        if fit is not None:
+            x_line = np.linspace(np.min(x_data), np.max(x_data), 200)
+            prediction, lower, upper = fit.confidence_band(x_line)
+            self.axes.plot(x_line, prediction, "r--", alpha=0.7,
+                           label=f"Trend (stopień {fit.degree}), R² = {fit.r_squared:.3f}")
+            self.axes.fill_between(x_line, lower, upper, color='r', alpha=0.2, label="Pasmo ufności 95%")
+            self.axes.legend(loc='best')
         
         self.axes.set_xlabel(x_label)
         self.axes.set_ylabel(y_label)
@@ -40,26 +130,55 @@ class MatplotlibCanvas(FigureCanvas):
         self.fig.tight_layout()
         self.draw()
         
-    def plot_habitability_map(self, temp_range, pressure_range, habitability_data, organism):
+    def plot_habitability_map(self, temp_range, pressure_range, habitability_data, organism,
+                              x_label='Temperatura (K)', y_label='Ciśnienie (atm)'):
         """Rysowanie mapy habitabilności"""
-        self.axes.clear()
+        self.reset_axes()
         
-        # Tworzenie siatki dla mapy cieplnej
-        X, Y = np.meshgrid(temp_range, pressure_range)
+        # Rysowanie mapy cieplnej (osie jako wektory - bez tworzenia pełnej siatki)
+        self.habitability_data = np.array(habitability_data, copy=True)
+        self.habitability_mesh = self.axes.pcolormesh(temp_range, pressure_range, self.habitability_data,
+                                                      cmap='viridis', shading='auto')
+        self.fig.colorbar(self.habitability_mesh, ax=self.axes, label='Indeks habitabilności')
         
-        # Rysowanie mapy cieplnej
-        c = self.axes.pcolormesh(X, Y, habitability_data, cmap='viridis', shading='auto')
-        self.fig.colorbar(c, ax=self.axes, label='Indeks habitabilności')
+        # Granica strefy habitabilności (łamane uzupełniane przez update_habitability_boundary)
+        self.boundary_lines = LineCollection([], colors='w', linewidths=1.2, linestyles='--')
+        self.axes.add_collection(self.boundary_lines, autolim=False)
         
-        self.axes.set_xlabel('Temperatura (K)')
-        self.axes.set_ylabel('Ciśnienie (atm)')
+        self.axes.set_xlabel(x_label)
+        self.axes.set_ylabel(y_label)
         self.axes.set_title(f'Mapa habitabilności dla {organism}')
         self.fig.tight_layout()
         self.draw()
         
-    def plot_simulation_biology(self, time_points, habitability_indices, organism_viability):
-        """Rysowanie wyników symulacji biologicznej w czasie"""
-        self.axes.clear()
+    def update_habitability_map(self, habitability_data, autoscale=True):
+        """Podmiana wartości istniejącej mapy habitabilności (bez tworzenia nowego wykresu)"""
+        self.habitability_data[...] = habitability_data
+        self.habitability_mesh.set_array(self.habitability_data.ravel())
+        if autoscale:
+            self.habitability_mesh.autoscale()
+        self.draw_idle()
+        
+    def update_habitability_boundary(self, boundary):
+        """Podmiana łamanych granicy strefy habitabilności (BoundaryTrace)"""
+        self.boundary_lines.set_segments(boundary.segments())
+        self.draw_idle()
+        
+    def update_habitability_tile(self, row, column, tile):
+        """Wpisanie przeliczonego kafelka do istniejącej mapy habitabilności"""
+        self.habitability_data[row:row + tile.shape[0], column:column + tile.shape[1]] = tile
+        self.habitability_mesh.set_array(self.habitability_data.ravel())
+        self.draw_idle()
+        
+    def plot_simulation_biology(self, time_points, habitability_indices, viability_series):
+        """
+        Rysowanie wyników symulacji biologicznej w czasie
+        
+        Parametry:
+        - viability_series: słownik nazwa serii -> przeżywalność (%) w czasie (agregaty po organizmach)
+        """
+        # Nowy rysunek - bez osi przeżywalności z poprzedniego wywołania
+        self.reset_axes()
         
         # Główny wykres - indeks habitabilności
         line1 = self.axes.plot(time_points, habitability_indices, 'b-', label='Indeks habitabilności')
@@ -70,13 +189,13 @@ class MatplotlibCanvas(FigureCanvas):
         # Dodatkowa oś dla przeżywalności organizmów
         ax2 = self.axes.twinx()
         
-        # Rysowanie przeżywalności dla każdego organizmu
+        # Rysowanie zagregowanych serii przeżywalności (stała liczba linii niezależnie od liczby organizmów)
         colors = ['r', 'g', 'm', 'c', 'y']
-        lines = [line1]
+        lines = list(line1)
         
-        for i, (organism, viability) in enumerate(organism_viability.items()):
+        for i, (series, viability) in enumerate(viability_series.items()):
             color = colors[i % len(colors)]
-            line = ax2.plot(time_points, viability, f'{color}-', label=organism)
+            line = ax2.plot(time_points, viability, f'{color}-', label=series)
             lines.extend(line)
             
         ax2.set_ylabel('Przeżywalność (%)')
@@ -117,20 +236,49 @@ class BiologicalModule(QWidget):
         # Wybór parametru
         parameter_label = QLabel("Parametr:")
         self.parameter_combo = QComboBox()
-        self.parameter_combo.addItems(["Temperatura", "Ciśnienie", "Promieniowanie", "pH"])
+        self.parameter_combo.addItems(CORRELATION_PARAMETERS.keys())
         control_layout.addWidget(parameter_label)
         control_layout.addWidget(self.parameter_combo)
         
+        # Stopień wielomianu linii trendu
+        degree_label = QLabel("Stopień:")
+        self.degree_spin = QSpinBox()
+        self.degree_spin.setRange(1, MAX_DEGREE)
+        self.degree_spin.setValue(1)
+        control_layout.addWidget(degree_label)
+        control_layout.addWidget(self.degree_spin)
+        
         # Przycisk analizy
         self.analyze_button = QPushButton("Analizuj korelację")
         self.analyze_button.clicked.connect(self.analyze_correlation)
         control_layout.addWidget(self.analyze_button)
         
+        # Przycisk analizy pliku obserwacji (regresja strumieniowa)
+        self.observations_button = QPushButton("Obserwacje...")
+        self.observations_button.clicked.connect(self.choose_observations)
+        control_layout.addWidget(self.observations_button)
+        
         # Przycisk mapy habitabilności
         self.map_button = QPushButton("Mapa habitabilności")
         self.map_button.clicked.connect(self.show_habitability_map)
         control_layout.addWidget(self.map_button)
         
+        # Tryb, przekrój i rozdzielczość mapy habitabilności
+        self.map_mode_combo = QComboBox()
+        self.map_mode_combo.addItems(MAP_MODES.keys())
+        control_layout.addWidget(self.map_mode_combo)
+        
+        self.map_axes_combo = QComboBox()
+        self.map_axes_combo.addItems(MAP_AXES.keys())
+        control_layout.addWidget(self.map_axes_combo)
+        
+        resolution_label = QLabel("Rozdzielczość:")
+        self.map_resolution_spin = QSpinBox()
+        self.map_resolution_spin.setRange(10, MAX_MAP_RESOLUTION)
+        self.map_resolution_spin.setValue(200)
+        control_layout.addWidget(resolution_label)
+        control_layout.addWidget(self.map_resolution_spin)
+        
         # Przycisk wyników symulacji
         self.simulation_results_button = QPushButton("Wyniki symulacji")
         self.simulation_results_button.clicked.connect(self.show_simulation_results)
@@ -187,6 +335,28 @@ class BiologicalModule(QWidget):
         env_layout.addWidget(self.radiation_slider)
         env_layout.addWidget(self.radiation_spin)
         
+        # pH
+        ph_label = QLabel("pH:")
+        self.ph_spin = QDoubleSpinBox()
+        self.ph_spin.setRange(0, 14)
+        self.ph_spin.setSingleStep(0.1)
+        self.ph_spin.setValue(7.4)
+        
+        env_layout.addWidget(ph_label)
+        env_layout.addWidget(self.ph_spin)
+        
+        # Liczba organizmów przeżywających w bieżących warunkach
+        self.survivors_label = QLabel()
+        env_layout.addWidget(self.survivors_label)
+        
+        # Zmiana parametrów środowiskowych to tylko nowy przekrój obwiedni tolerancji
+        self.temp_slider.valueChanged.connect(self.update_map_slice)
+        self.pressure_slider.valueChanged.connect(self.update_map_slice)
+        self.radiation_slider.valueChanged.connect(self.update_map_slice)
+        self.ph_spin.valueChanged.connect(self.update_map_slice)
+        for control in (self.temp_slider, self.pressure_slider, self.radiation_slider, self.ph_spin):
+            control.valueChanged.connect(self.update_survivors)
+        
         main_layout.addLayout(env_layout)
         
         # Zakładki z wykresami
@@ -230,230 +400,328 @@ class BiologicalModule(QWidget):
         self.setLayout(main_layout)
         
         # Dane symulacji
-        self.simulation_time_points = []
-        self.simulation_habitability_indices = []
-        self.simulation_organism_viability = {}
-        
-    def load_biological_data(self):
-        """Ładowanie danych biologicznych"""
-        # Przykładowe dane o organizmach (w rzeczywistej aplikacji byłyby pobierane z bazy danych)
-        self.organisms = {
-            "Niesporczak (Tardigrade)": {
-                "temp_range": (0, 150),  # K
-                "pressure_range": (0, 60),  # atm
-                "radiation_tolerance": 5000,  # Sv
-                "pH_range": (3, 10),
-                "cell_composition": {
-                    "water": 85,
-                    "protein": 10,
-                    "lipids": 3,
-                    "nucleic_acids": 1,
-                    "other": 1
-                }
-            },
-            "Deinococcus radiodurans": {
-                "temp_range": (10, 45),  # K
-                "pressure_range": (1, 5),  # atm
-                "radiation_tolerance": 15000,  # Sv
-                "pH_range": (5, 11),
-                "cell_composition": {
-                    "water": 80,
-                    "protein": 12,
-                    "lipids": 4,
-                    "nucleic_acids": 2,
-                    "other": 2
-                }
-            },
-            "Thermococcus litoralis": {
-                "temp_range": (55, 100),  # K
-                "pressure_range": (1, 20),  # atm
-                "radiation_tolerance": 200,  # Sv
-                "pH_range": (5, 9),
-                "cell_composition": {
-                    "water": 75,
-                    "protein": 15,
-                    "lipids": 5,
-                    "nucleic_acids": 3,
-                    "other": 2
-                }
-            },
-            "Escherichia coli": {
-                "temp_range": (15, 45),  # K
-                "pressure_range": (1, 2),  # atm
-                "radiation_tolerance": 20,  # Sv
-                "pH_range": (4.5, 9),
-                "cell_composition": {
-                    "water": 70,
-                    "protein": 15,
-                    "lipids": 10,
-                    "nucleic_acids": 3,
-                    "other": 2
-                }
-            },
-            "Homo sapiens (komórka)": {
-                "temp_range": (35, 42),  # K
-                "pressure_range": (0.8, 1.2),  # atm
-                "radiation_tolerance": 4,  # Sv
-                "pH_range": (7.35, 7.45),
-                "cell_composition": {
-                    "water": 65,
-                    "protein": 20,
-                    "lipids": 12,
-                    "nucleic_acids": 2,
-                    "other": 1
-                }
-            }
-        }
+        self.simulation_time_points = HistoryBuffer()
+        self.simulation_habitability_indices = HistoryBuffer()
+        self.simulation_viability = {series: HistoryBuffer() for series in VIABILITY_SERIES}
+        
+        # Statystyki regresji dla dużych zbiorów obserwacji liczone w tle (jeden przebieg porcjami)
+        self.observation_task = DebouncedTask(
+            lambda path, x_column, y_column: ((x_column, y_column, path),
+                                              statistics_with_sample(path, [x_column], y_column)),
+            debounce_ms=0, parent=self)
+        self.observation_task.result_ready.connect(self.observation_regression_ready)
+        self.observation_task.task_failed.connect(self.observation_regression_failed)
+        self.observations = None
+        
+        # Obwiednia tolerancji (liczona przy pierwszej mapie) i parametry wyświetlanej mapy
+        self.tolerance_envelope = None
+        self.map_state = None
+        
+        # Wątki stopniowego przeliczania mapy (numer generacji odrzuca nieaktualne kafelki)
+        self.map_generation = 0
+        self.map_threads = []
+        
+        # Przekroje mapy po zmianie suwaków liczone w tle (z opóźnieniem, wygrywa ostatnia wartość)
+        self.map_update_task = DebouncedTask(
+            lambda *request: (request, map_preview(*request), map_boundary(*request)), parent=self)
+        self.map_update_task.result_ready.connect(self.map_update_ready)
+        
+        # Zmiana organizmu, trybu, przekroju lub rozdzielczości przerywa przeliczanie mapy
+        self.organism_combo.currentTextChanged.connect(self.cancel_map_refinement)
+        self.map_mode_combo.currentIndexChanged.connect(self.cancel_map_refinement)
+        self.map_axes_combo.currentIndexChanged.connect(self.cancel_map_refinement)
+        self.map_resolution_spin.valueChanged.connect(self.cancel_map_refinement)
+        
+    def load_biological_data(self, path=None):
+        """
+        Ładowanie danych biologicznych
+        
+        Parametry:
+        - path: plik CSV/JSON/.dat z tolerancjami organizmów (None - wbudowane dane przykładowe)
+        """
+        # Kolumnowy magazyn organizmów (dane przykładowe lub plik) z indeksem przedziałów tolerancji
+        self.organisms = OrganismStore.default() if path is None else OrganismStore.load(path)
+        self.tolerance_index = ToleranceIndex(self.organisms)
+        
+        # Nowe dane organizmów unieważniają obwiednię tolerancji
+        self.map_update_task.cancel()
+        self.cancel_map_refinement()
+        self.tolerance_envelope = None
+        self.map_state = None
         
         # Wypełnienie combobox
+        self.organism_combo.clear()
         self.organism_combo.addItems(self.organisms.keys())
+        self.update_survivors()
         
         # Wyświetlenie początkowej korelacji
         self.analyze_correlation()
         
     def analyze_correlation(self):
-        """Analiza korelacji między parametrami środowiskowymi a właściwościami organizmów"""
-        organism = self.organism_combo.currentText()
-        parameter = self.parameter_combo.currentText()
+        """
+        Analiza korelacji między parametrami środowiskowymi a przeżywalnością organizmów
         
-        # Generowanie danych dla korelacji (przykład)
-        if parameter == "Temperatura":
-            x_data = np.linspace(0, 150, 50)
-            
-            # Symulacja przeżywalności w zależności od temperatury
-            min_temp, max_temp = self.organisms[organism]["temp_range"]
-            y_data = 100 * np.exp(-0.5 * ((x_data - (min_temp + max_temp) / 2) / ((max_temp - min_temp) / 4))**2)
-            
-            x_label = "Temperatura (K)"
-            y_label = "Przeżywalność (%)"
-            title = f"Korelacja temperatury i przeżywalności dla {organism}"
-            
-        elif parameter == "Ciśnienie":
-            x_data = np.linspace(0, 60, 50)
-            
-            # Symulacja przeżywalności w zależności od ciśnienia
-            min_pressure, max_pressure = self.organisms[organism]["pressure_range"]
-            y_data = 100 * np.exp(-0.5 * ((x_data - (min_pressure + max_pressure) / 2) / ((max_pressure - min_pressure) / 4))**2)
-            
-            x_label = "Ciśnienie (atm)"
-            y_label = "Przeżywalność (%)"
-            title = f"Korelacja ciśnienia i przeżywalności dla {organism}"
-            
-        elif parameter == "Promieniowanie":
-            x_data = np.linspace(0, 5000, 50)
-            
-            # Symulacja przeżywalności w zależności od promieniowania
-            max_radiation = self.organisms[organism]["radiation_tolerance"]
-            y_data = 100 * np.exp(-x_data / max_radiation)
-            
-            x_label = "Promieniowanie (Sv)"
-            y_label = "Przeżywalność (%)"
-            title = f"Korelacja promieniowania i przeżywalności dla {organism}"
-            
-        else:  # pH
-            x_data = np.linspace(0, 14, 50)
-            
-            # Symulacja przeżywalności w zależności od pH
-            min_ph, max_ph = self.organisms[organism]["pH_range"]
-            y_data = 100 * np.exp(-0.5 * ((x_data - (min_ph + max_ph) / 2) / ((max_ph - min_ph) / 4))**2)
+        Dla parametru środowiskowego rysowana jest krzywa przeżywalności wybranego
+        organizmu z modelu tolerancji (pozostałe parametry w optimum organizmu);
+        dla wczytanego pliku obserwacji - regresja z jego statystyk strumieniowych.
+        """
+        parameter = self.parameter_combo.currentText()
+        if parameter == OBSERVATIONS_PARAMETER:
+            self.plot_observations()
+            return
             
-            x_label = "pH"
-            y_label = "Przeżywalność (%)"
-            title = f"Korelacja pH i przeżywalności dla {organism}"
+        organism = self.organism_combo.currentText()
+        axis, (low, high), parameter_name = CORRELATION_PARAMETERS[parameter]
+        x_data = np.linspace(low, high, 50)
+        
+        # Przeżywalność z indeksu tolerancji wzdłuż wybranej osi
+        data = self.organisms[organism]
+        point = {
+            TEMPERATURE: np.mean(data["temp_range"]),
+            PRESSURE: np.mean(data["pressure_range"]),
+            RADIATION: 0.0,
+            PH: np.mean(data["pH_range"]),
+            axis: x_data,
+        }
+        row = self.organisms.rows([organism])[0]
+        y_data = self.tolerance_index.viability(*[point[name] for name in AXES])[row]
             
-        # Dodanie szumu do danych
-        y_data += np.random.normal(0, 5, size=y_data.shape)
-        y_data = np.clip(y_data, 0, 100)  # Ograniczenie wartości do zakresu 0-100%
+        # Regresja ze statystyk dostatecznych (ta sama ścieżka co dla dużych zbiorów obserwacji)
+        fit = RegressionAccumulator(1, self.degree_spin.value()).update(x_data, y_data).fit()
             
         # Aktualizacja wykresu
-        self.correlation_canvas.plot_correlation(x_data, y_data, x_label, y_label, title)
+        self.correlation_canvas.plot_correlation(
+            x_data, y_data, AXIS_LABELS[axis], "Przeżywalność (%)",
+            f"Korelacja {parameter_name} i przeżywalności dla {organism}", fit=fit)
         
         # Przełączenie na zakładkę korelacji
         self.tabs.setCurrentWidget(self.correlation_tab)
         
+    def choose_observations(self):
+        """Wybór pliku CSV z obserwacjami oraz kolumn parametru i odpowiedzi"""
+        path, _ = QFileDialog.getOpenFileName(self, "Wybierz plik z obserwacjami", "",
+                                              "Pliki CSV (*.csv);;Wszystkie pliki (*)")
+        if not path:
+            return
+        try:
+            columns = csv_columns(path)
+        except (OSError, ValueError) as error:
+            self.observation_regression_failed(str(error))
+            return
+        if len(columns) < 2:
+            self.observation_regression_failed(f"Plik {path} musi mieć co najmniej dwie kolumny")
+            return
+            
+        x_column, accepted = QInputDialog.getItem(self, "Obserwacje", "Parametr (oś X):", columns, 0, False)
+        if not accepted:
+            return
+        responses = [column for column in columns if column != x_column]
+        y_column, accepted = QInputDialog.getItem(self, "Obserwacje", "Odpowiedź (oś Y):", responses,
+                                                  len(responses) - 1, False)
+        if accepted:
+            self.analyze_observations(path, x_column, y_column)
+        
+    def analyze_observations(self, path, x_column, y_column):
+        """
+        Analiza korelacji dla pliku CSV z obserwacjami (miliony wierszy)
+        
+        Statystyki regresji liczone są w tle w jednym przebiegu porcjami danych
+        (dla najwyższego stopnia wielomianu, więc zmiana stopnia nie wymaga
+        ponownego odczytu); na wykresie rysowana jest losowa próbka punktów.
+        """
+        self.observation_task.schedule(path, x_column, y_column)
+        
+    def observation_regression_ready(self, result):
+        """Zapamiętanie statystyk pliku obserwacji i wyświetlenie regresji"""
+        labels, (accumulator, x_sample, y_sample) = result
+        self.observations = (labels, accumulator, x_sample[:, 0], y_sample)
+        if self.parameter_combo.findText(OBSERVATIONS_PARAMETER) < 0:
+            self.parameter_combo.addItem(OBSERVATIONS_PARAMETER)
+        self.parameter_combo.setCurrentText(OBSERVATIONS_PARAMETER)
+        self.plot_observations()
+        
+    def plot_observations(self):
+        """Regresja wybranego stopnia ze statystyk wczytanego pliku obserwacji"""
+        (x_column, y_column, path), accumulator, x_sample, y_sample = self.observations
+        try:
+            fit = accumulator.fit(self.degree_spin.value())
+        except ValueError as error:
+            self.observation_regression_failed(str(error))
+            return
+        self.correlation_canvas.plot_correlation(
+            x_sample, y_sample, x_column, y_column,
+            f"Korelacja {x_column} i {y_column} ({fit.count} obserwacji)", fit=fit)
+        self.tabs.setCurrentWidget(self.correlation_tab)
+        
+    def observation_regression_failed(self, message):
+        """Informacja o błędzie analizy pliku obserwacji"""
+        self.correlation_canvas.axes.clear()
+        self.correlation_canvas.axes.set_title("Błąd analizy danych obserwacyjnych")
+        self.correlation_canvas.axes.text(0.5, 0.5, message.strip().splitlines()[-1], ha='center',
+                                          va='center', wrap=True, transform=self.correlation_canvas.axes.transAxes)
+        self.correlation_canvas.draw()
+        
     def show_habitability_map(self):
         """Wyświetlenie mapy habitabilności"""
         organism = self.organism_combo.currentText()
-        
-        # Generowanie danych dla mapy habitabilności
-        temp_range = np.linspace(0, 150, 50)
-        pressure_range = np.linspace(0, 60, 50)
-        
-        # Symulacja indeksu habitabilności w zależności od temperatury i ciśnienia
-        min_temp, max_temp = self.organisms[organism]["temp_range"]
-        min_pressure, max_pressure = self.organisms[organism]["pressure_range"]
-        
-        habitability_data = np.zeros((len(pressure_range), len(temp_range)))
-        
-        for i, p in enumerate(pressure_range):
-            for j, t in enumerate(temp_range):
-                # Obliczenie indeksu habitabilności (przykład)
-                temp_factor = np.exp(-0.5 * ((t - (min_temp + max_temp) / 2) / ((max_temp - min_temp) / 4))**2)
-                pressure_factor = np.exp(-0.5 * ((p - (min_pressure + max_pressure) / 2) / ((max_pressure - min_pressure) / 4))**2)
-                
-                habitability_data[i, j] = temp_factor * pressure_factor
-                
-        # Aktualizacja wykresu
-        self.map_canvas.plot_habitability_map(temp_range, pressure_range, habitability_data, organism)
+        mode, label = MAP_MODES[self.map_mode_combo.currentText()]
+        x_axis, y_axis = MAP_AXES[self.map_axes_combo.currentText()]
+        resolution = self.map_resolution_spin.value()
+        
+        # Obwiednia tolerancji jest liczona raz dla danej rozdzielczości
+        envelope = self.get_tolerance_envelope(resolution)
+        self.map_state = {
+            "organism": organism if mode is None else None,
+            "mode": mode,
+            "x_axis": x_axis,
+            "y_axis": y_axis,
+        }
+        if mode is None:
+            label = organism
+            
+        # Aktualizacja wykresu (duże mapy: najpierw podgląd zgrubny, potem kafelki w tle)
+        self.map_canvas.plot_habitability_map(envelope.grids[x_axis], envelope.grids[y_axis],
+                                              self.render_habitability_map(), label,
+                                              AXIS_LABELS[x_axis], AXIS_LABELS[y_axis])
+        self.map_canvas.update_habitability_boundary(map_boundary(*self.map_request()))
         
         # Przełączenie na zakładkę mapy habitabilności
         self.tabs.setCurrentWidget(self.map_tab)
         
+    def get_tolerance_envelope(self, resolution):
+        """Obwiednia tolerancji organizmów dla danej rozdzielczości (z pamięci, jeśli już policzona)"""
+        envelope = self.tolerance_envelope
+        if envelope is None or len(envelope.grids[TEMPERATURE]) != resolution:
+            envelope = ToleranceEnvelope.regular(self.organisms, resolution)
+            self.tolerance_envelope = envelope
+        return envelope
+        
+    def environment_conditions(self):
+        """Bieżące wartości parametrów środowiskowych z suwaków"""
+        return {
+            TEMPERATURE: self.temp_spin.value(),
+            PRESSURE: self.pressure_spin.value(),
+            RADIATION: self.radiation_spin.value(),
+            PH: self.ph_spin.value(),
+        }
+        
+    def update_survivors(self):
+        """Liczba organizmów, których zakresy tolerancji obejmują bieżące warunki"""
+        conditions = self.environment_conditions()
+        rows = self.tolerance_index.survivors(conditions[TEMPERATURE], conditions[PRESSURE],
+                                              conditions[RADIATION], conditions[PH])
+        self.survivors_label.setText(f"Przeżywa: {len(rows)}/{len(self.organisms)}")
+        
+    def update_map_slice(self):
+        """Zaplanowanie odświeżenia wyświetlanej mapy po zmianie parametrów środowiskowych"""
+        if self.map_state is None:
+            return
+        self.map_update_task.schedule(*self.map_request())
+        
+    def map_update_ready(self, result):
+        """Wyświetlenie mapy policzonej w tle po zmianie parametrów"""
+        request, preview, boundary = result
+        if self.map_state is None or request[0] is not self.tolerance_envelope:
+            return
+        self.map_canvas.update_habitability_map(self.start_map_refinement(request, preview))
+        self.map_canvas.update_habitability_boundary(boundary)
+        
+    def map_request(self):
+        """Parametry przekroju wyświetlanej mapy (dane wejściowe dla obliczeń w tle)"""
+        state = self.map_state
+        return (self.tolerance_envelope, state["x_axis"], state["y_axis"], self.environment_conditions(),
+                state["organism"], state["mode"] or UNION)
+        
+    def render_habitability_map(self):
+        """
+        Obliczenie wyświetlanej mapy habitabilności
+        
+        Małe mapy liczone są od razu w całości. Dla dużych zwracany jest
+        podgląd zgrubny, a dokładne wartości liczy w tle MapRefinementThread,
+        zaczynając od kafelków na granicach strefy habitabilności.
+        """
+        self.map_update_task.cancel()
+        request = self.map_request()
+        return self.start_map_refinement(request, map_preview(*request))
+        
+    def start_map_refinement(self, request, preview):
+        """Uruchomienie dokładnego przeliczania podglądu zgrubnego (zwraca mapę do wyświetlenia)"""
+        self.cancel_map_refinement()
+        self.map_generation += 1
+        data, coarse, step = preview
+        if coarse is None:
+            return data
+            
+        envelope, x_axis, y_axis, conditions, organism, mode = request
+        thread = MapRefinementThread(self.map_generation, envelope, x_axis, y_axis, conditions, coarse,
+                                     organism=organism, mode=mode, step=step)
+        thread.tile_ready.connect(self.map_tile_ready)
+        thread.refinement_finished.connect(self.map_refinement_finished)
+        thread.finished.connect(lambda: self.map_threads.remove(thread))
+        self.map_threads.append(thread)
+        thread.start()
+        return data
+        
+    def map_tile_ready(self, generation, row, column, tile):
+        """Wpisanie dokładnie przeliczonego kafelka do wyświetlanej mapy"""
+        if generation == self.map_generation:
+            self.map_canvas.update_habitability_tile(row, column, tile)
+            
+    def map_refinement_finished(self, generation):
+        """Dopasowanie skali kolorów po przeliczeniu całej mapy"""
+        if generation == self.map_generation:
+            self.map_canvas.update_habitability_map(self.map_canvas.habitability_data)
+            
+    def cancel_map_refinement(self):
+        """Przerwanie stopniowego przeliczania mapy habitabilności"""
+        self.map_generation += 1
+        for thread in self.map_threads:
+            thread.cancel()
+            
+    def stop_map_refinement(self):
+        """Przerwanie przeliczania mapy i oczekiwanie na zakończenie wątków (np. przy zamykaniu)"""
+        self.cancel_map_refinement()
+        for thread in list(self.map_threads):
+            thread.wait()
+        
     def show_simulation_results(self):
         """Wyświetlenie wyników symulacji biologicznej"""
-        if len(self.simulation_time_points) > 0 and self.simulation_organism_viability:
+        if len(self.simulation_time_points) > 0:
             self.simulation_canvas.plot_simulation_biology(
-                self.simulation_time_points,
-                self.simulation_habitability_indices,
-                self.simulation_organism_viability
+                self.simulation_time_points.values(),
+                self.simulation_habitability_indices.values(),
+                {series: viability.values() for series, viability in self.simulation_viability.items()}
             )
         else:
-            # Jeśli nie ma danych symulacji, wygeneruj przykładowe
+            # Jeśli nie ma danych symulacji, wygeneruj przykładowe (wahania temperatury wokół bieżących warunków)
             time_points = np.linspace(0, 100, 50)
             habitability_indices = 50 + 30 * np.sin(0.1 * time_points) + np.random.normal(0, 5, time_points.shape)
             habitability_indices = np.clip(habitability_indices, 0, 100)
             
-            organism_viability = {}
-            for organism in self.organisms.keys():
-                # Różne wzorce przeżywalności dla różnych organizmów
-                if "Niesporczak" in organism:
-                    viability = 80 + 10 * np.sin(0.05 * time_points) + np.random.normal(0, 3, time_points.shape)
-                elif "Deinococcus" in organism:
-                    viability = 60 + 20 * np.sin(0.1 * time_points) + np.random.normal(0, 5, time_points.shape)
-                elif "Thermococcus" in organism:
-                    viability = 40 + 30 * np.sin(0.15 * time_points) + np.random.normal(0, 7, time_points.shape)
-                elif "coli" in organism:
-                    viability = 30 + 20 * np.sin(0.2 * time_points) + np.random.normal(0, 5, time_points.shape)
-                else:  # Homo sapiens
-                    viability = 20 + 10 * np.sin(0.25 * time_points) + np.random.normal(0, 3, time_points.shape)
-                    
-                viability = np.clip(viability, 0, 100)
-                organism_viability[organism] = viability
+            conditions = self.environment_conditions()
+            viability = self.tolerance_index.viability(
+                conditions[TEMPERATURE] + 20 * np.sin(0.1 * time_points), conditions[PRESSURE],
+                conditions[RADIATION], conditions[PH])
                 
             self.simulation_canvas.plot_simulation_biology(
                 time_points,
                 habitability_indices,
-                organism_viability
+                dict(zip(VIABILITY_SERIES, viability_summary(viability)))
             )
             
         # Przełączenie na zakładkę symulacji
         self.tabs.setCurrentWidget(self.simulation_tab)
         
-    def update_simulation_data(self, time_point, habitability_index, organism_data):
-        """Aktualizacja danych symulacji biologicznej"""
+    def update_simulation_data(self, time_point, habitability_index, temperature, pressure, radiation, ph):
+        """
+        Aktualizacja danych symulacji biologicznej
+        
+        Przeżywalność wszystkich organizmów w bieżących warunkach liczona jest
+        wektorowo z indeksu tolerancji; zapisywane są tylko jej agregaty.
+        """
         self.simulation_time_points.append(time_point)
         self.simulation_habitability_indices.append(habitability_index)
         
-        # Inicjalizacja słownika przeżywalności organizmów przy pierwszym wywołaniu
-        if not self.simulation_organism_viability:
-            for organism in self.organisms.keys():
-                self.simulation_organism_viability[organism] = []
-                
-        # Aktualizacja przeżywalności organizmów
-        for organism in self.simulation_organism_viability.keys():
-            if organism in organism_data:
-                self.simulation_organism_viability[organism].append(organism_data[organism])
-            else:
-                # Jeśli brak danych dla danego organizmu, użyj ostatniej wartości lub 0
-                last_value = self.simulation_organism_viability[organism][-1] if self.simulation_organism_viability[organism] else 0
-                self.simulation_organism_viability[organism].append(last_value)
+        viability = self.tolerance_index.viability(temperature, pressure, radiation, ph)
+        for history, values in zip(self.simulation_viability.values(), viability_summary(viability)):
+            history.append(values[0])
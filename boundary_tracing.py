@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+# Domyślna liczba komórek siatki zgrubnej (oś X, oś Y)
+DEFAULT_COARSE_SHAPE = (32, 32)
+
+# Domyślna dokładność granicy (ułamek zakresu osi)
+DEFAULT_TOLERANCE = 1e-3
+
+# Maksymalna liczba poziomów podziału komórek granicznych
+MAX_DEPTH = 16
+
+# Pary krawędzi łączonych odcinkami w komórkach siodłowych
+# (krawędzie: 0 - dolna, 1 - prawa, 2 - górna, 3 - lewa):
+# (przypadek, środek powyżej progu) -> dwie pary krawędzi
+_SADDLE_PAIRS = {
+    (5, True): ((0, 1), (2, 3)),
+    (5, False): ((3, 0), (1, 2)),
+    (10, True): ((3, 0), (1, 2)),
+    (10, False): ((0, 1), (2, 3)),
+}
+
+
+class BoundaryTrace:
+    """Granica obszaru wartość >= próg jako łamane (wynik trace_boundary)"""
+
+    def __init__(self, polylines, threshold, evaluations, dense_evaluations, depth):
+        self.polylines = polylines
+        self.threshold = threshold
+        self.evaluations = evaluations
+        self.dense_evaluations = dense_evaluations
+        self.depth = depth
+
+    def __len__(self):
+        return len(self.polylines)
+
+    def segments(self):
+        """Łamane jako lista tablic (punkty × 2), np. dla LineCollection"""
+        return list(self.polylines)
+
+
+class _LatticeValues:
+    """Wartości funkcji w węzłach najdrobniejszej siatki (każdy węzeł liczony raz)"""
+
+    def __init__(self, function, x_range, y_range, n_columns, n_rows):
+        self.function = function
+        self.x0, x1 = x_range
+        self.y0, y1 = y_range
+        self.dx = (x1 - self.x0) / n_columns
+        self.dy = (y1 - self.y0) / n_rows
+        self.stride = n_rows + 1
+        self.keys = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0)
+
+    def coordinates(self, p, q):
+        return self.x0 + p * self.dx, self.y0 + q * self.dy
+
+    def lookup(self, p, q):
+        """Wartości w węzłach (p, q); brakujące są liczone jedną wektorową porcją"""
+        keys = p * self.stride + q
+        position = np.searchsorted(self.keys, keys)
+        known = position < len(self.keys)
+        known[known] = self.keys[position[known]] == keys[known]
+        if not known.all():
+            missing = np.unique(keys[~known])
+            x, y = self.coordinates(missing // self.stride, missing % self.stride)
+            values = np.broadcast_to(np.asarray(self.function(x, y), dtype=np.float64), missing.shape)
+            insert_at = np.searchsorted(self.keys, missing)
+            self.keys = np.insert(self.keys, insert_at, missing)
+            self.values = np.insert(self.values, insert_at, values)
+            position = np.searchsorted(self.keys, keys)
+        return self.values[position]
+
+
+def _depth(coarse_shape, tolerance, max_depth):
+    """Liczba poziomów podziału, po której komórka jest nie większa niż tolerance zakresu osi"""
+    cells = min(coarse_shape)
+    if tolerance <= 0:
+        return max_depth
+    return int(np.clip(np.ceil(np.log2(1.0 / (tolerance * cells))), 0, max_depth))
+
+
+def _corner_values(lattice, cell_x, cell_y, step):
+    """Wartości w narożnikach komórek: (lewy dolny, prawy dolny, prawy górny, lewy górny)"""
+    p0, q0 = cell_x * step, cell_y * step
+    p1, q1 = p0 + step, q0 + step
+    values = lattice.lookup(np.concatenate([p0, p1, p1, p0]), np.concatenate([q0, q0, q1, q1]))
+    return tuple(values.reshape(4, len(cell_x)))
+
+
+def _crossings(corners, threshold):
+    """Maska krawędzi przecinanych przez granicę (komórki × 4) i przypadek marching squares"""
+    inside = [value >= threshold for value in corners]
+    case = inside[0] * 1 + inside[1] * 2 + inside[2] * 4 + inside[3] * 8
+    edges = np.column_stack([inside[0] != inside[1], inside[1] != inside[2],
+                             inside[2] != inside[3], inside[3] != inside[0]])
+    return edges, case
+
+
+def _children(cell_x, cell_y):
+    """Cztery komórki potomne (na następnym poziomie) każdej komórki"""
+    offsets_x = np.array([0, 1, 0, 1])
+    offsets_y = np.array([0, 0, 1, 1])
+    return ((2 * cell_x[:, None] + offsets_x).ravel(), (2 * cell_y[:, None] + offsets_y).ravel())
+
+
+def _refine(lattice, parents_x, parents_y, level_shape, step, threshold):
+    """
+    Podział komórek granicznych na następny poziom
+
+    Granica może przecinać krawędź komórki sąsiedniej dwukrotnie (narożniki
+    tego samego znaku), więc sąsiad nie byłby oznaczony jako graniczny.
+    Komórki potomne, do których prowadzi granica z już podzielonych
+    komórek, dołączane są do podziału aż do domknięcia zbioru.
+
+    Zwraca komórki graniczne następnego poziomu
+    """
+    n_columns, n_rows = level_shape
+    parent_keys = set((parents_x * (n_rows // 2) + parents_y).tolist())
+    cells_x, cells_y = _children(parents_x, parents_y)
+    boundary_x = []
+    boundary_y = []
+    while len(cells_x):
+        edges, _ = _crossings(_corner_values(lattice, cells_x, cells_y, step), threshold)
+        crossing = edges.any(axis=1)
+        boundary_x.append(cells_x[crossing])
+        boundary_y.append(cells_y[crossing])
+
+        # Sąsiedzi za przecinanymi krawędziami (dolna, prawa, górna, lewa)
+        neighbours_x = np.concatenate([cells_x[edges[:, 0]], cells_x[edges[:, 1]] + 1,
+                                       cells_x[edges[:, 2]], cells_x[edges[:, 3]] - 1])
+        neighbours_y = np.concatenate([cells_y[edges[:, 0]] - 1, cells_y[edges[:, 1]],
+                                       cells_y[edges[:, 2]] + 1, cells_y[edges[:, 3]]])
+        valid = (neighbours_x >= 0) & (neighbours_x < n_columns) & (neighbours_y >= 0) & (neighbours_y < n_rows)
+        new_parents = set(((neighbours_x[valid] // 2) * (n_rows // 2) + neighbours_y[valid] // 2).tolist())
+        new_parents -= parent_keys
+        parent_keys |= new_parents
+        new_parents = np.fromiter(new_parents, dtype=np.int64, count=len(new_parents))
+        cells_x, cells_y = _children(new_parents // (n_rows // 2), new_parents % (n_rows // 2))
+    return np.concatenate(boundary_x), np.concatenate(boundary_y)
+
+
+def _segments(lattice, cells_x, cells_y, threshold, n_rows):
+    """
+    Odcinki granicy w komórkach najdrobniejszego poziomu (marching squares)
+
+    Zwraca (klucze krawędzi odcinków (odcinki × 2), klucze krawędzi, punkty przecięcia)
+    """
+    corners = _corner_values(lattice, cells_x, cells_y, 1)
+    edges, case = _crossings(corners, threshold)
+    v00, v10, v11, v01 = corners
+
+    # Punkty przecięcia krawędzi (interpolacja liniowa)
+    def fraction(start, end):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.clip(np.nan_to_num((threshold - start) / (end - start), nan=0.5), 0, 1)
+
+    x0, y0 = lattice.coordinates(cells_x, cells_y)
+    points = np.stack([
+        np.column_stack([x0 + fraction(v00, v10) * lattice.dx, y0]),
+        np.column_stack([x0 + lattice.dx, y0 + fraction(v10, v11) * lattice.dy]),
+        np.column_stack([x0 + fraction(v01, v11) * lattice.dx, y0 + lattice.dy]),
+        np.column_stack([x0, y0 + fraction(v00, v01) * lattice.dy]),
+    ], axis=1)
+
+    # Klucze krawędzi siatki: poziome (parzyste) i pionowe (nieparzyste)
+    stride = n_rows + 1
+    edge_keys = np.column_stack([
+        2 * (cells_x * stride + cells_y),
+        2 * ((cells_x + 1) * stride + cells_y) + 1,
+        2 * (cells_x * stride + cells_y + 1),
+        2 * (cells_x * stride + cells_y) + 1,
+    ])
+
+    # Komórki zwykłe: jeden odcinek między dwiema przecinanymi krawędziami
+    saddle = (case == 5) | (case == 10)
+    regular = ~saddle
+    first = np.argmax(edges[regular], axis=1)
+    second = 3 - np.argmax(edges[regular][:, ::-1], axis=1)
+    rows = np.flatnonzero(regular)
+    pairs = [np.column_stack([rows, first, second])]
+
+    # Komórki siodłowe: dwa odcinki, rozstrzygnięcie wartością w środku komórki
+    for row in np.flatnonzero(saddle):
+        center_inside = (v00[row] + v10[row] + v11[row] + v01[row]) / 4 >= threshold
+        for edge_a, edge_b in _SADDLE_PAIRS[(int(case[row]), bool(center_inside))]:
+            pairs.append(np.array([[row, edge_a, edge_b]]))
+    pairs = np.concatenate(pairs)
+
+    segment_keys = np.column_stack([edge_keys[pairs[:, 0], pairs[:, 1]], edge_keys[pairs[:, 0], pairs[:, 2]]])
+    crossing_keys, unique_rows = np.unique(edge_keys[edges], return_index=True)
+    crossing_points = points[edges][unique_rows]
+    return segment_keys, crossing_keys, crossing_points
+
+
+def _join(segment_keys):
+    """
+    Połączenie odcinków o wspólnych krawędziach w łamane (listy kluczy krawędzi)
+
+    Końce odcinków numerowane są 2 * odcinek + strona; każda krawędź siatki
+    należy do najwyżej dwóch odcinków, więc po sortowaniu kluczy sąsiednie
+    równe klucze wskazują połączone końce.
+    """
+    keys = segment_keys.ravel()
+    order = np.argsort(keys, kind='stable')
+    shared = np.flatnonzero(keys[order[:-1]] == keys[order[1:]])
+    partner = np.full(len(keys), -1, dtype=np.int64)
+    partner[order[shared]] = order[shared + 1]
+    partner[order[shared + 1]] = order[shared]
+
+    keys = keys.tolist()
+    partner = partner.tolist()
+    used = [False] * len(segment_keys)
+
+    def walk(end):
+        chain = [keys[end]]
+        while end >= 0 and not used[end // 2]:
+            used[end // 2] = True
+            end ^= 1
+            chain.append(keys[end])
+            end = partner[end]
+        return chain
+
+    chains = []
+    # Najpierw łamane otwarte (zaczynające się na brzegu obszaru), potem zamknięte
+    for end in range(len(keys)):
+        if partner[end] < 0 and not used[end // 2]:
+            chains.append(walk(end))
+    for segment in range(len(used)):
+        if not used[segment]:
+            chains.append(walk(2 * segment))
+    return chains
+
+
+def trace_boundary(function, x_range, y_range, threshold, coarse_shape=DEFAULT_COARSE_SHAPE,
+                   tolerance=DEFAULT_TOLERANCE, max_depth=MAX_DEPTH):
+    """
+    Śledzenie granicy obszaru function(x, y) >= threshold bez gęstej siatki
+
+    Funkcja liczona jest na siatce zgrubnej; komórki, których narożniki
+    leżą po różnych stronach progu, są dzielone na cztery (drzewo
+    czwórkowe) aż do rozmiaru tolerance zakresu osi. Na najdrobniejszym
+    poziomie odcinki granicy wyznacza marching squares z interpolacją
+    liniową. Obszary mniejsze niż komórka siatki zgrubnej, nieprzecinające
+    jej węzłów, mogą zostać pominięte.
+
+    Parametry:
+    - function: funkcja wektorowa f(x, y) dla tablic współrzędnych
+    - x_range, y_range: zakresy osi (min, max)
+    - threshold: wartość progowa (np. indeks habitabilności)
+    - coarse_shape: liczba komórek siatki zgrubnej (oś X, oś Y)
+    - tolerance: dokładność granicy jako ułamek zakresu osi
+
+    Zwraca BoundaryTrace (łamane jako tablice punktów × 2 we współrzędnych osi)
+    """
+    n_columns, n_rows = coarse_shape
+    depth = _depth(coarse_shape, tolerance, max_depth)
+    scale = 2 ** depth
+    lattice = _LatticeValues(function, x_range, y_range, n_columns * scale, n_rows * scale)
+
+    # Poziom zgrubny: wszystkie komórki
+    cells_x, cells_y = np.meshgrid(np.arange(n_columns), np.arange(n_rows), indexing='ij')
+    cells_x = cells_x.ravel().astype(np.int64)
+    cells_y = cells_y.ravel().astype(np.int64)
+    edges, _ = _crossings(_corner_values(lattice, cells_x, cells_y, scale), threshold)
+    crossing = edges.any(axis=1)
+    cells_x, cells_y = cells_x[crossing], cells_y[crossing]
+
+    # Podział wyłącznie komórek granicznych
+    for level in range(1, depth + 1):
+        if not len(cells_x):
+            break
+        level_shape = (n_columns * 2 ** level, n_rows * 2 ** level)
+        cells_x, cells_y = _refine(lattice, cells_x, cells_y, level_shape, scale // 2 ** level, threshold)
+
+    dense_evaluations = (n_columns * scale + 1) * (n_rows * scale + 1)
+    if not len(cells_x):
+        return BoundaryTrace([], threshold, len(lattice.keys), dense_evaluations, depth)
+
+    segment_keys, crossing_keys, crossing_points = _segments(lattice, cells_x, cells_y, threshold, n_rows * scale)
+    polylines = [crossing_points[np.searchsorted(crossing_keys, chain)] for chain in _join(segment_keys)]
+    return BoundaryTrace(polylines, threshold, len(lattice.keys), dense_evaluations, depth)
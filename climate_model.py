@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import factorized
+
+# Stała słoneczna dla Ziemi (W/m²)
+SOLAR_CONSTANT = 1361.0
+
+# Jasność gwiazd (w jasnościach Słońca) dla typów widmowych z panelu danych wejściowych
+STAR_LUMINOSITY = {
+    'G': 1.0,
+    'K': 0.3,
+    'M': 0.03,
+    'F': 2.5,
+    'A': 20.0
+}
+
+# Promieniowanie wychodzące OLR = A + B (T - T_REF) (Budyko, North 1975)
+OLR_CONSTANT = 203.3  # A (W/m²)
+OLR_SLOPE = 2.09  # B (W/m²/K)
+OLR_REFERENCE_TEMPERATURE = 273.15  # T_REF (K)
+
+# Współczynnik dyfuzji ciepła na sferze (W/m²/K)
+DIFFUSION_COEFFICIENT = 0.6
+
+# Pojemność cieplna warstwy mieszania oceanu (W·rok/m²/K, ok. 75 m wody)
+HEAT_CAPACITY = 10.0
+
+# Albedo powierzchni bez lodu i zlodowaconej oraz temperatura i szerokość przejścia (K)
+ALBEDO_WARM = 0.3
+ALBEDO_ICE = 0.62
+ICE_TEMPERATURE = 263.15
+ALBEDO_TRANSITION = 2.0
+
+# Drugi wielomian Legendre'a rozkładu średniorocznego nasłonecznienia (North 1975)
+INSOLATION_P2 = -0.482
+
+# Domyślna liczba pasów szerokości geograficznej
+DEFAULT_LATITUDE_BANDS = 90
+
+# Domyślny krok czasowy (lata) - schemat półniejawny jest stabilny także dla dużych kroków
+DEFAULT_TIME_STEP = 1.0
+
+
+def star_luminosity(star_type):
+    """
+    Jasność gwiazdy (L☉) dla typu widmowego
+
+    Parametry:
+    - star_type: typ gwiazdy jako litera ("G") lub opis z panelu ("Typ G (jak Słońce)")
+
+    Zwraca jasność w jasnościach Słońca
+    """
+    name = star_type.strip()
+    if name.startswith("Typ"):
+        name = name[3:].strip()
+    spectral_class = name[:1].upper()
+    if spectral_class not in STAR_LUMINOSITY:
+        raise ValueError(f"Nieznany typ gwiazdy: {star_type}")
+    return STAR_LUMINOSITY[spectral_class]
+
+
+def albedo(temperatures):
+    """Albedo zależne od temperatury (płynne przejście do lodu wokół ICE_TEMPERATURE)"""
+    warm = 0.5 * (1 + np.tanh((temperatures - ICE_TEMPERATURE) / ALBEDO_TRANSITION))
+    return ALBEDO_ICE + (ALBEDO_WARM - ALBEDO_ICE) * warm
+
+
+def band_index(latitudes, longitudes, shape):
+    """
+    Indeksy komórek siatki klimatu zawierających punkty (szerokość, długość w radianach)
+
+    Pasy szerokości są równopolowe (równe przedziały sin szerokości), pasy
+    długości równe, od -π.
+
+    Zwraca (indeksy pasów szerokości, indeksy pasów długości)
+    """
+    latitude_bands, longitude_bands = shape
+    x = np.sin(np.asarray(latitudes))
+    rows = np.clip(((x + 1) / 2 * latitude_bands).astype(np.intp), 0, latitude_bands - 1)
+    columns = ((np.asarray(longitudes) + np.pi) / (2 * np.pi) * longitude_bands).astype(np.intp) % longitude_bands
+    return rows, columns
+
+
+def sampling_weights(shape, latitudes, longitudes):
+    """
+    Wagi próbkowania siatki klimatu w punktach powierzchni
+
+    Przy jednym pasie długości (model strefowy) temperatura jest interpolowana
+    liniowo po szerokości, w przeciwnym razie brana z komórki zawierającej punkt.
+
+    Zwraca (indeksy pierwszej komórki, indeksy drugiej komórki, wagi drugiej
+    komórki) - indeksy do spłaszczonej siatki
+    """
+    latitude_bands, longitude_bands = shape
+    if longitude_bands == 1:
+        centers = np.arcsin(-1 + (np.arange(latitude_bands) + 0.5) * 2 / latitude_bands)
+        position = np.interp(latitudes, centers, np.arange(latitude_bands, dtype=float))
+        first = np.minimum(position.astype(np.intp), latitude_bands - 2)
+        return first, first + 1, position - first
+    rows, columns = band_index(latitudes, longitudes, shape)
+    cells = rows * longitude_bands + columns
+    return cells, cells, np.zeros(np.shape(cells))
+
+
+def sample_temperatures(temperatures, latitudes, longitudes):
+    """
+    Temperatury siatki klimatu w dowolnych punktach powierzchni
+
+    Parametry:
+    - temperatures: temperatury siatki (pasy szerokości × pasy długości),
+      opcjonalnie z wiodącymi osiami (np. klatki zapisu symulacji)
+    - latitudes, longitudes: współrzędne punktów (radiany)
+
+    Zwraca temperatury o kształcie (osie wiodące..., kształt punktów)
+    """
+    temperatures = np.asarray(temperatures)
+    first, second, weight = sampling_weights(temperatures.shape[-2:], latitudes, longitudes)
+    flat = temperatures.reshape(temperatures.shape[:-2] + (-1,))
+    return flat[..., first] * (1 - weight) + flat[..., second] * weight
+
+
+class ClimateModel:
+    """
+    Model bilansu energetycznego w pasach szerokości (i opcjonalnie długości)
+
+    Temperatura T każdej komórki spełnia
+    C dT/dt = Q (1 - α(T)) - (A + B (T - T_REF)) + D ∇²T,
+    gdzie Q to nasłonecznienie, α(T) albedo z lodowym sprzężeniem zwrotnym,
+    a ∇² laplasjan na sferze jednostkowej w zmiennej x = sin(szerokość).
+    Dyfuzja i promieniowanie wychodzące liczone są niejawnie (macierz układu
+    rozkładana raz dla danego kroku), albedo jawnie - krok pozostaje stabilny
+    także dla kroków wielokrotnie dłuższych od skali czasowej C/B.
+
+    Pasy szerokości są równopolowe, więc średnia planety to zwykła średnia
+    po komórkach. Przy kilku pasach długości planeta ma obrót synchroniczny
+    (punkt podgwiazdowy na długości 0), przy jednym - nasłonecznienie jest
+    średnią roczną i dobową.
+    """
+
+    def __init__(self, luminosity=1.0, distance=1.0, initial_temperature=288.0,
+                 latitude_bands=DEFAULT_LATITUDE_BANDS, longitude_bands=1,
+                 heat_capacity=HEAT_CAPACITY, diffusion=DIFFUSION_COEFFICIENT):
+        """
+        Parametry:
+        - luminosity: jasność gwiazdy (L☉), np. z star_luminosity()
+        - distance: odległość od gwiazdy (AU)
+        - initial_temperature: temperatura początkowa wszystkich komórek (K)
+        - latitude_bands, longitude_bands: rozmiar siatki
+        - heat_capacity: pojemność cieplna (W·rok/m²/K)
+        - diffusion: współczynnik dyfuzji ciepła (W/m²/K)
+        """
+        if distance <= 0:
+            raise ValueError("Odległość od gwiazdy musi być dodatnia")
+        if latitude_bands < 2 or longitude_bands < 1:
+            raise ValueError("Siatka klimatu wymaga co najmniej 2 pasów szerokości i 1 pasa długości")
+        self.shape = (int(latitude_bands), int(longitude_bands))
+        self.heat_capacity = heat_capacity
+        self.diffusion = diffusion
+        self.solar_constant = SOLAR_CONSTANT * luminosity / distance**2
+
+        n, m = self.shape
+        self.x = -1 + (np.arange(n) + 0.5) * 2 / n
+        self.latitudes = np.arcsin(self.x)
+        self.longitudes = -np.pi + (np.arange(m) + 0.5) * 2 * np.pi / m
+        self.insolation = self._insolation()
+        self.laplacian = self._laplacian()
+
+        self.temperatures = np.full(self.shape, float(initial_temperature))
+        self.time = 0.0
+        self._solver = None
+        self._solver_step = None
+
+    def _insolation(self):
+        """Nasłonecznienie komórek (W/m²) - średnia po planecie równa S/4"""
+        n, m = self.shape
+        if m == 1:
+            p2 = (3 * self.x**2 - 1) / 2
+            return (self.solar_constant / 4 * (1 + INSOLATION_P2 * p2))[:, None]
+        cos_zenith = np.cos(self.latitudes)[:, None] * np.cos(self.longitudes)[None, :]
+        return self.solar_constant * np.maximum(cos_zenith, 0)
+
+    def _laplacian(self):
+        """
+        Rzadki laplasjan na sferze dla siatki (x = sin szerokości, długość)
+
+        Strumień przez granicę pasów szerokości ma wagę (1 - x²) / Δx²
+        (zerową na biegunach), przez granicę pasów długości
+        1 / ((1 - x²) Δλ²), z okresowością po długości.
+        """
+        n, m = self.shape
+        dx = 2 / n
+        index = np.arange(n * m).reshape(n, m)
+        sources = []
+        targets = []
+        weights = []
+
+        edges = -1 + np.arange(1, n) * dx
+        latitude_weight = np.repeat((1 - edges**2) / dx**2, m)
+        sources.append(index[:-1].ravel())
+        targets.append(index[1:].ravel())
+        weights.append(latitude_weight)
+
+        if m > 1:
+            d_lambda = 2 * np.pi / m
+            longitude_weight = np.repeat(1 / ((1 - self.x**2) * d_lambda**2), m)
+            sources.append(index.ravel())
+            targets.append(np.roll(index, -1, axis=1).ravel())
+            weights.append(longitude_weight)
+
+        sources = np.concatenate(sources)
+        targets = np.concatenate(targets)
+        weights = np.concatenate(weights)
+        coupling = sparse.coo_matrix(
+            (np.concatenate([weights, weights]),
+             (np.concatenate([sources, targets]), np.concatenate([targets, sources]))),
+            shape=(n * m, n * m)
+        ).tocsr()
+        degree = np.asarray(coupling.sum(axis=1)).ravel()
+        return (coupling - sparse.diags(degree)).tocsc()
+
+    def _factorized(self, dt):
+        """Rozkład macierzy kroku niejawnego (C/dt + B) I - D ∇² (liczony raz dla dt)"""
+        if self._solver is None or self._solver_step != dt:
+            size = self.laplacian.shape[0]
+            matrix = (sparse.identity(size, format='csc') * (self.heat_capacity / dt + OLR_SLOPE) -
+                      self.diffusion * self.laplacian)
+            self._solver = factorized(matrix.tocsc())
+            self._solver_step = dt
+        return self._solver
+
+    def step(self, dt=DEFAULT_TIME_STEP):
+        """Jeden krok półniejawny o długości dt (lata)"""
+        solve = self._factorized(dt)
+        absorbed = self.insolation * (1 - albedo(self.temperatures))
+        rhs = (self.heat_capacity / dt * self.temperatures + absorbed -
+               OLR_CONSTANT + OLR_SLOPE * OLR_REFERENCE_TEMPERATURE)
+        self.temperatures = solve(rhs.ravel()).reshape(self.shape)
+        self.time += dt
+        return self.temperatures
+
+    def run(self, duration, dt=DEFAULT_TIME_STEP):
+        """
+        Całkowanie modelu przez duration lat krokami nie dłuższymi niż dt
+
+        Zwraca temperatury komórek po ostatnim kroku (dla duration <= 0 - bez zmian)
+        """
+        if duration <= 0:
+            return self.temperatures
+        steps = max(1, math.ceil(duration / dt))
+        dt = duration / steps
+        for _ in range(steps):
+            self.step(dt)
+        return self.temperatures
+
+    def mean_temperature(self):
+        """Średnia temperatura planety (K) - komórki mają równe pola"""
+        return float(self.temperatures.mean())
+
+    def zonal_temperatures(self):
+        """Temperatury pasów szerokości uśrednione po długości (K)"""
+        return self.temperatures.mean(axis=1)
+
+    def ice_fraction(self):
+        """Ułamek powierzchni planety poniżej temperatury zlodowacenia"""
+        return float((self.temperatures < ICE_TEMPERATURE).mean())
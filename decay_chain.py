@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+import numpy as np
+from scipy import sparse
+from scipy.linalg import expm
+from scipy.sparse.csgraph import connected_components
+
+# Maksymalne uwarunkowanie macierzy wektorów własnych, powyżej którego
+# łańcuch (np. o powtarzających się stałych rozpadu) liczony jest przez expm
+MAX_EIGENVECTOR_CONDITION = 1e10
+
+# Uproszczony szereg uranowo-radowy (okresy połowicznego rozpadu w latach)
+DEFAULT_DECAY_CHAIN = [
+    {"nuclide": "U-238", "half_life": 4.468e9, "daughter": "Th-234", "branching_ratio": 1.0, "initial_abundance": 1.0},
+    {"nuclide": "Th-234", "half_life": 24.10 / 365.25, "daughter": "Pa-234", "branching_ratio": 1.0},
+    {"nuclide": "Pa-234", "half_life": 1.17 / 525960, "daughter": "U-234", "branching_ratio": 1.0},
+    {"nuclide": "U-234", "half_life": 2.455e5, "daughter": "Th-230", "branching_ratio": 1.0},
+    {"nuclide": "Th-230", "half_life": 7.54e4, "daughter": "Ra-226", "branching_ratio": 1.0},
+    {"nuclide": "Ra-226", "half_life": 1600, "daughter": "Rn-222", "branching_ratio": 1.0},
+    {"nuclide": "Rn-222", "half_life": 3.8235 / 365.25, "daughter": "Po-218", "branching_ratio": 1.0},
+    {"nuclide": "Po-218", "half_life": 3.10 / 525960, "daughter": "Pb-214", "branching_ratio": 1.0},
+    {"nuclide": "Pb-214", "half_life": 26.8 / 525960, "daughter": "Bi-214", "branching_ratio": 1.0},
+    {"nuclide": "Bi-214", "half_life": 19.9 / 525960, "daughter": "Po-214", "branching_ratio": 0.99979},
+    {"nuclide": "Bi-214", "half_life": 19.9 / 525960, "daughter": "Tl-210", "branching_ratio": 0.00021},
+    {"nuclide": "Po-214", "half_life": 164.3e-6 / 31557600, "daughter": "Pb-210", "branching_ratio": 1.0},
+    {"nuclide": "Tl-210", "half_life": 1.30 / 525960, "daughter": "Pb-210", "branching_ratio": 1.0},
+    {"nuclide": "Pb-210", "half_life": 22.2, "daughter": "Bi-210", "branching_ratio": 1.0},
+    {"nuclide": "Bi-210", "half_life": 5.012 / 365.25, "daughter": "Po-210", "branching_ratio": 1.0},
+    {"nuclide": "Po-210", "half_life": 138.376 / 365.25, "daughter": "Pb-206", "branching_ratio": 1.0},
+    {"nuclide": "Pb-206", "half_life": None},
+]
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and value.strip().lower() in ("", "inf", "stable", "stabilny"))
+
+
+class NuclideTable:
+    """
+    Tabela nuklidów z rzadką macierzą rozpadu
+
+    Macierz A (nuklidy × nuklidy) opisuje układ dN/dt = A N:
+    A[i, i] = -λ_i, A[j, i] = b_ij λ_i dla rozpadu i -> j z
+    współczynnikiem rozgałęzienia b_ij.
+    """
+
+    def __init__(self, records):
+        """
+        Parametry:
+        - records: lista słowników z kluczami nuclide, half_life (lata, pusty = stabilny),
+          opcjonalnie daughter, branching_ratio, element, initial_abundance;
+          nuklid z kilkoma gałęziami rozpadu występuje w kilku rekordach
+        """
+        records = list(records)
+        names = []
+        index = {}
+
+        def register(name):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+            return index[name]
+
+        for record in records:
+            register(record["nuclide"])
+            if not _is_empty(record.get("daughter")):
+                register(record["daughter"])
+
+        n = len(names)
+        self.names = np.array(names, dtype=str)
+        self.index = index
+        self.decay_constants = np.zeros(n)
+        self.initial_abundance = np.zeros(n)
+        self.elements = np.array([name.split("-")[0] for name in names], dtype=object)
+
+        branch_parents = []
+        branch_daughters = []
+        branch_ratios = []
+        for record in records:
+            parent = index[record["nuclide"]]
+            if not _is_empty(record.get("half_life")):
+                self.decay_constants[parent] = np.log(2) / float(record["half_life"])
+            if not _is_empty(record.get("initial_abundance")):
+                self.initial_abundance[parent] = float(record["initial_abundance"])
+            if not _is_empty(record.get("element")):
+                self.elements[parent] = record["element"]
+            if not _is_empty(record.get("daughter")):
+                branch_parents.append(parent)
+                branch_daughters.append(index[record["daughter"]])
+                ratio = record.get("branching_ratio")
+                branch_ratios.append(1.0 if _is_empty(ratio) else float(ratio))
+        self.elements = self.elements.astype(str)
+
+        branch_parents = np.array(branch_parents, dtype=np.intp)
+        branch_daughters = np.array(branch_daughters, dtype=np.intp)
+        branch_ratios = np.array(branch_ratios)
+
+        rows = np.concatenate([np.arange(n), branch_daughters])
+        cols = np.concatenate([np.arange(n), branch_parents])
+        values = np.concatenate([-self.decay_constants, branch_ratios * self.decay_constants[branch_parents]])
+        self.matrix = sparse.csr_matrix((values, (rows, cols)), shape=(n, n))
+
+    @classmethod
+    def default(cls):
+        """Tabela z wbudowanym uproszczonym szeregiem uranowo-radowym"""
+        return cls(DEFAULT_DECAY_CHAIN)
+
+    @classmethod
+    def load(cls, path):
+        """Wczytanie tabeli nuklidów z pliku CSV lub JSON (lista rekordów)"""
+        if os.path.splitext(path)[1].lower() == ".json":
+            with open(path, encoding="utf-8") as data_file:
+                return cls(json.load(data_file))
+        with open(path, encoding="utf-8", newline="") as data_file:
+            return cls(csv.DictReader(data_file))
+
+    def __len__(self):
+        return len(self.names)
+
+
+class DecayChainSolver:
+    """
+    Wektorowy solwer równań Batemana dla całej tabeli nuklidów
+
+    Macierz rozpadu dzielona jest na niezależne łańcuchy (spójne składowe
+    grafu rozpadów). Dla każdego łańcucha rozkład własny A = V diag(-λ) V⁻¹
+    liczony jest raz i zapamiętywany, więc N(t) = V diag(e^{-λt}) V⁻¹ N₀
+    dla wielu chwil t to jedno mnożenie macierzy. Łańcuchy tej samej
+    długości liczone są wsadowo. Łańcuchy z powtarzającymi się stałymi
+    rozpadu (macierz niediagonalizowalna) liczone są przez expm.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        n_chains, labels = connected_components(table.matrix, directed=True, connection='weak')
+        self.chains = [np.flatnonzero(labels == chain) for chain in range(n_chains)]
+        self._groups = None
+        self._fallback_chains = None
+
+    def _decompose(self):
+        """Rozkład własny łańcuchów (wykonywany raz, przy pierwszym użyciu)"""
+        matrix = self.table.matrix
+        groups = {}
+        fallback = []
+        for chain in self.chains:
+            block = matrix[chain][:, chain].toarray()
+            eigenvalues, eigenvectors = np.linalg.eig(block)
+            if np.iscomplexobj(eigenvalues) and np.abs(eigenvalues.imag).max() > 0:
+                fallback.append((chain, block))
+                continue
+            eigenvalues = eigenvalues.real
+            eigenvectors = eigenvectors.real
+            if np.linalg.cond(eigenvectors) > MAX_EIGENVECTOR_CONDITION:
+                fallback.append((chain, block))
+                continue
+            groups.setdefault(len(chain), []).append((chain, eigenvalues, eigenvectors,
+                                                      np.linalg.inv(eigenvectors)))
+
+        self._groups = []
+        for members in groups.values():
+            self._groups.append((
+                np.stack([member[0] for member in members]),
+                np.stack([member[1] for member in members]),
+                np.stack([member[2] for member in members]),
+                np.stack([member[3] for member in members]),
+            ))
+        self._fallback_chains = fallback
+
+    def solve(self, times, initial=None):
+        """
+        Obliczenie obfitości wszystkich nuklidów w wielu chwilach naraz
+
+        Parametry:
+        - times: tablica chwil (lata)
+        - initial: obfitości początkowe (domyślnie z tabeli nuklidów)
+
+        Zwraca macierz (nuklidy × chwile)
+        """
+        if self._groups is None:
+            self._decompose()
+
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        initial = self.table.initial_abundance if initial is None else np.asarray(initial, dtype=np.float64)
+        result = np.zeros((len(self.table), len(times)))
+
+        for chains, eigenvalues, eigenvectors, inverses in self._groups:
+            # Współczynniki w bazie własnej: (łańcuchy × n)
+            coefficients = np.einsum('kij,kj->ki', inverses, initial[chains])
+            # Ewolucja modów: (łańcuchy × n × chwile)
+            modes = eigenvalues[:, :, None] * times[None, None, :]
+            np.exp(modes, out=modes)
+            modes *= coefficients[:, :, None]
+            result[chains] = np.matmul(eigenvectors, modes)
+
+        for chain, block in self._fallback_chains:
+            result[chain] = self._solve_expm(block, initial[chain], times)
+
+        # Usunięcie ujemnych zer numerycznych
+        return np.maximum(result, 0, out=result)
+
+    @staticmethod
+    def _solve_expm(block, initial, times):
+        """Rozwiązanie łańcucha przez wykładnik macierzy z krokami między kolejnymi chwilami"""
+        order = np.argsort(times)
+        solution = np.empty((len(initial), len(times)))
+        propagators = {}
+        state = initial.copy()
+        previous_time = 0.0
+        for position in order:
+            step = times[position] - previous_time
+            key = round(step, 12)
+            if key not in propagators:
+                propagators[key] = expm(block * step)
+            state = propagators[key] @ state
+            solution[:, position] = state
+            previous_time = times[position]
+        return solution
+
+    def element_concentrations(self, times, initial=None):
+        """
+        Obfitości zsumowane po pierwiastkach
+
+        Zwraca (lista symboli pierwiastków, macierz pierwiastki × chwile)
+        """
+        abundances = self.solve(times, initial)
+        symbols, element_rows = np.unique(self.table.elements, return_inverse=True)
+        totals = np.zeros((len(symbols), abundances.shape[1]))
+        np.add.at(totals, element_rows, abundances)
+        return symbols.tolist(), totals
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import numpy as np
+
+# Domyślna precyzja przechowywania dla poszczególnych klas danych
+# (widma, mapy, historie symulacji). float32 wystarcza naukowo i zmniejsza
+# o połowę zużycie pamięci RAM oraz miejsca na dysku.
+DEFAULT_DTYPES = {
+    'spectra': np.float32,
+    'maps': np.float32,
+    'histories': np.float32,
+}
+
+# Precyzja akumulatorów (rekurencje filtrów, sumy, średnie)
+ACCUMULATOR_DTYPE = np.float64
+
+_dtype_policy = dict(DEFAULT_DTYPES)
+
+
+def get_dtype(data_class):
+    """Pobranie typu danych przechowywania dla danej klasy danych"""
+    if data_class not in _dtype_policy:
+        raise KeyError(f"Nieznana klasa danych: {data_class}")
+    return _dtype_policy[data_class]
+
+
+def set_dtype(data_class, dtype):
+    """
+    Ustawienie typu danych przechowywania dla danej klasy danych
+
+    Parametry:
+    - data_class: klasa danych ('spectra', 'maps', 'histories')
+    - dtype: typ zmiennoprzecinkowy (np. np.float32 lub np.float64)
+    """
+    if data_class not in _dtype_policy:
+        raise KeyError(f"Nieznana klasa danych: {data_class}")
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise ValueError(f"Typ danych musi być zmiennoprzecinkowy: {dtype}")
+    _dtype_policy[data_class] = dtype.type
+
+
+def reset_dtype_policy():
+    """Przywrócenie domyślnej polityki typów danych"""
+    _dtype_policy.clear()
+    _dtype_policy.update(DEFAULT_DTYPES)
+
+
+def as_storage(array, data_class):
+    """Konwersja tablicy do typu przechowywania (bez kopii, jeśli typ się zgadza)"""
+    return np.asarray(array, dtype=get_dtype(data_class))
+
+
+def as_accumulator(array):
+    """Konwersja tablicy do typu akumulatora (bez kopii, jeśli typ się zgadza)"""
+    return np.asarray(array, dtype=ACCUMULATOR_DTYPE)
+
+
+class HistoryBuffer:
+    """Rosnący bufor historii symulacji o typie zgodnym z polityką precyzji"""
+
+    def __init__(self, data_class='histories', capacity=256):
+        self.data_class = data_class
+        self._data = np.empty(capacity, dtype=get_dtype(data_class))
+        self._size = 0
+
+    def append(self, value):
+        """Dodanie wartości na koniec bufora (zamortyzowane O(1))"""
+        if self._size == len(self._data):
+            grown = np.empty(max(2 * len(self._data), 1), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        """Dodanie tablicy wartości na koniec bufora"""
+        values = np.asarray(values)
+        required = self._size + len(values)
+        if required > len(self._data):
+            grown = np.empty(max(2 * len(self._data), required), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:required] = values
+        self._size = required
+
+    def clear(self):
+        """Wyczyszczenie bufora bez zwalniania pamięci"""
+        self._size = 0
+
+    def values(self):
+        """Widok na zapisane wartości (bez kopii)"""
+        return self._data[:self._size]
+
+    @property
+    def nbytes(self):
+        """Rozmiar zapisanych danych w bajtach"""
+        return self._size * self._data.itemsize
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        return self.values()[index]
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def __array__(self, dtype=None, copy=None):
+        # Protokół NumPy 2: copy=False zabrania kopii, copy=True ją wymusza
+        values = self.values()
+        if dtype is not None and np.dtype(dtype) != values.dtype:
+            if copy is False:
+                raise ValueError("Konwersja typu bufora historii wymaga kopii")
+            return values.astype(dtype)
+        return values.copy() if copy else values
+
+
+def benchmark_precision(n_spectra=2000, n_points=4096, repeats=3):
+    """
+    Porównanie zużycia pamięci i czasu obliczeń dla float32 i float64
+
+    Parametry:
+    - n_spectra: liczba widm w archiwum testowym
+    - n_points: liczba punktów w widmie
+    - repeats: liczba powtórzeń pomiaru czasu
+
+    Zwraca słownik {nazwa typu: {'memory_mb', 'filter_time_s', 'mean_time_s'}}
+    """
+    from scipy.ndimage import gaussian_filter1d
+
+    rng = np.random.default_rng(0)
+    reference = rng.normal(50, 5, (n_spectra, n_points))
+    results = {}
+
+    for dtype in (np.float64, np.float32):
+        spectra = reference.astype(dtype)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            gaussian_filter1d(spectra, sigma=2, axis=1)
+        filter_time = (time.perf_counter() - start) / repeats
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            spectra.mean(axis=0, dtype=ACCUMULATOR_DTYPE)
+        mean_time = (time.perf_counter() - start) / repeats
+
+        results[np.dtype(dtype).name] = {
+            'memory_mb': spectra.nbytes / 2**20,
+            'filter_time_s': filter_time,
+            'mean_time_s': mean_time,
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    for name, stats in benchmark_precision().items():
+        print(f"{name}: pamięć {stats['memory_mb']:.1f} MB, "
+              f"filtr Gaussa {stats['filter_time_s'] * 1000:.1f} ms, "
+              f"średnia {stats['mean_time_s'] * 1000:.1f} ms")
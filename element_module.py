@@ -1,15 +1,41 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem
-from PyQt5.QtWidgets import QPushButton, QComboBox, QSlider, QSpinBox, QHeaderView
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QLineEdit
+from PyQt5.QtWidgets import QPushButton, QComboBox, QSlider, QSpinBox, QHeaderView, QAbstractItemView
+from PyQt5.QtCore import Qt, QItemSelectionModel
 import matplotlib
 matplotlib.use('Qt5Agg')
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import numpy as np
 
+from modules.dtype_policy import HistoryBuffer
+from modules.element_store import ElementStore
+from modules.element_table_model import ElementTableModel, ElementSortFilterProxyModel
+from modules.decay_chain import DecayChainSolver, NuclideTable
+from modules.element_properties import (PropertySurfaces, PHASE_NAMES, HALF_LIFE,
+                                        ACTIVATION_ENERGY, MELTING_POINT, BOILING_POINT)
+from modules.background_tasks import DebouncedTask
+
+# Siatki (min, max, liczba punktów) tensorów właściwości
+PROPERTY_TEMPERATURE_GRID = (100, 3000, 100)
+PROPERTY_PRESSURE_GRID = (0, 1000, 1001)
+
+# Maksymalna liczba podpisanych słupków na wykresie okresów połowicznego rozpadu
+MAX_LABELED_BARS = 40
+
+# Mapa stanów skupienia (temperatura × ciśnienie)
+PHASE_MAP = "Stan skupienia"
+
+# Opisy osi dla właściwości
+PROPERTY_LABELS = {
+    HALF_LIFE: "Okres połowicznego rozpadu (lata)",
+    ACTIVATION_ENERGY: "Energia aktywacji (eV)",
+    MELTING_POINT: "Temperatura topnienia (K)",
+    BOILING_POINT: "Temperatura wrzenia (K)",
+}
+
 class MatplotlibCanvas(FigureCanvas):
     """Klasa do osadzania wykresów matplotlib w interfejsie PyQt5"""
     
@@ -23,10 +49,23 @@ class MatplotlibCanvas(FigureCanvas):
         # Ustawienia wykresu
         self.fig.tight_layout()
         
+    def reset_axes(self):
+        """Wyczyszczenie rysunku razem z paskami kolorów"""
+        self.fig.clear()
+        self.axes = self.fig.add_subplot(111)
+        
     def plot_decay(self, elements, half_lives, label="Okresy połowicznego rozpadu", color='b'):
         """Rysowanie wykresu okresów połowicznego rozpadu"""
-        self.axes.clear()
-        self.axes.bar(elements, half_lives, color=color)
+        self.reset_axes()
+        if len(elements) <= MAX_LABELED_BARS:
+            self.axes.bar(elements, half_lives, color=color)
+        else:
+            # Pełna tabela izotopów: linie zamiast prostokątów i co n-ta etykieta
+            positions = np.arange(len(elements))
+            self.axes.vlines(positions, 0, half_lives, color=color)
+            step = int(np.ceil(len(elements) / MAX_LABELED_BARS))
+            self.axes.set_xticks(positions[::step])
+            self.axes.set_xticklabels(elements[::step])
         self.axes.set_xlabel('Pierwiastek')
         self.axes.set_ylabel('Okres połowicznego rozpadu (lata)')
         self.axes.set_title(label)
@@ -34,10 +73,16 @@ class MatplotlibCanvas(FigureCanvas):
         self.fig.tight_layout()
         self.draw()
         
-    def plot_property_change(self, temperatures, property_values, element_name, property_name):
+    def plot_property_change(self, temperatures, property_values, element_name, property_name,
+                             marker_temperature=None):
         """Rysowanie wykresu zmian właściwości w zależności od temperatury"""
-        self.axes.clear()
-        self.axes.plot(temperatures, property_values, 'r-o')
+        self.reset_axes()
+        self.property_line, = self.axes.plot(temperatures, property_values, 'r-o')
+        
+        # Zaznaczenie bieżącej temperatury z suwaka
+        self.marker_line = self.axes.axvline(temperatures[0], color='k', linestyle=':')
+        self.marker_point, = self.axes.plot([], [], 'ks')
+        self.set_property_marker(temperatures, property_values, marker_temperature)
         self.axes.set_xlabel('Temperatura (K)')
         self.axes.set_ylabel(property_name)
         self.axes.set_title(f'Zmiana {property_name} dla {element_name}')
@@ -45,9 +90,40 @@ class MatplotlibCanvas(FigureCanvas):
         self.fig.tight_layout()
         self.draw()
         
+    def set_property_marker(self, temperatures, property_values, marker_temperature):
+        """Ustawienie znacznika bieżącej temperatury na wykresie właściwości"""
+        visible = marker_temperature is not None and temperatures[0] <= marker_temperature <= temperatures[-1]
+        self.marker_line.set_visible(visible)
+        self.marker_point.set_visible(visible)
+        if visible:
+            self.marker_line.set_xdata([marker_temperature, marker_temperature])
+            self.marker_point.set_data([marker_temperature],
+                                       [np.interp(marker_temperature, temperatures, property_values)])
+            
+    def update_property_change(self, temperatures, property_values, marker_temperature=None):
+        """Podmiana danych istniejącego wykresu właściwości (bez przebudowy rysunku)"""
+        self.property_line.set_data(temperatures, property_values)
+        self.set_property_marker(temperatures, property_values, marker_temperature)
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.draw_idle()
+        
+    def plot_phase_map(self, temperatures, pressures, phase, element_name):
+        """Rysowanie mapy stanów skupienia w zależności od temperatury i ciśnienia"""
+        self.reset_axes()
+        mesh = self.axes.pcolormesh(temperatures, pressures, phase.T, cmap='coolwarm',
+                                    vmin=0, vmax=len(PHASE_NAMES) - 1, shading='auto')
+        colorbar = self.fig.colorbar(mesh, ax=self.axes, ticks=range(len(PHASE_NAMES)))
+        colorbar.ax.set_yticklabels(PHASE_NAMES)
+        self.axes.set_xlabel('Temperatura (K)')
+        self.axes.set_ylabel('Ciśnienie (atm)')
+        self.axes.set_title(f'Stan skupienia dla {element_name}')
+        self.fig.tight_layout()
+        self.draw()
+        
     def plot_simulation_elements(self, time_points, element_concentrations, element_names):
         """Rysowanie zmian stężeń pierwiastków podczas symulacji"""
-        self.axes.clear()
+        self.reset_axes()
         
         for i, element in enumerate(element_names):
             self.axes.plot(time_points, element_concentrations[i], label=element)
@@ -66,6 +142,15 @@ class ElementModule(QWidget):
     
     def __init__(self):
         super().__init__()
+        # Solwer łańcuchów rozpadu (lata symulowane na jednostkę czasu symulacji)
+        self.decay_solver = DecayChainSolver(NuclideTable.default())
+        self.decay_time_scale = 1e8
+        # Pamięć podręczna tensorów właściwości pierwiastków
+        self.property_surfaces = PropertySurfaces()
+        # Przebieg właściwości po zmianie suwaków liczony w tle (wygrywa ostatnia wartość)
+        self.property_update_task = DebouncedTask(self.property_surfaces.curve, parent=self)
+        self.property_update_task.result_ready.connect(self.property_update_ready)
+        self.property_plot = None
         self.init_ui()
         self.load_element_data()
         
@@ -86,7 +171,7 @@ class ElementModule(QWidget):
         # Wybór właściwości
         property_label = QLabel("Właściwość:")
         self.property_combo = QComboBox()
-        self.property_combo.addItems(["Okres połowicznego rozpadu", "Energia aktywacji", "Temperatura topnienia", "Temperatura wrzenia"])
+        self.property_combo.addItems(["Okres połowicznego rozpadu", "Energia aktywacji", "Temperatura topnienia", "Temperatura wrzenia", PHASE_MAP])
         control_layout.addWidget(property_label)
         control_layout.addWidget(self.property_combo)
         
@@ -137,6 +222,10 @@ class ElementModule(QWidget):
         self.pressure_slider.valueChanged.connect(self.pressure_spin.setValue)
         self.pressure_spin.valueChanged.connect(self.pressure_slider.setValue)
         
+        # Zmiana warunków przelicza wyświetlany przebieg właściwości w tle
+        self.temp_slider.valueChanged.connect(self.schedule_property_update)
+        self.pressure_slider.valueChanged.connect(self.schedule_property_update)
+        
         env_layout.addWidget(pressure_label)
         env_layout.addWidget(self.pressure_slider)
         env_layout.addWidget(self.pressure_spin)
@@ -146,12 +235,31 @@ class ElementModule(QWidget):
         # Układ dla tabeli i wykresu
         content_layout = QHBoxLayout()
         
-        # Tabela pierwiastków
-        self.element_table = QTableWidget()
-        self.element_table.setColumnCount(5)
-        self.element_table.setHorizontalHeaderLabels(["Symbol", "Nazwa", "Okres połowicznego rozpadu", "Stan skupienia", "Energia aktywacji"])
+        # Tabela pierwiastków (model/widok - renderowane są tylko widoczne wiersze)
+        table_layout = QVBoxLayout()
+        
+        self.element_filter = QLineEdit()
+        self.element_filter.setPlaceholderText("Filtruj po symbolu lub nazwie...")
+        table_layout.addWidget(self.element_filter)
+        
+        self.element_model = ElementTableModel(parent=self)
+        self.element_proxy = ElementSortFilterProxyModel(self)
+        self.element_proxy.setSourceModel(self.element_model)
+        self.element_filter.textChanged.connect(self.element_proxy.set_filter_text)
+        
+        self.element_table = QTableView()
+        self.element_table.setModel(self.element_proxy)
+        self.element_table.setSortingEnabled(True)
+        self.element_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.element_table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.element_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        content_layout.addWidget(self.element_table)
+        self.element_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.element_table.verticalHeader().setDefaultSectionSize(22)
+        self.element_table.selectionModel().currentRowChanged.connect(self.table_row_changed)
+        self.element_combo.currentTextChanged.connect(self.select_table_element)
+        table_layout.addWidget(self.element_table)
+        
+        content_layout.addLayout(table_layout)
         
         # Obszar wykresu
         self.canvas = MatplotlibCanvas(self, width=5, height=4, dpi=100)
@@ -163,58 +271,56 @@ class ElementModule(QWidget):
         self.setLayout(main_layout)
         
         # Dane symulacji
-        self.simulation_time_points = []
+        self.simulation_time_points = HistoryBuffer()
         self.simulation_element_concentrations = []
         self.simulation_element_names = []
         
-    def load_element_data(self):
-        """Ładowanie danych o pierwiastkach"""
-        # Przykładowe dane o pierwiastkach (w rzeczywistej aplikacji byłyby pobierane z bazy danych)
-        self.elements = {
-            "U": {"name": "Uran", "half_life": 4.5e9, "state": "Stały", "activation_energy": 0.52, "melting_point": 1405, "boiling_point": 4404},
-            "Pu": {"name": "Pluton", "half_life": 2.4e4, "state": "Stały", "activation_energy": 0.57, "melting_point": 912, "boiling_point": 3505},
-            "Th": {"name": "Tor", "half_life": 1.4e10, "state": "Stały", "activation_energy": 0.58, "melting_point": 2023, "boiling_point": 5061},
-            "Ra": {"name": "Rad", "half_life": 1.6e3, "state": "Stały", "activation_energy": 0.48, "melting_point": 973, "boiling_point": 2010},
-            "Rn": {"name": "Radon", "half_life": 3.8, "state": "Gazowy", "activation_energy": 0.36, "melting_point": 202, "boiling_point": 211},
-            "Po": {"name": "Polon", "half_life": 138, "state": "Stały", "activation_energy": 0.41, "melting_point": 527, "boiling_point": 1235},
-            "Bi": {"name": "Bizmut", "half_life": 2.0e19, "state": "Stały", "activation_energy": 0.43, "melting_point": 544, "boiling_point": 1837},
-            "Pb": {"name": "Ołów", "half_life": float('inf'), "state": "Stały", "activation_energy": 0.37, "melting_point": 600, "boiling_point": 2022},
-            "Tl": {"name": "Tal", "half_life": float('inf'), "state": "Stały", "activation_energy": 0.33, "melting_point": 577, "boiling_point": 1746},
-            "Hg": {"name": "Rtęć", "half_life": float('inf'), "state": "Ciekły", "activation_energy": 0.29, "melting_point": 234, "boiling_point": 630},
-        }
-        
-        # Wypełnienie tabeli
-        self.element_table.setRowCount(len(self.elements))
-        row = 0
-        for symbol, data in self.elements.items():
-            self.element_table.setItem(row, 0, QTableWidgetItem(symbol))
-            self.element_table.setItem(row, 1, QTableWidgetItem(data["name"]))
-            
-            half_life = data["half_life"]
-            half_life_str = f"{half_life:.2e}" if half_life != float('inf') else "Stabilny"
-            self.element_table.setItem(row, 2, QTableWidgetItem(half_life_str))
-            
-            self.element_table.setItem(row, 3, QTableWidgetItem(data["state"]))
-            self.element_table.setItem(row, 4, QTableWidgetItem(f"{data['activation_energy']:.2f} eV"))
-            row += 1
+    def load_element_data(self, path=None):
+        """
+        Ładowanie danych o pierwiastkach
+        
+        Parametry:
+        - path: plik CSV/JSON z danymi (None - wbudowane dane przykładowe)
+        """
+        self.element_store = ElementStore.default() if path is None else ElementStore.load(path)
+        self.property_surfaces.clear()
+        store = self.element_store
+        
+        # Podpięcie magazynu do modelu tabeli
+        self.element_model.set_store(store)
+        self.element_proxy.set_filter_text(self.element_filter.text())
             
         # Wypełnienie combobox
-        self.element_combo.addItems(self.elements.keys())
+        self.element_combo.clear()
+        self.element_combo.addItems(store.symbol.tolist())
         
         # Wyświetlenie początkowego wykresu
         self.plot_half_lives()
         
+    def table_row_changed(self, current, previous):
+        """Synchronizacja wyboru w tabeli z listą pierwiastków"""
+        if current.isValid():
+            source_row = self.element_proxy.mapToSource(current).row()
+            self.element_combo.setCurrentText(self.element_model.symbol(source_row))
+            
+    def select_table_element(self, symbol):
+        """Zaznaczenie w tabeli pierwiastka wybranego na liście"""
+        if symbol not in self.element_store:
+            return
+        source_index = self.element_model.index_of_symbol(symbol)
+        proxy_index = self.element_proxy.mapFromSource(source_index)
+        if proxy_index.isValid() and proxy_index.row() != self.element_table.currentIndex().row():
+            self.element_table.selectionModel().setCurrentIndex(
+                proxy_index, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+            self.element_table.scrollTo(proxy_index)
+            
     def plot_half_lives(self):
         """Rysowanie wykresu okresów połowicznego rozpadu"""
-        elements = []
-        half_lives = []
-        
-        for symbol, data in self.elements.items():
-            if data["half_life"] != float('inf'):  # Pomijamy stabilne pierwiastki
-                elements.append(symbol)
-                half_lives.append(data["half_life"])
-                
-        self.canvas.plot_decay(elements, half_lives)
+        self.clear_property_plot()
+        # Pomijamy stabilne pierwiastki
+        radioactive = self.element_store.radioactive()
+        self.canvas.plot_decay(self.element_store.symbol[radioactive].tolist(),
+                               self.element_store.half_life[radioactive])
         
     def analyze_element(self):
         """Analiza wybranego pierwiastka"""
@@ -231,47 +337,54 @@ class ElementModule(QWidget):
         """Symulacja zmian właściwości w zależności od temperatury"""
         element = self.element_combo.currentText()
         property_name = self.property_combo.currentText()
-        
-        # Generowanie danych dla symulacji
-        temperatures = np.linspace(100, 3000, 100)
-        
-        if property_name == "Energia aktywacji":
-            # Symulacja zmiany energii aktywacji z temperaturą (przykład)
-            base_value = self.elements[element]["activation_energy"]
-            property_values = base_value * (1 + 0.0001 * (temperatures - 300))
-            y_label = "Energia aktywacji (eV)"
-        elif property_name == "Temperatura topnienia":
-            # Symulacja wpływu ciśnienia na temperaturę topnienia (przykład)
-            base_value = self.elements[element]["melting_point"]
-            pressure = self.pressure_spin.value()
-            property_values = base_value * np.ones_like(temperatures) * (1 + 0.01 * np.log(pressure + 1))
-            y_label = "Temperatura topnienia (K)"
-        elif property_name == "Temperatura wrzenia":
-            # Symulacja wpływu ciśnienia na temperaturę wrzenia (przykład)
-            base_value = self.elements[element]["boiling_point"]
-            pressure = self.pressure_spin.value()
-            property_values = base_value * np.ones_like(temperatures) * (1 + 0.02 * np.log(pressure + 1))
-            y_label = "Temperatura wrzenia (K)"
-        else:
-            # Okres połowicznego rozpadu (przykład)
-            if self.elements[element]["half_life"] == float('inf'):
-                property_values = np.ones_like(temperatures) * 1e20  # Stabilny pierwiastek
-            else:
-                base_value = self.elements[element]["half_life"]
-                # Symulacja wpływu temperatury na okres połowicznego rozpadu (przykład)
-                property_values = base_value * np.exp(-0.0001 * (temperatures - 300))
-            y_label = "Okres połowicznego rozpadu (lata)"
+        store = self.element_store
+        row = store.row(element)
+        self.clear_property_plot()
+        
+        if property_name == PHASE_MAP:
+            # Mapa faz liczona na żądanie z temperatur przemian z pamięci podręcznej
+            temperatures, pressures, phase = self.property_surfaces.phase_map(
+                store, PROPERTY_TEMPERATURE_GRID, PROPERTY_PRESSURE_GRID, row)
+            self.canvas.plot_phase_map(temperatures, pressures, phase, store.name[row])
+            return
+            
+        # Wycinek dla wybranego pierwiastka i bieżącego ciśnienia
+        temperatures, property_values = self.property_surfaces.curve(
+            store, PROPERTY_TEMPERATURE_GRID, PROPERTY_PRESSURE_GRID, property_name, row, self.pressure_spin.value())
+        self.property_plot = (store, row, property_name)
             
         # Aktualizacja wykresu
         self.canvas.plot_property_change(temperatures, property_values, 
-                                         self.elements[element]["name"], y_label)
+                                         store.name[row], PROPERTY_LABELS[property_name],
+                                         self.temp_spin.value())
+        
+    def clear_property_plot(self):
+        """Wyłączenie odświeżania przebiegu właściwości (wykres zastąpiony innym)"""
+        self.property_plot = None
+        self.property_update_task.cancel()
+        
+    def schedule_property_update(self):
+        """Zaplanowanie przeliczenia wyświetlanego przebiegu właściwości po zmianie suwaków"""
+        if self.property_plot is None:
+            return
+        store, row, property_name = self.property_plot
+        self.property_update_task.schedule(store, PROPERTY_TEMPERATURE_GRID, PROPERTY_PRESSURE_GRID,
+                                           property_name, row, self.pressure_spin.value())
+        
+    def property_update_ready(self, result):
+        """Wyświetlenie przebiegu właściwości policzonego w tle"""
+        if self.property_plot is None:
+            return
+        temperatures, property_values = result
+        self.canvas.update_property_change(temperatures, property_values, self.temp_spin.value())
                                          
     def show_simulation_results(self):
         """Wyświetlenie wyników symulacji dla pierwiastków"""
+        self.clear_property_plot()
         if len(self.simulation_time_points) > 0 and len(self.simulation_element_concentrations) > 0:
             self.canvas.plot_simulation_elements(
-                self.simulation_time_points,
-                self.simulation_element_concentrations,
+                self.simulation_time_points.values(),
+                [concentrations.values() for concentrations in self.simulation_element_concentrations],
                 self.simulation_element_names
             )
         else:
@@ -304,12 +417,29 @@ class ElementModule(QWidget):
                 element_names
             )
             
+    def load_nuclide_table(self, path):
+        """Wczytanie tabeli nuklidów (CSV/JSON) dla solwera łańcuchów rozpadu"""
+        table = NuclideTable.load(path)
+        if len(table) == 0:
+            raise ValueError(f"Plik {path} nie zawiera nuklidów")
+        self.decay_solver = DecayChainSolver(table)
+        
+    def decay_element_concentrations(self, time_point):
+        """
+        Względne stężenia pierwiastków z równań Batemana w chwili symulacji
+        
+        Zwraca słownik symbol pierwiastka -> stężenie (w formacie update_simulation_data)
+        """
+        symbols, concentrations = self.decay_solver.element_concentrations(
+            [time_point * self.decay_time_scale])
+        return dict(zip(symbols, concentrations[:, 0]))
+        
     def update_simulation_data(self, time_point, element_data):
         """Aktualizacja danych symulacji dla pierwiastków"""
         if not self.simulation_element_names:
             # Inicjalizacja list elementów przy pierwszym wywołaniu
             self.simulation_element_names = list(element_data.keys())
-            self.simulation_element_concentrations = [[] for _ in range(len(self.simulation_element_names))]
+            self.simulation_element_concentrations = [HistoryBuffer() for _ in range(len(self.simulation_element_names))]
             
         self.simulation_time_points.append(time_point)
         
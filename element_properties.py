@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+import threading
+import numpy as np
+
+from modules.dtype_policy import get_dtype
+
+# Nazwy właściwości (jak w ElementModule.property_combo)
+HALF_LIFE = "Okres połowicznego rozpadu"
+ACTIVATION_ENERGY = "Energia aktywacji"
+MELTING_POINT = "Temperatura topnienia"
+BOILING_POINT = "Temperatura wrzenia"
+PROPERTIES = (HALF_LIFE, ACTIVATION_ENERGY, MELTING_POINT, BOILING_POINT)
+
+# Kody stanów skupienia w mapie faz
+SOLID, LIQUID, GAS = 0, 1, 2
+PHASE_NAMES = ("Stały", "Ciekły", "Gazowy")
+
+# Klucz mapy faz w słowniku tensorów
+PHASE = 'phase'
+
+# Okres połowicznego rozpadu przypisywany stabilnym pierwiastkom na wykresach
+STABLE_HALF_LIFE = 1e20
+
+
+def evaluate_property_surfaces(store, temperatures, pressures):
+    """
+    Obliczenie wszystkich właściwości dla wszystkich pierwiastków naraz
+
+    Parametry:
+    - store: ElementStore
+    - temperatures: siatka temperatur (K)
+    - pressures: siatka ciśnień (atm)
+
+    Zwraca słownik nazwa właściwości -> tensor (pierwiastki × temperatury × ciśnienia)
+    oraz PHASE -> (temperatury, temperatury topnienia, temperatury wrzenia),
+    z których phase_codes() liczy mapę faz jednego pierwiastka na żądanie.
+    Właściwości niezależne od jednej z osi są widokami rozgłoszonymi
+    (np.broadcast_to), więc nie zajmują dodatkowej pamięci.
+    """
+    dtype = get_dtype('maps')
+    shape = (len(store), len(temperatures), len(pressures))
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    pressures = np.asarray(pressures, dtype=np.float64)
+
+    # Zależności od temperatury: pierwiastki × temperatury
+    temperature_shift = temperatures[None, :] - 300
+    activation = store.activation_energy[:, None] * (1 + 0.0001 * temperature_shift)
+    half_life = np.where(store.stable[:, None], STABLE_HALF_LIFE,
+                         np.nan_to_num(store.half_life)[:, None] * np.exp(-0.0001 * temperature_shift))
+
+    # Zależności od ciśnienia: pierwiastki × ciśnienia
+    log_pressure = np.log(pressures[None, :] + 1)
+    melting = store.melting_point[:, None] * (1 + 0.01 * log_pressure)
+    boiling = store.boiling_point[:, None] * (1 + 0.02 * log_pressure)
+
+    return {
+        HALF_LIFE: np.broadcast_to(half_life.astype(dtype)[:, :, None], shape),
+        ACTIVATION_ENERGY: np.broadcast_to(activation.astype(dtype)[:, :, None], shape),
+        MELTING_POINT: np.broadcast_to(melting.astype(dtype)[:, None, :], shape),
+        BOILING_POINT: np.broadcast_to(boiling.astype(dtype)[:, None, :], shape),
+        # Temperatury przemian (pierwiastki × ciśnienia) zamiast pełnego tensora faz
+        PHASE: (temperatures, melting, boiling),
+    }
+
+
+def phase_codes(temperatures, melting, boiling):
+    """
+    Kody stanu skupienia (SOLID/LIQUID/GAS) z porównania temperatur z temperaturami przemian
+
+    Parametry:
+    - temperatures: wektor temperatur (K)
+    - melting, boiling: temperatury topnienia i wrzenia (K) - wektory dla kolejnych
+      ciśnień albo skalary dla jednego ciśnienia
+
+    Zwraca tablicę int8 (temperatury × ciśnienia), a dla skalarnych temperatur
+    przemian wektor kodów dla kolejnych temperatur.
+    """
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    temperatures = temperatures.reshape(temperatures.shape + (1,) * np.ndim(melting))
+    return ((temperatures >= melting).astype(np.int8) * LIQUID
+            + (temperatures >= boiling).astype(np.int8) * (GAS - LIQUID))
+
+
+class PropertySurfaces:
+    """
+    Pamięć podręczna tensorów właściwości pierwiastków
+
+    Tensory są liczone raz dla danego magazynu i siatek (T, P); zmiana
+    pierwiastka, właściwości lub ciśnienia to tylko wycinek z tensora.
+    Pamięć podręczna może być używana z wątków roboczych.
+    """
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, store, temperature_grid, pressure_grid):
+        """
+        Pobranie tensorów właściwości
+
+        Parametry:
+        - store: ElementStore
+        - temperature_grid, pressure_grid: krotki (min, max, liczba punktów) dla np.linspace
+
+        Zwraca (temperatury, ciśnienia, słownik tensorów)
+        """
+        key = (id(store), len(store), tuple(temperature_grid), tuple(pressure_grid))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+            temperatures = np.linspace(*temperature_grid)
+            pressures = np.linspace(*pressure_grid)
+            entry = (temperatures, pressures, evaluate_property_surfaces(store, temperatures, pressures))
+            self._cache[key] = entry
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return entry
+
+    def curve(self, store, temperature_grid, pressure_grid, property_name, row, pressure):
+        """
+        Przebieg właściwości pierwiastka w funkcji temperatury przy danym ciśnieniu (temperatury, wartości)
+
+        Dla PHASE kody stanu skupienia są brane z najbliższego węzła ciśnienia
+        (interpolacja kodów dawałaby stany ułamkowe).
+        """
+        temperatures, pressures, surfaces = self.get(store, temperature_grid, pressure_grid)
+        if property_name == PHASE:
+            _, melting, boiling = surfaces[PHASE]
+            node = nearest_node(pressures, pressure)
+            return temperatures, phase_codes(temperatures, melting[row, node], boiling[row, node])
+        return temperatures, pressure_slice(surfaces[property_name], pressures, row, pressure)
+
+    def phase_map(self, store, temperature_grid, pressure_grid, row):
+        """Mapa stanów skupienia pierwiastka (temperatury, ciśnienia, kody temperatury × ciśnienia)"""
+        temperatures, pressures, surfaces = self.get(store, temperature_grid, pressure_grid)
+        _, melting, boiling = surfaces[PHASE]
+        return temperatures, pressures, phase_codes(temperatures, melting[row], boiling[row])
+
+    def clear(self):
+        """Wyczyszczenie pamięci podręcznej (np. po wczytaniu nowych danych)"""
+        with self._lock:
+            self._cache.clear()
+
+
+def nearest_node(pressures, pressure):
+    """Indeks węzła siatki ciśnień najbliższego podanemu ciśnieniu"""
+    return int(np.abs(np.asarray(pressures) - pressure).argmin())
+
+
+def pressure_slice(tensor, pressures, row, pressure):
+    """Wycinek tensora dla pierwiastka i ciśnienia (interpolacja liniowa między węzłami siatki)"""
+    position = np.interp(pressure, pressures, np.arange(len(pressures)))
+    lower = int(np.floor(position))
+    upper = min(lower + 1, len(pressures) - 1)
+    weight = position - lower
+    return (1 - weight) * tensor[row, :, lower] + weight * tensor[row, :, upper]
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+import numpy as np
+
+# Kolumny liczbowe magazynu pierwiastków
+NUMERIC_COLUMNS = ("half_life", "activation_energy", "melting_point", "boiling_point")
+
+# Kolumny tekstowe magazynu pierwiastków
+TEXT_COLUMNS = ("symbol", "name", "state")
+
+# Wersja formatu pamięci podręcznej (zmiana unieważnia stare pliki .npz)
+CACHE_VERSION = 1
+
+# Przykładowe dane o pierwiastkach (używane, gdy nie wczytano pliku)
+DEFAULT_ELEMENTS = [
+    {"symbol": "U", "name": "Uran", "half_life": 4.5e9, "state": "Stały", "activation_energy": 0.52, "melting_point": 1405, "boiling_point": 4404},
+    {"symbol": "Pu", "name": "Pluton", "half_life": 2.4e4, "state": "Stały", "activation_energy": 0.57, "melting_point": 912, "boiling_point": 3505},
+    {"symbol": "Th", "name": "Tor", "half_life": 1.4e10, "state": "Stały", "activation_energy": 0.58, "melting_point": 2023, "boiling_point": 5061},
+    {"symbol": "Ra", "name": "Rad", "half_life": 1.6e3, "state": "Stały", "activation_energy": 0.48, "melting_point": 973, "boiling_point": 2010},
+    {"symbol": "Rn", "name": "Radon", "half_life": 3.8, "state": "Gazowy", "activation_energy": 0.36, "melting_point": 202, "boiling_point": 211},
+    {"symbol": "Po", "name": "Polon", "half_life": 138, "state": "Stały", "activation_energy": 0.41, "melting_point": 527, "boiling_point": 1235},
+    {"symbol": "Bi", "name": "Bizmut", "half_life": 2.0e19, "state": "Stały", "activation_energy": 0.43, "melting_point": 544, "boiling_point": 1837},
+    {"symbol": "Pb", "name": "Ołów", "half_life": None, "state": "Stały", "activation_energy": 0.37, "melting_point": 600, "boiling_point": 2022},
+    {"symbol": "Tl", "name": "Tal", "half_life": None, "state": "Stały", "activation_energy": 0.33, "melting_point": 577, "boiling_point": 1746},
+    {"symbol": "Hg", "name": "Rtęć", "half_life": None, "state": "Ciekły", "activation_energy": 0.29, "melting_point": 234, "boiling_point": 630},
+]
+
+
+def _parse_half_life(value, stable=None):
+    """Rozdzielenie okresu połowicznego rozpadu na (wartość, flaga stabilności)"""
+    if isinstance(stable, str):
+        stable = stable.strip().lower() in ("1", "true", "tak", "yes")
+    if value is None or (isinstance(value, str) and value.strip().lower() in ("", "inf", "stable", "stabilny")):
+        return np.nan, True
+    value = float(value)
+    if not np.isfinite(value):
+        return np.nan, True
+    return value, bool(stable)
+
+
+def _parse_number(value):
+    if value is None or (isinstance(value, str) and value.strip() == ""):
+        return np.nan
+    return float(value)
+
+
+class ElementStore:
+    """
+    Kolumnowy magazyn danych o pierwiastkach i nuklidach
+
+    Każda właściwość jest osobną tablicą NumPy (jeden wiersz = jeden
+    pierwiastek), a słownik symbol -> wiersz zapewnia szybkie wyszukiwanie.
+    Stabilne nuklidy mają jawną flagę 'stable' i okres połowicznego
+    rozpadu NaN zamiast float('inf').
+    """
+
+    def __init__(self, columns):
+        """
+        Parametry:
+        - columns: słownik nazwa kolumny -> tablica (TEXT_COLUMNS, NUMERIC_COLUMNS, 'stable')
+        """
+        self.symbol = np.asarray(columns["symbol"], dtype=str)
+        self.name = np.asarray(columns["name"], dtype=str)
+        self.state = np.asarray(columns["state"], dtype=str)
+        self.half_life = np.asarray(columns["half_life"], dtype=np.float64)
+        self.stable = np.asarray(columns["stable"], dtype=bool)
+        self.activation_energy = np.asarray(columns["activation_energy"], dtype=np.float64)
+        self.melting_point = np.asarray(columns["melting_point"], dtype=np.float64)
+        self.boiling_point = np.asarray(columns["boiling_point"], dtype=np.float64)
+        self.index = {symbol: row for row, symbol in enumerate(self.symbol)}
+
+    @classmethod
+    def from_records(cls, records):
+        """Utworzenie magazynu z listy słowników (jeden słownik na pierwiastek)"""
+        columns = {name: [] for name in TEXT_COLUMNS + NUMERIC_COLUMNS + ("stable",)}
+        for record in records:
+            for name in TEXT_COLUMNS:
+                columns[name].append(str(record.get(name, "") or ""))
+            half_life, stable = _parse_half_life(record.get("half_life"), record.get("stable"))
+            columns["half_life"].append(half_life)
+            columns["stable"].append(stable)
+            for name in NUMERIC_COLUMNS[1:]:
+                columns[name].append(_parse_number(record.get(name)))
+        return cls(columns)
+
+    @classmethod
+    def default(cls):
+        """Magazyn z wbudowanymi przykładowymi danymi"""
+        return cls.from_records(DEFAULT_ELEMENTS)
+
+    @classmethod
+    def load(cls, path, use_cache=True):
+        """
+        Wczytanie magazynu z pliku CSV lub JSON
+
+        Po pierwszym wczytaniu kolumny zapisywane są w binarnej pamięci
+        podręcznej (<plik>.cache.npz) powiązanej z czasem modyfikacji pliku,
+        więc kolejne uruchomienia pomijają parsowanie.
+        """
+        cache_path = path + ".cache.npz"
+        source_mtime = os.path.getmtime(path)
+
+        if use_cache and os.path.exists(cache_path):
+            with np.load(cache_path) as cache:
+                if int(cache["cache_version"]) == CACHE_VERSION and float(cache["source_mtime"]) == source_mtime:
+                    return cls({name: cache[name] for name in TEXT_COLUMNS + NUMERIC_COLUMNS + ("stable",)})
+
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".json":
+            with open(path, encoding="utf-8") as data_file:
+                data = json.load(data_file)
+            if isinstance(data, dict):
+                # Format {symbol: {właściwości}} jak w dawnym ElementModule.elements
+                data = [dict(properties, symbol=symbol) for symbol, properties in data.items()]
+            store = cls.from_records(data)
+        else:
+            with open(path, encoding="utf-8", newline="") as data_file:
+                store = cls.from_records(csv.DictReader(data_file))
+
+        if use_cache:
+            try:
+                store.save_cache(cache_path, source_mtime)
+            except OSError:
+                pass
+        return store
+
+    def save_cache(self, cache_path, source_mtime):
+        """Zapis kolumn do binarnej pamięci podręcznej"""
+        np.savez(cache_path, cache_version=CACHE_VERSION, source_mtime=source_mtime,
+                 **{name: getattr(self, name) for name in TEXT_COLUMNS + NUMERIC_COLUMNS + ("stable",)})
+
+    def __len__(self):
+        return len(self.symbol)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def row(self, symbol):
+        """Numer wiersza dla symbolu"""
+        return self.index[symbol]
+
+    def rows(self, symbols):
+        """Numery wierszy dla listy symboli (tablica)"""
+        return np.fromiter((self.index[symbol] for symbol in symbols), dtype=np.intp, count=len(symbols))
+
+    def column(self, name):
+        """Kolumna o podanej nazwie"""
+        if name not in TEXT_COLUMNS + NUMERIC_COLUMNS + ("stable",):
+            raise KeyError(f"Nieznana kolumna: {name}")
+        return getattr(self, name)
+
+    def radioactive(self):
+        """Maska pierwiastków niestabilnych"""
+        return ~self.stable
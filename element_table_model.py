@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+import numpy as np
+
+# Kolumny tabeli: (nagłówek, kolumna magazynu)
+TABLE_COLUMNS = (
+    ("Symbol", "symbol"),
+    ("Nazwa", "name"),
+    ("Okres połowicznego rozpadu", "half_life"),
+    ("Stan skupienia", "state"),
+    ("Energia aktywacji", "activation_energy"),
+)
+
+
+class ElementTableModel(QAbstractTableModel):
+    """
+    Model tabeli pierwiastków oparty bezpośrednio na ElementStore
+
+    Teksty komórek są formatowane dopiero, gdy widok o nie poprosi
+    (tylko widoczne wiersze). Klucze sortowania liczone są raz przy
+    ustawieniu magazynu, a sortowanie to jedna permutacja np.argsort
+    zamiast porównań wywoływanych z Qt dla każdej pary wierszy.
+    """
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = None
+        self.sort_keys = []
+        # Permutacja: wiersz modelu -> wiersz magazynu (i odwrotnie)
+        self.order = np.empty(0, dtype=np.intp)
+        self.position = np.empty(0, dtype=np.intp)
+        self.order_list = []
+        if store is not None:
+            self.set_store(store)
+
+    def set_store(self, store):
+        """Podmiana magazynu danych (jeden reset modelu zamiast wstawiania komórek)"""
+        self.beginResetModel()
+        self.store = store
+        # Klucze sortowania: teksty i wartości liczbowe (stabilne pierwiastki na końcu)
+        keys = {
+            "symbol": store.symbol,
+            "name": np.char.lower(store.name),
+            "half_life": np.where(store.stable, np.inf, store.half_life),
+            "state": store.state,
+            "activation_energy": store.activation_energy,
+        }
+        self.sort_keys = [keys[column] for _, column in TABLE_COLUMNS]
+        self.order = np.arange(len(store))
+        self.position = np.arange(len(store))
+        self.order_list = self.order.tolist()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sortowanie według wcześniej przygotowanych kluczy kolumny"""
+        if self.store is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_store_rows = [self.order[index.row()] for index in persistent]
+
+        permutation = np.argsort(self.sort_keys[column], kind='stable')
+        if order == Qt.DescendingOrder:
+            permutation = permutation[::-1]
+        self.order = permutation
+        self.position = np.empty_like(permutation)
+        self.position[permutation] = np.arange(len(permutation))
+        self.order_list = self.order.tolist()
+
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(int(self.position[store_row]), index.column())
+             for index, store_row in zip(persistent, persistent_store_rows)])
+        self.layoutChanged.emit()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.store is None:
+            return 0
+        return len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(TABLE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return TABLE_COLUMNS[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.order_list[index.row()]
+        column = TABLE_COLUMNS[index.column()][1]
+        if column == "half_life":
+            return "Stabilny" if self.store.stable[row] else f"{self.store.half_life[row]:.2e}"
+        if column == "activation_energy":
+            return f"{self.store.activation_energy[row]:.2f} eV"
+        return str(self.store.column(column)[row])
+
+    def symbol(self, row):
+        """Symbol pierwiastka w wierszu modelu"""
+        return str(self.store.symbol[self.order_list[row]])
+
+    def index_of_symbol(self, symbol, column=0):
+        """Indeks modelu dla symbolu pierwiastka"""
+        return self.index(int(self.position[self.store.row(symbol)]), column)
+
+
+class ElementSortFilterProxyModel(QSortFilterProxyModel):
+    """
+    Model pośredni filtrujący po symbolu lub nazwie
+
+    Sortowanie przekazywane jest do ElementTableModel (klucze
+    przygotowane zawczasu), a filtr to maska liczona wektorowo.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDynamicSortFilter(False)
+        self._accepted = None
+
+    def set_filter_text(self, text):
+        """Ustawienie filtra (maska wierszy liczona wektorowo raz na zmianę tekstu)"""
+        store = self.sourceModel().store
+        text = text.strip().lower()
+        if not text or store is None:
+            self._accepted = None
+        else:
+            matches = ((np.char.find(np.char.lower(store.symbol), text) >= 0)
+                       | (np.char.find(np.char.lower(store.name), text) >= 0))
+            self._accepted = matches.tolist()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._accepted is None or self._accepted[self.sourceModel().order_list[source_row]]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
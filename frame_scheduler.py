@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer
+
+# Domyślny limit klatek na sekundę
+DEFAULT_MAX_FPS = 30
+
+# Granice przedziałów histogramu czasu rysowania klatki (ms)
+FRAME_TIME_BINS_MS = (1, 2, 4, 8, 16, 33, 66)
+
+
+class FrameScheduler(QObject):
+    """
+    Rysowanie na żądanie z limitem klatek na sekundę
+
+    Wszystkie żądania odświeżenia (request_frame) zgłoszone w odstępie
+    jednej klatki są łączone w jedno rysowanie, wykonywane nie częściej
+    niż max_fps razy na sekundę. Po wstrzymaniu (np. ukryta karta) żądania
+    tylko zaznaczają, że widok jest nieaktualny - zaległa klatka jest
+    rysowana po wznowieniu.
+
+    Czasy rysowania zgłaszane przez record_frame_time() trafiają do
+    histogramu o przedziałach FRAME_TIME_BINS_MS.
+    """
+
+    def __init__(self, render, max_fps=DEFAULT_MAX_FPS, parent=None):
+        """
+        Parametry:
+        - render: funkcja wywołująca faktyczne odświeżenie widoku
+        - max_fps: limit klatek na sekundę (None lub 0 - bez limitu)
+        - parent: obiekt nadrzędny Qt
+        """
+        super().__init__(parent)
+        self.render = render
+        self.min_interval = 0.0
+        self.set_max_fps(max_fps)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._render_pending)
+
+        self.pending = False
+        self.paused = False
+        self.last_frame = None
+
+        self.requests = 0
+        self.frames = 0
+        self.frame_time_edges = np.array(FRAME_TIME_BINS_MS, dtype=float)
+        self.frame_time_counts = np.zeros(len(FRAME_TIME_BINS_MS) + 1, dtype=np.int64)
+        self.frame_time_total = 0.0
+        self.frame_time_max = 0.0
+
+    def set_max_fps(self, max_fps):
+        """Zmiana limitu klatek na sekundę (None lub 0 - bez limitu)"""
+        self.max_fps = max_fps
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+
+    def request_frame(self):
+        """Zgłoszenie zmiany sceny - klatka zostanie narysowana najwcześniej, jak pozwala limit"""
+        self.requests += 1
+        self.pending = True
+        if not self.paused and not self.timer.isActive():
+            self.timer.start(int(round(self._time_to_next_frame() * 1000)))
+
+    def set_paused(self, paused):
+        """Wstrzymanie lub wznowienie rysowania (zaległa klatka rysowana po wznowieniu)"""
+        self.paused = paused
+        if paused:
+            self.timer.stop()
+        elif self.pending and not self.timer.isActive():
+            self.timer.start(int(round(self._time_to_next_frame() * 1000)))
+
+    def _time_to_next_frame(self):
+        if self.last_frame is None:
+            return 0.0
+        return max(0.0, self.last_frame + self.min_interval - time.monotonic())
+
+    def _render_pending(self):
+        if self.paused or not self.pending:
+            return
+        self.pending = False
+        self.last_frame = time.monotonic()
+        self.frames += 1
+        self.render()
+
+    def record_frame_time(self, milliseconds):
+        """Dodanie czasu rysowania klatki (ms) do histogramu"""
+        self.frame_time_counts[np.searchsorted(self.frame_time_edges, milliseconds, side='right')] += 1
+        self.frame_time_total += milliseconds
+        self.frame_time_max = max(self.frame_time_max, milliseconds)
+
+    def frame_time_histogram(self):
+        """
+        Histogram czasów rysowania klatek
+
+        Zwraca (granice przedziałów w ms, liczności) - liczności mają o jeden
+        element więcej niż granice (ostatni przedział jest otwarty)
+        """
+        return self.frame_time_edges.copy(), self.frame_time_counts.copy()
+
+    def reset_statistics(self):
+        """Wyzerowanie liczników i histogramu"""
+        self.requests = 0
+        self.frames = 0
+        self.frame_time_counts[:] = 0
+        self.frame_time_total = 0.0
+        self.frame_time_max = 0.0
+
+    def summary_lines(self):
+        """Podsumowanie rysowania (liczniki i histogram) jako lista wierszy tekstu"""
+        drawn = int(self.frame_time_counts.sum())
+        lines = [f"Klatki: {self.frames} (żądania odświeżenia: {self.requests}, "
+                 f"limit: {self.max_fps or 'brak'} fps)"]
+        if drawn == 0:
+            return lines
+        lines.append(f"Czas rysowania: średnio {self.frame_time_total / drawn:.2f} ms, "
+                     f"maksymalnie {self.frame_time_max:.2f} ms")
+        lower = [0.0] + list(self.frame_time_edges)
+        upper = list(self.frame_time_edges) + [None]
+        for low, high, count in zip(lower, upper, self.frame_time_counts):
+            if count == 0:
+                continue
+            label = f"{low:g}-{high:g} ms" if high is not None else f">= {low:g} ms"
+            lines.append(f"  {label}: {count} ({count / drawn:.0%})")
+        return lines
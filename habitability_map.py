@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import numpy as np
+
+from modules.dtype_policy import get_dtype
+from modules.boundary_tracing import trace_boundary
+
+# Tryby łączenia map wielu organizmów
+UNION = "union"                # dowolny organizm przeżywa (maksimum indeksów)
+INTERSECTION = "intersection"  # wszystkie organizmy przeżywają (minimum indeksów)
+
+# Maksymalna liczba elementów (organizmy × wiersze × kolumny) liczonych
+# naraz w jednym bloku; ogranicza szczytowe zużycie pamięci dużych map
+MAX_CHUNK_ELEMENTS = 2 ** 22
+
+# Maksymalna rozdzielczość mapy (punkty na oś)
+MAX_MAP_RESOLUTION = 4000
+
+# Osie obwiedni tolerancji organizmów
+TEMPERATURE = "temperature"
+PRESSURE = "pressure"
+RADIATION = "radiation"
+PH = "pH"
+AXES = (TEMPERATURE, PRESSURE, RADIATION, PH)
+
+# Klucze zakresów tolerancji w danych organizmów dla osi z krzywą Gaussa
+RANGE_KEYS = {TEMPERATURE: "temp_range", PRESSURE: "pressure_range", PH: "pH_range"}
+
+# Domyślne zakresy osi (jak na wykresach korelacji)
+DEFAULT_AXIS_RANGES = {
+    TEMPERATURE: (0, 150),    # K
+    PRESSURE: (0, 60),        # atm
+    RADIATION: (0, 5000),     # Sv
+    PH: (0, 14),
+}
+
+
+def tolerance_parameters(organisms, names, key):
+    """
+    Środki i szerokości krzywych tolerancji organizmów dla jednego parametru
+
+    Parametry:
+    - organisms: słownik nazwa organizmu -> dane (jak BiologicalModule.organisms) lub OrganismStore
+    - names: lista nazw organizmów
+    - key: klucz zakresu tolerancji ('temp_range', 'pressure_range', 'pH_range')
+
+    Zwraca (środki, szerokości) - tablice o długości len(names)
+    """
+    if hasattr(organisms, "ranges"):
+        # Magazyn kolumnowy (OrganismStore) - bez przechodzenia przez słowniki
+        ranges = organisms.ranges(key, names)
+    else:
+        ranges = np.array([organisms[name][key] for name in names], dtype=np.float64).reshape(len(names), 2)
+    centers = ranges.mean(axis=1)
+    # Szerokość krzywej Gaussa jak w dotychczasowym modelu: (max - min) / 4
+    widths = np.maximum((ranges[:, 1] - ranges[:, 0]) / 4, np.finfo(np.float64).tiny)
+    return centers, widths
+
+
+def tolerance_factors(values, centers, widths):
+    """Czynniki Gaussa exp(-0.5 ((x - środek) / szerokość)^2) dla wszystkich organizmów (organizmy × punkty)"""
+    factors = (np.asarray(values, dtype=np.float64)[None, :] - centers[:, None]) / widths[:, None]
+    factors *= factors
+    factors *= -0.5
+    return np.exp(factors, out=factors)
+
+
+def radiation_factors(doses, tolerances):
+    """Czynniki przeżywalności exp(-dawka / tolerancja) dla wszystkich organizmów (organizmy × punkty)"""
+    factors = np.asarray(doses, dtype=np.float64)[None, :] / tolerances[:, None]
+    np.negative(factors, out=factors)
+    return np.exp(factors, out=factors)
+
+
+def _factors(organisms, names, temperatures, pressures):
+    """Czynniki temperatury i ciśnienia w precyzji map (organizmy × punkty)"""
+    dtype = get_dtype('maps')
+    temperature_factors = tolerance_factors(temperatures, *tolerance_parameters(organisms, names, "temp_range"))
+    pressure_factors = tolerance_factors(pressures, *tolerance_parameters(organisms, names, "pressure_range"))
+    return temperature_factors.astype(dtype), pressure_factors.astype(dtype)
+
+
+def _chunk_rows(n_organisms, n_columns, max_chunk_elements):
+    return max(1, max_chunk_elements // max(1, n_organisms * n_columns))
+
+
+def habitability_maps(organisms, temperatures, pressures, names=None, max_chunk_elements=MAX_CHUNK_ELEMENTS):
+    """
+    Mapy habitabilności dla wielu organizmów naraz
+
+    Indeks habitabilności jest iloczynem czynnika temperatury i czynnika
+    ciśnienia, więc mapa każdego organizmu to iloczyn zewnętrzny dwóch
+    wektorów - liczony przez rozgłaszanie, blokami wierszy ciśnienia.
+
+    Parametry:
+    - organisms: słownik nazwa organizmu -> dane
+    - temperatures: siatka temperatur (K)
+    - pressures: siatka ciśnień (atm)
+    - names: lista organizmów (domyślnie wszystkie)
+    - max_chunk_elements: maksymalny rozmiar bloku obliczeń
+
+    Zwraca tablicę (organizmy × ciśnienia × temperatury)
+    """
+    names = list(organisms.keys()) if names is None else list(names)
+    temperature_factors, pressure_factors = _factors(organisms, names, temperatures, pressures)
+
+    maps = np.empty((len(names), len(pressures), len(temperatures)), dtype=temperature_factors.dtype)
+    step = _chunk_rows(len(names), len(temperatures), max_chunk_elements)
+    for start in range(0, len(pressures), step):
+        stop = min(start + step, len(pressures))
+        np.multiply(pressure_factors[:, start:stop, None], temperature_factors[:, None, :],
+                    out=maps[:, start:stop, :])
+    return maps
+
+
+def combined_habitability_map(organisms, temperatures, pressures, mode=UNION, names=None,
+                              max_chunk_elements=MAX_CHUNK_ELEMENTS):
+    """
+    Łączna mapa habitabilności dla grupy organizmów
+
+    Pełny tensor (organizmy × ciśnienia × temperatury) nie jest tworzony -
+    w pamięci jest naraz tylko jeden blok wierszy ciśnienia.
+
+    Parametry:
+    - mode: UNION (dowolny organizm przeżywa - maksimum indeksów)
+      lub INTERSECTION (wszystkie przeżywają - minimum indeksów)
+
+    Zwraca tablicę (ciśnienia × temperatury)
+    """
+    if mode not in (UNION, INTERSECTION):
+        raise ValueError(f"Nieznany tryb łączenia map: {mode}")
+    names = list(organisms.keys()) if names is None else list(names)
+    temperature_factors, pressure_factors = _factors(organisms, names, temperatures, pressures)
+    return _combined_outer(temperature_factors, pressure_factors, mode, max_chunk_elements)
+
+
+def _combined_outer(x_factors, y_factors, mode, max_chunk_elements=MAX_CHUNK_ELEMENTS):
+    """Maksimum/minimum po organizmach z iloczynów zewnętrznych (organizmy × y) i (organizmy × x), blokami wierszy y"""
+    reduce = np.max if mode == UNION else np.min
+    n_organisms, n_columns = x_factors.shape
+    n_rows = y_factors.shape[1]
+
+    combined = np.empty((n_rows, n_columns), dtype=x_factors.dtype)
+    step = _chunk_rows(n_organisms, n_columns, max_chunk_elements)
+    block = np.empty((n_organisms, min(step, n_rows), n_columns), dtype=x_factors.dtype)
+    for start in range(0, n_rows, step):
+        stop = min(start + step, n_rows)
+        chunk = block[:, :stop - start, :]
+        np.multiply(y_factors[:, start:stop, None], x_factors[:, None, :], out=chunk)
+        reduce(chunk, axis=0, out=combined[start:stop])
+    return combined
+
+
+class ToleranceEnvelope:
+    """
+    Obwiednia tolerancji organizmów na siatce 4-D (temperatura × ciśnienie × promieniowanie × pH)
+
+    Przeżywalność jest iloczynem czynników poszczególnych parametrów,
+    więc dla każdej osi wystarczy raz policzyć wektor czynników
+    (organizmy × punkty osi). Dowolny przekrój 2-D to iloczyn zewnętrzny
+    dwóch wektorów przeskalowany czynnikami ustalonych parametrów -
+    zmiana ustalonej wartości (np. suwaka promieniowania) oznacza tylko
+    nowy przekrój, a nie ponowne obliczanie funkcji wykładniczych na siatce.
+    Pełny tensor 5-D tworzony jest wyłącznie na żądanie (tensor()).
+    """
+
+    def __init__(self, organisms, grids, names=None):
+        """
+        Parametry:
+        - organisms: słownik nazwa organizmu -> dane (jak BiologicalModule.organisms)
+        - grids: słownik oś -> siatka wartości (AXES)
+        - names: lista organizmów (domyślnie wszystkie)
+        """
+        self.names = list(organisms.keys()) if names is None else list(names)
+        self.index = {name: row for row, name in enumerate(self.names)}
+        self.grids = {axis: np.asarray(grids[axis], dtype=np.float64) for axis in AXES}
+
+        # Parametry krzywych tolerancji (liczone raz)
+        self._parameters = {axis: tolerance_parameters(organisms, self.names, key)
+                            for axis, key in RANGE_KEYS.items()}
+        if hasattr(organisms, "tolerances"):
+            self._radiation_tolerance = organisms.tolerances(self.names)
+        else:
+            self._radiation_tolerance = np.array([organisms[name]["radiation_tolerance"] for name in self.names],
+                                                 dtype=np.float64)
+
+        # Wektory czynników na siatkach osi (organizmy × punkty)
+        dtype = get_dtype('maps')
+        self.factors = {axis: self.axis_factors(axis, self.grids[axis]).astype(dtype) for axis in AXES}
+
+    @classmethod
+    def regular(cls, organisms, resolution, axis_ranges=None, names=None):
+        """Obwiednia na regularnej siatce o tej samej liczbie punktów na każdej osi"""
+        axis_ranges = dict(DEFAULT_AXIS_RANGES, **(axis_ranges or {}))
+        grids = {axis: np.linspace(*axis_ranges[axis], resolution) for axis in AXES}
+        return cls(organisms, grids, names)
+
+    def axis_factors(self, axis, values):
+        """Czynniki przeżywalności dla dowolnych wartości jednej osi (organizmy × punkty, float64)"""
+        if axis == RADIATION:
+            return radiation_factors(values, self._radiation_tolerance)
+        if axis not in RANGE_KEYS:
+            raise KeyError(f"Nieznana oś: {axis}")
+        return tolerance_factors(values, *self._parameters[axis])
+
+    def _fixed_scale(self, x_axis, y_axis, fixed):
+        """Iloczyn czynników ustalonych parametrów dla każdego organizmu"""
+        scale = np.ones(len(self.names))
+        for axis in AXES:
+            if axis not in (x_axis, y_axis):
+                scale *= self.axis_factors(axis, [fixed[axis]])[:, 0]
+        return scale
+
+    def slice(self, x_axis, y_axis, fixed, organism=None, mode=UNION, max_chunk_elements=MAX_CHUNK_ELEMENTS,
+              rows=None, columns=None):
+        """
+        Przekrój 2-D obwiedni
+
+        Parametry:
+        - x_axis, y_axis: osie przekroju (AXES)
+        - fixed: słownik oś -> wartość dla pozostałych osi
+        - organism: nazwa organizmu; None oznacza mapę łączną
+        - mode: UNION lub INTERSECTION dla mapy łącznej
+        - rows, columns: opcjonalne wycinki (slice) punktów osi y i x, np. kafelek
+          lub co k-ty punkt dla podglądu zgrubnego
+
+        Zwraca tablicę (punkty y_axis × punkty x_axis)
+        """
+        if x_axis == y_axis:
+            raise ValueError("Osie przekroju muszą być różne")
+        scale = self._fixed_scale(x_axis, y_axis, fixed)
+        x_factors = self.factors[x_axis]
+        y_factors = self.factors[y_axis]
+        if columns is not None:
+            x_factors = x_factors[:, columns]
+        if rows is not None:
+            y_factors = y_factors[:, rows]
+
+        if organism is not None:
+            row = self.index[organism]
+            return np.outer(y_factors[row] * x_factors.dtype.type(scale[row]), x_factors[row])
+
+        if mode not in (UNION, INTERSECTION):
+            raise ValueError(f"Nieznany tryb łączenia map: {mode}")
+        scaled_y = y_factors * scale.astype(y_factors.dtype)[:, None]
+        return _combined_outer(x_factors, scaled_y, mode, max_chunk_elements)
+
+    def point_values(self, x_axis, y_axis, fixed, x, y, organism=None, mode=UNION,
+                     max_chunk_elements=MAX_CHUNK_ELEMENTS):
+        """
+        Wartości przekroju 2-D w dowolnych punktach (x, y) - bez siatki
+
+        Parametry jak w slice(); x, y to tablice współrzędnych punktów.
+        Zwraca tablicę o kształcie x.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        scale = self._fixed_scale(x_axis, y_axis, fixed)
+        if organism is not None:
+            row = self.index[organism]
+            return (self.axis_factors(x_axis, x.ravel())[row] * self.axis_factors(y_axis, y.ravel())[row]
+                    * scale[row]).reshape(x.shape)
+
+        if mode not in (UNION, INTERSECTION):
+            raise ValueError(f"Nieznany tryb łączenia map: {mode}")
+        reduce = np.max if mode == UNION else np.min
+        x_flat = x.ravel()
+        y_flat = y.ravel()
+        values = np.empty(len(x_flat))
+        step = _chunk_rows(len(self.names), 1, max_chunk_elements)
+        for start in range(0, len(x_flat), step):
+            stop = min(start + step, len(x_flat))
+            products = self.axis_factors(x_axis, x_flat[start:stop]) * self.axis_factors(y_axis, y_flat[start:stop])
+            values[start:stop] = reduce(products * scale[:, None], axis=0)
+        return values.reshape(x.shape)
+
+    def boundary(self, x_axis, y_axis, fixed, threshold, organism=None, mode=UNION, coarse_shape=None,
+                 tolerance=None):
+        """
+        Granica obszaru przeżywalności >= threshold na przekroju 2-D (łamane)
+
+        Siatka zgrubna domyślnie odpowiada siatkom osi obwiedni (najwyżej
+        256 komórek na oś), a dokładność - 1/8 komórki siatki osi.
+
+        Zwraca BoundaryTrace
+        """
+        x_grid = self.grids[x_axis]
+        y_grid = self.grids[y_axis]
+        if coarse_shape is None:
+            coarse_shape = (min(len(x_grid) - 1, 256), min(len(y_grid) - 1, 256))
+        if tolerance is None:
+            tolerance = 1.0 / (8 * max(len(x_grid) - 1, len(y_grid) - 1, 1))
+        return trace_boundary(
+            lambda x, y: self.point_values(x_axis, y_axis, fixed, x, y, organism=organism, mode=mode),
+            (x_grid[0], x_grid[-1]), (y_grid[0], y_grid[-1]), threshold,
+            coarse_shape=coarse_shape, tolerance=tolerance)
+
+    def value(self, organism, temperature, pressure, radiation, ph):
+        """Przeżywalność jednego organizmu w punkcie (T, P, promieniowanie, pH)"""
+        row = self.index[organism]
+        point = {TEMPERATURE: temperature, PRESSURE: pressure, RADIATION: radiation, PH: ph}
+        return float(np.prod([self.axis_factors(axis, [point[axis]])[row, 0] for axis in AXES]))
+
+    def tensor(self, organism=None):
+        """
+        Pełny tensor przeżywalności (materializowany tylko na żądanie)
+
+        Zwraca (organizmy × T × P × promieniowanie × pH) albo (T × P × promieniowanie × pH)
+        dla jednego organizmu
+        """
+        factors = [self.factors[axis] for axis in AXES]
+        if organism is not None:
+            row = self.index[organism]
+            return np.einsum('t,p,r,h->tprh', *[factor[row] for factor in factors])
+        return np.einsum('ot,op,or,oh->otprh', *factors)
+
+    def __len__(self):
+        return len(self.names)
+
+
+def benchmark_habitability_maps(organisms, resolution=2000):
+    """Porównanie czasu obliczeń map dla wszystkich organizmów (wynik wypisywany na konsolę)"""
+    temperatures = np.linspace(0, 150, resolution)
+    pressures = np.linspace(0, 60, resolution)
+
+    start = time.perf_counter()
+    habitability_maps(organisms, temperatures, pressures)
+    maps_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    combined_habitability_map(organisms, temperatures, pressures, UNION)
+    combined_habitability_map(organisms, temperatures, pressures, INTERSECTION)
+    combined_time = time.perf_counter() - start
+
+    print(f"Siatka {resolution}×{resolution}, organizmy: {len(organisms)}")
+    print(f"  mapy wszystkich organizmów: {maps_time * 1000:.1f} ms")
+    print(f"  mapy łączne (suma + część wspólna): {combined_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    example_organisms = {
+        "A": {"temp_range": (0, 150), "pressure_range": (0, 60)},
+        "B": {"temp_range": (10, 45), "pressure_range": (1, 5)},
+        "C": {"temp_range": (55, 100), "pressure_range": (1, 20)},
+        "D": {"temp_range": (15, 45), "pressure_range": (1, 2)},
+        "E": {"temp_range": (35, 42), "pressure_range": (0.8, 1.2)},
+    }
+    benchmark_habitability_maps(example_organisms)
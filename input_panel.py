@@ -3,11 +3,17 @@
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QFormLayout, QLineEdit, QComboBox
 from PyQt5.QtWidgets import QPushButton, QFileDialog, QLabel, QGroupBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 
 class InputPanel(QWidget):
     """Panel danych wejściowych"""
     
+    # Sygnały z wybranymi plikami danych
+    element_file_selected = pyqtSignal(str)  # ścieżka do pliku z danymi o pierwiastkach
+    bio_file_selected = pyqtSignal(str)  # ścieżka do pliku z danymi biologicznymi
+    spectral_file_selected = pyqtSignal(str)  # ścieżka do pliku z widmem
+    nuclide_file_selected = pyqtSignal(str)  # ścieżka do pliku z tabelą nuklidów
+    
     def __init__(self):
         super().__init__()
         self.init_ui()
@@ -67,6 +73,10 @@ class InputPanel(QWidget):
         self.import_element_button.clicked.connect(self.import_element_data)
         import_buttons_layout.addWidget(self.import_element_button)
         
+        self.import_nuclide_button = QPushButton("Importuj tabelę nuklidów")
+        self.import_nuclide_button.clicked.connect(self.import_nuclide_data)
+        import_buttons_layout.addWidget(self.import_nuclide_button)
+        
         self.import_bio_button = QPushButton("Importuj dane biologiczne")
         self.import_bio_button.clicked.connect(self.import_bio_data)
         import_buttons_layout.addWidget(self.import_bio_button)
@@ -100,14 +110,21 @@ class InputPanel(QWidget):
         # Ustawienie głównego układu
         self.setLayout(main_layout)
         
+    def get_star_distance(self):
+        """Odległość od gwiazdy (AU); 1.0 dla wartości nieprawidłowej lub niedodatniej"""
+        try:
+            distance = float(self.star_distance.text().replace(",", "."))
+        except ValueError:
+            return 1.0
+        return distance if distance > 0 else 1.0
+        
     def import_spectral_data(self):
         """Import danych widmowych"""
         if self.data_source.currentText() == "Dane lokalne":
             file_path, _ = QFileDialog.getOpenFileName(self, "Wybierz plik z danymi widmowymi", "", 
-                                                     "Pliki danych (*.csv *.fits *.dat);;Wszystkie pliki (*)")
+                                                     "Pliki danych (*.csv *.dat *.txt);;Wszystkie pliki (*)")
             if file_path:
-                # Tutaj byłaby implementacja importu danych z pliku
-                pass
+                self.spectral_file_selected.emit(file_path)
         else:
             # Tutaj byłaby implementacja importu danych z innych źródeł
             pass
@@ -116,10 +133,20 @@ class InputPanel(QWidget):
         """Import danych o pierwiastkach"""
         if self.data_source.currentText() == "Dane lokalne":
             file_path, _ = QFileDialog.getOpenFileName(self, "Wybierz plik z danymi o pierwiastkach", "", 
-                                                     "Pliki danych (*.csv *.json *.dat);;Wszystkie pliki (*)")
+                                                     "Pliki danych (*.csv *.json);;Wszystkie pliki (*)")
+            if file_path:
+                self.element_file_selected.emit(file_path)
+        else:
+            # Tutaj byłaby implementacja importu danych z innych źródeł
+            pass
+        
+    def import_nuclide_data(self):
+        """Import tabeli nuklidów dla łańcuchów rozpadu"""
+        if self.data_source.currentText() == "Dane lokalne":
+            file_path, _ = QFileDialog.getOpenFileName(self, "Wybierz plik z tabelą nuklidów", "", 
+                                                     "Pliki danych (*.csv *.json);;Wszystkie pliki (*)")
             if file_path:
-                # Tutaj byłaby implementacja importu danych z pliku
-                pass
+                self.nuclide_file_selected.emit(file_path)
         else:
             # Tutaj byłaby implementacja importu danych z innych źródeł
             pass
@@ -130,8 +157,7 @@ class InputPanel(QWidget):
             file_path, _ = QFileDialog.getOpenFileName(self, "Wybierz plik z danymi biologicznymi", "", 
                                                      "Pliki danych (*.csv *.json *.dat);;Wszystkie pliki (*)")
             if file_path:
-                # Tutaj byłaby implementacja importu danych z pliku
-                pass
+                self.bio_file_selected.emit(file_path)
         else:
             # Tutaj byłaby implementacja importu danych z innych źródeł
             pass
@@ -1,15 +1,74 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTextEdit
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QTextCharFormat, QFont
+import threading
+import time
+from collections import deque
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QPlainTextEdit
+from PyQt5.QtCore import Qt, QThread, QTimer, QMetaObject
+from PyQt5.QtGui import QColor, QTextCharFormat, QTextCursor, QFont
+
+# Poziomy komunikatów: (waga do filtrowania, prefiks, kolor)
+LOG_LEVELS = {
+    "info": (0, "[INFO] ", "#000000"),  # czarny
+    "success": (1, "[SUKCES] ", "#008000"),  # zielony
+    "warning": (2, "[OSTRZEŻENIE] ", "#FF8C00"),  # pomarańczowy
+    "error": (3, "[BŁĄD] ", "#FF0000")  # czerwony
+}
+
+# Pozycje filtra poziomu: (etykieta, najmniejsza wyświetlana waga)
+LOG_FILTERS = (
+    ("Wszystkie", 0),
+    ("Sukcesy, ostrzeżenia i błędy", 1),
+    ("Ostrzeżenia i błędy", 2),
+    ("Tylko błędy", 3)
+)
+
+# Odstęp (ms) dopisywania zebranych komunikatów do konsoli
+LOG_FLUSH_INTERVAL_MS = 100
+
+# Największa liczba wierszy konsoli (starsze są usuwane) i zapamiętanych komunikatów
+MAX_LOG_LINES = 5000
+
 
 class LogConsole(QWidget):
-    """Konsola logów do monitorowania operacji systemowych"""
+    """
+    Konsola logów do monitorowania operacji systemowych
+    
+    add_log() tylko dopisuje komunikat do kolejki (bezpiecznie z dowolnego
+    wątku), a zegar w wątku interfejsu co LOG_FLUSH_INTERVAL_MS dopisuje
+    zebrane komunikaty do konsoli jedną operacją. Konsola i historia mają
+    ograniczoną liczbę wierszy, powtórzenia tego samego komunikatu są
+    zliczane i zastępowane jednym wierszem podsumowania, a filtr poziomu
+    odrzuca komunikaty dopiero przy wyświetlaniu (zmiana filtra pokazuje
+    całą zapamiętaną historię).
+    """
     
     def __init__(self):
         super().__init__()
+        # Kolejka komunikatów czekających na wyświetlenie (czas, poziom, treść)
+        # i historia wyświetlonych - ograniczone do MAX_LOG_LINES (w kolejce zostaje
+        # miejsce na wiersz o wypartych komunikatach)
+        self.lock = threading.Lock()
+        self.flush_scheduled = False
+        self.pending = deque(maxlen=MAX_LOG_LINES - 1)
+        self.history = deque(maxlen=MAX_LOG_LINES)
+        self.dropped = 0
+        
+        # Ostatni komunikat i liczba jego pominiętych powtórzeń (także przy ostatnim dopisaniu)
+        self.last_record = None
+        self.suppressed = 0
+        self.suppressed_at_flush = 0
+        
+        self.min_weight = 0
+        
+        # Formaty tekstu poziomów (tworzone raz)
+        self.formats = {}
+        for level, (_, _, color) in LOG_LEVELS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(color))
+            self.formats[level] = text_format
+            
         self.init_ui()
         
     def init_ui(self):
@@ -17,10 +76,25 @@ class LogConsole(QWidget):
         # Główny układ
         main_layout = QVBoxLayout()
         
-        # Pole tekstowe dla logów
-        self.log_text = QTextEdit()
+        # Filtr poziomu i czyszczenie konsoli
+        control_layout = QHBoxLayout()
+        control_layout.addWidget(QLabel("Poziom:"))
+        self.level_filter = QComboBox()
+        self.level_filter.addItems([label for label, _ in LOG_FILTERS])
+        self.level_filter.currentIndexChanged.connect(self.set_level_filter)
+        control_layout.addWidget(self.level_filter)
+        control_layout.addStretch()
+        clear_button = QPushButton("Wyczyść")
+        clear_button.clicked.connect(self.clear_logs)
+        control_layout.addWidget(clear_button)
+        main_layout.addLayout(control_layout)
+        
+        # Pole tekstowe dla logów (ograniczona liczba wierszy)
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setLineWrapMode(QTextEdit.NoWrap)
+        self.log_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.log_text.setMaximumBlockCount(MAX_LOG_LINES)
+        self.log_text.setUndoRedoEnabled(False)
         
         # Ustawienie czcionki o stałej szerokości
         font = QFont("Courier New", 9)
@@ -34,56 +108,130 @@ class LogConsole(QWidget):
         # Ustawienie głównego układu
         self.setLayout(main_layout)
         
+        # Zegar dopisywania komunikatów (uruchamiany, gdy w kolejce coś czeka)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+        
         # Dodanie początkowego komunikatu
         self.add_log("Aplikacja uruchomiona", "info")
         
     def add_log(self, message, level="info"):
         """
-        Dodanie komunikatu do konsoli logów
+        Dodanie komunikatu do konsoli logów (bezpieczne z dowolnego wątku)
         
         Parametry:
         - message: treść komunikatu
         - level: poziom komunikatu (info, warning, error, success)
+        
+        Komunikat trafia do kolejki i jest wyświetlany przy najbliższym
+        dopisaniu; powtórzenie poprzedniego komunikatu jest tylko zliczane.
+        """
+        if level not in LOG_LEVELS:
+            level = "info"
+        record = (level, str(message))
+        with self.lock:
+            if record == self.last_record:
+                self.suppressed += 1
+            else:
+                self._queue_suppressed()
+                self.last_record = record
+                self._enqueue(level, record[1])
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+            
+        # Zegar uruchamiany tylko przez pierwszy komunikat porcji
+        if QThread.currentThread() is self.thread():
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
+        else:
+            QMetaObject.invokeMethod(self.flush_timer, "start", Qt.QueuedConnection)
+            
+    def _enqueue(self, level, message):
+        """Dopisanie komunikatu do kolejki z liczeniem wypartych (wywoływane pod blokadą)"""
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append((time.time(), level, message))
+        
+    def _queue_suppressed(self):
+        """Dopisanie do kolejki podsumowania pominiętych powtórzeń (wywoływane pod blokadą)"""
+        if self.suppressed == 0:
+            return
+        level, _ = self.last_record
+        self._enqueue(level, f"Pominięto {self.suppressed} powtórzeń poprzedniego komunikatu")
+        self.suppressed = 0
+        self.suppressed_at_flush = 0
+        
+    def flush(self):
         """
-        # Utworzenie formatu tekstu w zależności od poziomu komunikatu
-        text_format = QTextCharFormat()
-        
-        if level == "info":
-            text_format.setForeground(QColor("#000000"))  # czarny
-        elif level == "warning":
-            text_format.setForeground(QColor("#FF8C00"))  # pomarańczowy
-        elif level == "error":
-            text_format.setForeground(QColor("#FF0000"))  # czerwony
-        elif level == "success":
-            text_format.setForeground(QColor("#008000"))  # zielony
-        
-        # Dodanie prefiksu w zależności od poziomu komunikatu
-        if level == "info":
-            prefix = "[INFO] "
-        elif level == "warning":
-            prefix = "[OSTRZEŻENIE] "
-        elif level == "error":
-            prefix = "[BŁĄD] "
-        elif level == "success":
-            prefix = "[SUKCES] "
-        
-        # Dodanie znacznika czasu
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # Pełny komunikat
-        full_message = f"[{timestamp}] {prefix}{message}"
-        
-        # Dodanie komunikatu do konsoli
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(cursor.End)
-        cursor.insertText(full_message + "\n")
-        
-        # Przewinięcie do końca
-        self.log_text.setTextCursor(cursor)
-        self.log_text.ensureCursorVisible()
+        Dopisanie zebranych komunikatów do konsoli jedną operacją
+        
+        Podsumowanie powtórzeń dopisywane jest, gdy komunikat się zmieni albo
+        gdy przez cały odstęp zegara nie było nowych powtórzeń.
+        """
+        with self.lock:
+            if self.suppressed and self.suppressed == self.suppressed_at_flush:
+                self._queue_suppressed()
+            self.suppressed_at_flush = self.suppressed
+            records = list(self.pending)
+            self.pending.clear()
+            dropped = self.dropped
+            self.dropped = 0
+            
+        if dropped:
+            records.insert(0, (records[0][0], "warning", f"Pominięto {dropped} starszych komunikatów (przepełniona kolejka)"))
+        self.history.extend(records)
+        self.append_records(records)
+        
+        with self.lock:
+            if not self.suppressed and not self.pending:
+                self.flush_scheduled = False
+                self.flush_timer.stop()
+            
+    def append_records(self, records):
+        """Dopisanie komunikatów przechodzących przez filtr poziomu (jedna operacja edycji dokumentu)"""
+        records = [record for record in records if LOG_LEVELS[record[1]][0] >= self.min_weight]
+        if not records:
+            return
+        # Przy dużych porcjach i tak zostaje tylko MAX_LOG_LINES ostatnich wierszy
+        records = records[-MAX_LOG_LINES:]
+        
+        scroll_bar = self.log_text.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        
+        document = self.log_text.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        first = document.isEmpty()
+        for timestamp, level, message in records:
+            if not first:
+                cursor.insertBlock()
+            first = False
+            prefix = LOG_LEVELS[level][1]
+            cursor.insertText(f"[{time.strftime('%H:%M:%S', time.localtime(timestamp))}] {prefix}{message}",
+                              self.formats[level])
+        cursor.endEditBlock()
+        
+        # Przewinięcie do końca tylko wtedy, gdy konsola była przewinięta do końca
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+            
+    def set_level_filter(self, index):
+        """Zmiana filtra poziomu - konsola odtwarzana z zapamiętanej historii"""
+        self.min_weight = LOG_FILTERS[index][1]
+        self.log_text.clear()
+        self.append_records(list(self.history))
         
     def clear_logs(self):
         """Wyczyszczenie konsoli logów"""
+        with self.lock:
+            self.pending.clear()
+            self.dropped = 0
+            self.last_record = None
+            self.suppressed = 0
+            self.suppressed_at_flush = 0
+        self.history.clear()
         self.log_text.clear()
         self.add_log("Konsola wyczyszczona", "info")
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import sqlite3
 from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QDockWidget, QStatusBar
 from PyQt5.QtWidgets import QAction, QToolBar, QMenu, QMessageBox, QVBoxLayout, QWidget
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
@@ -10,13 +11,16 @@ from PyQt5.QtGui import QIcon
 from modules.spectral_module import SpectralModule
 from modules.element_module import ElementModule
 from modules.biological_module import BiologicalModule
-from modules.visualization_3d import Visualization3DModule
+from modules.visualization_3d import SURFACE_LOD_LEVELS, Visualization3DModule
 from modules.input_panel import InputPanel
 from modules.simulation_panel import SimulationPanel
 from modules.filter_panel import FilterPanel
 from modules.log_console import LogConsole
 from modules.info_panel import InfoPanel
 from modules.simulation_thread import SimulationThread
+from modules.sensitivity_analysis import SensitivityThread, INPUT_LABELS
+from modules.background_tasks import DebouncedTask
+from modules.timeline_playback import SimulationRecorder, build_timeline
 
 class HabitabilityAnalyzer(QMainWindow):
     """
@@ -31,6 +35,15 @@ class HabitabilityAnalyzer(QMainWindow):
         # Inicjalizacja wątku symulacji
         self.simulation_thread = None
         
+        # Wątek analizy wrażliwości indeksu habitabilności
+        self.sensitivity_thread = None
+        
+        # Zapis kroków symulacji i przygotowanie odtwarzania w tle po jej zakończeniu
+        self.simulation_recorder = SimulationRecorder()
+        self.timeline_task = DebouncedTask(build_timeline, debounce_ms=0, parent=self)
+        self.timeline_task.result_ready.connect(self.timeline_ready)
+        self.timeline_task.task_failed.connect(self.timeline_failed)
+        
         # Inicjalizacja interfejsu użytkownika
         self.init_ui()
         
@@ -137,6 +150,10 @@ class HabitabilityAnalyzer(QMainWindow):
         self.stop_simulation_action.setEnabled(False)
         toolbar.addAction(self.stop_simulation_action)
         
+        self.sensitivity_action = QAction("Analiza wrażliwości", self)
+        self.sensitivity_action.triggered.connect(self.start_sensitivity_analysis)
+        toolbar.addAction(self.sensitivity_action)
+        
         save_session_action = QAction("Zapisz sesję", self)
         save_session_action.triggered.connect(self.save_session)
         toolbar.addAction(save_session_action)
@@ -173,6 +190,10 @@ class HabitabilityAnalyzer(QMainWindow):
         self.input_dock = QDockWidget("Dane Wejściowe", self)
         self.input_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
         self.input_panel = InputPanel()
+        self.input_panel.element_file_selected.connect(self.import_element_file)
+        self.input_panel.nuclide_file_selected.connect(self.import_nuclide_file)
+        self.input_panel.bio_file_selected.connect(self.import_bio_file)
+        self.input_panel.spectral_file_selected.connect(self.import_spectral_file)
         self.input_dock.setWidget(self.input_panel)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.input_dock)
         
@@ -265,6 +286,53 @@ class HabitabilityAnalyzer(QMainWindow):
         self.log_console.add_log("Importowanie danych...")
         # Implementacja importowania danych
         
+    def import_element_file(self, file_path):
+        """Import danych o pierwiastkach z pliku CSV/JSON"""
+        self.log_console.add_log(f"Importowanie danych o pierwiastkach z pliku {file_path}...")
+        try:
+            self.element_module.load_element_data(file_path)
+        except (OSError, ValueError, KeyError) as error:
+            self.log_console.add_log(f"Błąd importu danych o pierwiastkach: {error}", "error")
+            return
+        self.log_console.add_log(
+            f"Zaimportowano {len(self.element_module.element_store)} pierwiastków", "success")
+        
+    def import_nuclide_file(self, file_path):
+        """Import tabeli nuklidów (CSV/JSON) dla symulacji łańcuchów rozpadu"""
+        self.log_console.add_log(f"Importowanie tabeli nuklidów z pliku {file_path}...")
+        try:
+            self.element_module.load_nuclide_table(file_path)
+        except (OSError, ValueError, KeyError) as error:
+            self.log_console.add_log(f"Błąd importu tabeli nuklidów: {error}", "error")
+            return
+        self.log_console.add_log(
+            f"Zaimportowano {len(self.element_module.decay_solver.table)} nuklidów", "success")
+        
+    def import_spectral_file(self, file_path):
+        """Import widma z pliku CSV/.dat (dopisywanego do otwartej biblioteki widm)"""
+        self.log_console.add_log(f"Importowanie danych widmowych z pliku {file_path}...")
+        try:
+            spectrum_id = self.spectral_module.import_spectrum_file(file_path)
+        except (OSError, ValueError, sqlite3.Error) as error:
+            self.log_console.add_log(f"Błąd importu danych widmowych: {error}", "error")
+            return
+        if spectrum_id is None:
+            self.log_console.add_log("Zaimportowano widmo jako bieżące widmo", "success")
+        else:
+            self.log_console.add_log(
+                f"Zaimportowano widmo do biblioteki {self.spectral_module.library.path} (ID {spectrum_id})", "success")
+        
+    def import_bio_file(self, file_path):
+        """Import danych o tolerancjach organizmów z pliku CSV/JSON/.dat"""
+        self.log_console.add_log(f"Importowanie danych biologicznych z pliku {file_path}...")
+        try:
+            self.biological_module.load_biological_data(file_path)
+        except (OSError, ValueError, KeyError) as error:
+            self.log_console.add_log(f"Błąd importu danych biologicznych: {error}", "error")
+            return
+        self.log_console.add_log(
+            f"Zaimportowano {len(self.biological_module.organisms)} organizmów", "success")
+        
     def get_simulation_parameters(self):
         """Pobieranie parametrów symulacji z interfejsu użytkownika"""
         params = {
@@ -281,7 +349,9 @@ class HabitabilityAnalyzer(QMainWindow):
             'include_radiation': self.simulation_panel.include_radiation.isChecked(),
             'include_evolution': self.simulation_panel.include_evolution.isChecked(),
             'include_biology': self.simulation_panel.include_biology.isChecked(),
-            'planet_name': self.input_panel.planet_name.text()
+            'planet_name': self.input_panel.planet_name.text(),
+            'star_type': self.input_panel.star_type.currentText(),
+            'star_distance': self.input_panel.get_star_distance()
         }
         return params
         
@@ -312,6 +382,14 @@ class HabitabilityAnalyzer(QMainWindow):
             atmosphere_text
         )
         
+        # Statystyki rysowania widoku 3D liczone od początku symulacji
+        self.visualization_3d.reset_frame_statistics()
+        
+        # Nowy zapis symulacji (poprzednie odtwarzanie jest zamykane)
+        self.timeline_task.cancel()
+        self.visualization_3d.stop_playback()
+        self.simulation_recorder.clear()
+        
         # Inicjalizacja i uruchomienie wątku symulacji
         self.simulation_thread = SimulationThread(params)
         
@@ -366,6 +444,9 @@ class HabitabilityAnalyzer(QMainWindow):
         # Pobieranie aktualnych parametrów
         params = self.get_simulation_parameters()
         
+        # Średnia temperatura planety z modelu klimatu (temperatura z panelu to stan początkowy)
+        temperature = results.get('temperature', params['temperature'])
+        
         # Aktualizacja modułu widmowego
         elapsed_time = self.info_panel.simulation_time.text().replace("Czas: ", "").replace("s", "")
         try:
@@ -376,19 +457,14 @@ class HabitabilityAnalyzer(QMainWindow):
         self.spectral_module.update_simulation_data(
             elapsed_time,
             results['habitability_index'],
-            params['temperature'],
-            params['pressure']
+            temperature,
+            params['pressure'],
+            {name: params[name] for name in ('radiation', 'ph', 'oxygen', 'nitrogen', 'co2')}
         )
         
         # Aktualizacja modułu pierwiastkowego
-        # Przykładowe dane o pierwiastkach
-        element_data = {
-            'O': 0.2 + 0.6 * (1 - np.exp(-0.05 * elapsed_time)),
-            'N': 0.8 - 0.3 * (1 - np.exp(-0.02 * elapsed_time)),
-            'C': 0.1 + 0.05 * np.sin(0.2 * elapsed_time),
-            'H': 0.5 * np.exp(-0.03 * elapsed_time),
-            'Fe': 0.05 + 0.02 * (1 - np.exp(-0.01 * elapsed_time))
-        }
+        # Stężenia pierwiastków z łańcuchów rozpadu (równania Batemana)
+        element_data = self.element_module.decay_element_concentrations(elapsed_time)
         
         self.element_module.update_simulation_data(
             elapsed_time,
@@ -396,28 +472,14 @@ class HabitabilityAnalyzer(QMainWindow):
         )
         
         # Aktualizacja modułu biologicznego
-        # Przykładowe dane o organizmach
-        organism_data = {}
-        for organism in self.biological_module.organisms.keys():
-            # Różne wzorce przeżywalności dla różnych organizmów
-            if "Niesporczak" in organism:
-                viability = 80 + 10 * np.sin(0.05 * elapsed_time)
-            elif "Deinococcus" in organism:
-                viability = 60 + 20 * np.sin(0.1 * elapsed_time)
-            elif "Thermococcus" in organism:
-                viability = 40 + 30 * np.sin(0.15 * elapsed_time)
-            elif "coli" in organism:
-                viability = 30 + 20 * np.sin(0.2 * elapsed_time)
-            else:  # Homo sapiens
-                viability = 20 + 10 * np.sin(0.25 * elapsed_time)
-                
-            viability = max(0, min(100, viability))
-            organism_data[organism] = viability
-            
+        # Przeżywalność organizmów w bieżących warunkach (wektorowo z indeksu tolerancji)
         self.biological_module.update_simulation_data(
             elapsed_time,
             results['habitability_index'],
-            organism_data
+            temperature,
+            params['pressure'],
+            params['radiation'],
+            params['ph']
         )
         
         # Aktualizacja wizualizacji 3D
@@ -427,13 +489,28 @@ class HabitabilityAnalyzer(QMainWindow):
             'co2': params['co2']
         }
         
+        # Zapis kroku do odtwarzania po zakończeniu symulacji
+        climate = results.get('climate')
+        self.simulation_recorder.append(
+            elapsed_time,
+            {
+                'habitability_index': results['habitability_index'],
+                'temperature': temperature,
+                **{name: params[name] for name in ('pressure', 'radiation', 'ph', 'oxygen', 'nitrogen', 'co2')}
+            },
+            climate['temperatures'] if climate is not None else None
+        )
+        
+        if climate is not None:
+            self.visualization_3d.update_planet_model(climate)
         self.visualization_3d.update_simulation_data(
             int(self.info_panel.simulation_progress.value()),
             results['habitability_index'],
-            params['temperature'],
+            temperature,
             params['pressure'],
             params['radiation'],
-            atmosphere_data
+            atmosphere_data,
+            ph=params['ph']
         )
         
     def simulation_finished(self, results):
@@ -441,6 +518,15 @@ class HabitabilityAnalyzer(QMainWindow):
         self.log_console.add_log("Symulacja zakończona", "success")
         self.statusBar.showMessage("Symulacja zakończona")
         
+        # Histogram czasów rysowania widoku 3D w trakcie symulacji
+        for line in self.visualization_3d.frame_report():
+            self.log_console.add_log(f"Widok 3D: {line}", "info")
+        
+        # Przygotowanie odtwarzania zapisu w tle (bufory klatek wszystkich poziomów szczegółowości liczone raz)
+        if len(self.simulation_recorder) > 0:
+            levels = [subdivisions for _, subdivisions in SURFACE_LOD_LEVELS]
+            self.timeline_task.schedule(self.simulation_recorder.snapshot(), levels)
+        
         # Aktualizacja interfejsu
         self.simulate_action.setEnabled(True)
         self.stop_simulation_action.setEnabled(False)
@@ -451,6 +537,43 @@ class HabitabilityAnalyzer(QMainWindow):
                                f"Możliwe formy życia: {results['life_forms']}\n"
                                f"Czas symulacji: {round(results['simulation_time'], 1)} sekund")
         
+    def timeline_ready(self, timeline):
+        """Załadowanie przygotowanego zapisu symulacji do odtwarzania w widoku 3D"""
+        self.visualization_3d.load_timeline(timeline)
+        self.log_console.add_log(f"Zapis symulacji gotowy do odtworzenia ({len(timeline)} klatek)", "info")
+        
+    def timeline_failed(self, message):
+        """Obsługa błędu przygotowania odtwarzania"""
+        self.log_console.add_log(f"Błąd przygotowania odtwarzania: {message}", "error")
+        
+    def start_sensitivity_analysis(self):
+        """Analiza wrażliwości indeksu habitabilności (indeksy Sobola) wokół bieżących parametrów"""
+        if self.sensitivity_thread is not None and self.sensitivity_thread.isRunning():
+            self.log_console.add_log("Analiza wrażliwości już jest uruchomiona", "warning")
+            return
+        
+        self.sensitivity_action.setEnabled(False)
+        self.sensitivity_thread = SensitivityThread(self.get_simulation_parameters())
+        self.sensitivity_thread.update_status.connect(self.update_simulation_status)
+        self.sensitivity_thread.analysis_finished.connect(self.sensitivity_analysis_finished)
+        self.sensitivity_thread.analysis_failed.connect(self.sensitivity_analysis_failed)
+        self.sensitivity_thread.start()
+        
+    def sensitivity_analysis_finished(self, result):
+        """Wyświetlenie indeksów Sobola (pierwszego rzędu S1 i całkowitych ST)"""
+        self.sensitivity_action.setEnabled(True)
+        self.log_console.add_log(
+            f"Analiza wrażliwości zakończona ({result.n_evaluations} ocen modelu, "
+            f"przedziały ufności {round(result.level * 100)}%):", "success")
+        for line in result.summary_lines():
+            self.log_console.add_log(line, "info")
+        self.statusBar.showMessage(f"Najważniejszy parametr: {INPUT_LABELS[result.ranking()[0]]}")
+        
+    def sensitivity_analysis_failed(self, message):
+        """Obsługa błędu analizy wrażliwości"""
+        self.sensitivity_action.setEnabled(True)
+        self.log_console.add_log(f"Błąd analizy wrażliwości: {message.strip().splitlines()[-1]}", "error")
+        
     def save_session(self):
         """Zapisywanie sesji"""
         self.log_console.add_log("Zapisywanie sesji...")
@@ -482,6 +605,11 @@ class HabitabilityAnalyzer(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
+            # Zatrzymanie wątków przeliczających mapę habitabilności i strumienia widmowego
+            self.biological_module.stop_map_refinement()
+            self.spectral_module.stop_stream()
+            if self.sensitivity_thread is not None:
+                self.sensitivity_thread.wait()
             event.accept()
         else:
             event.ignore()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from pyqtgraph.opengl import MeshData
+
+
+def unit_sphere(rows, cols):
+    """
+    Siatka UV sfery jednostkowej liczona przez rozgłaszanie (bez pętli)
+
+    Wierzchołki leżą na rows + 1 równoleżnikach po cols punktów (bieguny
+    powtórzone cols razy), każdy czworokąt siatki to dwa trójkąty.
+
+    Zwraca (wierzchołki (N × 3, float32), trójkąty (2·rows·cols × 3, uint32))
+    """
+    phi = (np.pi * np.arange(rows + 1) / rows)[:, None]
+    theta = (2 * np.pi * np.arange(cols) / cols)[None, :]
+    sin_phi = np.sin(phi)
+    vertices = np.empty((rows + 1, cols, 3), dtype=np.float32)
+    vertices[..., 0] = sin_phi * np.cos(theta)
+    vertices[..., 1] = sin_phi * np.sin(theta)
+    vertices[..., 2] = np.cos(phi)
+
+    ring = np.arange(rows, dtype=np.uint32)[:, None] * cols
+    column = np.arange(cols, dtype=np.uint32)[None, :]
+    next_column = (column + 1) % cols
+    p1 = ring + column
+    p2 = ring + next_column
+    p3 = ring + cols + column
+    p4 = ring + cols + next_column
+    faces = np.stack([np.stack([p1, p2, p3], axis=-1), np.stack([p2, p4, p3], axis=-1)], axis=2)
+    return vertices.reshape(-1, 3), faces.reshape(-1, 3)
+
+
+def icosahedron():
+    """
+    Dwudziestościan foremny wpisany w sferę jednostkową
+
+    Zwraca (wierzchołki (12 × 3, float64), trójkąty (20 × 3, uint32))
+    """
+    t = (1 + np.sqrt(5)) / 2
+    vertices = np.array([
+        [-1, t, 0], [1, t, 0], [-1, -t, 0], [1, -t, 0],
+        [0, -1, t], [0, 1, t], [0, -1, -t], [0, 1, -t],
+        [t, 0, -1], [t, 0, 1], [-t, 0, -1], [-t, 0, 1],
+    ], dtype=np.float64)
+    vertices /= np.linalg.norm(vertices, axis=1, keepdims=True)
+    faces = np.array([
+        [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+        [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+        [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+        [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+    ], dtype=np.uint32)
+    return vertices, faces
+
+
+def subdivide(vertices, faces):
+    """
+    Jeden krok podziału siatki sfery jednostkowej (bez pętli)
+
+    Każda krawędź dostaje jeden nowy wierzchołek (środek rzutowany na sferę),
+    wspólny dla obu przylegających trójkątów, a każdy trójkąt dzielony jest
+    na cztery.
+
+    Zwraca (wierzchołki, trójkąty) siatki po podziale
+    """
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2).astype(np.int64), axis=1)
+    # Krawędź jako jedna liczba - np.unique na skalarach zamiast na wierszach
+    edge_keys, edge_index = np.unique(edges[:, 0] * len(vertices) + edges[:, 1], return_inverse=True)
+    start, end = np.divmod(edge_keys, len(vertices))
+    midpoints = vertices[start] + vertices[end]
+    midpoints /= np.linalg.norm(midpoints, axis=1, keepdims=True)
+
+    # Indeksy środków krawędzi ab, bc, ca każdego trójkąta
+    mid = (edge_index.reshape(-1, 3) + len(vertices)).astype(np.uint32)
+    a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+    ab, bc, ca = mid[:, 0], mid[:, 1], mid[:, 2]
+    new_faces = np.stack([
+        np.stack([a, ab, ca], axis=1),
+        np.stack([b, bc, ab], axis=1),
+        np.stack([c, ca, bc], axis=1),
+        np.stack([ab, bc, ca], axis=1),
+    ], axis=1).reshape(-1, 3)
+    return np.concatenate([vertices, midpoints]), new_faces
+
+
+class GeometryCache:
+    """
+    Pamięć podręczna geometrii siatek sfer jednostkowych (UV i ikosfer)
+
+    Tablice są tylko do odczytu i współdzielone przez wszystkie siatki
+    o tej samej liczbie segmentów - promień i położenie nadaje się
+    transformacją obiektu sceny.
+    """
+
+    def __init__(self):
+        self._spheres = {}
+        self._icospheres = {}
+
+    def sphere(self, rows, cols):
+        """Wierzchołki i trójkąty sfery jednostkowej dla (rows, cols)"""
+        key = (int(rows), int(cols))
+        geometry = self._spheres.get(key)
+        if geometry is None:
+            geometry = unit_sphere(*key)
+            for array in geometry:
+                array.setflags(write=False)
+            self._spheres[key] = geometry
+        return geometry
+
+    def icosphere(self, subdivisions):
+        """
+        Wierzchołki i trójkąty ikosfery jednostkowej po danej liczbie podziałów
+
+        Kolejne poziomy liczone są z poprzedniego poziomu z pamięci podręcznej,
+        więc przygotowanie kilku poziomów szczegółowości kosztuje tyle, co
+        zbudowanie najdokładniejszego z nich.
+        """
+        key = ('icosphere', int(subdivisions))
+        geometry = self._spheres.get(key)
+        if geometry is None:
+            vertices, faces = self._subdivided(key[1])
+            geometry = (vertices.astype(np.float32), faces)
+            for array in geometry:
+                array.setflags(write=False)
+            self._spheres[key] = geometry
+        return geometry
+
+    def _subdivided(self, level):
+        """Geometria ikosfery w pełnej precyzji (podstawa kolejnych podziałów)"""
+        geometry = self._icospheres.get(level)
+        if geometry is None:
+            geometry = icosahedron() if level == 0 else subdivide(*self._subdivided(level - 1))
+            self._icospheres[level] = geometry
+        return geometry
+
+    def clear(self):
+        self._spheres.clear()
+        self._icospheres.clear()
+
+    def __len__(self):
+        return len(self._spheres)
+
+
+class SphereMeshData(MeshData):
+    """
+    MeshData sfery jednostkowej z gotowymi normalnymi
+
+    Normalne sfery jednostkowej są równe wierzchołkom, więc nie trzeba ich
+    liczyć (MeshData.vertexNormals przechodzi pętlą po wszystkich wierzchołkach).
+    """
+
+    def __init__(self, vertices, faces):
+        super().__init__(vertexes=vertices, faces=faces)
+        self._sphere_normals = vertices
+
+    def vertexNormals(self, indexed=None):
+        if indexed == 'faces':
+            return self._sphere_normals[self.faces()]
+        return self._sphere_normals
+
+
+# Wspólna pamięć podręczna geometrii modułu wizualizacji 3D
+GEOMETRY_CACHE = GeometryCache()
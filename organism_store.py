@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+import numpy as np
+
+from modules.habitability_map import (TEMPERATURE, PRESSURE, RADIATION, PH, AXES, radiation_factors,
+                                      tolerance_factors)
+
+# Kolumny liczbowe magazynu organizmów: granice tolerancji
+TOLERANCE_COLUMNS = ("temp_min", "temp_max", "pressure_min", "pressure_max",
+                     "radiation_tolerance", "ph_min", "ph_max")
+
+# Kolumny składu komórki (%)
+COMPOSITION_COLUMNS = ("water", "protein", "lipids", "nucleic_acids", "other")
+
+# Zakresy tolerancji w formacie słownikowym (jak dawne BiologicalModule.organisms)
+RANGE_COLUMNS = {
+    "temp_range": ("temp_min", "temp_max"),
+    "pressure_range": ("pressure_min", "pressure_max"),
+    "pH_range": ("ph_min", "ph_max"),
+}
+
+# Kolumny dolnej i górnej granicy tolerancji dla osi (promieniowanie ma tylko górną)
+AXIS_BOUNDS = {
+    TEMPERATURE: ("temp_min", "temp_max"),
+    PRESSURE: ("pressure_min", "pressure_max"),
+    RADIATION: (None, "radiation_tolerance"),
+    PH: ("ph_min", "ph_max"),
+}
+
+# Wersja formatu pamięci podręcznej (zmiana unieważnia stare pliki .npz)
+CACHE_VERSION = 1
+
+# Przykładowe dane o organizmach (używane, gdy nie wczytano pliku)
+DEFAULT_ORGANISMS = {
+    "Niesporczak (Tardigrade)": {
+        "temp_range": (0, 150),  # K
+        "pressure_range": (0, 60),  # atm
+        "radiation_tolerance": 5000,  # Sv
+        "pH_range": (3, 10),
+        "cell_composition": {"water": 85, "protein": 10, "lipids": 3, "nucleic_acids": 1, "other": 1}
+    },
+    "Deinococcus radiodurans": {
+        "temp_range": (10, 45),  # K
+        "pressure_range": (1, 5),  # atm
+        "radiation_tolerance": 15000,  # Sv
+        "pH_range": (5, 11),
+        "cell_composition": {"water": 80, "protein": 12, "lipids": 4, "nucleic_acids": 2, "other": 2}
+    },
+    "Thermococcus litoralis": {
+        "temp_range": (55, 100),  # K
+        "pressure_range": (1, 20),  # atm
+        "radiation_tolerance": 200,  # Sv
+        "pH_range": (5, 9),
+        "cell_composition": {"water": 75, "protein": 15, "lipids": 5, "nucleic_acids": 3, "other": 2}
+    },
+    "Escherichia coli": {
+        "temp_range": (15, 45),  # K
+        "pressure_range": (1, 2),  # atm
+        "radiation_tolerance": 20,  # Sv
+        "pH_range": (4.5, 9),
+        "cell_composition": {"water": 70, "protein": 15, "lipids": 10, "nucleic_acids": 3, "other": 2}
+    },
+    "Homo sapiens (komórka)": {
+        "temp_range": (35, 42),  # K
+        "pressure_range": (0.8, 1.2),  # atm
+        "radiation_tolerance": 4,  # Sv
+        "pH_range": (7.35, 7.45),
+        "cell_composition": {"water": 65, "protein": 20, "lipids": 12, "nucleic_acids": 2, "other": 1}
+    },
+}
+
+
+def _parse_number(value):
+    if value is None or (isinstance(value, str) and value.strip() == ""):
+        return np.nan
+    return float(value)
+
+
+def _record_value(record, column):
+    """Wartość kolumny z rekordu płaskiego (temp_min, ...) lub zagnieżdżonego (temp_range, cell_composition)"""
+    if column in record:
+        return record[column]
+    if column == "ph_min" or column == "ph_max":
+        # Dopuszczalna pisownia pH_min / pH_max
+        alias = "pH" + column[2:]
+        if alias in record:
+            return record[alias]
+    for key, (lower, upper) in RANGE_COLUMNS.items():
+        if column in (lower, upper) and record.get(key) is not None:
+            return record[key][0 if column == lower else 1]
+    composition = record.get("cell_composition")
+    if isinstance(composition, dict):
+        return composition.get(column)
+    return None
+
+
+def _read_delimited(path):
+    """Wczytanie pliku CSV lub .dat (separator wykrywany automatycznie)"""
+    with open(path, encoding="utf-8", newline="") as data_file:
+        sample = data_file.read(4096)
+        data_file.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t ")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(data_file, dialect=dialect, skipinitialspace=True)
+        return list(reader)
+
+
+class OrganismStore:
+    """
+    Kolumnowy magazyn danych o tolerancjach organizmów
+
+    Każda granica tolerancji jest osobną tablicą NumPy (jeden wiersz =
+    jeden organizm/szczep). Magazyn udostępnia też interfejs słownika
+    nazwa -> dane w dawnym formacie BiologicalModule.organisms
+    (temp_range, pressure_range, radiation_tolerance, pH_range,
+    cell_composition), więc istniejący kod może go używać bez zmian.
+    """
+
+    def __init__(self, columns):
+        """
+        Parametry:
+        - columns: słownik nazwa kolumny -> tablica ('name', TOLERANCE_COLUMNS, COMPOSITION_COLUMNS)
+        """
+        self.name = np.asarray(columns["name"], dtype=str)
+        for column in TOLERANCE_COLUMNS + COMPOSITION_COLUMNS:
+            setattr(self, column, np.asarray(columns[column], dtype=np.float64))
+        self.index = {name: row for row, name in enumerate(self.name.tolist())}
+
+    @classmethod
+    def from_records(cls, records):
+        """Utworzenie magazynu z listy słowników (płaskich lub w formacie zagnieżdżonym)"""
+        columns = {name: [] for name in ("name",) + TOLERANCE_COLUMNS + COMPOSITION_COLUMNS}
+        for record in records:
+            columns["name"].append(str(record.get("name", "") or ""))
+            for column in TOLERANCE_COLUMNS + COMPOSITION_COLUMNS:
+                columns[column].append(_parse_number(_record_value(record, column)))
+        return cls(columns)
+
+    @classmethod
+    def from_organisms(cls, organisms):
+        """Utworzenie magazynu ze słownika nazwa -> dane (format BiologicalModule.organisms)"""
+        return cls.from_records(dict(properties, name=name) for name, properties in organisms.items())
+
+    @classmethod
+    def default(cls):
+        """Magazyn z wbudowanymi przykładowymi danymi"""
+        return cls.from_organisms(DEFAULT_ORGANISMS)
+
+    @classmethod
+    def load(cls, path, use_cache=True):
+        """
+        Wczytanie magazynu z pliku CSV, .dat (kolumny rozdzielone) lub JSON
+
+        Po pierwszym wczytaniu kolumny zapisywane są w binarnej pamięci
+        podręcznej (<plik>.cache.npz) powiązanej z czasem modyfikacji pliku.
+        """
+        cache_path = path + ".cache.npz"
+        source_mtime = os.path.getmtime(path)
+        column_names = ("name",) + TOLERANCE_COLUMNS + COMPOSITION_COLUMNS
+
+        if use_cache and os.path.exists(cache_path):
+            with np.load(cache_path) as cache:
+                if int(cache["cache_version"]) == CACHE_VERSION and float(cache["source_mtime"]) == source_mtime:
+                    return cls({name: cache[name] for name in column_names})
+
+        if os.path.splitext(path)[1].lower() == ".json":
+            with open(path, encoding="utf-8") as data_file:
+                data = json.load(data_file)
+            store = cls.from_organisms(data) if isinstance(data, dict) else cls.from_records(data)
+        else:
+            store = cls.from_records(_read_delimited(path))
+
+        if use_cache:
+            try:
+                np.savez(cache_path, cache_version=CACHE_VERSION, source_mtime=source_mtime,
+                         **{name: getattr(store, name) for name in column_names})
+            except OSError:
+                pass
+        return store
+
+    def __len__(self):
+        return len(self.name)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def keys(self):
+        """Nazwy organizmów (w kolejności wierszy)"""
+        return self.index.keys()
+
+    def __getitem__(self, name):
+        """Dane organizmu w formacie słownikowym"""
+        row = self.index[name]
+        return {
+            "temp_range": (float(self.temp_min[row]), float(self.temp_max[row])),
+            "pressure_range": (float(self.pressure_min[row]), float(self.pressure_max[row])),
+            "radiation_tolerance": float(self.radiation_tolerance[row]),
+            "pH_range": (float(self.ph_min[row]), float(self.ph_max[row])),
+            "cell_composition": {column: float(getattr(self, column)[row]) for column in COMPOSITION_COLUMNS},
+        }
+
+    def rows(self, names):
+        """Numery wierszy dla listy nazw (tablica)"""
+        return np.fromiter((self.index[name] for name in names), dtype=np.intp, count=len(names))
+
+    def ranges(self, key, names=None):
+        """Zakresy tolerancji (organizmy × 2) dla klucza 'temp_range', 'pressure_range' lub 'pH_range'"""
+        lower, upper = RANGE_COLUMNS[key]
+        ranges = np.column_stack([getattr(self, lower), getattr(self, upper)])
+        return ranges if names is None else ranges[self.rows(names)]
+
+    def tolerances(self, names=None):
+        """Tolerancje promieniowania (dla listy nazw lub wszystkich organizmów)"""
+        return self.radiation_tolerance if names is None else self.radiation_tolerance[self.rows(names)]
+
+
+class ToleranceIndex:
+    """
+    Indeks przedziałów tolerancji organizmów
+
+    Dla każdej osi (temperatura, ciśnienie, promieniowanie, pH) granice
+    dolne i górne są posortowane raz. Organizmy z dolną granicą <= a
+    tworzą prefiks porządku dolnych granic, a z górną granicą >= b -
+    sufiks porządku górnych granic; ich liczność daje np.searchsorted.
+    Zapytanie wybiera najmniej liczny z tych zbiorów kandydatów i tylko
+    jego sprawdza na pozostałych osiach, zamiast przeglądać wszystkie
+    organizmy.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lower = {}
+        self._upper = {}
+        for axis, (lower, upper) in AXIS_BOUNDS.items():
+            if lower is not None:
+                values = getattr(store, lower)
+                order = np.argsort(values, kind='stable')
+                self._lower[axis] = (values, order, values[order])
+            values = getattr(store, upper)
+            order = np.argsort(values, kind='stable')
+            self._upper[axis] = (values, order, values[order])
+
+    def survivors_in_box(self, box):
+        """
+        Organizmy przeżywające w całym prostopadłościanie warunków
+
+        Parametry:
+        - box: słownik oś -> (min, max); pominięte osie nie ograniczają wyniku
+
+        Zwraca posortowane numery wierszy magazynu
+        """
+        box = {axis: bounds for axis, bounds in box.items() if bounds is not None}
+        for axis in box:
+            if axis not in AXES:
+                raise KeyError(f"Nieznana oś: {axis}")
+
+        # Wybór najmniej licznego zbioru kandydatów (prefiks/sufiks posortowanych granic)
+        best = None
+        for axis, (low, high) in box.items():
+            if axis in self._lower:
+                _, order, sorted_values = self._lower[axis]
+                count = np.searchsorted(sorted_values, low, side='right')
+                if best is None or count < best[0]:
+                    best = (count, order[:count])
+            _, order, sorted_values = self._upper[axis]
+            start = np.searchsorted(sorted_values, high, side='left')
+            if best is None or len(order) - start < best[0]:
+                best = (len(order) - start, order[start:])
+
+        if best is None:
+            return np.arange(len(self.store))
+
+        # Sprawdzenie kandydatów na wszystkich osiach
+        candidates = best[1]
+        mask = np.ones(len(candidates), dtype=bool)
+        for axis, (low, high) in box.items():
+            if axis in self._lower:
+                mask &= self._lower[axis][0][candidates] <= low
+            mask &= self._upper[axis][0][candidates] >= high
+        return np.sort(candidates[mask])
+
+    def survivors(self, temperature=None, pressure=None, radiation=None, ph=None):
+        """Organizmy przeżywające w punkcie (T, P, promieniowanie, pH); None = parametr dowolny"""
+        point = {TEMPERATURE: temperature, PRESSURE: pressure, RADIATION: radiation, PH: ph}
+        return self.survivors_in_box({axis: (value, value) for axis, value in point.items() if value is not None})
+
+    def viability(self, temperature, pressure, radiation, ph):
+        """
+        Przeżywalność wszystkich organizmów (%) w punktach warunków
+
+        Iloczyn czynników tolerancji jak na mapie habitabilności, liczony
+        na tablicach granic indeksu (bez przechodzenia po organizmach).
+        Parametry są skalarami lub tablicami 1-D tej samej długości.
+
+        Zwraca tablicę organizmy × punkty
+        """
+        point = dict(zip(AXES, np.broadcast_arrays(*[np.atleast_1d(np.asarray(value, dtype=np.float64))
+                                                     for value in (temperature, pressure, radiation, ph)])))
+        viability = np.full((len(self.store), len(point[TEMPERATURE])), 100.0)
+        for axis, values in point.items():
+            upper = self._upper[axis][0]
+            if axis in self._lower:
+                lower = self._lower[axis][0]
+                # Krzywa Gaussa o środku w połowie zakresu i szerokości (max - min) / 4
+                widths = np.maximum((upper - lower) / 4, np.finfo(np.float64).tiny)
+                viability *= tolerance_factors(values, (lower + upper) / 2, widths)
+            else:
+                viability *= radiation_factors(values, upper)
+        return viability
+
+    def names(self, rows):
+        """Nazwy organizmów dla numerów wierszy"""
+        return self.store.name[rows].tolist()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from modules.climate_model import sample_temperatures
+from modules.simulation_thread import habitability_model
+
+# Różnica temperatur (K) między równikiem a biegunami
+EQUATOR_POLE_CONTRAST = 40.0
+
+# Nadwyżka temperatury (K) w punkcie podgwiazdowym (długość 0°) względem strony nocnej
+SUBSTELLAR_CONTRAST = 10.0
+
+# Promień planety w scenie
+PLANET_RADIUS = 10
+
+# Warunki domyślne pola habitabilności powierzchni
+DEFAULT_SURFACE_CONDITIONS = {
+    'temperature': 300,
+    'pressure': 1,
+    'radiation': 1,
+    'ph': 7.0,
+    'oxygen': 21,
+    'nitrogen': 78,
+    'co2': 0
+}
+
+# Rozmiar puli znaczników stref krytycznych (największa liczba stref wyświetlanych naraz)
+MAX_CRITICAL_ZONES = 3
+
+# Progi średniego indeksu strefy: bezpieczna / umiarkowana / niebezpieczna
+SAFE_ZONE_THRESHOLD = 80
+HAZARD_THRESHOLD = 65
+
+# Zakres promieni znaczników stref (jednostki sceny)
+ZONE_MARKER_RADIUS_RANGE = (1.0, 4.0)
+
+# Węzły skali barw habitabilności: (indeks, (r, g, b))
+HABITABILITY_COLOR_STOPS = (
+    (0, (0.45, 0.12, 0.08)),   # Niehabitabilna (brązowoczerwona)
+    (35, (0.80, 0.45, 0.15)),  # Niska (pomarańczowa)
+    (60, (0.85, 0.75, 0.30)),  # Średnia (ochra)
+    (100, (0.15, 0.65, 0.25))  # Wysoka (zielona)
+)
+
+# Liczba wpisów tablicy barw
+COLOR_LUT_SIZE = 256
+
+
+def _color_lut():
+    """Tablica barw (COLOR_LUT_SIZE × 4, uint8) dla indeksu 0-100"""
+    stops = np.array([stop for stop, _ in HABITABILITY_COLOR_STOPS], dtype=float)
+    colors = np.array([color for _, color in HABITABILITY_COLOR_STOPS], dtype=float)
+    index = np.linspace(0, 100, COLOR_LUT_SIZE)
+    lut = np.empty((COLOR_LUT_SIZE, 4), dtype=np.uint8)
+    for channel in range(3):
+        lut[:, channel] = np.round(255 * np.interp(index, stops, colors[:, channel]))
+    lut[:, 3] = 255
+    lut.setflags(write=False)
+    return lut
+
+
+HABITABILITY_LUT = _color_lut()
+
+
+def vertex_coordinates(vertices):
+    """
+    Szerokość i długość geograficzna (radiany) wierzchołków sfery jednostkowej
+
+    Zwraca (szerokości, długości) - biegun północny leży na osi Z
+    """
+    vertices = np.asarray(vertices)
+    latitudes = np.arcsin(np.clip(vertices[:, 2], -1, 1))
+    longitudes = np.arctan2(vertices[:, 1], vertices[:, 0])
+    return latitudes, longitudes
+
+
+def surface_temperature(latitudes, longitudes, temperature):
+    """
+    Temperatura lokalna powierzchni dla średniej temperatury planety
+
+    Człon równik-biegun (cos² szerokości - 2/3) i człon podgwiazdowy
+    (cos długości · cos szerokości) mają zerową średnią po powierzchni sfery,
+    więc średnia temperatura planety pozostaje równa podanej.
+    """
+    cos_latitude = np.cos(latitudes)
+    return (temperature +
+            EQUATOR_POLE_CONTRAST * (cos_latitude**2 - 2 / 3) +
+            SUBSTELLAR_CONTRAST * np.cos(longitudes) * cos_latitude)
+
+
+def habitability_field(latitudes, longitudes, conditions, temperatures=None):
+    """
+    Pole indeksu habitabilności (0-100) na powierzchni planety
+
+    Parametry:
+    - latitudes, longitudes: tablice współrzędnych (radiany)
+    - conditions: słownik warunków (klucze jak w DEFAULT_SURFACE_CONDITIONS,
+      temperature to średnia temperatura planety); wartości mogą być
+      tablicami rozgłaszanymi ze współrzędnymi (np. kolumny klatek × 1)
+    - temperatures: temperatury siatki modelu klimatu (pasy szerokości ×
+      pasy długości, opcjonalnie z osią klatek); zastępują rozkład liczony
+      ze średniej temperatury
+
+    Zwraca tablicę indeksów (float32) o kształcie rozgłoszonych współrzędnych i warunków
+    """
+    conditions = {**DEFAULT_SURFACE_CONDITIONS, **conditions}
+    if temperatures is None:
+        temperature = surface_temperature(latitudes, longitudes, conditions['temperature'])
+    else:
+        temperature = sample_temperatures(temperatures, latitudes, longitudes)
+    field = habitability_model(
+        temperature, conditions['pressure'], conditions['radiation'], conditions['ph'],
+        conditions['oxygen'], conditions['nitrogen'], conditions['co2']
+    )
+    shape = np.broadcast_shapes(np.shape(field), np.shape(latitudes))
+    return np.broadcast_to(field, shape).astype(np.float32)
+
+
+def habitability_colors(values):
+    """Kolory RGBA (N × 4, uint8) indeksów habitabilności z tablicy barw"""
+    index = np.clip(np.asarray(values) * ((COLOR_LUT_SIZE - 1) / 100), 0, COLOR_LUT_SIZE - 1)
+    return HABITABILITY_LUT[np.round(index).astype(np.intp)]
+
+
+def surface_colors(vertices, conditions, temperatures=None):
+    """
+    Kolory wierzchołków siatki planety z pola habitabilności
+
+    Parametry:
+    - vertices: wierzchołki sfery jednostkowej (N × 3)
+    - conditions: słownik warunków (jak w habitability_field)
+    - temperatures: opcjonalne temperatury siatki modelu klimatu
+
+    Zwraca tablicę kolorów (N × 4, uint8) - 4 bajty na wierzchołek
+    """
+    latitudes, longitudes = vertex_coordinates(vertices)
+    return habitability_colors(habitability_field(latitudes, longitudes, conditions, temperatures))
+
+
+def atmosphere_appearance(oxygen, nitrogen, co2, pressure):
+    """
+    Kolor i promień atmosfery zależne od składu i ciśnienia
+
+    Parametry mogą być tablicami (np. kolumny zapisu symulacji).
+
+    Zwraca (kolory RGBA w ostatniej osi, promienie)
+    """
+    # Kolor atmosfery zależny od składu
+    r = 0.6 + 0.4 * (np.asarray(co2, dtype=float) / 100)  # Więcej CO2 = bardziej czerwona
+    g = 0.6 + 0.4 * (np.asarray(oxygen, dtype=float) / 100)  # Więcej tlenu = bardziej zielona
+    b = 0.6 + 0.4 * (np.asarray(nitrogen, dtype=float) / 100)  # Więcej azotu = bardziej niebieska
+    r, g, b = np.broadcast_arrays(r, g, b)
+    colors = np.stack([r, g, b, np.full_like(r, 0.3)], axis=-1)
+    
+    # Rozmiar atmosfery zależny od ciśnienia (większe ciśnienie = większa atmosfera)
+    radii = 12 + np.asarray(pressure, dtype=float) / 50
+    return colors, radii
+
+
+def zone_marker_states(zones, limit=MAX_CRITICAL_ZONES):
+    """
+    Stany znaczników największych stref: (położenie, promień, kolor, etykieta)
+    
+    Położenia i promienie są zaokrąglone, więc drobne zmiany stref nie
+    zmieniają stanu znacznika. Kolor zależy od średniego indeksu strefy.
+    """
+    states = []
+    min_radius, max_radius = ZONE_MARKER_RADIUS_RANGE
+    for i in range(min(len(zones), limit)):
+        area = zones.areas[i]
+        pos = tuple(round(float(value), 2) for value in zones.centroids[i] * PLANET_RADIUS)
+        radius = round(float(np.clip(PLANET_RADIUS * np.sqrt(area), min_radius, max_radius)), 2)
+        if zones.mean_values[i] >= SAFE_ZONE_THRESHOLD:
+            color, name = (0.0, 0.8, 0.0, 0.7), "Strefa bezpieczna"
+        elif zones.mean_values[i] >= HAZARD_THRESHOLD:
+            color, name = (0.8, 0.8, 0.0, 0.7), "Strefa umiarkowana"
+        else:
+            color, name = (0.8, 0.0, 0.0, 0.7), "Strefa niebezpieczna"
+        states.append((pos, radius, color, f"{name} ({area * 100:.1f}% pow.)"))
+    return states
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import QThread, pyqtSignal
+import numpy as np
+
+from modules.habitability_map import UNION
+
+# Co który punkt siatki liczony jest podgląd zgrubny
+COARSE_STEP = 8
+
+# Rozmiar kafelka dokładnego przeliczenia (punkty na bok)
+TILE_SIZE = 128
+
+# Mapy o mniejszej liczbie elementów (organizmy × punkty) liczone są od razu w całości
+PROGRESSIVE_MIN_ELEMENTS = 2 ** 20
+
+# Maksymalna liczba elementów (organizmy × punkty) podglądu zgrubnego
+COARSE_MAX_ELEMENTS = 2 ** 18
+
+
+def coarse_step(n_points, n_organisms=1):
+    """Krok podglądu zgrubnego: co najmniej COARSE_STEP, większy dla wielu organizmów"""
+    return max(COARSE_STEP, int(np.ceil(np.sqrt(n_points * n_organisms / COARSE_MAX_ELEMENTS))))
+
+
+def coarse_map(envelope, x_axis, y_axis, fixed, organism=None, mode=UNION, step=COARSE_STEP):
+    """
+    Podgląd zgrubny mapy w pełnej rozdzielczości
+
+    Liczony jest co step-ty punkt każdej osi, a wartości powielane są
+    na sąsiednie punkty (najbliższy sąsiad).
+
+    Zwraca (mapa pełnej rozdzielczości, mapa zgrubna)
+    """
+    n_rows = len(envelope.grids[y_axis])
+    n_columns = len(envelope.grids[x_axis])
+    sampling = slice(None, None, step)
+    coarse = envelope.slice(x_axis, y_axis, fixed, organism=organism, mode=mode, rows=sampling, columns=sampling)
+    preview = np.repeat(np.repeat(coarse, step, axis=0), step, axis=1)[:n_rows, :n_columns]
+    return np.ascontiguousarray(preview), coarse
+
+
+def map_preview(envelope, x_axis, y_axis, fixed, organism=None, mode=UNION):
+    """
+    Mapa do natychmiastowego wyświetlenia
+
+    Małe mapy (do PROGRESSIVE_MIN_ELEMENTS) liczone są od razu dokładnie,
+    dla dużych zwracany jest podgląd zgrubny do dalszego przeliczania.
+
+    Zwraca (mapa, mapa zgrubna lub None dla mapy dokładnej, krok podglądu)
+    """
+    n_organisms = 1 if organism is not None else len(envelope)
+    n_points = len(envelope.grids[x_axis]) * len(envelope.grids[y_axis])
+    if n_points * n_organisms <= PROGRESSIVE_MIN_ELEMENTS:
+        return envelope.slice(x_axis, y_axis, fixed, organism=organism, mode=mode), None, 1
+    step = coarse_step(n_points, n_organisms)
+    preview, coarse = coarse_map(envelope, x_axis, y_axis, fixed, organism=organism, mode=mode, step=step)
+    return preview, coarse, step
+
+
+def tile_order(coarse, shape, step=COARSE_STEP, tile_size=TILE_SIZE):
+    """
+    Kolejność kafelków do dokładnego przeliczenia
+
+    Kafelki z największym gradientem podglądu zgrubnego (granice strefy
+    habitabilności) liczone są najpierw.
+
+    Zwraca listę (wiersz początkowy, kolumna początkowa) w kolejności przeliczania
+    """
+    if min(coarse.shape) > 1:
+        gradient_rows, gradient_columns = np.gradient(coarse.astype(np.float64))
+        gradient = np.hypot(gradient_rows, gradient_columns)
+    else:
+        gradient = np.zeros(coarse.shape)
+
+    n_rows, n_columns = shape
+    tiles = []
+    priorities = []
+    for row in range(0, n_rows, tile_size):
+        for column in range(0, n_columns, tile_size):
+            # Komórki podglądu zgrubnego pokrywające kafelek (z marginesem jednej komórki)
+            block = gradient[max(row // step - 1, 0):(row + tile_size) // step + 2,
+                             max(column // step - 1, 0):(column + tile_size) // step + 2]
+            tiles.append((row, column))
+            priorities.append(block.max() if block.size else 0.0)
+    order = np.argsort(priorities, kind='stable')[::-1]
+    return [tiles[position] for position in order]
+
+
+class MapRefinementThread(QThread):
+    """Wątek dokładnego przeliczania mapy habitabilności kafelek po kafelku"""
+
+    # Sygnały do komunikacji z głównym wątkiem
+    tile_ready = pyqtSignal(int, int, int, object)  # generacja, wiersz, kolumna, wartości kafelka
+    refinement_finished = pyqtSignal(int)  # generacja (mapa kompletna)
+
+    def __init__(self, generation, envelope, x_axis, y_axis, fixed, coarse, organism=None, mode=UNION,
+                 step=COARSE_STEP, tile_size=TILE_SIZE):
+        """
+        Parametry:
+        - generation: numer mapy (sygnały nieaktualnych map są pomijane)
+        - envelope: ToleranceEnvelope
+        - x_axis, y_axis, fixed, organism, mode: parametry przekroju (jak ToleranceEnvelope.slice)
+        - coarse: podgląd zgrubny (do ustalenia kolejności kafelków)
+        """
+        super().__init__()
+        self.generation = generation
+        self.envelope = envelope
+        self.x_axis = x_axis
+        self.y_axis = y_axis
+        self.fixed = dict(fixed)
+        self.organism = organism
+        self.mode = mode
+        self.shape = (len(envelope.grids[y_axis]), len(envelope.grids[x_axis]))
+        self.tiles = tile_order(coarse, self.shape, step, tile_size)
+        self.tile_size = tile_size
+        self.is_running = True
+
+    def run(self):
+        """Przeliczanie kafelków w kolejności malejącego gradientu"""
+        for row, column in self.tiles:
+            if not self.is_running:
+                return
+            tile = self.envelope.slice(self.x_axis, self.y_axis, self.fixed, organism=self.organism, mode=self.mode,
+                                       rows=slice(row, row + self.tile_size),
+                                       columns=slice(column, column + self.tile_size))
+            self.tile_ready.emit(self.generation, row, column, tile)
+        if self.is_running:
+            self.refinement_finished.emit(self.generation)
+
+    def cancel(self):
+        """Przerwanie przeliczania (wątek kończy się po bieżącym kafelku)"""
+        self.is_running = False
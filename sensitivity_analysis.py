@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import traceback
+from PyQt5.QtCore import QThread, pyqtSignal
+import numpy as np
+from scipy.stats import qmc
+
+from modules.simulation_thread import habitability_model
+
+# Parametry wejściowe modelu habitabilności (kolejność kolumn macierzy próbek)
+INPUTS = ("temperature", "pressure", "radiation", "ph", "oxygen", "nitrogen", "co2")
+
+# Nazwy parametrów do wyświetlenia
+INPUT_LABELS = {
+    "temperature": "Temperatura",
+    "pressure": "Ciśnienie",
+    "radiation": "Promieniowanie",
+    "ph": "pH",
+    "oxygen": "Tlen (O₂)",
+    "nitrogen": "Azot (N₂)",
+    "co2": "CO₂",
+}
+
+# Dopuszczalne zakresy parametrów (jak w panelu symulacji)
+PARAMETER_LIMITS = {
+    "temperature": (0, 5000),
+    "pressure": (0, 1000),
+    "radiation": (0, 10000),
+    "ph": (0, 14),
+    "oxygen": (0, 100),
+    "nitrogen": (0, 100),
+    "co2": (0, 100),
+}
+
+# Minimalna połowa szerokości przedziału próbkowania wokół bieżącej wartości
+MIN_HALF_WIDTH = {
+    "temperature": 10,
+    "pressure": 0.1,
+    "radiation": 0.5,
+    "ph": 0.5,
+    "oxygen": 1,
+    "nitrogen": 1,
+    "co2": 0.1,
+}
+
+# Domyślna względna szerokość reżimu (±20% bieżącej wartości)
+DEFAULT_RELATIVE_SPAN = 0.2
+
+# Domyślna liczba wierszy macierzy bazowych A i B (potęga dwójki dla ciągu Sobola)
+DEFAULT_BASE_SAMPLES = 2 ** 13
+
+# Domyślna liczba prób bootstrapowych
+DEFAULT_BOOTSTRAP = 500
+
+# Liczba wierszy próbek w jednej porcji obliczeń modelu
+BATCH_ROWS = 2 ** 16
+
+# Liczba prób bootstrapowych liczonych jednocześnie (ograniczenie pamięci)
+BOOTSTRAP_CHUNK = 64
+
+
+def regime_bounds(params, relative_span=DEFAULT_RELATIVE_SPAN, inputs=INPUTS):
+    """
+    Przedziały próbkowania wokół bieżących parametrów symulacji
+
+    Każdy parametr zmienia się o ±relative_span swojej wartości (co
+    najmniej o MIN_HALF_WIDTH), w granicach PARAMETER_LIMITS.
+
+    Zwraca tablicę (parametry × 2) z dolnymi i górnymi granicami
+    """
+    bounds = np.empty((len(inputs), 2))
+    for position, name in enumerate(inputs):
+        value = float(params[name])
+        half_width = max(abs(value) * relative_span, MIN_HALF_WIDTH[name])
+        low, high = PARAMETER_LIMITS[name]
+        bounds[position] = (max(value - half_width, low), min(value + half_width, high))
+    return bounds
+
+
+def saltelli_matrices(bounds, n_base=DEFAULT_BASE_SAMPLES, seed=None):
+    """
+    Macierze bazowe A i B schematu Saltellego
+
+    Obie pochodzą z jednego (mieszanego) ciągu Sobola o wymiarze 2k,
+    więc są od siebie niezależne. Liczba wierszy zaokrąglana jest w górę
+    do potęgi dwójki.
+
+    Zwraca (A, B) - tablice (n_base × k) w jednostkach parametrów
+    """
+    bounds = np.asarray(bounds, dtype=np.float64)
+    n_inputs = len(bounds)
+    sampler = qmc.Sobol(d=2 * n_inputs, scramble=True, seed=seed)
+    unit = sampler.random_base2(m=max(int(np.ceil(np.log2(n_base))), 1))
+    samples = bounds[:, 0] + unit.reshape(len(unit), 2, n_inputs) * (bounds[:, 1] - bounds[:, 0])
+    return samples[:, 0], samples[:, 1]
+
+
+def saltelli_design(A, B):
+    """
+    Pełny zestaw próbek do oceny modelu: [A; B; AB_1; ...; AB_k]
+
+    AB_i to macierz A z i-tą kolumną wziętą z B. Zwraca tablicę
+    (n × (k + 2)) × k.
+    """
+    n_rows, n_inputs = A.shape
+    design = np.empty((n_inputs + 2, n_rows, n_inputs))
+    design[0] = A
+    design[1] = B
+    design[2:] = A
+    columns = np.arange(n_inputs)
+    design[2 + columns, :, columns] = B.T
+    return design.reshape(-1, n_inputs)
+
+
+def evaluate_model(samples):
+    """Indeks habitabilności dla wierszy próbek (kolumny w kolejności INPUTS)"""
+    return habitability_model(*samples.T)
+
+
+def evaluate_batches(samples, batch_rows=BATCH_ROWS):
+    """
+    Ocena modelu w dużych porcjach wektorowych (ograniczenie pamięci pośrednich tablic)
+
+    Obliczenia odbywają się w bieżącym procesie: model jest wektorowy,
+    a analiza uruchamiana jest z wątku QThread, z którego nie należy
+    tworzyć procesów przez fork.
+    """
+    n_batches = max(int(np.ceil(len(samples) / batch_rows)), 1)
+    return np.concatenate([evaluate_model(batch) for batch in np.array_split(samples, n_batches)])
+
+
+def sobol_estimates(f_A, f_B, f_AB, weights=None):
+    """
+    Estymatory indeksów Sobola z wartości modelu
+
+    Indeks pierwszego rzędu - estymator Saltellego (2010), indeks
+    całkowity - estymator Jansena. Oba są średnimi wielkości liczonych
+    dla każdego wiersza, więc próba bootstrapowa to tylko wagi wierszy
+    (liczby wylosowań) - wartości modelu nie są liczone ponownie.
+
+    Parametry:
+    - f_A, f_B: wartości modelu dla A i B (n)
+    - f_AB: wartości modelu dla AB_i (k × n)
+    - weights: liczby wylosowań wierszy (próby × n); None = każdy wiersz raz
+
+    Zwraca (pierwszego rzędu, całkowite) - tablice (próby × k) lub (k) dla weights=None
+    """
+    # Wartości względem średniej (stabilniejsza wariancja E[x²] - E[x]²)
+    center = 0.5 * (f_A.mean() + f_B.mean())
+    a = f_A - center
+    b = f_B - center
+    ab = f_AB - center
+    first_terms = b * (ab - a)
+    total_terms = 0.5 * (a - ab) ** 2
+
+    single = weights is None
+    if single:
+        weights = np.ones((1, len(a)))
+    counts = weights.sum(axis=1)
+    mean = weights @ (a + b) / (2 * counts)
+    variance = weights @ (a ** 2 + b ** 2) / (2 * counts) - mean ** 2
+    scale = np.divide(1.0, variance * counts, out=np.full_like(variance, np.nan), where=variance > 0)
+
+    first = (weights @ first_terms.T) * scale[:, np.newaxis]
+    total = (weights @ total_terms.T) * scale[:, np.newaxis]
+    if single:
+        return first[0], total[0]
+    return first, total
+
+
+class SensitivityResult:
+    """Wynik analizy wrażliwości: indeksy Sobola z przedziałami ufności"""
+
+    def __init__(self, inputs, bounds, first_order, total, first_order_samples, total_samples,
+                 n_base, n_evaluations, mean, variance, level):
+        self.inputs = tuple(inputs)
+        self.bounds = bounds
+        self.first_order = first_order
+        self.total = total
+        self.n_base = n_base
+        self.n_evaluations = n_evaluations
+        self.mean = mean
+        self.variance = variance
+        self.level = level
+
+        # Przedziały percentylowe z prób bootstrapowych (k × 2)
+        percentiles = [50 * (1 - level), 50 * (1 + level)]
+        if len(first_order_samples):
+            self.first_order_interval = np.nanpercentile(first_order_samples, percentiles, axis=0).T
+            self.total_interval = np.nanpercentile(total_samples, percentiles, axis=0).T
+        else:
+            self.first_order_interval = np.column_stack([first_order, first_order])
+            self.total_interval = np.column_stack([total, total])
+
+    def ranking(self):
+        """Parametry uporządkowane malejąco według indeksu całkowitego"""
+        order = np.argsort(-np.nan_to_num(self.total, nan=-np.inf), kind='stable')
+        return [self.inputs[position] for position in order]
+
+    def summary_lines(self):
+        """Opis wyników (jedna linia na parametr, od najważniejszego)"""
+        lines = []
+        for name in self.ranking():
+            position = self.inputs.index(name)
+            low, high = self.first_order_interval[position]
+            total_low, total_high = self.total_interval[position]
+            lines.append(
+                f"{INPUT_LABELS.get(name, name)}: S1 = {self.first_order[position]:.3f} [{low:.3f}, {high:.3f}], "
+                f"ST = {self.total[position]:.3f} [{total_low:.3f}, {total_high:.3f}]")
+        return lines
+
+
+def sobol_analysis(bounds, n_base=DEFAULT_BASE_SAMPLES, n_bootstrap=DEFAULT_BOOTSTRAP, level=0.95, seed=None,
+                   inputs=INPUTS):
+    """
+    Globalna analiza wrażliwości indeksu habitabilności (indeksy Sobola)
+
+    Model oceniany jest raz dla n × (k + 2) próbek; przedziały ufności
+    powstają z losowania wierszy tych samych macierzy (bez ponownych
+    obliczeń modelu).
+
+    Parametry:
+    - bounds: przedziały parametrów (k × 2), np. z regime_bounds
+    - n_base: liczba wierszy macierzy A i B
+    - n_bootstrap: liczba prób bootstrapowych (0 = bez przedziałów)
+    - level: poziom ufności przedziałów
+
+    Zwraca SensitivityResult
+    """
+    rng = np.random.default_rng(seed)
+    A, B = saltelli_matrices(bounds, n_base, seed=rng)
+    n_rows, n_inputs = A.shape
+
+    values = evaluate_batches(saltelli_design(A, B)).reshape(n_inputs + 2, n_rows)
+    f_A, f_B, f_AB = values[0], values[1], values[2:]
+    first_order, total = sobol_estimates(f_A, f_B, f_AB)
+
+    first_samples = []
+    total_samples = []
+    for start in range(0, n_bootstrap, BOOTSTRAP_CHUNK):
+        weights = rng.multinomial(n_rows, np.full(n_rows, 1.0 / n_rows),
+                                  size=min(BOOTSTRAP_CHUNK, n_bootstrap - start)).astype(np.float64)
+        first, total_chunk = sobol_estimates(f_A, f_B, f_AB, weights)
+        first_samples.append(first)
+        total_samples.append(total_chunk)
+    first_samples = np.concatenate(first_samples) if first_samples else np.empty((0, n_inputs))
+    total_samples = np.concatenate(total_samples) if total_samples else np.empty((0, n_inputs))
+
+    f_base = np.concatenate([f_A, f_B])
+    return SensitivityResult(inputs, np.asarray(bounds), first_order, total, first_samples, total_samples,
+                             n_rows, values.size, f_base.mean(), f_base.var(), level)
+
+
+class SensitivityThread(QThread):
+    """Wątek analizy wrażliwości indeksu habitabilności"""
+
+    # Sygnały do komunikacji z głównym wątkiem
+    update_status = pyqtSignal(str)  # status analizy
+    analysis_finished = pyqtSignal(object)  # SensitivityResult
+    analysis_failed = pyqtSignal(str)  # opis błędu
+
+    def __init__(self, params, relative_span=DEFAULT_RELATIVE_SPAN, n_base=DEFAULT_BASE_SAMPLES,
+                 n_bootstrap=DEFAULT_BOOTSTRAP):
+        """
+        Parametry:
+        - params: słownik parametrów symulacji (reżim analizy)
+        - relative_span: względna szerokość przedziałów wokół bieżących wartości
+        """
+        super().__init__()
+        self.params = dict(params)
+        self.relative_span = relative_span
+        self.n_base = n_base
+        self.n_bootstrap = n_bootstrap
+
+    def run(self):
+        """Główna metoda wątku analizy"""
+        try:
+            bounds = regime_bounds(self.params, self.relative_span)
+            self.update_status.emit(
+                f"Analiza wrażliwości: {self.n_base * (len(INPUTS) + 2)} ocen modelu, "
+                f"{self.n_bootstrap} prób bootstrapowych...")
+            result = sobol_analysis(bounds, self.n_base, self.n_bootstrap)
+        except Exception:
+            self.analysis_failed.emit(traceback.format_exc())
+            return
+        self.analysis_finished.emit(result)
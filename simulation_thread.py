@@ -6,6 +6,75 @@ import numpy as np
 import time
 import math
 
+from modules.climate_model import ClimateModel, star_luminosity
+
+# Wagi czynników indeksu habitabilności
+HABITABILITY_WEIGHTS = {
+    'temperature': 0.3,
+    'pressure': 0.2,
+    'radiation': 0.15,
+    'atmosphere': 0.25,
+    'ph': 0.1
+}
+
+# Czas (lata) modelu klimatu przypadający na jeden krok symulacji
+CLIMATE_YEARS_PER_STEP = 1.0
+
+
+def temperature_factor(temperature):
+    """Czynnik temperatury (Gauss z centrum w 285K); działa na skalarach i tablicach"""
+    return np.exp(-0.5 * ((np.asarray(temperature, dtype=float) - 285) / 50)**2)
+
+
+def pressure_factor(pressure):
+    """Czynnik ciśnienia (funkcja logistyczna log10 ciśnienia)"""
+    return 1 / (1 + np.exp(-2 * (np.log10(np.asarray(pressure, dtype=float) + 0.01) + 0.3)))
+
+
+def radiation_factor(radiation):
+    """Czynnik promieniowania (funkcja wykładnicza malejąca)"""
+    return np.exp(-0.1 * np.asarray(radiation, dtype=float))
+
+
+def atmosphere_factor(oxygen, nitrogen, co2):
+    """Czynnik składu atmosfery (0.1 dla składu sumującego się daleko od 100%)"""
+    oxygen = np.asarray(oxygen, dtype=float)
+    nitrogen = np.asarray(nitrogen, dtype=float)
+    co2 = np.asarray(co2, dtype=float)
+    
+    oxygen_factor = np.exp(-0.5 * ((oxygen - 20) / 15)**2)
+    nitrogen_factor = np.exp(-0.5 * ((nitrogen - 75) / 10)**2)
+    
+    # CO2 ma logarytmiczną skalę optymalności (brak CO2 -> 0.1)
+    with np.errstate(divide='ignore'):
+        co2_log = np.log10(np.where(co2 > 0, co2, 1.0))
+    co2_factor = np.where(co2 > 0, np.exp(-0.5 * ((co2_log - np.log10(0.3)) / 1)**2), 0.1)
+    
+    factor = 0.4 * oxygen_factor + 0.4 * nitrogen_factor + 0.2 * co2_factor
+    return np.where(np.abs(oxygen + nitrogen + co2 - 100) > 5, 0.1, factor)
+
+
+def ph_factor(ph):
+    """Czynnik pH (Gauss z centrum w pH 7)"""
+    return np.exp(-0.5 * ((np.asarray(ph, dtype=float) - 7) / 1.5)**2)
+
+
+def habitability_model(temperature, pressure, radiation, ph, oxygen, nitrogen, co2, weights=HABITABILITY_WEIGHTS):
+    """
+    Deterministyczny indeks habitabilności (0-100) jako ważona suma czynników
+    
+    Wszystkie parametry mogą być tablicami (obliczenia wektorowe).
+    """
+    index = (
+        weights['temperature'] * temperature_factor(temperature) +
+        weights['pressure'] * pressure_factor(pressure) +
+        weights['radiation'] * radiation_factor(radiation) +
+        weights['atmosphere'] * atmosphere_factor(oxygen, nitrogen, co2) +
+        weights['ph'] * ph_factor(ph)
+    ) * 100
+    return np.clip(index, 0, 100)
+
+
 class SimulationThread(QThread):
     """Wątek symulacji do analizy habitabilności planet"""
     
@@ -45,6 +114,12 @@ class SimulationThread(QThread):
         include_evolution = self.params.get('include_evolution', True)
         include_biology = self.params.get('include_biology', True)
         planet_name = self.params.get('planet_name', "Przykładowa planeta")
+        star_type = self.params.get('star_type', "G")
+        star_distance = self.params.get('star_distance', 1.0)
+        
+        # Model bilansu energetycznego w pasach szerokości (temperatura z panelu jako stan początkowy)
+        climate = ClimateModel(luminosity=star_luminosity(star_type), distance=star_distance,
+                               initial_temperature=temperature)
         
         # Inicjalizacja zmiennych symulacji
         start_time = time.time()
@@ -111,31 +186,19 @@ class SimulationThread(QThread):
                 else:
                     results['bio_status'] = "Analiza biologiczna zakończona"
             
-            # Obliczanie indeksu habitabilności na podstawie parametrów
-            # Rzeczywiste obliczenia naukowe
-            temp_factor = self.calculate_temperature_factor(temperature)
-            pressure_factor = self.calculate_pressure_factor(pressure)
-            radiation_factor = self.calculate_radiation_factor(radiation)
-            atmosphere_factor = self.calculate_atmosphere_factor(oxygen, nitrogen, co2)
-            ph_factor = self.calculate_ph_factor(ph)
-            
-            # Wagi czynników
-            weights = {
-                'temperature': 0.3,
-                'pressure': 0.2,
-                'radiation': 0.15,
-                'atmosphere': 0.25,
-                'ph': 0.1
+            # Krok modelu klimatu - temperatury pasów szerokości
+            band_temperatures = climate.step(CLIMATE_YEARS_PER_STEP)
+            results['temperature'] = round(climate.mean_temperature(), 1)
+            results['climate'] = {
+                'latitudes': climate.latitudes,
+                'temperatures': band_temperatures
             }
             
-            # Obliczenie indeksu habitabilności jako ważonej sumy czynników
-            habitability_index = (
-                weights['temperature'] * temp_factor +
-                weights['pressure'] * pressure_factor +
-                weights['radiation'] * radiation_factor +
-                weights['atmosphere'] * atmosphere_factor +
-                weights['ph'] * ph_factor
-            ) * 100
+            # Obliczanie indeksu habitabilności na podstawie parametrów
+            # (ważona suma czynników, wagi w HABITABILITY_WEIGHTS) jako średnia
+            # po pasach klimatu (pasy równopolowe, więc średnia zwykła)
+            habitability_index = float(np.mean(habitability_model(
+                band_temperatures, pressure, radiation, ph, oxygen, nitrogen, co2)))
             
             # Dodanie losowych fluktuacji dla realizmu (±5%)
             habitability_index += np.random.normal(0, 2)
@@ -179,69 +242,6 @@ class SimulationThread(QThread):
         """Zatrzymanie symulacji"""
         self.is_running = False
         
-    def calculate_temperature_factor(self, temperature):
-        """
-        Obliczenie czynnika temperatury dla habitabilności
-        
-        Optymalny zakres: 260-310K (dla życia opartego na wodzie)
-        """
-        # Funkcja Gaussa z centrum w 285K (optymalna temperatura)
-        return np.exp(-0.5 * ((temperature - 285) / 50)**2)
-    
-    def calculate_pressure_factor(self, pressure):
-        """
-        Obliczenie czynnika ciśnienia dla habitabilności
-        
-        Optymalny zakres: 0.5-5 atm
-        """
-        # Funkcja logistyczna dla ciśnienia
-        return 1 / (1 + np.exp(-2 * (np.log10(pressure + 0.01) + 0.3)))
-    
-    def calculate_radiation_factor(self, radiation):
-        """
-        Obliczenie czynnika promieniowania dla habitabilności
-        
-        Optymalny zakres: <10 Sv/h
-        """
-        # Funkcja wykładnicza malejąca
-        return np.exp(-0.1 * radiation)
-    
-    def calculate_atmosphere_factor(self, oxygen, nitrogen, co2):
-        """
-        Obliczenie czynnika atmosfery dla habitabilności
-        
-        Optymalne składy:
-        - Tlen: 10-30%
-        - Azot: 65-80%
-        - CO2: 0.03-1%
-        """
-        # Sprawdzenie czy suma procentowa jest bliska 100%
-        total = oxygen + nitrogen + co2
-        if abs(total - 100) > 5:
-            return 0.1  # Nierealistyczny skład atmosfery
-        
-        # Czynniki dla poszczególnych gazów
-        oxygen_factor = np.exp(-0.5 * ((oxygen - 20) / 15)**2)
-        nitrogen_factor = np.exp(-0.5 * ((nitrogen - 75) / 10)**2)
-        
-        # CO2 ma logarytmiczną skalę optymalności
-        if co2 == 0:
-            co2_factor = 0.1
-        else:
-            co2_factor = np.exp(-0.5 * ((np.log10(co2) - np.log10(0.3)) / 1)**2)
-        
-        # Średnia ważona czynników
-        return 0.4 * oxygen_factor + 0.4 * nitrogen_factor + 0.2 * co2_factor
-    
-    def calculate_ph_factor(self, ph):
-        """
-        Obliczenie czynnika pH dla habitabilności
-        
-        Optymalny zakres: 6-8 pH
-        """
-        # Funkcja Gaussa z centrum w pH 7
-        return np.exp(-0.5 * ((ph - 7) / 1.5)**2)
-    
     def determine_life_forms(self, habitability_index):
         """
         Określenie możliwych form życia na podstawie indeksu habitabilności
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import glob
+import os
+import pathlib
+import re
+import sqlite3
+import zlib
+import numpy as np
+
+from modules.dtype_policy import get_dtype
+from modules.spectral_search import index_path_for, update_search_index
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS library_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spectra (
+    id INTEGER PRIMARY KEY,
+    planet TEXT,
+    instrument TEXT,
+    date TEXT,
+    wavelength_min REAL NOT NULL,
+    wavelength_max REAL NOT NULL,
+    snr REAL,
+    n_points INTEGER NOT NULL,
+    dtype TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_spectra_planet ON spectra (planet);
+CREATE INDEX IF NOT EXISTS idx_spectra_instrument ON spectra (instrument);
+CREATE INDEX IF NOT EXISTS idx_spectra_date ON spectra (date);
+CREATE INDEX IF NOT EXISTS idx_spectra_snr ON spectra (snr);
+CREATE INDEX IF NOT EXISTS idx_spectra_coverage ON spectra (wavelength_min, wavelength_max);
+CREATE TABLE IF NOT EXISTS chunks (
+    spectrum_id INTEGER NOT NULL REFERENCES spectra (id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    wavelength_start REAL NOT NULL,
+    wavelength_end REAL NOT NULL,
+    wavelengths BLOB NOT NULL,
+    intensities BLOB NOT NULL,
+    PRIMARY KEY (spectrum_id, chunk_index)
+) WITHOUT ROWID;
+"""
+
+METADATA_COLUMNS = ("id", "planet", "instrument", "date", "wavelength_min",
+                    "wavelength_max", "snr", "n_points", "dtype")
+
+# Metadane odczytywane z komentarzy nagłówka plików widm ("# klucz: wartość")
+FILE_METADATA_KEYS = ("planet", "instrument", "date", "snr")
+
+# Separatory kolumn plików widm (przecinek, średnik, tabulator, spacje)
+COLUMN_SEPARATORS = re.compile(r"[,;\s]+")
+
+# Liczba widm importowanych w jednej transakcji
+IMPORT_COMMIT_INTERVAL = 1000
+
+
+class SpectralLibrary:
+    """
+    Trwała biblioteka widm w jednym pliku (SQLite)
+
+    Widma są dzielone na skompresowane fragmenty o stałej liczbie punktów,
+    a metadane (planeta, instrument, data, pokrycie długości fal, SNR)
+    są indeksowane, co pozwala na szybkie zapytania filtrujące oraz odczyt
+    wybranego okna długości fal bez dekompresji całego widma.
+    Plik pracuje w trybie WAL, dzięki czemu GUI i narzędzia wsadowe mogą
+    jednocześnie czytać bibliotekę.
+    """
+
+    def __init__(self, path, readonly=False, chunk_size=1024, compression_level=6):
+        """
+        Otwarcie (lub utworzenie) biblioteki widm
+
+        Parametry:
+        - path: ścieżka do pliku biblioteki
+        - readonly: otwarcie tylko do odczytu (współdzielony dostęp)
+        - chunk_size: liczba punktów widma w jednym fragmencie (dla nowych bibliotek)
+        - compression_level: poziom kompresji zlib (0-9)
+        """
+        self.path = path
+        self.readonly = readonly
+        self.compression_level = compression_level
+
+        if readonly:
+            uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+            self.connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA foreign_keys=ON")
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(
+                "INSERT OR IGNORE INTO library_info (key, value) VALUES ('chunk_size', ?)",
+                (str(int(chunk_size)),))
+            self.connection.commit()
+
+        row = self.connection.execute(
+            "SELECT value FROM library_info WHERE key = 'chunk_size'").fetchone()
+        self.chunk_size = int(row[0])
+
+    def close(self):
+        """Zamknięcie biblioteki"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM spectra").fetchone()[0]
+
+    def _compress(self, array):
+        return zlib.compress(np.ascontiguousarray(array).tobytes(), self.compression_level)
+
+    @staticmethod
+    def _decompress(blob, dtype):
+        return np.frombuffer(zlib.decompress(blob), dtype=dtype)
+
+    def add_spectrum(self, wavelengths, intensities, planet=None, instrument=None,
+                     date=None, snr=None, commit=True):
+        """
+        Dodanie widma do biblioteki
+
+        Parametry:
+        - wavelengths: długości fal (nm; nieposortowane są porządkowane rosnąco)
+        - intensities: intensywności
+        - planet, instrument, date (ISO 8601), snr: metadane widma
+        - commit: zatwierdzenie transakcji (False przy imporcie wsadowym)
+
+        Zwraca identyfikator widma
+        """
+        dtype = np.dtype(get_dtype('spectra'))
+        wavelengths = np.asarray(wavelengths, dtype=dtype)
+        intensities = np.asarray(intensities, dtype=dtype)
+        if wavelengths.shape != intensities.shape or wavelengths.ndim != 1 or len(wavelengths) == 0:
+            raise ValueError("Długości fal i intensywności muszą być niepustymi tablicami 1-D tej samej długości")
+        if np.any(np.diff(wavelengths) < 0):
+            # Fragmenty i zakresy pokrycia zakładają rosnące długości fal
+            order = np.argsort(wavelengths, kind='stable')
+            wavelengths, intensities = wavelengths[order], intensities[order]
+
+        cursor = self.connection.execute(
+            "INSERT INTO spectra (planet, instrument, date, wavelength_min, wavelength_max, snr, n_points, dtype) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (planet, instrument, date, float(wavelengths[0]), float(wavelengths[-1]),
+             None if snr is None else float(snr), len(wavelengths), dtype.str))
+        spectrum_id = cursor.lastrowid
+
+        rows = []
+        for chunk_index, start in enumerate(range(0, len(wavelengths), self.chunk_size)):
+            stop = start + self.chunk_size
+            rows.append((spectrum_id, chunk_index,
+                         float(wavelengths[start]), float(wavelengths[min(stop, len(wavelengths)) - 1]),
+                         self._compress(wavelengths[start:stop]), self._compress(intensities[start:stop])))
+        self.connection.executemany(
+            "INSERT INTO chunks (spectrum_id, chunk_index, wavelength_start, wavelength_end, wavelengths, intensities) "
+            "VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+        if commit:
+            self.connection.commit()
+        return spectrum_id
+
+    def commit(self):
+        """Zatwierdzenie oczekujących zmian (import wsadowy)"""
+        self.connection.commit()
+
+    def query(self, planet=None, instrument=None, date_from=None, date_to=None,
+              wavelength_min=None, wavelength_max=None, min_snr=None, limit=None):
+        """
+        Wyszukiwanie widm po metadanych
+
+        Parametry:
+        - planet, instrument: dokładne dopasowanie
+        - date_from, date_to: zakres dat (ISO 8601, włącznie)
+        - wavelength_min, wavelength_max: wymagane pokrycie długości fal
+        - min_snr: minimalny stosunek sygnału do szumu
+        - limit: maksymalna liczba wyników
+
+        Zwraca listę słowników z metadanymi
+        """
+        conditions = []
+        arguments = []
+        if planet is not None:
+            conditions.append("planet = ?")
+            arguments.append(planet)
+        if instrument is not None:
+            conditions.append("instrument = ?")
+            arguments.append(instrument)
+        if date_from is not None:
+            conditions.append("date >= ?")
+            arguments.append(date_from)
+        if date_to is not None:
+            conditions.append("date <= ?")
+            arguments.append(date_to)
+        if wavelength_min is not None:
+            conditions.append("wavelength_min <= ?")
+            arguments.append(wavelength_min)
+        if wavelength_max is not None:
+            conditions.append("wavelength_max >= ?")
+            arguments.append(wavelength_max)
+        if min_snr is not None:
+            conditions.append("snr >= ?")
+            arguments.append(min_snr)
+
+        sql = f"SELECT {', '.join(METADATA_COLUMNS)} FROM spectra"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            arguments.append(int(limit))
+
+        return [dict(zip(METADATA_COLUMNS, row)) for row in self.connection.execute(sql, arguments)]
+
+    def get_metadata(self, spectrum_id):
+        """Pobranie metadanych widma"""
+        row = self.connection.execute(
+            f"SELECT {', '.join(METADATA_COLUMNS)} FROM spectra WHERE id = ?", (spectrum_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Brak widma o identyfikatorze {spectrum_id}")
+        return dict(zip(METADATA_COLUMNS, row))
+
+    def _read_chunks(self, spectrum_id, wavelength_min=None, wavelength_max=None):
+        dtype = np.dtype(self.get_metadata(spectrum_id)["dtype"])
+
+        sql = "SELECT wavelengths, intensities FROM chunks WHERE spectrum_id = ?"
+        arguments = [spectrum_id]
+        if wavelength_min is not None:
+            sql += " AND wavelength_end >= ?"
+            arguments.append(wavelength_min)
+        if wavelength_max is not None:
+            sql += " AND wavelength_start <= ?"
+            arguments.append(wavelength_max)
+        sql += " ORDER BY chunk_index"
+
+        wavelength_parts = []
+        intensity_parts = []
+        for wavelength_blob, intensity_blob in self.connection.execute(sql, arguments):
+            wavelength_parts.append(self._decompress(wavelength_blob, dtype))
+            intensity_parts.append(self._decompress(intensity_blob, dtype))
+
+        if not wavelength_parts:
+            return np.empty(0, dtype=dtype), np.empty(0, dtype=dtype)
+        return np.concatenate(wavelength_parts), np.concatenate(intensity_parts)
+
+    def read_spectrum(self, spectrum_id):
+        """Odczyt całego widma; zwraca (długości fal, intensywności)"""
+        return self._read_chunks(spectrum_id)
+
+    def read_window(self, spectrum_id, wavelength_min, wavelength_max):
+        """
+        Odczyt okna długości fal widma
+
+        Dekompresowane są tylko fragmenty nachodzące na okno
+        [wavelength_min, wavelength_max]. Zwraca (długości fal, intensywności).
+        """
+        wavelengths, intensities = self._read_chunks(spectrum_id, wavelength_min, wavelength_max)
+        mask = (wavelengths >= wavelength_min) & (wavelengths <= wavelength_max)
+        return wavelengths[mask], intensities[mask]
+
+    def iter_spectra(self, batch_size=256, min_id=None):
+        """
+        Iteracja po widmach biblioteki w partiach (przetwarzanie strumieniowe)
+
+        Parametry:
+        - batch_size: liczba widm w partii
+        - min_id: pomija widma o identyfikatorze mniejszym lub równym min_id
+
+        Zwraca kolejne krotki (identyfikatory, lista par (długości fal, intensywności))
+        """
+        sql = "SELECT id FROM spectra"
+        arguments = []
+        if min_id is not None:
+            sql += " WHERE id > ?"
+            arguments.append(min_id)
+        sql += " ORDER BY id"
+        spectrum_ids = [row[0] for row in self.connection.execute(sql, arguments)]
+
+        for start in range(0, len(spectrum_ids), batch_size):
+            batch_ids = spectrum_ids[start:start + batch_size]
+            yield np.array(batch_ids, dtype=np.int64), [self.read_spectrum(spectrum_id) for spectrum_id in batch_ids]
+
+
+def read_spectrum_file(path):
+    """
+    Odczyt widma z pliku tekstowego (CSV lub .dat)
+
+    Plik ma dwie kolumny - długość fali (nm) i intensywność - rozdzielone
+    przecinkiem, średnikiem, tabulatorem lub spacjami; wiersz nagłówka
+    z nazwami kolumn jest pomijany. Metadane widma można podać
+    w komentarzach, np. "# planet: Kepler-22b", "# snr: 35".
+
+    Zwraca (długości fal rosnąco, intensywności, słownik metadanych)
+    """
+    metadata = {}
+    lines = []
+    with open(path, encoding="utf-8") as spectrum_file:
+        for line in spectrum_file:
+            line = line.strip()
+            if line.startswith("#"):
+                key, separator, value = line[1:].partition(":")
+                key = key.strip().lower()
+                if separator and key in FILE_METADATA_KEYS:
+                    metadata[key] = value.strip()
+            elif line:
+                lines.append(COLUMN_SEPARATORS.sub(" ", line))
+
+    # Wiersz nagłówka (pierwsza kolumna nie jest liczbą)
+    if lines:
+        try:
+            float(lines[0].split()[0])
+        except ValueError:
+            lines = lines[1:]
+    data = np.loadtxt(lines, ndmin=2) if lines else np.empty((0, 0))
+    if len(data) == 0 or data.shape[1] < 2:
+        raise ValueError(f"Plik {path} nie zawiera kolumn długości fali i intensywności")
+
+    if "snr" in metadata:
+        metadata["snr"] = float(metadata["snr"])
+    order = np.argsort(data[:, 0], kind="stable")
+    return data[order, 0], data[order, 1], metadata
+
+
+def import_spectrum_files(library, paths, **metadata):
+    """
+    Import wsadowy plików widm do biblioteki
+
+    Parametry:
+    - library: biblioteka otwarta do zapisu
+    - paths: ścieżki plików widm (format jak w read_spectrum_file)
+    - metadata: domyślne metadane (planet, instrument, date, snr) dla plików,
+      które ich nie podają
+
+    Zwraca listę identyfikatorów dodanych widm
+    """
+    defaults = {key: value for key, value in metadata.items() if value is not None}
+    spectrum_ids = []
+    for path in paths:
+        wavelengths, intensities, file_metadata = read_spectrum_file(path)
+        spectrum_ids.append(library.add_spectrum(wavelengths, intensities, commit=False,
+                                                 **{**defaults, **file_metadata}))
+        if len(spectrum_ids) % IMPORT_COMMIT_INTERVAL == 0:
+            library.commit()
+    library.commit()
+    return spectrum_ids
+
+
+def import_directory(library, directory, pattern="*.csv", **metadata):
+    """Import wszystkich plików widm katalogu pasujących do wzorca (kolejność alfabetyczna)"""
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    return import_spectrum_files(library, paths, **metadata)
+
+
+def main(arguments=None):
+    """
+    Narzędzie wsadowe: import katalogu plików widm do biblioteki
+
+    Po imporcie indeks podobieństwa zapisany obok biblioteki jest
+    uzupełniany o nowe widma (lub budowany, jeśli jeszcze nie istnieje).
+    """
+    parser = argparse.ArgumentParser(description="Import plików widm z katalogu do biblioteki widm")
+    parser.add_argument("library", help="plik biblioteki (tworzony, jeśli nie istnieje)")
+    parser.add_argument("directory", help="katalog z plikami widm")
+    parser.add_argument("--pattern", default="*.csv", help="wzorzec nazw plików (domyślnie *.csv)")
+    parser.add_argument("--planet", help="planeta (dla plików bez metadanych)")
+    parser.add_argument("--instrument", help="instrument (dla plików bez metadanych)")
+    parser.add_argument("--date", help="data obserwacji ISO 8601 (dla plików bez metadanych)")
+    parser.add_argument("--snr", type=float, help="stosunek sygnału do szumu (dla plików bez metadanych)")
+    parser.add_argument("--index", help="plik indeksu podobieństwa (domyślnie obok biblioteki)")
+    parser.add_argument("--no-index", action="store_true", help="bez aktualizacji indeksu podobieństwa")
+    arguments = parser.parse_args(arguments)
+
+    with SpectralLibrary(arguments.library) as library:
+        spectrum_ids = import_directory(library, arguments.directory, arguments.pattern,
+                                        planet=arguments.planet, instrument=arguments.instrument,
+                                        date=arguments.date, snr=arguments.snr)
+        print(f"Zaimportowano {len(spectrum_ids)} widm, w bibliotece: {len(library)}")
+
+        if not arguments.no_index and len(library) >= 2:
+            index_path = arguments.index or index_path_for(arguments.library)
+            _, added = update_search_index(library, index_path)
+            print(f"Indeks podobieństwa {index_path}: dopisano {added} widm")
+    return spectrum_ids
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,67 @@
 # -*- coding: utf-8 -*-
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDialog, QDialogButtonBox, QFormLayout, QLineEdit, QDoubleSpinBox, QCheckBox
+from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QAbstractItemView, QFileDialog
+from PyQt5.QtCore import Qt, QTimer
+import sqlite3
 import matplotlib
 matplotlib.use('Qt5Agg')
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import numpy as np
 
+from modules.dtype_policy import ACCUMULATOR_DTYPE, HistoryBuffer, as_accumulator, as_storage
+from modules.spectral_library import SpectralLibrary, read_spectrum_file
+from modules.spectral_search import SpectralSearchIndex, index_path_for, update_search_index
+from modules.spectral_stream import SpectralStream, open_stream_source
+from modules.simulation_thread import habitability_model
+from modules.boundary_tracing import trace_boundary
+from modules.background_tasks import DebouncedTask
+
+# Próg indeksu habitabilności wyznaczający granicę strefy na płaszczyźnie T × P
+HABITABILITY_THRESHOLD = 50
+
+# Domyślne zakresy płaszczyzny T × P (rozszerzane do trajektorii symulacji)
+ZONE_TEMPERATURE_RANGE = (0, 600)  # K
+ZONE_PRESSURE_RANGE = (0, 10)  # atm
+
+# Pozostałe parametry modelu, gdy symulacja ich nie przekazała (jak w SimulationThread)
+DEFAULT_CONDITIONS = {'radiation': 1, 'ph': 7.0, 'oxygen': 21, 'nitrogen': 78, 'co2': 0}
+
+# Największa liczba widm pokazywanych w wynikach zapytania do biblioteki
+LIBRARY_QUERY_LIMIT = 500
+
+# Liczba widm zwracanych przez wyszukiwanie podobnych widm
+SIMILAR_SPECTRA_COUNT = 10
+
+# Kolumny tabeli widm biblioteki: (klucz metadanych, nagłówek)
+LIBRARY_TABLE_COLUMNS = (
+    ('id', 'ID'),
+    ('planet', 'Planeta'),
+    ('instrument', 'Instrument'),
+    ('date', 'Data'),
+    ('wavelength_min', 'λ min (nm)'),
+    ('wavelength_max', 'λ max (nm)'),
+    ('snr', 'SNR'),
+    ('n_points', 'Punkty')
+)
+
+# Dodatkowa kolumna wyników wyszukiwania podobnych widm
+DISTANCE_COLUMN = ('distance', 'Odległość')
+
+
+def refresh_search_index(library_path):
+    """
+    Wczytanie i uzupełnienie (lub zbudowanie) indeksu podobieństwa biblioteki
+    (funkcja dla wątku roboczego - biblioteka otwierana osobnym połączeniem)
+    
+    Zwraca (ścieżka biblioteki, indeks)
+    """
+    with SpectralLibrary(library_path, readonly=True) as library:
+        index, _ = update_search_index(library, index_path_for(library_path))
+    return library_path, index
+
 class MatplotlibCanvas(FigureCanvas):
     """Klasa do osadzania wykresów matplotlib w interfejsie PyQt5"""
     
@@ -85,6 +139,188 @@ class MatplotlibCanvas(FigureCanvas):
         self.axes.grid(True)
         self.fig.tight_layout()
         self.draw()
+        
+    def plot_habitability_zone(self, boundary, temperature_values=None, pressure_values=None):
+        """
+        Granica strefy habitabilności na płaszczyźnie T × P z trajektorią symulacji
+        
+        Parametry:
+        - boundary: BoundaryTrace (łamane granicy indeksu = próg)
+        - temperature_values, pressure_values: przebieg symulacji (opcjonalnie)
+        """
+        self.axes.clear()
+        for number, polyline in enumerate(boundary.polylines):
+            self.axes.plot(polyline[:, 0], polyline[:, 1], 'g-',
+                           label=f'Indeks = {boundary.threshold}' if number == 0 else None)
+        has_trajectory = temperature_values is not None and len(temperature_values) > 0
+        if has_trajectory:
+            self.axes.plot(temperature_values, pressure_values, 'b.-', alpha=0.6, label='Trajektoria symulacji')
+            self.axes.plot(temperature_values[-1], pressure_values[-1], 'ro', label='Stan bieżący')
+        self.axes.set_xlabel('Temperatura (K)')
+        self.axes.set_ylabel('Ciśnienie (atm)')
+        self.axes.set_title(f'Strefa habitabilności ({boundary.evaluations} ocen modelu)')
+        if boundary.polylines or has_trajectory:
+            self.axes.legend(loc='upper right')
+        self.axes.grid(True)
+        self.fig.tight_layout()
+        self.draw()
+        
+    def start_live_plot(self):
+        """Przygotowanie wykresu strumienia na żywo (linie dopisywane przyrostowo)"""
+        self.axes.clear()
+        self.live_wavelengths = HistoryBuffer('spectra')
+        self.live_raw = HistoryBuffer('spectra')
+        self.live_filtered = HistoryBuffer('spectra')
+        self.live_raw_line, = self.axes.plot([], [], 'r-', alpha=0.4, label='Widmo surowe')
+        self.live_filtered_line, = self.axes.plot([], [], 'g-', label='Widmo filtrowane')
+        self.axes.set_xlabel('Długość fali (nm)')
+        self.axes.set_ylabel('Intensywność')
+        self.axes.set_title('Strumień widmowy na żywo')
+        self.axes.legend()
+        self.axes.grid(True)
+        self.draw()
+        
+    def append_live_data(self, wavelengths, raw_intensities, filtered_intensities):
+        """Dopisanie nowych próbek do wykresu strumienia bez przerysowywania od zera"""
+        self.live_wavelengths.extend(wavelengths)
+        self.live_raw.extend(raw_intensities)
+        self.live_filtered.extend(filtered_intensities)
+        self.live_raw_line.set_data(self.live_wavelengths.values(), self.live_raw.values())
+        self.live_filtered_line.set_data(self.live_wavelengths.values(), self.live_filtered.values())
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.draw_idle()
+
+
+class LibrarySpectrumDialog(QDialog):
+    """
+    Wybór widma z biblioteki: filtry metadanych, tabela wyników zapytania
+    i opcjonalne okno długości fal (odczyt częściowy)
+    
+    Z podaną listą matches dialog pokazuje tylko te widma (wyniki
+    wyszukiwania podobnych widm z kolumną odległości), bez filtrów.
+    """
+    
+    def __init__(self, library, parent=None, matches=None):
+        super().__init__(parent)
+        self.library = library
+        self.setWindowTitle("Biblioteka widm" if matches is None else "Podobne widma")
+        self.resize(800, 500)
+        self.columns = LIBRARY_TABLE_COLUMNS if matches is None else LIBRARY_TABLE_COLUMNS + (DISTANCE_COLUMN,)
+        
+        main_layout = QVBoxLayout()
+        
+        # Filtry metadanych (puste pola nie ograniczają zapytania)
+        self.filter_widget = QWidget()
+        filter_layout = QFormLayout(self.filter_widget)
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        self.planet_edit = QLineEdit()
+        filter_layout.addRow("Planeta:", self.planet_edit)
+        self.instrument_edit = QLineEdit()
+        filter_layout.addRow("Instrument:", self.instrument_edit)
+        
+        date_layout = QHBoxLayout()
+        self.date_from_edit = QLineEdit()
+        self.date_from_edit.setPlaceholderText("RRRR-MM-DD")
+        self.date_to_edit = QLineEdit()
+        self.date_to_edit.setPlaceholderText("RRRR-MM-DD")
+        date_layout.addWidget(self.date_from_edit)
+        date_layout.addWidget(QLabel("-"))
+        date_layout.addWidget(self.date_to_edit)
+        filter_layout.addRow("Data:", date_layout)
+        
+        self.min_snr_spin = QDoubleSpinBox()
+        self.min_snr_spin.setRange(0, 100000)
+        self.min_snr_spin.setSpecialValueText("dowolny")
+        filter_layout.addRow("Minimalny SNR:", self.min_snr_spin)
+        
+        # Okno długości fal - wymagane pokrycie w zapytaniu i zakres odczytu widma
+        window_layout = QHBoxLayout()
+        self.window_check = QCheckBox("Tylko okno")
+        self.wavelength_min_spin = QDoubleSpinBox()
+        self.wavelength_min_spin.setRange(0, 100000)
+        self.wavelength_min_spin.setValue(300)
+        self.wavelength_max_spin = QDoubleSpinBox()
+        self.wavelength_max_spin.setRange(0, 100000)
+        self.wavelength_max_spin.setValue(1000)
+        window_layout.addWidget(self.window_check)
+        window_layout.addWidget(self.wavelength_min_spin)
+        window_layout.addWidget(QLabel("-"))
+        window_layout.addWidget(self.wavelength_max_spin)
+        filter_layout.addRow("Długości fal (nm):", window_layout)
+        main_layout.addWidget(self.filter_widget)
+        
+        self.search_button = QPushButton("Szukaj")
+        self.search_button.clicked.connect(self.run_query)
+        main_layout.addWidget(self.search_button)
+        
+        # Wyniki zapytania
+        self.results_table = QTableWidget(0, len(self.columns))
+        self.results_table.setHorizontalHeaderLabels([header for _, header in self.columns])
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results_table.cellDoubleClicked.connect(self.accept)
+        main_layout.addWidget(self.results_table)
+        
+        self.status_label = QLabel("")
+        main_layout.addWidget(self.status_label)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        main_layout.addWidget(buttons)
+        
+        self.setLayout(main_layout)
+        self.rows = []
+        if matches is None:
+            self.run_query()
+        else:
+            self.filter_widget.hide()
+            self.search_button.hide()
+            self.rows = list(matches)
+            self.show_rows(self.rows)
+            self.status_label.setText(f"Najbardziej podobne widma: {len(self.rows)}")
+        
+    def wavelength_window(self):
+        """Wybrane okno długości fal (min, max) lub (None, None) dla całego widma"""
+        if not self.window_check.isChecked():
+            return None, None
+        return self.wavelength_min_spin.value(), self.wavelength_max_spin.value()
+        
+    def run_query(self):
+        """Zapytanie do biblioteki z bieżącymi filtrami"""
+        wavelength_min, wavelength_max = self.wavelength_window()
+        self.rows = self.library.query(
+            planet=self.planet_edit.text().strip() or None,
+            instrument=self.instrument_edit.text().strip() or None,
+            date_from=self.date_from_edit.text().strip() or None,
+            date_to=self.date_to_edit.text().strip() or None,
+            wavelength_min=wavelength_min,
+            wavelength_max=wavelength_max,
+            min_snr=self.min_snr_spin.value() or None,
+            limit=LIBRARY_QUERY_LIMIT)
+        self.show_rows(self.rows)
+        suffix = f" (pokazano pierwsze {LIBRARY_QUERY_LIMIT})" if len(self.rows) == LIBRARY_QUERY_LIMIT else ""
+        self.status_label.setText(f"Znaleziono widm: {len(self.rows)}{suffix}")
+        
+    def show_rows(self, rows):
+        """Wypełnienie tabeli metadanymi widm"""
+        self.results_table.setRowCount(len(rows))
+        for row_number, row in enumerate(rows):
+            for column, (key, _) in enumerate(self.columns):
+                value = row.get(key)
+                text = "" if value is None else f"{value:g}" if isinstance(value, float) else str(value)
+                self.results_table.setItem(row_number, column, QTableWidgetItem(text))
+        if rows:
+            self.results_table.selectRow(0)
+            
+    def selected_spectrum_id(self):
+        """Identyfikator zaznaczonego widma (None, gdy nic nie zaznaczono)"""
+        row = self.results_table.currentRow()
+        if row < 0 or row >= len(self.rows):
+            return None
+        return self.rows[row]['id']
 
 
 class SpectralModule(QWidget):
@@ -92,6 +328,9 @@ class SpectralModule(QWidget):
     
     def __init__(self):
         super().__init__()
+        # Biblioteka widm na dysku i indeks podobieństwa (otwierane na żądanie)
+        self.library = None
+        self.search_index = None
         self.init_ui()
         
     def init_ui(self):
@@ -131,6 +370,27 @@ class SpectralModule(QWidget):
         self.simulation_results_button.clicked.connect(self.show_simulation_results)
         control_layout.addWidget(self.simulation_results_button)
         
+        # Przycisk strefy habitabilności (granica indeksu na płaszczyźnie T × P)
+        self.habitability_zone_button = QPushButton("Strefa habitabilności")
+        self.habitability_zone_button.clicked.connect(self.show_habitability_zone)
+        control_layout.addWidget(self.habitability_zone_button)
+        
+        # Przycisk biblioteki widm (otwarcie pliku biblioteki i wybór widma)
+        self.open_library_button = QPushButton("Otwórz bibliotekę")
+        self.open_library_button.clicked.connect(self.choose_library)
+        control_layout.addWidget(self.open_library_button)
+        
+        self.browse_library_button = QPushButton("Przeglądaj bibliotekę")
+        self.browse_library_button.clicked.connect(self.browse_library)
+        self.browse_library_button.setEnabled(False)
+        control_layout.addWidget(self.browse_library_button)
+        
+        # Wyszukiwanie w bibliotece widm najbardziej podobnych do bieżącego
+        self.similar_spectra_button = QPushButton("Podobne widma")
+        self.similar_spectra_button.clicked.connect(self.show_similar_spectra)
+        self.similar_spectra_button.setEnabled(False)
+        control_layout.addWidget(self.similar_spectra_button)
+        
         # Dodanie panelu kontrolnego do głównego układu
         main_layout.addLayout(control_layout)
         
@@ -138,6 +398,39 @@ class SpectralModule(QWidget):
         self.canvas = MatplotlibCanvas(self, width=5, height=4, dpi=100)
         main_layout.addWidget(self.canvas)
         
+        # Status biblioteki widm
+        self.library_status_label = QLabel("Biblioteka widm: nie otwarto")
+        main_layout.addWidget(self.library_status_label)
+        
+        # Strumień na żywo: źródło (plik śledzony jak tail -f lub host:port gniazda TCP)
+        stream_layout = QHBoxLayout()
+        stream_layout.addWidget(QLabel("Strumień:"))
+        self.stream_source_edit = QLineEdit()
+        self.stream_source_edit.setPlaceholderText("ścieżka pliku lub host:port")
+        stream_layout.addWidget(self.stream_source_edit)
+        self.start_stream_button = QPushButton("Start strumienia")
+        self.start_stream_button.clicked.connect(self.start_stream_from_address)
+        stream_layout.addWidget(self.start_stream_button)
+        self.stop_stream_button = QPushButton("Stop strumienia")
+        self.stop_stream_button.clicked.connect(self.stop_stream)
+        self.stop_stream_button.setEnabled(False)
+        stream_layout.addWidget(self.stop_stream_button)
+        main_layout.addLayout(stream_layout)
+        
+        # Status strumienia na żywo
+        self.stream_status_label = QLabel("")
+        main_layout.addWidget(self.stream_status_label)
+        
+        # Indeks podobieństwa wczytywany (i uzupełniany o nowe widma) w tle
+        self.index_task = DebouncedTask(refresh_search_index, debounce_ms=0, parent=self)
+        self.index_task.result_ready.connect(self.search_index_ready)
+        self.index_task.task_failed.connect(self.search_index_failed)
+        
+        # Strumień widmowy na żywo
+        self.stream = None
+        self.stream_timer = QTimer(self)
+        self.stream_timer.timeout.connect(self.poll_stream)
+        
         # Ustawienie głównego układu
         self.setLayout(main_layout)
         
@@ -145,29 +438,35 @@ class SpectralModule(QWidget):
         self.generate_sample_data()
         
         # Dane symulacji
-        self.simulation_time_points = []
-        self.simulation_habitability_indices = []
-        self.simulation_temperature_values = []
-        self.simulation_pressure_values = []
+        self.simulation_time_points = HistoryBuffer()
+        self.simulation_habitability_indices = HistoryBuffer()
+        self.simulation_temperature_values = HistoryBuffer()
+        self.simulation_pressure_values = HistoryBuffer()
+        self.simulation_conditions = dict(DEFAULT_CONDITIONS)
         
     def generate_sample_data(self):
         """Generowanie przykładowych danych widmowych"""
-        # Przykładowe dane widmowe
-        self.wavelengths = np.linspace(300, 1000, 500)  # długości fali od 300 do 1000 nm
+        # Przykładowe dane widmowe (obliczenia w precyzji akumulatora,
+        # przechowywanie w precyzji z polityki typów danych)
+        wavelengths = np.linspace(300, 1000, 500, dtype=ACCUMULATOR_DTYPE)  # długości fali od 300 do 1000 nm
         
         # Widmo emisyjne (przykład)
-        self.emission_spectrum = np.zeros_like(self.wavelengths)
+        emission_spectrum = np.zeros_like(wavelengths)
         for peak in [350, 450, 550, 650, 750]:
-            self.emission_spectrum += 100 * np.exp(-(self.wavelengths - peak)**2 / (2 * 10**2))
+            emission_spectrum += 100 * np.exp(-(wavelengths - peak)**2 / (2 * 10**2))
         
         # Dodanie szumu
-        self.emission_spectrum += np.random.normal(0, 5, self.wavelengths.shape)
+        emission_spectrum += np.random.normal(0, 5, wavelengths.shape)
+        
+        self.wavelengths = as_storage(wavelengths, 'spectra')
+        self.emission_spectrum = as_storage(emission_spectrum, 'spectra')
         
         # Widmo absorpcyjne (przykład)
-        self.absorption_spectrum = 100 - self.emission_spectrum / 2
+        self.absorption_spectrum = as_storage(100 - emission_spectrum / 2, 'spectra')
         
         # Widmo interferometryczne (przykład)
-        self.interferometric_spectrum = 50 + 30 * np.sin(0.1 * self.wavelengths) + np.random.normal(0, 3, self.wavelengths.shape)
+        self.interferometric_spectrum = as_storage(
+            50 + 30 * np.sin(0.1 * wavelengths) + np.random.normal(0, 3, wavelengths.shape), 'spectra')
         
         # Skorygowane widma
         self.corrected_emission = self.apply_filter(self.emission_spectrum)
@@ -181,21 +480,21 @@ class SpectralModule(QWidget):
         """Aplikacja wybranego filtra do widma"""
         # Implementacja prostego filtrowania (w rzeczywistej aplikacji byłaby bardziej zaawansowana)
         if filter_type == "Filtr Kalmana":
-            # Uproszczona implementacja filtra Kalmana
-            filtered = np.zeros_like(spectrum)
+            # Uproszczona implementacja filtra Kalmana (rekurencja w precyzji akumulatora)
+            filtered = np.zeros(len(spectrum), dtype=ACCUMULATOR_DTYPE)
             filtered[0] = spectrum[0]
             kalman_gain = 0.75
             for i in range(1, len(spectrum)):
                 filtered[i] = filtered[i-1] + kalman_gain * (spectrum[i] - filtered[i-1])
-            return filtered
+            return as_storage(filtered, 'spectra')
         elif filter_type == "Filtr Gaussa":
             # Uproszczona implementacja filtra Gaussa
             from scipy.ndimage import gaussian_filter
-            return gaussian_filter(spectrum, sigma=2)
+            return as_storage(gaussian_filter(as_accumulator(spectrum), sigma=2), 'spectra')
         elif filter_type == "Filtr medianowy":
             # Uproszczona implementacja filtra medianowego
             from scipy.signal import medfilt
-            return medfilt(spectrum, kernel_size=5)
+            return as_storage(medfilt(spectrum, kernel_size=5), 'spectra')
         else:
             # Bez filtrowania
             return spectrum
@@ -245,10 +544,10 @@ class SpectralModule(QWidget):
         """Wyświetlenie wyników symulacji"""
         if len(self.simulation_time_points) > 0:
             self.canvas.plot_simulation_results(
-                self.simulation_time_points,
-                self.simulation_habitability_indices,
-                self.simulation_temperature_values,
-                self.simulation_pressure_values
+                self.simulation_time_points.values(),
+                self.simulation_habitability_indices.values(),
+                self.simulation_temperature_values.values(),
+                self.simulation_pressure_values.values()
             )
         else:
             # Jeśli nie ma danych symulacji, wygeneruj przykładowe
@@ -265,8 +564,291 @@ class SpectralModule(QWidget):
                 pressure_values
             )
             
-    def update_simulation_data(self, time_point, habitability_index, temperature, pressure):
-        """Aktualizacja danych symulacji"""
+    def show_habitability_zone(self):
+        """
+        Wyświetlenie granicy strefy habitabilności (T × P) dla bieżących warunków symulacji
+        
+        Granica śledzona jest adaptacyjnie (trace_boundary) zamiast liczenia
+        indeksu na gęstej siatce.
+        """
+        temperature_values = self.simulation_temperature_values.values()
+        pressure_values = self.simulation_pressure_values.values()
+        temperature_range = (ZONE_TEMPERATURE_RANGE[0],
+                             max(ZONE_TEMPERATURE_RANGE[1], float(np.max(temperature_values, initial=0))))
+        pressure_range = (ZONE_PRESSURE_RANGE[0], max(ZONE_PRESSURE_RANGE[1], float(np.max(pressure_values, initial=0))))
+        conditions = self.simulation_conditions
+        boundary = trace_boundary(
+            lambda temperature, pressure: habitability_model(
+                temperature, pressure, conditions['radiation'], conditions['ph'],
+                conditions['oxygen'], conditions['nitrogen'], conditions['co2']),
+            temperature_range, pressure_range, HABITABILITY_THRESHOLD)
+        self.canvas.plot_habitability_zone(boundary, temperature_values, pressure_values)
+        
+    def open_library(self, path, readonly=True):
+        """Otwarcie biblioteki widm (domyślnie tylko do odczytu, współdzielonej z narzędziami wsadowymi)"""
+        if self.library is not None:
+            self.library.close()
+            self.library = None
+            self.browse_library_button.setEnabled(False)
+            self.similar_spectra_button.setEnabled(False)
+        # Indeks poprzedniej biblioteki nie pasuje do nowej
+        self.index_task.cancel()
+        self.search_index = None
+        self.library = SpectralLibrary(path, readonly=readonly)
+        self.browse_library_button.setEnabled(True)
+        self.similar_spectra_button.setEnabled(True)
+        self.library_status_label.setText(f"Biblioteka widm: {path} ({len(self.library)} widm)")
+        return self.library
+        
+    def choose_library(self):
+        """Wybór pliku biblioteki widm i widma z biblioteki (zapytanie po metadanych)"""
+        path, _ = QFileDialog.getOpenFileName(self, "Wybierz bibliotekę widm", "",
+                                              "Biblioteki widm (*.sqlite *.db);;Wszystkie pliki (*)")
+        if not path:
+            return
+        try:
+            self.open_library(path)
+        except sqlite3.Error as error:
+            self.library_status_label.setText(f"Biblioteka widm: błąd otwarcia {path} - {error}")
+            return
+        self.browse_library()
+        
+    def browse_library(self):
+        """Dialog zapytania do biblioteki - wybrane widmo staje się bieżącym widmem"""
+        dialog = LibrarySpectrumDialog(self.library, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        spectrum_id = dialog.selected_spectrum_id()
+        if spectrum_id is None:
+            return
+        try:
+            self.load_library_spectrum(spectrum_id, *dialog.wavelength_window())
+        except ValueError as error:
+            self.library_status_label.setText(f"Biblioteka widm: {error}")
+            return
+        self.library_status_label.setText(
+            f"Biblioteka widm: {self.library.path} ({len(self.library)} widm), bieżące widmo: {spectrum_id}")
+        
+    def load_library_spectrum(self, spectrum_id, wavelength_min=None, wavelength_max=None):
+        """
+        Wczytanie widma z biblioteki jako bieżącego widma wybranego typu
+        
+        Parametry:
+        - spectrum_id: identyfikator widma w bibliotece
+        - wavelength_min, wavelength_max: opcjonalne okno długości fal (odczyt częściowy)
+        """
+        if self.library is None:
+            raise RuntimeError("Biblioteka widm nie jest otwarta")
+            
+        if wavelength_min is None and wavelength_max is None:
+            wavelengths, spectrum = self.library.read_spectrum(spectrum_id)
+        else:
+            wavelengths, spectrum = self.library.read_window(
+                spectrum_id,
+                -np.inf if wavelength_min is None else wavelength_min,
+                np.inf if wavelength_max is None else wavelength_max)
+        if len(wavelengths) < 2:
+            raise ValueError(f"Widmo {spectrum_id} ma mniej niż 2 punkty w wybranym oknie długości fal")
+        self.set_current_spectrum(wavelengths, spectrum)
+        
+    def import_spectrum_file(self, path):
+        """
+        Import widma z pliku (CSV/.dat) jako bieżącego widma wybranego typu
+        
+        Gdy biblioteka widm jest otwarta, widmo jest do niej dopisywane
+        (osobnym połączeniem do zapisu), a wczytany indeks podobieństwa
+        uzupełniany o nowe widma i zapisywany.
+        
+        Zwraca identyfikator widma w bibliotece albo None (biblioteka nie jest otwarta)
+        """
+        wavelengths, spectrum, metadata = read_spectrum_file(path)
+        if len(wavelengths) < 2:
+            raise ValueError(f"Plik {path} zawiera mniej niż 2 punkty widma")
+            
+        spectrum_id = None
+        if self.library is not None:
+            with SpectralLibrary(self.library.path) as library:
+                spectrum_id = library.add_spectrum(wavelengths, spectrum, **metadata)
+            if self.search_index is not None:
+                self.search_index.update_from_library(self.library)
+                self.search_index.save(index_path_for(self.library.path))
+            self.library_status_label.setText(
+                f"Biblioteka widm: {self.library.path} ({len(self.library)} widm), bieżące widmo: {spectrum_id}")
+                
+        self.set_current_spectrum(wavelengths, spectrum)
+        return spectrum_id
+        
+    def set_current_spectrum(self, wavelengths, spectrum):
+        """Ustawienie widma (i jego wersji przefiltrowanej) jako bieżącego widma wybranego typu"""
+        # Pozostałe widma przenoszone są na nową siatkę długości fal
+        previous_wavelengths = self.wavelengths
+        for name in ("emission_spectrum", "absorption_spectrum", "interferometric_spectrum",
+                     "corrected_emission", "corrected_absorption", "corrected_interferometric"):
+            setattr(self, name, as_storage(
+                np.interp(wavelengths, previous_wavelengths, getattr(self, name)), 'spectra'))
+                
+        self.wavelengths = as_storage(wavelengths, 'spectra')
+        spectrum = as_storage(spectrum, 'spectra')
+        corrected = self.apply_filter(spectrum)
+        
+        spectrum_type = self.spectrum_type.currentText()
+        if spectrum_type == "Emisyjne":
+            self.emission_spectrum, self.corrected_emission = spectrum, corrected
+        elif spectrum_type == "Absorpcyjne":
+            self.absorption_spectrum, self.corrected_absorption = spectrum, corrected
+        else:  # Interferometryczne
+            self.interferometric_spectrum, self.corrected_interferometric = spectrum, corrected
+            
+        self.perform_analysis()
+        
+    def open_search_index(self, path):
+        """Wczytanie indeksu podobieństwa widm z pliku"""
+        self.search_index = SpectralSearchIndex.load(path)
+        return self.search_index
+        
+    def find_similar_spectra(self, k=5, n_probe=4):
+        """
+        Wyszukanie w bibliotece k widm najbardziej podobnych do bieżącego
+        
+        Zwraca listę słowników z metadanymi widm uzupełnionych o odległość ('distance')
+        """
+        if self.search_index is None:
+            raise RuntimeError("Indeks podobieństwa widm nie jest wczytany")
+            
+        spectrum_type = self.spectrum_type.currentText()
+        if spectrum_type == "Emisyjne":
+            spectrum = self.emission_spectrum
+        elif spectrum_type == "Absorpcyjne":
+            spectrum = self.absorption_spectrum
+        else:  # Interferometryczne
+            spectrum = self.interferometric_spectrum
+            
+        matches = []
+        for spectrum_id, distance in self.search_index.query(self.wavelengths, spectrum, k, n_probe):
+            metadata = self.library.get_metadata(spectrum_id) if self.library is not None else {"id": spectrum_id}
+            metadata["distance"] = distance
+            matches.append(metadata)
+        return matches
+        
+    def show_similar_spectra(self):
+        """
+        Wyszukanie widm podobnych do bieżącego i wczytanie wybranego
+        
+        Przy pierwszym wyszukiwaniu indeks jest wczytywany w tle (i uzupełniany
+        o widma zaimportowane od ostatniej aktualizacji) albo budowany, gdy
+        biblioteka nie ma jeszcze indeksu.
+        """
+        if self.library is None:
+            return
+        if self.search_index is None:
+            self.similar_spectra_button.setEnabled(False)
+            self.library_status_label.setText("Biblioteka widm: przygotowanie indeksu podobieństwa...")
+            self.index_task.schedule(self.library.path)
+            return
+            
+        dialog = LibrarySpectrumDialog(self.library, self, matches=self.find_similar_spectra(SIMILAR_SPECTRA_COUNT))
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        spectrum_id = dialog.selected_spectrum_id()
+        if spectrum_id is not None:
+            self.load_library_spectrum(spectrum_id)
+            self.library_status_label.setText(
+                f"Biblioteka widm: {self.library.path} ({len(self.library)} widm), bieżące widmo: {spectrum_id}")
+            
+    def search_index_ready(self, result):
+        """Indeks podobieństwa gotowy - wyszukanie widm podobnych do bieżącego"""
+        library_path, index = result
+        if self.library is None or self.library.path != library_path:
+            return
+        self.search_index = index
+        self.similar_spectra_button.setEnabled(True)
+        self.library_status_label.setText(
+            f"Biblioteka widm: {library_path} ({len(self.library)} widm, w indeksie {len(index.ids)})")
+        self.show_similar_spectra()
+        
+    def search_index_failed(self, message):
+        """Obsługa błędu przygotowania indeksu podobieństwa"""
+        self.similar_spectra_button.setEnabled(self.library is not None)
+        self.library_status_label.setText(
+            f"Biblioteka widm: błąd indeksu podobieństwa - {message.strip().splitlines()[-1]}")
+        
+    def start_stream(self, source, interval_ms=50):
+        """
+        Uruchomienie strumienia widmowego na żywo
+        
+        Parametry:
+        - source: źródło próbek (FileTailSource, SocketSource)
+        - interval_ms: okres odpytywania źródła (ms)
+        """
+        self.stop_stream()
+        self.stream = SpectralStream(source, self.filter_algorithm.currentText())
+        self.canvas.start_live_plot()
+        self.stream_timer.start(interval_ms)
+        self.start_stream_button.setEnabled(False)
+        self.stop_stream_button.setEnabled(True)
+        
+    def start_stream_from_address(self):
+        """Uruchomienie strumienia ze źródła wpisanego w polu adresu"""
+        address = self.stream_source_edit.text().strip()
+        if not address:
+            self.stream_status_label.setText("Strumień: podaj ścieżkę pliku lub host:port")
+            return
+        try:
+            source = open_stream_source(address)
+        except OSError as error:
+            self.stream_status_label.setText(f"Strumień: nie można połączyć z {address} - {error}")
+            return
+        self.start_stream(source)
+        self.stream_status_label.setText(f"Strumień: oczekiwanie na próbki z {address}")
+        
+    def stop_stream(self):
+        """Zatrzymanie strumienia widmowego (próbki wstrzymane przez filtr są dopisywane do wykresu)"""
+        self.stream_timer.stop()
+        if self.stream is not None:
+            wavelengths, raw, filtered = self.stream.flush()
+            if len(wavelengths):
+                self.canvas.append_live_data(wavelengths, raw, filtered)
+            self.stream.close()
+            self.show_stream_stats()
+            self.stream = None
+        self.start_stream_button.setEnabled(True)
+        self.stop_stream_button.setEnabled(False)
+            
+    def poll_stream(self):
+        """Odczyt nowych próbek strumienia i przyrostowa aktualizacja wykresu"""
+        try:
+            wavelengths, raw, filtered = self.stream.poll()
+        except (OSError, ValueError, IndexError) as error:
+            # Zerwane połączenie, niedostępny plik lub uszkodzone dane - strumień jest zatrzymywany
+            self.stop_stream()
+            self.stream_status_label.setText(f"Strumień przerwany: {error}")
+            return
+        if len(wavelengths):
+            self.canvas.append_live_data(wavelengths, raw, filtered)
+        if self.stream.ended:
+            # Źródło zamknęło połączenie - dopisanie wstrzymanych próbek i zatrzymanie strumienia
+            self.stop_stream()
+            self.stream_status_label.setText(f"Strumień zakończony przez źródło. {self.stream_status_label.text()}")
+            return
+        self.show_stream_stats()
+        
+    def show_stream_stats(self):
+        """Wyświetlenie liczników strumienia (próbki, utracone, opóźnienie)"""
+        stats = self.stream.stats()
+        self.stream_status_label.setText(
+            f"Strumień: {stats['samples_received']} próbek, utracono {stats['samples_dropped']}, "
+            f"opóźnienie {stats['last_latency'] * 1000:.1f} ms "
+            f"(średnio {stats['mean_latency'] * 1000:.1f} ms, maks. {stats['max_latency'] * 1000:.1f} ms)")
+        
+    def update_simulation_data(self, time_point, habitability_index, temperature, pressure, conditions=None):
+        """
+        Aktualizacja danych symulacji
+        
+        Parametry:
+        - conditions: pozostałe parametry modelu (radiation, ph, oxygen, nitrogen, co2) dla strefy habitabilności
+        """
+        if conditions is not None:
+            self.simulation_conditions.update(conditions)
         self.simulation_time_points.append(time_point)
         self.simulation_habitability_indices.append(habitability_index)
         self.simulation_temperature_values.append(temperature)
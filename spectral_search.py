@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import numpy as np
+
+from modules.dtype_policy import ACCUMULATOR_DTYPE
+
+# Końcówka nazwy pliku indeksu zapisywanego obok pliku biblioteki widm
+INDEX_FILE_SUFFIX = ".index.npz"
+
+
+def resample_spectra(spectra, grid):
+    """
+    Przeniesienie widm na wspólną siatkę długości fal i normalizacja kształtu
+
+    Parametry:
+    - spectra: lista par (długości fal, intensywności)
+    - grid: wspólna siatka długości fal
+
+    Zwraca macierz (liczba widm × len(grid)) o zerowej średniej i jednostkowej normie wierszy
+    """
+    resampled = np.empty((len(spectra), len(grid)), dtype=ACCUMULATOR_DTYPE)
+    for row, (wavelengths, intensities) in enumerate(spectra):
+        resampled[row] = np.interp(grid, wavelengths, intensities)
+
+    resampled -= resampled.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(resampled, axis=1, keepdims=True)
+    resampled /= np.where(norms > 0, norms, 1)
+    return resampled
+
+
+class IncrementalPCA:
+    """
+    Strumieniowa analiza PCA dopasowywana partiami
+
+    Akumuluje liczbę próbek, sumę i macierz iloczynów w precyzji float64,
+    więc pamięć nie zależy od liczby widm, a wynik jest identyczny jak
+    dla PCA na całym zbiorze naraz.
+    """
+
+    def __init__(self, n_components):
+        self.n_components = n_components
+        self.n_samples = 0
+        self._sum = None
+        self._outer = None
+        self.mean = None
+        self.components = None
+        self.explained_variance = None
+
+    def partial_fit(self, batch):
+        """Dołączenie partii próbek (wiersze) do akumulatorów"""
+        batch = np.asarray(batch, dtype=ACCUMULATOR_DTYPE)
+        if self._sum is None:
+            self._sum = np.zeros(batch.shape[1], dtype=ACCUMULATOR_DTYPE)
+            self._outer = np.zeros((batch.shape[1], batch.shape[1]), dtype=ACCUMULATOR_DTYPE)
+        self.n_samples += len(batch)
+        self._sum += batch.sum(axis=0)
+        self._outer += batch.T @ batch
+        return self
+
+    def finalize(self):
+        """Wyznaczenie składowych głównych z akumulatorów"""
+        if self.n_samples < 2:
+            raise ValueError("Za mało próbek do wyznaczenia PCA")
+        self.mean = self._sum / self.n_samples
+        covariance = (self._outer - self.n_samples * np.outer(self.mean, self.mean)) / (self.n_samples - 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:self.n_components]
+        self.explained_variance = eigenvalues[order]
+        self.components = eigenvectors[:, order].T
+        return self
+
+    def transform(self, batch):
+        """Rzutowanie próbek na składowe główne (osadzenia float32)"""
+        batch = np.asarray(batch, dtype=ACCUMULATOR_DTYPE)
+        return ((batch - self.mean) @ self.components.T).astype(np.float32)
+
+
+def _squared_distances(points, centers):
+    """Kwadraty odległości euklidesowych (punkty × centra)"""
+    distances = (np.einsum('ij,ij->i', points, points)[:, None]
+                 - 2 * points @ centers.T
+                 + np.einsum('ij,ij->i', centers, centers)[None, :])
+    return np.maximum(distances, 0)
+
+
+class SpectralSearchIndex:
+    """
+    Indeks podobieństwa widm: osadzenia PCA + podział na partycje (IVF)
+
+    Osadzenia są grupowane algorytmem k-średnich w partycje; zapytanie
+    przeszukuje dokładnie tylko n_probe najbliższych partycji
+    (n_probe = liczba partycji daje wyszukiwanie dokładne). Nowe widma
+    można dopisywać bez przebudowy indeksu.
+    """
+
+    def __init__(self, grid=None, n_components=16, n_partitions=64):
+        """
+        Parametry:
+        - grid: wspólna siatka długości fal (domyślnie 256 punktów 300-1000 nm)
+        - n_components: wymiar osadzenia
+        - n_partitions: liczba partycji indeksu
+        """
+        self.grid = np.linspace(300, 1000, 256) if grid is None else np.asarray(grid, dtype=ACCUMULATOR_DTYPE)
+        self.n_components = n_components
+        self.n_partitions = n_partitions
+        self.pca = IncrementalPCA(n_components)
+        self.centroids = None
+        self.ids = np.empty(0, dtype=np.int64)
+        self.embeddings = np.empty((0, n_components), dtype=np.float32)
+        self.labels = np.empty(0, dtype=np.int32)
+        self._order = None
+        self._offsets = None
+
+    def fit(self, library, batch_size=1024, kmeans_iterations=20, kmeans_sample=50000, seed=0):
+        """
+        Budowa indeksu na podstawie całej biblioteki widm
+
+        Pierwsze przejście dopasowuje PCA partiami, drugie liczy osadzenia;
+        partycje wyznaczane są na próbce osadzeń.
+        """
+        for _, spectra in library.iter_spectra(batch_size):
+            self.pca.partial_fit(resample_spectra(spectra, self.grid))
+        self.pca.finalize()
+
+        ids = []
+        embeddings = []
+        for batch_ids, spectra in library.iter_spectra(batch_size):
+            ids.append(batch_ids)
+            embeddings.append(self.embed(spectra))
+        ids = np.concatenate(ids)
+        embeddings = np.concatenate(embeddings)
+
+        rng = np.random.default_rng(seed)
+        sample = embeddings[rng.choice(len(embeddings), min(kmeans_sample, len(embeddings)), replace=False)]
+        self.centroids = self._kmeans(sample, min(self.n_partitions, len(sample)), kmeans_iterations, rng)
+
+        self.ids = np.empty(0, dtype=np.int64)
+        self.embeddings = np.empty((0, self.n_components), dtype=np.float32)
+        self.labels = np.empty(0, dtype=np.int32)
+        self._add_embeddings(ids, embeddings)
+        return self
+
+    @staticmethod
+    def _kmeans(points, k, iterations, rng):
+        """Algorytm k-średnich (Lloyd) na osadzeniach"""
+        centers = points[rng.choice(len(points), k, replace=False)].astype(ACCUMULATOR_DTYPE)
+        for _ in range(iterations):
+            labels = np.argmin(_squared_distances(points, centers), axis=1)
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, points)
+            nonempty = counts > 0
+            centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+        return centers.astype(np.float32)
+
+    def embed(self, spectra):
+        """Osadzenie listy widm (długości fal, intensywności) w przestrzeni PCA"""
+        return self.pca.transform(resample_spectra(spectra, self.grid))
+
+    def _add_embeddings(self, ids, embeddings):
+        labels = np.argmin(_squared_distances(embeddings, self.centroids), axis=1).astype(np.int32)
+        self.ids = np.concatenate([self.ids, ids])
+        self.embeddings = np.concatenate([self.embeddings, embeddings])
+        self.labels = np.concatenate([self.labels, labels])
+        self._order = None
+
+    def add_spectra(self, ids, spectra):
+        """Dopisanie nowych widm do indeksu (bez ponownego dopasowania PCA i partycji)"""
+        if self.centroids is None:
+            raise RuntimeError("Indeks nie został zbudowany")
+        self._add_embeddings(np.asarray(ids, dtype=np.int64), self.embed(spectra))
+
+    def update_from_library(self, library, batch_size=1024):
+        """Dopisanie widm zaimportowanych do biblioteki od ostatniej aktualizacji"""
+        last_id = int(self.ids.max()) if len(self.ids) else None
+        added = 0
+        for batch_ids, spectra in library.iter_spectra(batch_size, min_id=last_id):
+            self.add_spectra(batch_ids, spectra)
+            added += len(batch_ids)
+        return added
+
+    def _ensure_sorted(self):
+        if self._order is None:
+            self._order = np.argsort(self.labels, kind='stable')
+            self._offsets = np.searchsorted(self.labels[self._order], np.arange(len(self.centroids) + 1))
+
+    def query(self, wavelengths, intensities, k=5, n_probe=4):
+        """
+        Wyszukanie k widm najbardziej podobnych do podanego
+
+        Zwraca listę par (identyfikator widma, odległość w przestrzeni osadzeń)
+        """
+        if self.centroids is None:
+            raise RuntimeError("Indeks nie został zbudowany")
+        self._ensure_sorted()
+
+        embedding = self.embed([(wavelengths, intensities)])
+        probes = np.argsort(_squared_distances(embedding, self.centroids)[0])[:n_probe]
+        candidates = np.concatenate([self._order[self._offsets[p]:self._offsets[p + 1]] for p in probes])
+        if len(candidates) == 0:
+            return []
+
+        distances = _squared_distances(embedding, self.embeddings[candidates])[0]
+        k = min(k, len(candidates))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [(int(self.ids[candidates[i]]), float(np.sqrt(distances[i]))) for i in nearest]
+
+    def save(self, path):
+        """Zapis indeksu do pliku .npz"""
+        np.savez(path, grid=self.grid, n_components=self.n_components, n_partitions=self.n_partitions,
+                 n_samples=self.pca.n_samples, pca_sum=self.pca._sum, pca_outer=self.pca._outer,
+                 mean=self.pca.mean, components=self.pca.components,
+                 explained_variance=self.pca.explained_variance, centroids=self.centroids,
+                 ids=self.ids, embeddings=self.embeddings, labels=self.labels)
+
+    @classmethod
+    def load(cls, path):
+        """Odczyt indeksu zapisanego metodą save"""
+        with np.load(path) as data:
+            index = cls(data['grid'], int(data['n_components']), int(data['n_partitions']))
+            index.pca.n_samples = int(data['n_samples'])
+            index.pca._sum = data['pca_sum']
+            index.pca._outer = data['pca_outer']
+            index.pca.mean = data['mean']
+            index.pca.components = data['components']
+            index.pca.explained_variance = data['explained_variance']
+            index.centroids = data['centroids']
+            index.ids = data['ids']
+            index.embeddings = data['embeddings']
+            index.labels = data['labels']
+        return index
+
+
+def index_path_for(library_path):
+    """Ścieżka pliku indeksu podobieństwa zapisywanego obok biblioteki widm"""
+    return os.path.splitext(library_path)[0] + INDEX_FILE_SUFFIX
+
+
+def update_search_index(library, index_path, **fit_options):
+    """
+    Aktualizacja indeksu podobieństwa biblioteki po imporcie widm
+
+    Istniejący indeks jest wczytywany i uzupełniany o widma dodane od
+    ostatniej aktualizacji (update_from_library), a przy braku pliku
+    indeksu budowany od nowa (fit); zmieniony indeks jest zapisywany.
+
+    Parametry:
+    - library: biblioteka widm (SpectralLibrary)
+    - index_path: plik indeksu (.npz)
+    - fit_options: parametry SpectralSearchIndex.fit przy budowie od nowa
+
+    Zwraca (indeks, liczba dopisanych widm)
+    """
+    if os.path.exists(index_path):
+        index = SpectralSearchIndex.load(index_path)
+        added = index.update_from_library(library)
+    else:
+        index = SpectralSearchIndex().fit(library, **fit_options)
+        added = len(index.ids)
+    if added:
+        index.save(index_path)
+    return index, added
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import socket
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+from scipy.ndimage import gaussian_filter1d, median_filter
+from scipy.signal import lfilter
+
+from modules.dtype_policy import ACCUMULATOR_DTYPE, as_storage
+
+
+class LineStreamSource(ABC):
+    """
+    Bazowe źródło strumienia próbek w formacie tekstowym
+
+    Każda linia ma postać: numer_próbki,długość_fali,intensywność[,znacznik_czasu]
+    (znacznik czasu w sekundach epoki, moment akwizycji). Niepełne linie
+    są buforowane do następnego odczytu. Atrybut ended oznacza, że źródło
+    zakończyło nadawanie (np. nadawca zamknął połączenie).
+    """
+
+    def __init__(self):
+        self._pending = b""
+        self.ended = False
+
+    @abstractmethod
+    def _read_bytes(self):
+        """Odczyt nowych bajtów ze źródła (nieblokujący)"""
+
+    def read(self):
+        """
+        Odczyt nowych próbek
+
+        Zwraca tablice (numery próbek, długości fal, intensywności, znaczniki czasu)
+        """
+        data = self._pending + self._read_bytes()
+        end = data.rfind(b"\n") + 1
+        # Po zakończeniu źródła niepełny ostatni rekord nie zostanie już uzupełniony
+        self._pending = b"" if self.ended else data[end:]
+        lines = [line for line in data[:end].splitlines() if line.strip()]
+        if not lines:
+            empty = np.empty(0)
+            return np.empty(0, dtype=np.int64), empty, empty, empty
+
+        received_at = time.time()
+        rows = [line.split(b",") for line in lines]
+        sequence = np.array([int(row[0]) for row in rows], dtype=np.int64)
+        wavelengths = np.array([float(row[1]) for row in rows], dtype=ACCUMULATOR_DTYPE)
+        intensities = np.array([float(row[2]) for row in rows], dtype=ACCUMULATOR_DTYPE)
+        timestamps = np.array([float(row[3]) if len(row) > 3 else received_at for row in rows])
+        return sequence, wavelengths, intensities, timestamps
+
+    def close(self):
+        """Zamknięcie źródła"""
+        pass
+
+
+class FileTailSource(LineStreamSource):
+    """Źródło śledzące przyrastający plik (jak tail -f)"""
+
+    def __init__(self, path, from_start=True):
+        super().__init__()
+        self.path = path
+        self._offset = 0 if from_start or not os.path.exists(path) else os.path.getsize(path)
+
+    def _read_bytes(self):
+        if not os.path.exists(self.path):
+            return b""
+        size = os.path.getsize(self.path)
+        if size < self._offset:
+            # Plik został obcięty lub zastąpiony - czytamy od początku
+            self._offset = 0
+            self._pending = b""
+        if size == self._offset:
+            return b""
+        with open(self.path, "rb") as stream_file:
+            stream_file.seek(self._offset)
+            data = stream_file.read(size - self._offset)
+        self._offset += len(data)
+        return data
+
+
+class SocketSource(LineStreamSource):
+    """Źródło czytające próbki z lokalnego gniazda TCP (zastępczo dla spektrometru)"""
+
+    def __init__(self, host="127.0.0.1", port=5555):
+        super().__init__()
+        self.socket = socket.create_connection((host, port))
+        self.socket.setblocking(False)
+
+    def _read_bytes(self):
+        if self.ended:
+            return b""
+        parts = []
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except BlockingIOError:
+                break
+            if not data:
+                # Nadawca zamknął połączenie
+                self.ended = True
+                self.close()
+                break
+            parts.append(data)
+        return b"".join(parts)
+
+    def close(self):
+        self.socket.close()
+
+
+def open_stream_source(address):
+    """
+    Źródło strumienia dla adresu podanego przez użytkownika
+
+    "host:port" (port liczbowy) otwiera gniazdo TCP, każdy inny adres
+    jest ścieżką śledzonego pliku.
+    """
+    address = address.strip()
+    host, separator, port = address.rpartition(":")
+    if separator and host and port.isdigit() and not os.path.exists(address):
+        return SocketSource(host, int(port))
+    return FileTailSource(address)
+
+
+class StreamingKalmanFilter:
+    """Filtr Kalmana (stałe wzmocnienie) z rekurencją przenoszoną między fragmentami"""
+
+    def __init__(self, kalman_gain=0.75):
+        self.kalman_gain = kalman_gain
+        self._state = None
+
+    def process(self, samples):
+        if len(samples) == 0:
+            return samples
+        samples = np.asarray(samples, dtype=ACCUMULATOR_DTYPE)
+        if self._state is None:
+            # Pierwsza próbka przechodzi bez zmian, jak w filtrze wsadowym
+            self._state = np.array([(1 - self.kalman_gain) * samples[0]])
+        filtered, self._state = lfilter([self.kalman_gain], [1, -(1 - self.kalman_gain)],
+                                        samples, zi=self._state)
+        return filtered
+
+    def flush(self):
+        return np.empty(0, dtype=ACCUMULATOR_DTYPE)
+
+
+class StreamingWindowFilter:
+    """
+    Filtr okienkowy (Gaussa, medianowy) z buforem nakładki
+
+    Przechowuje tylko 2 * radius ostatnich próbek, więc każdy fragment
+    jest filtrowany w czasie O(fragment); wynik jest opóźniony o radius próbek.
+    """
+
+    def __init__(self, function, radius):
+        self.function = function
+        self.radius = radius
+        self._buffer = np.empty(0, dtype=ACCUMULATOR_DTYPE)
+        self._started = False
+
+    def process(self, samples):
+        buffer = np.concatenate([self._buffer, np.asarray(samples, dtype=ACCUMULATOR_DTYPE)])
+        start = self.radius if self._started else 0
+        end = len(buffer) - self.radius
+        if end <= start:
+            self._buffer = buffer
+            return np.empty(0, dtype=ACCUMULATOR_DTYPE)
+
+        filtered = self.function(buffer)[start:end]
+        self._buffer = buffer[end - self.radius:]
+        self._started = True
+        return filtered
+
+    def flush(self):
+        """Wyprowadzenie próbek wstrzymanych na końcu strumienia"""
+        if len(self._buffer) == 0:
+            return np.empty(0, dtype=ACCUMULATOR_DTYPE)
+        start = self.radius if self._started else 0
+        filtered = self.function(self._buffer)[start:]
+        self._buffer = np.empty(0, dtype=ACCUMULATOR_DTYPE)
+        return filtered
+
+
+class PassThroughFilter:
+    """Brak filtrowania"""
+
+    def process(self, samples):
+        return np.asarray(samples, dtype=ACCUMULATOR_DTYPE)
+
+    def flush(self):
+        return np.empty(0, dtype=ACCUMULATOR_DTYPE)
+
+
+def create_stream_filter(filter_type):
+    """Utworzenie filtra strumieniowego odpowiadającego algorytmowi z SpectralModule.apply_filter"""
+    if filter_type == "Filtr Kalmana":
+        return StreamingKalmanFilter()
+    elif filter_type == "Filtr Gaussa":
+        # Promień jądra jak w scipy (truncate=4.0, sigma=2)
+        return StreamingWindowFilter(lambda samples: gaussian_filter1d(samples, sigma=2), radius=8)
+    elif filter_type == "Filtr medianowy":
+        return StreamingWindowFilter(lambda samples: median_filter(samples, size=5, mode='constant'), radius=2)
+    else:
+        return PassThroughFilter()
+
+
+class SpectralStream:
+    """
+    Strumień widmowy: źródło próbek + filtr z ciągłym stanem + liczniki
+
+    Raportuje opóźnienie od akwizycji do przefiltrowania oraz liczbę
+    próbek utraconych (luki w numeracji oraz przepełnienie kolejki).
+    """
+
+    def __init__(self, source, filter_type="Filtr Kalmana", max_backlog=100000):
+        """
+        Parametry:
+        - source: źródło próbek (FileTailSource, SocketSource)
+        - filter_type: nazwa algorytmu filtrowania
+        - max_backlog: maksymalna liczba próbek przetwarzanych w jednym odczycie;
+          starsze próbki ponad limit są odrzucane i liczone jako utracone
+        """
+        self.source = source
+        self.filter = create_stream_filter(filter_type)
+        self.max_backlog = max_backlog
+        self.samples_received = 0
+        self.samples_dropped = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        self._last_sequence = None
+        # Próbki wstrzymane przez filtr okienkowy (czekające na kontekst z prawej)
+        self._held_wavelengths = np.empty(0, dtype=ACCUMULATOR_DTYPE)
+        self._held_raw = np.empty(0, dtype=ACCUMULATOR_DTYPE)
+        self._held_timestamps = np.empty(0)
+
+    def poll(self):
+        """
+        Odczyt i przefiltrowanie nowych próbek
+
+        Zwraca (długości fal, intensywności surowe, intensywności przefiltrowane)
+        dla próbek, których wynik filtra jest już dostępny
+        """
+        sequence, wavelengths, intensities, timestamps = self.source.read()
+        empty = as_storage(np.empty(0), 'spectra')
+        if len(sequence) == 0:
+            return empty, empty, empty
+
+        # Luki w numeracji próbek
+        previous = sequence[0] - 1 if self._last_sequence is None else self._last_sequence
+        gaps = np.diff(sequence, prepend=previous) - 1
+        self.samples_dropped += int(np.maximum(gaps, 0).sum())
+        self._last_sequence = int(sequence[-1])
+
+        # Przepełnienie kolejki - zachowujemy najnowsze próbki
+        if len(sequence) > self.max_backlog:
+            overflow = len(sequence) - self.max_backlog
+            self.samples_dropped += overflow
+            wavelengths, intensities, timestamps = (wavelengths[overflow:], intensities[overflow:],
+                                                     timestamps[overflow:])
+        self.samples_received += len(wavelengths)
+
+        self._held_wavelengths = np.concatenate([self._held_wavelengths, wavelengths])
+        self._held_timestamps = np.concatenate([self._held_timestamps, timestamps])
+        self._held_raw = np.concatenate([self._held_raw, intensities])
+        return self._release(self.filter.process(intensities))
+
+    def flush(self):
+        """
+        Wyprowadzenie próbek wstrzymanych przez filtr okienkowy (koniec strumienia)
+
+        Zwraca (długości fal, intensywności surowe, intensywności przefiltrowane)
+        """
+        return self._release(self.filter.flush())
+
+    def _release(self, filtered):
+        """Wydanie najstarszych wstrzymanych próbek, dla których filtr zwrócił wynik"""
+        ready = len(filtered)
+        wavelengths, self._held_wavelengths = self._held_wavelengths[:ready], self._held_wavelengths[ready:]
+        timestamps, self._held_timestamps = self._held_timestamps[:ready], self._held_timestamps[ready:]
+        raw, self._held_raw = self._held_raw[:ready], self._held_raw[ready:]
+
+        if ready:
+            latencies = time.time() - timestamps
+            self.last_latency = float(latencies[-1])
+            self.max_latency = max(self.max_latency, float(latencies.max()))
+            self._latency_sum += float(latencies.sum())
+            self._latency_count += ready
+
+        return (as_storage(wavelengths, 'spectra'), as_storage(raw, 'spectra'),
+                as_storage(filtered, 'spectra'))
+
+    @property
+    def mean_latency(self):
+        """Średnie opóźnienie od akwizycji do przefiltrowania (s)"""
+        return self._latency_sum / self._latency_count if self._latency_count else 0.0
+
+    def stats(self):
+        """Liczniki strumienia"""
+        return {
+            'samples_received': self.samples_received,
+            'samples_dropped': self.samples_dropped,
+            'last_latency': self.last_latency,
+            'mean_latency': self.mean_latency,
+            'max_latency': self.max_latency,
+        }
+
+    @property
+    def ended(self):
+        """Czy źródło zakończyło nadawanie"""
+        return self.source.ended
+
+    def close(self):
+        """Zamknięcie źródła strumienia"""
+        self.source.close()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+import numpy as np
+from scipy import stats
+
+# Maksymalny stopień wielomianu dla każdego parametru
+MAX_DEGREE = 3
+
+# Domyślny rozmiar porcji danych (wiersze)
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def _basis_transform(source_shift, source_scale, target_shift, target_scale, degree):
+    """
+    Macierz przejścia między bazami potęg (x - s) / c dla wielu parametrów
+
+    Cechy w kolejności [1, t1, t1², ..., t1^d, t2, ..., tk^d]. Zwraca T
+    taką, że cechy w bazie docelowej = T @ cechy w bazie źródłowej.
+    """
+    n_parameters = len(source_shift)
+    size = 1 + n_parameters * degree
+    transform = np.zeros((size, size))
+    transform[0, 0] = 1.0
+    for parameter in range(n_parameters):
+        # t_target = a * t_source + b
+        a = source_scale[parameter] / target_scale[parameter]
+        b = (source_shift[parameter] - target_shift[parameter]) / target_scale[parameter]
+        offset = 1 + parameter * degree
+        for power in range(1, degree + 1):
+            for source_power in range(power + 1):
+                value = comb(power, source_power) * a ** source_power * b ** (power - source_power)
+                column = 0 if source_power == 0 else offset + source_power - 1
+                transform[offset + power - 1, column] += value
+    return transform
+
+
+def polynomial_features(x, shift, scale, degree):
+    """Macierz cech [1, t1..t1^d, ..., tk..tk^d] dla t = (x - shift) / scale (wiersze × cechy)"""
+    x = np.asarray(x, dtype=np.float64).reshape(-1, len(shift))
+    t = (x - shift) / scale
+    powers = t[:, :, None] ** np.arange(1, degree + 1)
+    return np.hstack([np.ones((len(x), 1)), powers.reshape(len(x), -1)])
+
+
+class RegressionAccumulator:
+    """
+    Strumieniowa regresja wielomianowa wielu parametrów
+
+    Dane przetwarzane są porcjami w jednym przebiegu. Przechowywane są
+    wyłącznie statystyki dostateczne: średnie i współmomenty parametrów
+    i odpowiedzi (Welford/Chan), macierz Grama cech wielomianowych
+    G = Σ φ φᵀ, wektor Σ φ (y - y₀) oraz Σ (y - y₀)². Cechy liczone są
+    w przesuniętej i przeskalowanej bazie (x - s) / c ustalonej przy
+    pierwszej porcji, co ogranicza utratę precyzji dla dużych wartości.
+    Częściowe wyniki z równoległych procesów łączy merge().
+
+    Model: y = β₀ + Σ_j Σ_p β_jp t_j^p (wielomian każdego parametru bez
+    członów mieszanych; dla jednego parametru zwykły wielomian).
+    """
+
+    def __init__(self, n_parameters=1, degree=1):
+        if not 1 <= degree <= MAX_DEGREE:
+            raise ValueError(f"Stopień wielomianu musi być z zakresu 1-{MAX_DEGREE}")
+        self.n_parameters = n_parameters
+        self.degree = degree
+        self.count = 0
+
+        # Welford: średnie i współmomenty [x1..xk, y]
+        self.mean = np.zeros(n_parameters + 1)
+        self.comoment = np.zeros((n_parameters + 1, n_parameters + 1))
+
+        # Baza cech i statystyki najmniejszych kwadratów
+        self.shift = None
+        self.scale = None
+        self.y_shift = 0.0
+        size = 1 + n_parameters * degree
+        self.gram = np.zeros((size, size))
+        self.moment = np.zeros(size)
+        self.y_square = 0.0
+
+    def update(self, x, y):
+        """
+        Dodanie porcji danych
+
+        Parametry:
+        - x: tablica (wiersze) lub (wiersze × parametry)
+        - y: tablica odpowiedzi (wiersze)
+        """
+        x = np.asarray(x, dtype=np.float64).reshape(-1, self.n_parameters)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        valid = np.isfinite(x).all(axis=1) & np.isfinite(y)
+        x, y = x[valid], y[valid]
+        if len(y) == 0:
+            return self
+
+        if self.shift is None:
+            # Baza ustalana na podstawie pierwszej porcji
+            self.shift = x.mean(axis=0)
+            spread = x.std(axis=0)
+            self.scale = np.where(spread > 0, spread, 1.0)
+            self.y_shift = float(y.mean())
+
+        # Welford/Chan: połączenie statystyk porcji z dotychczasowymi
+        data = np.column_stack([x, y])
+        chunk_mean = data.mean(axis=0)
+        centered = data - chunk_mean
+        self._merge_moments(len(y), chunk_mean, centered.T @ centered)
+
+        # Statystyki najmniejszych kwadratów
+        phi = polynomial_features(x, self.shift, self.scale, self.degree)
+        residual = y - self.y_shift
+        self.gram += phi.T @ phi
+        self.moment += phi.T @ residual
+        self.y_square += float(residual @ residual)
+        return self
+
+    def _merge_moments(self, count, mean, comoment):
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean += delta * (count / total)
+        self.count = total
+
+    def merge(self, other):
+        """Dołączenie częściowego wyniku innego akumulatora (np. z innego procesu)"""
+        if other.count == 0:
+            return self
+        if (other.n_parameters, other.degree) != (self.n_parameters, self.degree):
+            raise ValueError("Akumulatory mają różną liczbę parametrów lub stopień wielomianu")
+        if self.count == 0:
+            self.__dict__.update({key: np.copy(value) if isinstance(value, np.ndarray) else value
+                                  for key, value in other.__dict__.items()})
+            return self
+
+        # Przeniesienie statystyk drugiego akumulatora do bazy tego akumulatora
+        transform = _basis_transform(other.shift, other.scale, self.shift, self.scale, self.degree)
+        gram = transform @ other.gram @ transform.T
+        feature_sums = gram[:, 0]
+        difference = other.y_shift - self.y_shift
+        moment = transform @ other.moment + difference * feature_sums
+        y_square = other.y_square + 2 * difference * other.moment[0] + other.count * difference ** 2
+
+        self._merge_moments(other.count, other.mean, other.comoment)
+        self.gram += gram
+        self.moment += moment
+        self.y_square += y_square
+        return self
+
+    def covariance(self):
+        """Macierz kowariancji [x1..xk, y] (estymator nieobciążony)"""
+        return self.comoment / max(self.count - 1, 1)
+
+    def correlation(self):
+        """Macierz korelacji Pearsona [x1..xk, y]"""
+        deviation = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.comoment / np.outer(deviation, deviation)
+
+    def fit(self, degree=None):
+        """
+        Dopasowanie modelu na podstawie zgromadzonych statystyk (RegressionResult)
+
+        Parametry:
+        - degree: stopień wielomianu nie większy niż stopień akumulatora
+          (None - stopień akumulatora); niższy stopień korzysta z podmacierzy
+          tych samych statystyk, bez ponownego przebiegu po danych
+        """
+        degree = self.degree if degree is None else degree
+        if not 1 <= degree <= self.degree:
+            raise ValueError(f"Stopień wielomianu musi być z zakresu 1-{self.degree}")
+        features = np.concatenate([[0], (1 + np.arange(self.n_parameters)[:, None] * self.degree
+                                         + np.arange(degree)).ravel()])
+        gram = self.gram[np.ix_(features, features)]
+        moment = self.moment[features]
+        if self.count <= len(features):
+            raise ValueError("Za mało danych do dopasowania modelu")
+        gram_inverse = np.linalg.pinv(gram)
+        beta = gram_inverse @ moment
+        residual_sum = max(self.y_square - float(beta @ moment), 0.0)
+        total_sum = self.comoment[-1, -1]
+        r_squared = 1 - residual_sum / total_sum if total_sum > 0 else 1.0
+        return RegressionResult(self, beta, gram_inverse, residual_sum, r_squared, degree)
+
+
+class RegressionResult:
+    """Wynik regresji: współczynniki, R², przewidywania i pasma ufności"""
+
+    def __init__(self, accumulator, beta, gram_inverse, residual_sum, r_squared, degree=None):
+        self.n_parameters = accumulator.n_parameters
+        self.degree = accumulator.degree if degree is None else degree
+        self.count = accumulator.count
+        self.shift = accumulator.shift.copy()
+        self.scale = accumulator.scale.copy()
+        self.y_shift = accumulator.y_shift
+        self.beta = beta
+        self.gram_inverse = gram_inverse
+        self.r_squared = r_squared
+        self.degrees_of_freedom = self.count - len(beta)
+        self.residual_variance = residual_sum / self.degrees_of_freedom
+        self.correlation = accumulator.correlation()[:-1, -1]
+
+    @property
+    def coefficients(self):
+        """
+        Współczynniki w zwykłej bazie potęg x
+
+        Dla jednego parametru - kolejność jak w np.polyfit (od najwyższej
+        potęgi); dla wielu - (wyraz wolny, macierz parametry × potęgi 1..d).
+        """
+        zero = np.zeros(self.n_parameters)
+        one = np.ones(self.n_parameters)
+        transform = _basis_transform(self.shift, self.scale, zero, one, self.degree)
+        # Cechy w bazie wyniku = T⁻¹ @ cechy w bazie potęg x
+        beta = np.linalg.solve(transform.T, self.beta)
+        beta[0] += self.y_shift
+        if self.n_parameters == 1:
+            return beta[::-1]
+        return beta[0], beta[1:].reshape(self.n_parameters, self.degree)
+
+    def predict(self, x):
+        """Przewidywane wartości odpowiedzi"""
+        return polynomial_features(x, self.shift, self.scale, self.degree) @ self.beta + self.y_shift
+
+    def confidence_band(self, x, level=0.95):
+        """
+        Pasmo ufności dla wartości średniej odpowiedzi
+
+        Zwraca (przewidywanie, dolna granica, górna granica)
+        """
+        phi = polynomial_features(x, self.shift, self.scale, self.degree)
+        prediction = phi @ self.beta + self.y_shift
+        standard_error = np.sqrt(np.maximum(np.einsum('ij,jk,ik->i', phi, self.gram_inverse, phi), 0)
+                                 * self.residual_variance)
+        critical = stats.t.ppf(0.5 + level / 2, self.degrees_of_freedom)
+        return prediction, prediction - critical * standard_error, prediction + critical * standard_error
+
+
+class ReservoirSample:
+    """
+    Losowa próbka stałej wielkości ze strumienia porcji danych (do wykresu punktowego)
+
+    Każdy wiersz dostaje losowy klucz; próbkę tworzą wiersze o najmniejszych
+    kluczach, co daje próbkę jednostajną bez znajomości liczby wierszy.
+    """
+
+    def __init__(self, size=2000, seed=None):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.rows = None
+
+    def update(self, rows):
+        rows = np.asarray(rows, dtype=np.float64)
+        keys = np.concatenate([self.keys, self.rng.random(len(rows))])
+        rows = rows if self.rows is None else np.concatenate([self.rows, rows])
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keys, rows = keys[keep], rows[keep]
+        self.keys, self.rows = keys, rows
+        return self
+
+
+def csv_columns(path):
+    """Nazwy kolumn z nagłówka pliku CSV"""
+    with open(path, encoding="utf-8", newline="") as data_file:
+        header = next(csv.reader(data_file), None)
+    if not header:
+        raise ValueError(f"Plik {path} nie ma nagłówka z nazwami kolumn")
+    return header
+
+
+def iter_csv_chunks(path, x_columns, y_column, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Odczyt pliku CSV porcjami (bez wczytywania całości do pamięci)
+
+    Zwraca generator par (x: wiersze × parametry, y: wiersze)
+    """
+    columns = list(x_columns) + [y_column]
+    with open(path, encoding="utf-8", newline="") as data_file:
+        reader = csv.reader(data_file)
+        header = next(reader)
+        positions = [header.index(column) for column in columns]
+        rows = []
+        for record in reader:
+            try:
+                rows.append([float(record[position]) for position in positions])
+            except (ValueError, IndexError):
+                continue
+            if len(rows) == chunk_rows:
+                block = np.array(rows)
+                yield block[:, :-1], block[:, -1]
+                rows = []
+        if rows:
+            block = np.array(rows)
+            yield block[:, :-1], block[:, -1]
+
+
+def accumulate_csv(path, x_columns, y_column, degree=1, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Akumulator regresji dla jednego pliku CSV (jeden przebieg porcjami)"""
+    accumulator = RegressionAccumulator(len(x_columns), degree)
+    for x, y in iter_csv_chunks(path, x_columns, y_column, chunk_rows):
+        accumulator.update(x, y)
+    return accumulator
+
+
+def statistics_with_sample(path, x_columns, y_column, degree=MAX_DEGREE, sample_size=2000,
+                           chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Statystyki regresji dla pliku CSV wraz z losową próbką punktów do wykresu
+
+    Jeden przebieg porcjami; akumulator o stopniu degree pozwala dopasować
+    także modele niższych stopni (RegressionAccumulator.fit(degree)).
+
+    Zwraca (RegressionAccumulator, próbka x, próbka y)
+    """
+    accumulator = RegressionAccumulator(len(x_columns), degree)
+    sample = ReservoirSample(sample_size)
+    for x, y in iter_csv_chunks(path, x_columns, y_column, chunk_rows):
+        accumulator.update(x, y)
+        sample.update(np.column_stack([x, y]))
+    if sample.rows is None:
+        raise ValueError(f"Brak danych liczbowych w pliku {path}")
+    return accumulator, sample.rows[:, :-1], sample.rows[:, -1]
+
+
+def regression_with_sample(path, x_columns, y_column, degree=1, sample_size=2000, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Regresja dla pliku CSV wraz z losową próbką punktów do wykresu
+
+    Zwraca (RegressionResult, próbka x, próbka y)
+    """
+    accumulator, x_sample, y_sample = statistics_with_sample(path, x_columns, y_column, degree, sample_size,
+                                                             chunk_rows)
+    return accumulator.fit(), x_sample, y_sample
+
+
+def accumulate_files(paths, x_columns, y_column, degree=1, max_workers=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Regresja dla wielu plików liczona równolegle w procesach
+
+    Każdy proces zwraca częściowy akumulator, które są następnie łączone.
+    """
+    paths = list(paths)
+    total = RegressionAccumulator(len(x_columns), degree)
+    if len(paths) == 1 or max_workers == 1:
+        for path in paths:
+            total.merge(accumulate_csv(path, x_columns, y_column, degree, chunk_rows))
+        return total
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        partials = executor.map(accumulate_csv, paths, [list(x_columns)] * len(paths), [y_column] * len(paths),
+                                [degree] * len(paths), [chunk_rows] * len(paths))
+        for partial in partials:
+            total.merge(partial)
+    return total
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from scipy import ndimage, sparse
+from scipy.sparse.csgraph import connected_components
+
+# Rozmiar siatki powierzchni (pasy szerokości równopolowe × pasy długości)
+ZONE_GRID_SHAPE = (90, 180)
+
+# Najmniejsza strefa (ułamek powierzchni planety) - mniejsze skupiska są pomijane
+ZONE_MIN_AREA = 0.002
+
+# Długość średniego wektora komórek strefy, poniżej której środek jest nieokreślony
+# (np. pas wokół całej planety) - wtedy środkiem jest komórka z ekstremum pola
+MIN_RESULTANT_LENGTH = 0.05
+
+# Strefy-skupiska to komórki z górnej części zakresu pola (ułamek zakresu od maksimum);
+# pole o mniejszym zakresie uznawane jest za jednorodne
+HOTSPOT_FRACTION = 0.25
+MIN_FIELD_CONTRAST = 2.0
+
+
+def grid_coordinates(shape=ZONE_GRID_SHAPE):
+    """
+    Współrzędne środków komórek siatki powierzchni (radiany)
+
+    Pasy szerokości są równopolowe (równe przedziały sin szerokości, jak
+    w modelu klimatu), więc wszystkie komórki mają to samo pole.
+
+    Zwraca (szerokości, długości) - tablice o kształcie siatki
+    """
+    latitude_bands, longitude_bands = shape
+    latitudes = np.arcsin(-1 + (np.arange(latitude_bands) + 0.5) * 2 / latitude_bands)
+    longitudes = -np.pi + (np.arange(longitude_bands) + 0.5) * 2 * np.pi / longitude_bands
+    return np.meshgrid(latitudes, longitudes, indexing='ij')
+
+
+def label_spherical(mask):
+    """
+    Etykietowanie spójnych obszarów maski na siatce sferycznej
+
+    Sąsiedztwo jest czterokierunkowe, z zawinięciem długości (pierwsza
+    i ostatnia kolumna sąsiadują) i z biegunami - komórki skrajnego pasa
+    szerokości stykają się w biegunie, więc należą do jednego obszaru.
+    Maska może mieć wiodącą oś klatek (klatki × pasy szerokości × pasy
+    długości) - klatki są etykietowane razem, bez połączeń między nimi.
+
+    Zwraca (etykiety 1..count, 0 poza maską; liczba obszarów)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    stack = mask.reshape((-1,) + mask.shape[-2:])
+    structure = np.zeros((3, 3, 3), dtype=bool)
+    structure[1] = ndimage.generate_binary_structure(2, 1)
+    labels, count = ndimage.label(stack, structure=structure)
+    if count == 0:
+        return labels.reshape(mask.shape), 0
+
+    # Pary etykiet do połączenia: przez południk ±180° i przez bieguny
+    pairs = [np.stack([labels[:, :, 0].ravel(), labels[:, :, -1].ravel()], axis=1)]
+    for row in (labels[:, 0], labels[:, -1]):
+        frames, columns = np.nonzero(row)
+        polar = row[frames, columns]
+        same_frame = frames[1:] == frames[:-1]
+        pairs.append(np.stack([polar[:-1][same_frame], polar[1:][same_frame]], axis=1))
+    pairs = np.concatenate(pairs)
+    pairs = pairs[(pairs[:, 0] > 0) & (pairs[:, 1] > 0)]
+    if len(pairs) == 0:
+        return labels.reshape(mask.shape), count
+
+    graph = sparse.coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(count + 1, count + 1))
+    _, components = connected_components(graph, directed=False)
+    # Numeracja scalonych obszarów od 1 (tło ma własną składową z etykietą 0)
+    _, mapping = np.unique(components[1:], return_inverse=True)
+    mapping = np.concatenate([[0], mapping + 1])
+    return mapping[labels].reshape(mask.shape), int(mapping.max())
+
+
+class SurfaceZones:
+    """
+    Strefy powierzchni - spójne obszary pola po progowaniu
+
+    Tablice posortowane według klatki, a w klatce malejąco według pola strefy:
+    - frames: numery klatek stref (zera dla pojedynczego pola)
+    - centroids: środki stref (wektory jednostkowe, średnia po komórkach
+      lub komórka z ekstremum pola dla stref bez wyraźnego środka)
+    - latitudes, longitudes: współrzędne środków (radiany)
+    - areas: pola stref jako ułamki powierzchni planety
+    - mean_values: średnie wartości pola w strefach
+    """
+
+    def __init__(self, centroids, areas, mean_values, frames=None):
+        self.centroids = centroids
+        self.latitudes = np.arcsin(np.clip(centroids[:, 2], -1, 1))
+        self.longitudes = np.arctan2(centroids[:, 1], centroids[:, 0])
+        self.areas = areas
+        self.mean_values = mean_values
+        self.frames = frames if frames is not None else np.zeros(len(areas), dtype=np.intp)
+
+    def __len__(self):
+        return len(self.areas)
+
+    def frame(self, index):
+        """Strefy jednej klatki (obiekt SurfaceZones)"""
+        start, stop = np.searchsorted(self.frames, [index, index + 1])
+        return SurfaceZones(self.centroids[start:stop], self.areas[start:stop],
+                            self.mean_values[start:stop], self.frames[start:stop])
+
+
+def find_zones(field, threshold, above=True, min_area=ZONE_MIN_AREA):
+    """
+    Strefy pola na siatce sferycznej (wszystkie statystyki liczone wektorowo)
+
+    Parametry:
+    - field: wartości pola na siatce grid_coordinates (pasy szerokości × pasy
+      długości), opcjonalnie z wiodącą osią klatek
+    - threshold: próg pola (liczba lub tablica progów klatek)
+    - above: True - strefy o wartościach >= threshold, False - < threshold
+    - min_area: najmniejsze pole strefy (ułamek powierzchni)
+
+    Zwraca obiekt SurfaceZones
+    """
+    field = np.asarray(field, dtype=float)
+    grid_shape = field.shape[-2:]
+    stack = field.reshape((-1,) + grid_shape)
+    threshold = np.broadcast_to(np.asarray(threshold, dtype=float), field.shape[:-2]).reshape(-1, 1, 1)
+    mask = stack >= threshold if above else stack < threshold
+    labels, count = label_spherical(mask)
+
+    # Statystyki tylko po komórkach należących do stref
+    cells = int(np.prod(grid_shape))
+    flat_labels = labels.ravel()
+    members = np.flatnonzero(flat_labels)
+    member_labels = flat_labels[members]
+    member_cells = members % cells
+
+    latitudes, longitudes = grid_coordinates(grid_shape)
+    cos_latitude = np.cos(latitudes).ravel()
+    vectors = (cos_latitude * np.cos(longitudes).ravel(),
+               cos_latitude * np.sin(longitudes).ravel(),
+               np.sin(latitudes).ravel())
+
+    counts = np.bincount(member_labels, minlength=count + 1)[1:]
+    # Środek strefy jako znormalizowana suma wektorów - poprawny także przy
+    # strefach przechodzących przez południk ±180° lub biegun
+    sums = np.stack([np.bincount(member_labels, weights=component[member_cells], minlength=count + 1)[1:]
+                     for component in vectors], axis=1)
+    value_sums = np.bincount(member_labels, weights=stack.ravel()[members], minlength=count + 1)[1:]
+    frames = np.zeros(count + 1, dtype=np.intp)
+    frames[member_labels] = members // cells
+    frames = frames[1:]
+
+    areas = counts / cells
+    keep = areas >= min_area
+    order = np.lexsort((-areas[keep], frames[keep]))
+    zone_labels = np.arange(1, count + 1)[keep][order]
+    counts = counts[keep][order]
+    sums = sums[keep][order]
+    norms = np.linalg.norm(sums, axis=1)
+    centroids = sums / np.where(norms > 0, norms, 1)[:, None]
+
+    degenerate = np.flatnonzero(norms < MIN_RESULTANT_LENGTH * counts)
+    if len(degenerate):
+        # Komórka z ekstremum pola - przy równych wartościach pierwsza na siatce,
+        # niezależnie od liczby klatek liczonych naraz
+        member_values = stack.ravel()[members]
+        ranking = np.lexsort((members, -member_values if above else member_values, member_labels))
+        first = np.searchsorted(member_labels[ranking], zone_labels[degenerate])
+        peak_cells = member_cells[ranking[first]]
+        centroids[degenerate] = np.stack([component[peak_cells] for component in vectors], axis=1)
+
+    return SurfaceZones(centroids, areas[keep][order], value_sums[keep][order] / counts, frames[keep][order])
+
+
+def find_hotspots(field, fraction=HOTSPOT_FRACTION, min_contrast=MIN_FIELD_CONTRAST):
+    """
+    Strefy-skupiska górnej części zakresu pola (pojedyncze pole lub klatki)
+
+    Próg każdej klatki leży o fraction zakresu pola poniżej jej maksimum;
+    klatki o zakresie mniejszym niż min_contrast uznawane są za jednorodne
+    i nie mają stref.
+
+    Zwraca obiekt SurfaceZones
+    """
+    field = np.asarray(field, dtype=float)
+    field_max = field.max(axis=(-2, -1))
+    contrast = field_max - field.min(axis=(-2, -1))
+    threshold = np.where(contrast < min_contrast, np.inf, field_max - fraction * contrast)
+    return find_zones(field, threshold)
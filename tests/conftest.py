@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import types
+
+import pytest
+
+# Moduły aplikacji importują się nawzajem jako pakiet "modules" (katalog
+# repozytorium), a testy widżetów działają bez serwera wyświetlania
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+if 'modules' not in sys.modules:
+    package = types.ModuleType('modules')
+    package.__path__ = [ROOT]
+    sys.modules['modules'] = package
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """Wspólna instancja QApplication dla testów widżetów i wątków Qt"""
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+from PyQt5.QtCore import QThreadPool
+
+from modules.background_tasks import DebouncedTask
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    """Obsługa zdarzeń Qt aż do spełnienia warunku (lub upływu czasu)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        qapp.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+@pytest.fixture
+def pool(qapp):
+    pool = QThreadPool()
+    yield pool
+    pool.waitForDone(5000)
+
+
+def make_task(function, pool, **kwargs):
+    task = DebouncedTask(function, pool=pool, **kwargs)
+    results, errors = [], []
+    task.result_ready.connect(results.append)
+    task.task_failed.connect(errors.append)
+    return task, results, errors
+
+
+def test_burst_of_changes_runs_once_with_last_value(qapp, pool):
+    calls = []
+
+    def square(value):
+        calls.append(value)
+        return value * value
+
+    task, results, errors = make_task(square, pool, debounce_ms=20, max_wait_ms=10000)
+    for value in range(10):
+        task.schedule(value)
+    assert wait_until(qapp, lambda: results)
+    # Krótka przerwa - żadne kolejne zadanie nie powinno już wystartować
+    wait_until(qapp, lambda: False, timeout=0.1)
+    assert calls == [9] and results == [81] and errors == []
+
+
+def test_continuous_changes_start_within_max_wait(qapp, pool):
+    calls = []
+    task, results, _ = make_task(lambda value: calls.append(value) or value, pool, debounce_ms=50, max_wait_ms=80)
+    start = time.monotonic()
+    value = 0
+    # Zmiany co 10 ms - sam debounce nigdy by nie upłynął
+    while not calls and time.monotonic() - start < 2:
+        task.schedule(value)
+        value += 1
+        wait_until(qapp, lambda: False, timeout=0.01)
+    assert calls and time.monotonic() - start < 1
+    task.cancel()
+
+
+def test_changes_during_computation_wait_and_last_value_wins(qapp, pool):
+    release = threading.Event()
+    calls = []
+
+    def blocking(value):
+        calls.append(value)
+        if value == "pierwsze":
+            release.wait(5)
+        return value
+
+    task, results, _ = make_task(blocking, pool, debounce_ms=0, max_wait_ms=0)
+    task.schedule("pierwsze")
+    assert wait_until(qapp, lambda: calls)
+    for value in ("drugie", "trzecie", "czwarte"):
+        task.schedule(value)
+        wait_until(qapp, lambda: False, timeout=0.01)
+    # Naraz liczone jest tylko jedno zadanie
+    assert calls == ["pierwsze"]
+    release.set()
+    assert wait_until(qapp, lambda: len(results) == 2)
+    assert calls == ["pierwsze", "czwarte"] and results == ["pierwsze", "czwarte"]
+
+
+def test_cancel_drops_pending_and_running_results(qapp, pool):
+    release = threading.Event()
+    calls = []
+
+    def blocking(value):
+        calls.append(value)
+        release.wait(5)
+        return value
+
+    task, results, _ = make_task(blocking, pool, debounce_ms=0, max_wait_ms=0)
+    task.schedule(1)
+    assert wait_until(qapp, lambda: calls)
+    task.schedule(2)
+    task.cancel()
+    release.set()
+    pool.waitForDone(5000)
+    wait_until(qapp, lambda: False, timeout=0.05)
+    assert calls == [1] and results == []
+    assert not task.running
+
+    task.schedule(3)
+    assert wait_until(qapp, lambda: results)
+    assert results == [3]
+
+
+def test_errors_are_reported_with_traceback(qapp, pool):
+    task, results, errors = make_task(lambda value: 1 / value, pool, debounce_ms=0)
+    task.schedule(0)
+    assert wait_until(qapp, lambda: errors)
+    assert "ZeroDivisionError" in errors[0] and results == []
+    task.schedule(4)
+    assert wait_until(qapp, lambda: results)
+    assert results == [0.25]
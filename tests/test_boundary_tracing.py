@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from modules.boundary_tracing import trace_boundary
+
+
+def circle(x, y):
+    return 1 - (x ** 2 + y ** 2)
+
+
+def two_circles(x, y):
+    return np.maximum(0.09 - ((x + 0.5) ** 2 + y ** 2), 0.04 - ((x - 0.5) ** 2 + (y - 0.3) ** 2))
+
+
+def dense_crossings(function, x_range, y_range, n_columns, n_rows, threshold):
+    """Punkty przecięcia granicy ze wszystkimi krawędziami gęstej siatki (wzorzec)"""
+    x = np.linspace(*x_range, n_columns + 1)
+    y = np.linspace(*y_range, n_rows + 1)
+    grid_x, grid_y = np.meshgrid(x, y, indexing='ij')
+    values = function(grid_x, grid_y)
+    inside = values >= threshold
+    points = []
+    # Krawędzie poziome (wzdłuż osi X) i pionowe (wzdłuż osi Y)
+    for axis in (0, 1):
+        start = [slice(None), slice(None)]
+        end = [slice(None), slice(None)]
+        start[axis], end[axis] = slice(None, -1), slice(1, None)
+        start, end = tuple(start), tuple(end)
+        crossing = inside[start] != inside[end]
+        fraction = (threshold - values[start][crossing]) / (values[end][crossing] - values[start][crossing])
+        px = grid_x[start][crossing] + (fraction * (x[1] - x[0]) if axis == 0 else 0)
+        py = grid_y[start][crossing] + (fraction * (y[1] - y[0]) if axis == 1 else 0)
+        points.append(np.column_stack([px, py]))
+    return np.concatenate(points)
+
+
+def sorted_points(points):
+    points = np.round(points, 9)
+    return points[np.lexsort(points.T[::-1])]
+
+
+@pytest.mark.parametrize("function, threshold, n_polylines", [(circle, 0.36, 1), (two_circles, 0, 2)])
+def test_points_equal_dense_marching_squares(function, threshold, n_polylines):
+    trace = trace_boundary(function, (-1.5, 1.5), (-1.2, 1.2), threshold, coarse_shape=(12, 10), tolerance=0.01)
+    assert trace.depth == 4
+    assert len(trace) == n_polylines
+    points = np.concatenate(trace.segments())
+    # Łamane zamknięte - pierwszy punkt powtórzony na końcu
+    for polyline in trace.polylines:
+        np.testing.assert_array_equal(polyline[0], polyline[-1])
+    unique = np.concatenate([polyline[:-1] for polyline in trace.polylines])
+    assert len(np.unique(np.round(unique, 12), axis=0)) == len(unique)
+
+    expected = dense_crossings(function, (-1.5, 1.5), (-1.2, 1.2), 12 * 16, 10 * 16, threshold)
+    np.testing.assert_allclose(sorted_points(unique), sorted_points(expected), atol=1e-9)
+    np.testing.assert_allclose(function(points[:, 0], points[:, 1]), threshold, atol=2e-3)
+    assert trace.evaluations < trace.dense_evaluations / 4
+
+
+def test_circle_radius_converges_with_tolerance():
+    errors = []
+    for tolerance in (0.02, 0.005, 0.001):
+        trace = trace_boundary(circle, (-2, 2), (-2, 2), 0, coarse_shape=(8, 8), tolerance=tolerance)
+        (polyline,) = trace.polylines
+        errors.append(np.abs(np.hypot(polyline[:, 0], polyline[:, 1]) - 1).max())
+        # Łamana obiega okrąg - kolejne punkty są blisko siebie
+        assert np.hypot(*np.diff(polyline, axis=0).T).max() < 4 * tolerance * np.sqrt(2)
+    assert errors[0] > errors[1] > errors[2]
+    assert errors[2] < 1e-5
+
+
+def test_open_boundaries_end_on_domain_edges():
+    trace = trace_boundary(lambda x, y: x, (0, 1), (0, 2), 0.3, coarse_shape=(4, 4), tolerance=0.01)
+    (polyline,) = trace.polylines
+    np.testing.assert_allclose(polyline[:, 0], 0.3, atol=1e-12)
+    assert {polyline[0, 1], polyline[-1, 1]} == {0.0, 2.0}
+
+    # Hiperbola xy = 0.1 - dwie gałęzie przez komórki siodłowe wokół środka
+    trace = trace_boundary(lambda x, y: x * y, (-1, 1), (-1, 1), 0.1, coarse_shape=(8, 8), tolerance=0.005)
+    assert len(trace) == 2
+    for polyline in trace.polylines:
+        assert np.all(np.sign(polyline[:, 0]) == np.sign(polyline[0, 0]))
+        np.testing.assert_allclose(polyline[:, 0] * polyline[:, 1], 0.1, atol=1e-3)
+
+
+def test_each_lattice_node_is_evaluated_once():
+    evaluated = []
+
+    def counted(x, y):
+        evaluated.append(np.column_stack([np.ravel(x), np.ravel(y)]))
+        return circle(x, y)
+
+    trace = trace_boundary(counted, (-1.5, 1.5), (-1.5, 1.5), 0.5, coarse_shape=(16, 16), tolerance=0.002)
+    nodes = np.concatenate(evaluated)
+    assert len(nodes) == trace.evaluations
+    assert len(np.unique(np.round(nodes, 12), axis=0)) == len(nodes)
+
+
+def test_no_boundary_gives_empty_trace():
+    assert len(trace_boundary(circle, (-0.1, 0.1), (-0.1, 0.1), 0.5)) == 0
+    empty = trace_boundary(lambda x, y: np.zeros_like(x), (0, 1), (0, 1), 1.0, coarse_shape=(4, 4))
+    assert empty.segments() == [] and empty.evaluations == 25
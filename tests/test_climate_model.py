@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+import pytest
+
+from modules import climate_model
+from modules.climate_model import (ALBEDO_ICE, ALBEDO_WARM, DIFFUSION_COEFFICIENT, HEAT_CAPACITY, ICE_TEMPERATURE,
+                                   INSOLATION_P2, OLR_CONSTANT, OLR_REFERENCE_TEMPERATURE, OLR_SLOPE, SOLAR_CONSTANT,
+                                   ClimateModel, albedo, band_index, sample_temperatures, star_luminosity)
+
+
+def linear_steady_state(x, solar_constant, fixed_albedo, diffusion=DIFFUSION_COEFFICIENT):
+    """
+    Analityczny stan równowagi modelu Northa przy stałym albedo
+
+    Nasłonecznienie S/4 (1 + s₂ P₂(x)) daje T = T₀ + T₂ P₂(x), bo P₂ jest
+    funkcją własną laplasjanu na sferze z wartością -6.
+    """
+    absorbed = solar_constant / 4 * (1 - fixed_albedo)
+    t0 = OLR_REFERENCE_TEMPERATURE + (absorbed - OLR_CONSTANT) / OLR_SLOPE
+    t2 = absorbed * INSOLATION_P2 / (OLR_SLOPE + 6 * diffusion)
+    return t0 + t2 * (3 * x ** 2 - 1) / 2
+
+
+def test_star_luminosity_from_panel_names():
+    assert star_luminosity("Typ G (jak Słońce)") == 1.0
+    assert star_luminosity("k") == 0.3
+    assert star_luminosity(" Typ M (czerwony karzeł)") == 0.03
+    with pytest.raises(ValueError):
+        star_luminosity("Typ O")
+
+
+def test_albedo_switches_to_ice_below_threshold():
+    values = albedo(np.array([150.0, ICE_TEMPERATURE, 350.0]))
+    np.testing.assert_allclose(values, [ALBEDO_ICE, (ALBEDO_ICE + ALBEDO_WARM) / 2, ALBEDO_WARM], atol=1e-12)
+
+
+@pytest.mark.parametrize("longitude_bands", [1, 72])
+def test_insolation_averages_to_quarter_of_solar_constant(longitude_bands):
+    model = ClimateModel(luminosity=2.5, distance=1.5, latitude_bands=180, longitude_bands=longitude_bands)
+    assert model.solar_constant == pytest.approx(SOLAR_CONSTANT * 2.5 / 1.5 ** 2)
+    assert model.insolation.mean() == pytest.approx(model.solar_constant / 4, rel=1e-3)
+
+
+@pytest.mark.parametrize("shape", [(40, 1), (24, 16)])
+def test_laplacian_is_symmetric_and_conserves_energy(shape):
+    model = ClimateModel(latitude_bands=shape[0], longitude_bands=shape[1])
+    laplacian = model.laplacian.toarray()
+    np.testing.assert_allclose(laplacian, laplacian.T, atol=1e-12)
+    np.testing.assert_allclose(laplacian.sum(axis=1), 0, atol=1e-9)
+    # Równe pola komórek - dyfuzja nie zmienia średniej temperatury planety
+    rng = np.random.default_rng(1)
+    assert (laplacian @ rng.normal(size=len(laplacian))).sum() == pytest.approx(0, abs=1e-8)
+
+
+def test_laplacian_eigenfunctions_are_legendre_polynomials():
+    model = ClimateModel(latitude_bands=400)
+    x = model.x
+    for degree, values in ((1, x), (2, (3 * x ** 2 - 1) / 2), (3, (5 * x ** 3 - 3 * x) / 2)):
+        # Wnętrze siatki - przy biegunach błąd dyskretyzacji jest większy
+        interior = np.abs(x) < 0.9
+        np.testing.assert_allclose((model.laplacian @ values)[interior], -degree * (degree + 1) * values[interior],
+                                   atol=2e-2)
+
+
+def test_steady_state_matches_analytic_north_solution(monkeypatch):
+    monkeypatch.setattr(climate_model, 'albedo', lambda temperatures: np.full_like(temperatures, 0.3))
+    model = ClimateModel(latitude_bands=90, initial_temperature=250)
+    model.run(300, dt=5)
+    expected = linear_steady_state(model.x, SOLAR_CONSTANT, 0.3)
+    np.testing.assert_allclose(model.zonal_temperatures(), expected, atol=0.05)
+    assert model.mean_temperature() == pytest.approx(expected.mean(), abs=0.01)
+    assert model.time == pytest.approx(300)
+
+
+def test_step_solves_semi_implicit_equation():
+    model = ClimateModel(latitude_bands=12, longitude_bands=6, initial_temperature=270)
+    model.temperatures += np.random.default_rng(2).normal(0, 5, model.shape)
+    previous = model.temperatures.copy()
+    dt = 0.5
+    current = model.step(dt)
+    # C (T' - T) / dt = Q (1 - α(T)) - A - B (T' - T_REF) + D ∇²T'
+    residual = (HEAT_CAPACITY * (current - previous) / dt -
+                model.insolation * (1 - albedo(previous)) + OLR_CONSTANT +
+                OLR_SLOPE * (current - OLR_REFERENCE_TEMPERATURE) -
+                DIFFUSION_COEFFICIENT * (model.laplacian @ current.ravel()).reshape(model.shape))
+    np.testing.assert_allclose(residual, 0, atol=1e-9)
+
+
+def test_large_time_steps_reach_same_equilibrium():
+    fine = ClimateModel(latitude_bands=60, initial_temperature=300)
+    coarse = ClimateModel(latitude_bands=60, initial_temperature=300)
+    fine.run(200, dt=0.5)
+    coarse.run(200, dt=50)
+    assert np.isfinite(coarse.temperatures).all()
+    np.testing.assert_allclose(coarse.temperatures, fine.temperatures, atol=0.05)
+    assert fine.zonal_temperatures()[30] > fine.zonal_temperatures()[0]
+
+
+def test_run_without_duration_keeps_state():
+    model = ClimateModel(latitude_bands=12, initial_temperature=280)
+    before = model.temperatures.copy()
+    for duration in (0, -5):
+        np.testing.assert_array_equal(model.run(duration), before)
+
+
+def test_ice_albedo_feedback_freezes_planet_further_from_star():
+    earth = ClimateModel(distance=1.0, latitude_bands=60, initial_temperature=300)
+    earth.run(300)
+    assert earth.ice_fraction() == 0.0
+    # 9% mniej nasłonecznienia - sprzężenie lodowe prowadzi do pełnego zlodowacenia
+    distant = ClimateModel(distance=1.05, latitude_bands=60, initial_temperature=300)
+    distant.run(300)
+    assert distant.ice_fraction() == 1.0
+    assert earth.mean_temperature() - distant.mean_temperature() > 40
+
+
+def test_sampling_of_climate_grid():
+    temperatures = np.arange(12.0).reshape(4, 3)
+    rows, columns = band_index([-math.pi / 2, 0.1, math.pi / 2], [-math.pi, 0.0, math.pi], (4, 3))
+    np.testing.assert_array_equal(rows, [0, 2, 3])
+    np.testing.assert_array_equal(columns, [0, 1, 0])
+    np.testing.assert_array_equal(sample_temperatures(temperatures, [0.1, -1.2], [0.0, 2.5]), [7.0, 2.0])
+
+    # Model strefowy: interpolacja liniowa po szerokości między środkami pasów
+    model = ClimateModel(latitude_bands=5)
+    zonal = np.array([[250.0], [260.0], [280.0], [270.0], [240.0]])
+    np.testing.assert_allclose(sample_temperatures(zonal, model.latitudes, np.zeros(5)), zonal[:, 0])
+    middle = math.asin((model.x[1] + model.x[2]) / 2)
+    position = (middle - model.latitudes[1]) / (model.latitudes[2] - model.latitudes[1])
+    assert sample_temperatures(zonal, [middle], [1.0])[0] == pytest.approx(260 + 20 * position)
+    # Oś klatek przed osiami siatki
+    frames = np.stack([zonal, zonal + 10])
+    np.testing.assert_allclose(sample_temperatures(frames, model.latitudes[:2], [0, 0]), [[250, 260], [260, 270]])
+
+
+def test_invalid_model_parameters():
+    with pytest.raises(ValueError):
+        ClimateModel(distance=0)
+    with pytest.raises(ValueError):
+        ClimateModel(latitude_bands=1)
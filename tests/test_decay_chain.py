@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+from scipy.linalg import expm
+
+from modules.decay_chain import DecayChainSolver, NuclideTable
+from modules.element_module import ElementModule
+
+TIMES = np.array([0, 1e-6, 1e-2, 1, 100, 1e4, 1e6, 1e9])
+
+
+def expm_reference(table, times, initial=None):
+    """Rozwiązanie dN/dt = A N przez pełny wykładnik macierzy dla każdej chwili"""
+    initial = table.initial_abundance if initial is None else initial
+    matrix = table.matrix.toarray()
+    return np.stack([expm(matrix * time) @ initial for time in times], axis=1)
+
+
+def test_uranium_series_matches_matrix_exponential():
+    table = NuclideTable.default()
+    solver = DecayChainSolver(table)
+    abundances = solver.solve(TIMES)
+    np.testing.assert_allclose(abundances, expm_reference(table, TIMES), rtol=0, atol=1e-12)
+    # Cały szereg kończy się na Pb-206 - suma obfitości jest zachowana
+    np.testing.assert_allclose(abundances.sum(axis=0), 1, rtol=1e-12)
+
+
+def test_parent_daughter_pair_matches_bateman_formula():
+    table = NuclideTable([
+        {"nuclide": "Sr-90", "half_life": 28.8, "daughter": "Y-90", "initial_abundance": 2.0},
+        {"nuclide": "Y-90", "half_life": 64.1 / 8766, "daughter": "Zr-90"},
+        {"nuclide": "Zr-90", "half_life": ""},
+    ])
+    times = np.linspace(0, 100, 11)
+    parent, daughter, stable = DecayChainSolver(table).solve(times)
+
+    decay_parent, decay_daughter = np.log(2) / 28.8, np.log(2) / (64.1 / 8766)
+    np.testing.assert_allclose(parent, 2.0 * np.exp(-decay_parent * times), rtol=1e-12)
+    np.testing.assert_allclose(daughter, 2.0 * decay_parent / (decay_daughter - decay_parent)
+                               * (np.exp(-decay_parent * times) - np.exp(-decay_daughter * times)),
+                               rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(parent + daughter + stable, 2.0, rtol=1e-12)
+
+
+def test_repeated_decay_constants_use_expm_fallback():
+    table = NuclideTable([
+        {"nuclide": "A-1", "half_life": 5.0, "daughter": "B-1", "initial_abundance": 1.0},
+        {"nuclide": "B-1", "half_life": 5.0, "daughter": "C-1"},
+        {"nuclide": "C-1", "half_life": None},
+    ])
+    solver = DecayChainSolver(table)
+    times = np.array([30.0, 0.0, 7.5, 2.5, 7.5])
+    abundances = solver.solve(times)
+    assert len(solver._fallback_chains) == 1
+
+    decay = np.log(2) / 5.0
+    # Dla równych stałych rozpadu: N_B(t) = N_A(0) λ t e^{-λt}
+    np.testing.assert_allclose(abundances[1], decay * times * np.exp(-decay * times), rtol=1e-9)
+    np.testing.assert_allclose(abundances, expm_reference(table, times), atol=1e-13)
+
+
+def test_independent_chains_with_branching_are_solved_together():
+    records = []
+    for number, half_life in enumerate((3.0, 11.0, 0.5)):
+        records += [
+            {"nuclide": f"P{number}-1", "half_life": half_life, "daughter": f"D{number}-1",
+             "branching_ratio": 0.3, "initial_abundance": number + 1},
+            {"nuclide": f"P{number}-1", "half_life": half_life, "daughter": f"E{number}-1",
+             "branching_ratio": 0.7},
+            {"nuclide": f"D{number}-1", "half_life": 2 * half_life + 1, "daughter": f"X{number}-1"},
+            {"nuclide": f"E{number}-1", "half_life": None},
+            {"nuclide": f"X{number}-1", "half_life": None, "element": "Pb"},
+        ]
+    table = NuclideTable(records)
+    solver = DecayChainSolver(table)
+    assert len(solver.chains) == 3
+
+    times = np.geomspace(0.01, 50, 9)
+    initial = np.linspace(0.5, 2.0, len(table))
+    np.testing.assert_allclose(solver.solve(times, initial), expm_reference(table, times, initial),
+                               rtol=1e-10, atol=1e-13)
+
+    symbols, totals = solver.element_concentrations(times, initial)
+    assert "Pb" in symbols
+    np.testing.assert_allclose(totals.sum(axis=0), initial.sum(), rtol=1e-12)
+    lead = [row for row, name in enumerate(table.names) if name.startswith("X")]
+    np.testing.assert_allclose(totals[symbols.index("Pb")], solver.solve(times, initial)[lead].sum(axis=0))
+
+
+def test_load_csv_table(tmp_path):
+    path = tmp_path / "chain.csv"
+    path.write_text("nuclide,half_life,daughter,branching_ratio,initial_abundance\n"
+                    "Cs-137,30.17,Ba-137,,1\n"
+                    "Ba-137,stable,,,\n", encoding="utf-8")
+    table = NuclideTable.load(str(path))
+    assert table.names.tolist() == ["Cs-137", "Ba-137"]
+    assert table.decay_constants[1] == 0
+    assert DecayChainSolver(table).solve(30.17)[0, 0] == pytest.approx(0.5)
+
+
+def test_element_module_simulates_imported_table(qapp, tmp_path):
+    path = tmp_path / "chain.json"
+    path.write_text('[{"nuclide": "Cs-137", "half_life": 30.17, "daughter": "Ba-137", "initial_abundance": 1}]',
+                    encoding="utf-8")
+    module = ElementModule()
+    module.load_nuclide_table(str(path))
+    module.decay_time_scale = 30.17
+    concentrations = module.decay_element_concentrations(1)
+    assert concentrations == pytest.approx({"Cs": 0.5, "Ba": 0.5})
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("nuclide,half_life\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        module.load_nuclide_table(str(empty))
+    assert len(module.decay_solver.table) == 2
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from modules.dtype_policy import (ACCUMULATOR_DTYPE, DEFAULT_DTYPES, HistoryBuffer, as_accumulator,
+                                  as_storage, get_dtype, reset_dtype_policy, set_dtype)
+
+
+@pytest.fixture(autouse=True)
+def default_policy():
+    reset_dtype_policy()
+    yield
+    reset_dtype_policy()
+
+
+def test_default_policy_stores_float32():
+    for data_class in DEFAULT_DTYPES:
+        assert get_dtype(data_class) is np.float32
+    assert as_storage([1.0, 2.0], 'spectra').dtype == np.float32
+    assert as_accumulator(np.ones(3, dtype=np.float32)).dtype == ACCUMULATOR_DTYPE
+
+
+def test_as_storage_does_not_copy_matching_arrays():
+    spectrum = np.linspace(0, 1, 16, dtype=np.float32)
+    assert as_storage(spectrum, 'spectra') is spectrum
+    accumulator = np.zeros(4)
+    assert as_accumulator(accumulator) is accumulator
+
+
+def test_set_dtype_switches_and_resets():
+    set_dtype('maps', 'float64')
+    assert get_dtype('maps') is np.float64
+    assert get_dtype('spectra') is np.float32
+    reset_dtype_policy()
+    assert get_dtype('maps') is np.float32
+
+
+def test_set_dtype_rejects_unknown_class_and_integer_types():
+    with pytest.raises(KeyError):
+        set_dtype('widma', np.float32)
+    with pytest.raises(KeyError):
+        get_dtype('widma')
+    with pytest.raises(ValueError):
+        set_dtype('spectra', np.int32)
+
+
+def test_history_buffer_matches_list_and_grows():
+    buffer = HistoryBuffer(capacity=2)
+    reference = []
+    for value in np.linspace(-5, 5, 37):
+        buffer.append(value)
+        reference.append(value)
+    buffer.extend(np.arange(100))
+    reference.extend(range(100))
+
+    assert len(buffer) == len(reference)
+    assert buffer.values().dtype == np.float32
+    np.testing.assert_allclose(np.asarray(buffer), np.asarray(reference, dtype=np.float32))
+    assert buffer[-1] == 99
+    assert buffer.nbytes == len(reference) * 4
+
+    buffer.clear()
+    assert len(buffer) == 0 and list(buffer) == []
+
+
+def test_history_buffer_follows_policy_at_creation():
+    set_dtype('histories', np.float64)
+    buffer = HistoryBuffer()
+    buffer.append(1 / 3)
+    assert buffer.values().dtype == np.float64
+    assert buffer[0] == 1 / 3
+
+
+def test_history_buffer_array_protocol_honours_copy():
+    buffer = HistoryBuffer()
+    buffer.extend([1.0, 2.0, 3.0])
+
+    assert np.shares_memory(np.asarray(buffer), buffer.values())
+    assert np.shares_memory(np.array(buffer, copy=False), buffer.values())
+    copied = np.array(buffer, copy=True)
+    assert not np.shares_memory(copied, buffer.values())
+    np.testing.assert_array_equal(copied, buffer.values())
+
+    converted = np.asarray(buffer, dtype=np.float64)
+    assert converted.dtype == np.float64
+    with pytest.raises(ValueError):
+        np.array(buffer, dtype=np.float64, copy=False)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+import pytest
+
+from modules.dtype_policy import reset_dtype_policy, set_dtype
+from modules.element_properties import (ACTIVATION_ENERGY, BOILING_POINT, GAS, HALF_LIFE, LIQUID, MELTING_POINT,
+                                        PHASE, SOLID, STABLE_HALF_LIFE, PropertySurfaces,
+                                        evaluate_property_surfaces, phase_codes)
+from modules.element_store import ElementStore
+
+TEMPERATURE_GRID = (100, 3000, 30)
+PRESSURE_GRID = (0, 1000, 21)
+
+
+def scalar_properties(record, temperature, pressure):
+    """Właściwości jednego pierwiastka w jednym punkcie (T, P) liczone wprost"""
+    melting = record["melting_point"] * (1 + 0.01 * math.log(pressure + 1))
+    boiling = record["boiling_point"] * (1 + 0.02 * math.log(pressure + 1))
+    if record["half_life"] is None:
+        half_life = STABLE_HALF_LIFE
+    else:
+        half_life = record["half_life"] * math.exp(-0.0001 * (temperature - 300))
+    if temperature >= boiling:
+        phase = GAS
+    elif temperature >= melting:
+        phase = LIQUID
+    else:
+        phase = SOLID
+    return {
+        HALF_LIFE: half_life,
+        ACTIVATION_ENERGY: record["activation_energy"] * (1 + 0.0001 * (temperature - 300)),
+        MELTING_POINT: melting,
+        BOILING_POINT: boiling,
+        PHASE: phase,
+    }
+
+
+@pytest.fixture
+def store():
+    return ElementStore.default()
+
+
+@pytest.fixture
+def records(store):
+    return [{"half_life": None if store.stable[row] else store.half_life[row],
+             "activation_energy": store.activation_energy[row],
+             "melting_point": store.melting_point[row],
+             "boiling_point": store.boiling_point[row]} for row in range(len(store))]
+
+
+def test_surfaces_match_pointwise_formulas(store, records):
+    surfaces = PropertySurfaces()
+    temperatures, pressures, tensors = surfaces.get(store, TEMPERATURE_GRID, PRESSURE_GRID)
+    shape = (len(store), len(temperatures), len(pressures))
+
+    for row, record in enumerate(records):
+        _, _, phase = surfaces.phase_map(store, TEMPERATURE_GRID, PRESSURE_GRID, row)
+        assert phase.shape == shape[1:] and phase.dtype == np.int8
+        for i, temperature in enumerate(temperatures):
+            for j, pressure in enumerate(pressures):
+                expected = scalar_properties(record, temperature, pressure)
+                for name in (HALF_LIFE, ACTIVATION_ENERGY, MELTING_POINT, BOILING_POINT):
+                    assert tensors[name].shape == shape
+                    assert tensors[name][row, i, j] == pytest.approx(expected[name], rel=1e-6)
+                assert phase[i, j] == expected[PHASE]
+
+
+def test_property_tensors_are_broadcast_views(store):
+    temperatures = np.linspace(*TEMPERATURE_GRID)
+    pressures = np.linspace(*PRESSURE_GRID)
+    tensors = evaluate_property_surfaces(store, temperatures, pressures)
+    for name in (HALF_LIFE, ACTIVATION_ENERGY, MELTING_POINT, BOILING_POINT):
+        assert tensors[name].dtype == np.float32
+        assert 0 in tensors[name].strides
+    # Zamiast mapy faz przechowywane są tylko temperatury przemian (pierwiastki × ciśnienia)
+    _, melting, boiling = tensors[PHASE]
+    assert melting.shape == boiling.shape == (len(store), len(pressures))
+
+
+def test_policy_controls_tensor_precision(store):
+    set_dtype('maps', np.float64)
+    try:
+        tensors = evaluate_property_surfaces(store, [300.0], [1.0])
+        assert tensors[MELTING_POINT].dtype == np.float64
+    finally:
+        reset_dtype_policy()
+
+
+def test_curve_interpolates_properties_between_pressure_nodes(store):
+    surfaces = PropertySurfaces()
+    row = store.row("Hg")
+    temperatures, low = surfaces.curve(store, TEMPERATURE_GRID, PRESSURE_GRID, BOILING_POINT, row, 100)
+    _, high = surfaces.curve(store, TEMPERATURE_GRID, PRESSURE_GRID, BOILING_POINT, row, 150)
+    _, middle = surfaces.curve(store, TEMPERATURE_GRID, PRESSURE_GRID, BOILING_POINT, row, 130)
+    np.testing.assert_allclose(middle, 0.4 * low + 0.6 * high, rtol=1e-6)
+    assert len(temperatures) == TEMPERATURE_GRID[2]
+
+
+def test_phase_curve_uses_nearest_pressure_node(store):
+    surfaces = PropertySurfaces()
+    row = store.row("Hg")
+    _, _, phase = surfaces.phase_map(store, TEMPERATURE_GRID, PRESSURE_GRID, row)
+    assert {SOLID, LIQUID, GAS} <= set(np.unique(phase))
+    # Między węzłami 250 i 300 atm rtęć przy 700 K przechodzi z gazu w ciecz -
+    # interpolacja kodów dałaby tu stan ułamkowy
+    assert (phase[:, 5] != phase[:, 6]).any()
+
+    for pressure, node in ((0, 0), (24, 0), (26, 1), (260, 5), (290, 6), (2000, 20)):
+        _, curve = surfaces.curve(store, TEMPERATURE_GRID, PRESSURE_GRID, PHASE, row, pressure)
+        assert curve.dtype == np.int8
+        np.testing.assert_array_equal(curve, phase[:, node])
+
+
+def test_phase_codes_shapes():
+    temperatures = np.array([100.0, 300.0, 500.0])
+    codes = phase_codes(temperatures, np.array([200.0, 400.0]), np.array([250.0, 450.0]))
+    np.testing.assert_array_equal(codes, [[SOLID, SOLID], [GAS, SOLID], [GAS, GAS]])
+    np.testing.assert_array_equal(phase_codes(temperatures, 200.0, 400.0), [SOLID, LIQUID, GAS])
+
+
+def test_cache_reuses_entries_and_evicts_oldest(store):
+    surfaces = PropertySurfaces(max_entries=2)
+    first = surfaces.get(store, TEMPERATURE_GRID, PRESSURE_GRID)
+    assert surfaces.get(store, TEMPERATURE_GRID, PRESSURE_GRID) is first
+    surfaces.get(store, TEMPERATURE_GRID, (0, 10, 5))
+    surfaces.get(store, (200, 400, 3), PRESSURE_GRID)
+    assert surfaces.get(store, TEMPERATURE_GRID, PRESSURE_GRID) is not first
+    surfaces.clear()
+    assert surfaces.get(store, TEMPERATURE_GRID, PRESSURE_GRID) is not first
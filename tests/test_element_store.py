@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+
+import numpy as np
+import pytest
+
+from modules.element_store import DEFAULT_ELEMENTS, NUMERIC_COLUMNS, ElementStore
+
+NUCLIDES = [
+    {"symbol": "C-14", "name": "Węgiel-14", "half_life": "5730", "state": "Stały",
+     "activation_energy": "0.31", "melting_point": "3823", "boiling_point": "4098"},
+    {"symbol": "C-12", "name": "Węgiel-12", "half_life": "stable", "state": "Stały",
+     "activation_energy": "0.30", "melting_point": "3823", "boiling_point": "4098"},
+    {"symbol": "K-40", "name": "Potas-40", "half_life": "1.25e9", "stable": "false", "state": "Stały",
+     "activation_energy": "", "melting_point": "336.5", "boiling_point": "1032"},
+    {"symbol": "Xe-136", "name": "Ksenon-136", "half_life": "inf", "state": "Gazowy",
+     "activation_energy": "0.2", "melting_point": "161.4", "boiling_point": "165.1"},
+]
+
+
+def write_csv(path, records):
+    fields = ["symbol", "name", "half_life", "stable", "state", "activation_energy", "melting_point",
+              "boiling_point"]
+    with open(path, "w", encoding="utf-8", newline="") as data_file:
+        writer = csv.DictWriter(data_file, fields)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def test_default_store_matches_builtin_records():
+    store = ElementStore.default()
+    assert len(store) == len(DEFAULT_ELEMENTS)
+    for record in DEFAULT_ELEMENTS:
+        row = store.row(record["symbol"])
+        assert store.name[row] == record["name"]
+        assert store.melting_point[row] == record["melting_point"]
+        if record["half_life"] is None:
+            assert store.stable[row] and np.isnan(store.half_life[row])
+        else:
+            assert not store.stable[row] and store.half_life[row] == record["half_life"]
+    np.testing.assert_array_equal(store.radioactive(), [record["half_life"] is not None
+                                                        for record in DEFAULT_ELEMENTS])
+
+
+def test_csv_import_parses_stable_markers_and_missing_numbers(tmp_path):
+    path = str(tmp_path / "nuclides.csv")
+    write_csv(path, NUCLIDES)
+    store = ElementStore.load(path, use_cache=False)
+
+    np.testing.assert_array_equal(store.stable, [False, True, False, True])
+    np.testing.assert_array_equal(np.isnan(store.half_life), [False, True, False, True])
+    assert store.half_life[store.row("K-40")] == 1.25e9
+    assert np.isnan(store.activation_energy[store.row("K-40")])
+    np.testing.assert_array_equal(store.rows(["Xe-136", "C-14"]), [3, 0])
+    assert "C-12" in store and "U-235" not in store
+    with pytest.raises(KeyError):
+        store.column("density")
+
+
+def test_json_formats_give_the_same_store(tmp_path):
+    flat_path = str(tmp_path / "flat.json")
+    keyed_path = str(tmp_path / "keyed.json")
+    with open(flat_path, "w", encoding="utf-8") as data_file:
+        json.dump(NUCLIDES, data_file)
+    with open(keyed_path, "w", encoding="utf-8") as data_file:
+        json.dump({record["symbol"]: {key: value for key, value in record.items() if key != "symbol"}
+                   for record in NUCLIDES}, data_file)
+
+    flat = ElementStore.load(flat_path, use_cache=False)
+    keyed = ElementStore.load(keyed_path, use_cache=False)
+    np.testing.assert_array_equal(flat.symbol, keyed.symbol)
+    for name in NUMERIC_COLUMNS + ("stable",):
+        np.testing.assert_array_equal(flat.column(name), keyed.column(name))
+
+
+def test_binary_cache_is_used_until_source_changes(tmp_path):
+    path = str(tmp_path / "nuclides.csv")
+    write_csv(path, NUCLIDES)
+    parsed = ElementStore.load(path)
+    cache_path = path + ".cache.npz"
+    assert os.path.exists(cache_path)
+
+    cached = ElementStore.load(path)
+    for name in ("symbol", "name", "state") + NUMERIC_COLUMNS + ("stable",):
+        np.testing.assert_array_equal(cached.column(name), parsed.column(name))
+
+    # Nowszy plik źródłowy unieważnia pamięć podręczną
+    write_csv(path, NUCLIDES[:2])
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+    assert len(ElementStore.load(path)) == 2
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+import pytest
+from PyQt5.QtCore import QPersistentModelIndex, Qt
+
+from modules.element_store import ElementStore
+from modules.element_table_model import TABLE_COLUMNS, ElementSortFilterProxyModel, ElementTableModel
+
+COLUMN = {column: number for number, (_, column) in enumerate(TABLE_COLUMNS)}
+
+
+def isotope_store():
+    records = []
+    for number, (symbol, name) in enumerate((("U", "Uran"), ("Th", "Tor"), ("Ra", "Rad"), ("pb", "ołów"),
+                                             ("Bi", "Bizmut"), ("Po", "Polon"), ("Rn", "radon"))):
+        records.append({
+            "symbol": symbol,
+            "name": name,
+            "half_life": None if number in (3, 4) else 10.0 ** (number * 2 - 3),
+            "state": "Gazowy" if symbol == "Rn" else "Stały",
+            "activation_energy": 0.3 + ((number * 37) % 11) / 20,
+        })
+    return ElementStore.from_records(records)
+
+
+@pytest.fixture
+def model(qapp):
+    return ElementTableModel(isotope_store())
+
+
+def column_values(model, column):
+    return [model.data(model.index(row, column)) for row in range(model.rowCount())]
+
+
+def test_cells_are_formatted_on_request(model):
+    assert model.rowCount() == 7 and model.columnCount() == len(TABLE_COLUMNS)
+    assert model.headerData(0, Qt.Horizontal) == "Symbol"
+    assert model.data(model.index(0, COLUMN["half_life"])) == "1.00e-03"
+    assert model.data(model.index(3, COLUMN["half_life"])) == "Stabilny"
+    assert model.data(model.index(1, COLUMN["activation_energy"])).endswith(" eV")
+    assert model.data(model.index(0, 0), Qt.EditRole) is None
+
+
+def test_sort_matches_python_sorted(model):
+    store = model.store
+    model.sort(COLUMN["name"], Qt.AscendingOrder)
+    assert column_values(model, COLUMN["name"]) == sorted(store.name.tolist(), key=str.lower)
+
+    model.sort(COLUMN["symbol"], Qt.DescendingOrder)
+    assert column_values(model, COLUMN["symbol"]) == sorted(store.symbol.tolist(), reverse=True)
+
+    # Stabilne pierwiastki (bez okresu połowicznego rozpadu) trafiają na koniec
+    model.sort(COLUMN["half_life"], Qt.AscendingOrder)
+    rows = [store.row(model.symbol(row)) for row in range(model.rowCount())]
+    keys = [math.inf if store.stable[row] else store.half_life[row] for row in rows]
+    assert keys == sorted(keys)
+    assert column_values(model, COLUMN["half_life"])[-2:] == ["Stabilny", "Stabilny"]
+
+    model.sort(COLUMN["activation_energy"], Qt.DescendingOrder)
+    energies = [store.activation_energy[store.row(model.symbol(row))] for row in range(model.rowCount())]
+    assert energies == sorted(energies, reverse=True)
+
+
+def test_sort_moves_persistent_indexes_with_their_rows(model):
+    tracked = QPersistentModelIndex(model.index_of_symbol("Po", column=1))
+    for column in range(len(TABLE_COLUMNS)):
+        for order in (Qt.AscendingOrder, Qt.DescendingOrder):
+            model.sort(column, order)
+            assert model.symbol(tracked.row()) == "Po"
+            assert tracked.column() == 1
+            assert model.index_of_symbol("Po").row() == tracked.row()
+
+
+def test_proxy_filter_matches_substring_search(model):
+    proxy = ElementSortFilterProxyModel()
+    proxy.setSourceModel(model)
+    store = model.store
+
+    for text in ("r", "RA", " pb ", "on", "xyz", ""):
+        proxy.set_filter_text(text)
+        needle = text.strip().lower()
+        expected = {symbol for symbol, name in zip(store.symbol, store.name)
+                    if needle in symbol.lower() or needle in name.lower()}
+        shown = {proxy.data(proxy.index(row, 0)) for row in range(proxy.rowCount())}
+        assert shown == expected
+
+    proxy.set_filter_text("r")
+    proxy.sort(COLUMN["symbol"], Qt.AscendingOrder)
+    shown = [proxy.data(proxy.index(row, 0)) for row in range(proxy.rowCount())]
+    assert shown == sorted(shown)
+
+
+def test_set_store_resets_order(model):
+    model.sort(COLUMN["symbol"], Qt.DescendingOrder)
+    model.set_store(ElementStore.default())
+    assert model.rowCount() == len(ElementStore.default())
+    assert column_values(model, 0) == ElementStore.default().symbol.tolist()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+import numpy as np
+import pytest
+
+from modules.frame_scheduler import FRAME_TIME_BINS_MS, FrameScheduler
+
+
+def process_events(qapp, seconds):
+    """Obsługa zdarzeń Qt przez podany czas"""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def rendered():
+    return []
+
+
+def make_scheduler(rendered, max_fps):
+    return FrameScheduler(lambda: rendered.append(time.monotonic()), max_fps)
+
+
+def test_requests_within_a_frame_are_coalesced(qapp, rendered):
+    scheduler = make_scheduler(rendered, 30)
+    for _ in range(50):
+        scheduler.request_frame()
+    process_events(qapp, 0.05)
+    assert len(rendered) == 1
+    assert scheduler.requests == 50 and scheduler.frames == 1
+    # Bez nowych żądań nie ma kolejnych klatek
+    process_events(qapp, 0.1)
+    assert len(rendered) == 1
+
+
+def test_frame_rate_is_limited(qapp, rendered):
+    scheduler = make_scheduler(rendered, 20)
+    deadline = time.monotonic() + 0.5
+    while time.monotonic() < deadline:
+        scheduler.request_frame()
+        process_events(qapp, 0.002)
+    intervals = np.diff(rendered)
+    # Ok. 10 klatek w 0,5 s zamiast setek żądań; odstępy co najmniej 1/20 s
+    # (z zapasem na dokładność zegara QTimer)
+    assert 6 <= len(rendered) <= 11
+    assert intervals.min() >= 0.045
+
+
+def test_unlimited_rate_renders_every_event_loop_pass(qapp, rendered):
+    scheduler = make_scheduler(rendered, None)
+    assert scheduler.min_interval == 0.0
+    for _ in range(5):
+        scheduler.request_frame()
+        process_events(qapp, 0.005)
+    assert len(rendered) == 5
+
+
+def test_paused_scheduler_keeps_pending_frame(qapp, rendered):
+    scheduler = make_scheduler(rendered, 30)
+    scheduler.set_paused(True)
+    for _ in range(10):
+        scheduler.request_frame()
+    process_events(qapp, 0.1)
+    assert rendered == [] and scheduler.pending
+    scheduler.set_paused(False)
+    process_events(qapp, 0.05)
+    assert len(rendered) == 1 and not scheduler.pending
+
+    # Wstrzymanie po zgłoszeniu żądania anuluje zaplanowaną klatkę
+    scheduler.request_frame()
+    scheduler.set_paused(True)
+    process_events(qapp, 0.1)
+    assert len(rendered) == 1
+
+
+def test_frame_time_histogram_matches_numpy(qapp, rendered):
+    scheduler = make_scheduler(rendered, 30)
+    times = np.random.default_rng(3).lognormal(2, 1, 500)
+    times[:len(FRAME_TIME_BINS_MS)] = FRAME_TIME_BINS_MS
+    for milliseconds in times:
+        scheduler.record_frame_time(milliseconds)
+    edges, counts = scheduler.frame_time_histogram()
+    expected, _ = np.histogram(times, bins=np.concatenate([[0], edges, [np.inf]]))
+    np.testing.assert_array_equal(counts, expected)
+    assert scheduler.frame_time_max == times.max()
+
+    lines = scheduler.summary_lines()
+    assert lines[0].startswith("Klatki: 0") and "limit: 30 fps" in lines[0]
+    assert f"średnio {times.mean():.2f} ms" in lines[1]
+    assert len(lines) == 2 + np.count_nonzero(counts)
+    assert lines[-1].startswith("  >= 66 ms")
+
+    scheduler.reset_statistics()
+    assert scheduler.frame_time_histogram()[1].sum() == 0
+    assert len(scheduler.summary_lines()) == 1
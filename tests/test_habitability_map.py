@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+import pytest
+
+from modules.dtype_policy import reset_dtype_policy, set_dtype
+from modules.habitability_map import (AXES, INTERSECTION, PH, PRESSURE, RADIATION, TEMPERATURE, UNION,
+                                      ToleranceEnvelope, combined_habitability_map, habitability_maps,
+                                      tolerance_parameters)
+
+ORGANISMS = {
+    "Niesporczak": {"temp_range": (0, 150), "pressure_range": (0, 60), "pH_range": (3, 11),
+                    "radiation_tolerance": 5000},
+    "Deinococcus radiodurans": {"temp_range": (10, 45), "pressure_range": (1, 5), "pH_range": (6, 9),
+                                "radiation_tolerance": 5000},
+    "Thermococcus gammatolerans": {"temp_range": (55, 100), "pressure_range": (1, 20), "pH_range": (5, 8),
+                                   "radiation_tolerance": 3000},
+    "E. coli": {"temp_range": (15, 45), "pressure_range": (1, 2), "pH_range": (5.5, 8.5),
+                "radiation_tolerance": 60},
+}
+
+
+def survival(data, temperature, pressure, radiation=None, ph=None):
+    """Przeżywalność jednego organizmu w punkcie liczona wprost (pominięte osie nie wpływają na wynik)"""
+    index = 1.0
+    for key, value in (("temp_range", temperature), ("pressure_range", pressure), ("pH_range", ph)):
+        if value is not None:
+            low, high = data[key]
+            index *= math.exp(-0.5 * ((value - (low + high) / 2) / ((high - low) / 4)) ** 2)
+    if radiation is not None:
+        index *= math.exp(-radiation / data["radiation_tolerance"])
+    return index
+
+
+@pytest.fixture(autouse=True)
+def double_precision_maps():
+    # Porównanie z rachunkiem skalarnym w pełnej precyzji
+    set_dtype('maps', np.float64)
+    yield
+    reset_dtype_policy()
+
+
+def test_tolerance_parameters_from_ranges():
+    centers, widths = tolerance_parameters(ORGANISMS, ["E. coli", "Niesporczak"], "pressure_range")
+    np.testing.assert_allclose(centers, [1.5, 30])
+    np.testing.assert_allclose(widths, [0.25, 15])
+    # Zerowa szerokość zakresu nie prowadzi do dzielenia przez zero
+    _, widths = tolerance_parameters({"X": {"temp_range": (20, 20)}}, ["X"], "temp_range")
+    assert widths[0] > 0
+
+
+def test_maps_match_pointwise_model():
+    temperatures = np.linspace(0, 150, 31)
+    pressures = np.linspace(0, 60, 17)
+    maps = habitability_maps(ORGANISMS, temperatures, pressures)
+    assert maps.shape == (len(ORGANISMS), len(pressures), len(temperatures))
+
+    expected = np.array([[[survival(data, temperature, pressure) for temperature in temperatures]
+                          for pressure in pressures] for data in ORGANISMS.values()])
+    np.testing.assert_allclose(maps, expected, rtol=1e-12, atol=1e-300)
+
+
+@pytest.mark.parametrize("max_chunk_elements", [1, 7, 64, 2 ** 22])
+def test_chunking_does_not_change_results(max_chunk_elements):
+    temperatures = np.linspace(0, 120, 23)
+    pressures = np.geomspace(0.1, 60, 19)
+    full = habitability_maps(ORGANISMS, temperatures, pressures)
+    np.testing.assert_array_equal(
+        habitability_maps(ORGANISMS, temperatures, pressures, max_chunk_elements=max_chunk_elements), full)
+    np.testing.assert_array_equal(
+        combined_habitability_map(ORGANISMS, temperatures, pressures, UNION, max_chunk_elements=max_chunk_elements),
+        full.max(axis=0))
+    np.testing.assert_array_equal(
+        combined_habitability_map(ORGANISMS, temperatures, pressures, INTERSECTION,
+                                  max_chunk_elements=max_chunk_elements),
+        full.min(axis=0))
+
+
+def test_selected_organisms_and_invalid_mode():
+    temperatures = np.linspace(0, 100, 11)
+    pressures = np.linspace(0, 10, 5)
+    names = ["E. coli", "Deinococcus radiodurans"]
+    maps = habitability_maps(ORGANISMS, temperatures, pressures, names=names)
+    np.testing.assert_array_equal(maps[0], habitability_maps(ORGANISMS, temperatures, pressures, ["E. coli"])[0])
+    np.testing.assert_array_equal(combined_habitability_map(ORGANISMS, temperatures, pressures, UNION, names),
+                                  maps.max(axis=0))
+    with pytest.raises(ValueError):
+        combined_habitability_map(ORGANISMS, temperatures, pressures, mode="xor")
+
+
+def test_maps_follow_precision_policy():
+    reset_dtype_policy()
+    maps = habitability_maps(ORGANISMS, np.linspace(0, 100, 5), np.linspace(0, 10, 3))
+    assert maps.dtype == np.float32
+
+
+@pytest.fixture
+def envelope():
+    grids = {TEMPERATURE: np.linspace(0, 150, 16), PRESSURE: np.linspace(0, 60, 13),
+             RADIATION: np.linspace(0, 5000, 6), PH: np.linspace(0, 14, 8)}
+    return ToleranceEnvelope(ORGANISMS, grids)
+
+
+def test_envelope_value_matches_pointwise_model(envelope):
+    for name, data in ORGANISMS.items():
+        for point in ((37, 1, 0, 7), (80, 12.5, 250, 6.3), (3, 59, 4999, 13)):
+            assert envelope.value(name, *point) == pytest.approx(survival(data, *point), rel=1e-12)
+
+
+def test_slices_equal_sections_of_full_tensor(envelope):
+    tensor = envelope.tensor()
+    assert tensor.shape == (len(ORGANISMS), 16, 13, 6, 8)
+    fixed = {TEMPERATURE: envelope.grids[TEMPERATURE][5], PRESSURE: envelope.grids[PRESSURE][2],
+             RADIATION: envelope.grids[RADIATION][1], PH: envelope.grids[PH][4]}
+    node = {TEMPERATURE: 5, PRESSURE: 2, RADIATION: 1, PH: 4}
+
+    for x_axis, y_axis in ((TEMPERATURE, PRESSURE), (PH, RADIATION), (PRESSURE, PH)):
+        index = [slice(None)] + [slice(None) if axis in (x_axis, y_axis) else node[axis] for axis in AXES]
+        section = tensor[tuple(index)]
+        # Po wycięciu osie zostają w kolejności AXES - przekrój ma kształt (y × x)
+        if AXES.index(x_axis) < AXES.index(y_axis):
+            section = section.transpose(0, 2, 1)
+        for row, name in enumerate(envelope.names):
+            np.testing.assert_allclose(envelope.slice(x_axis, y_axis, fixed, organism=name), section[row],
+                                       rtol=1e-5)
+        np.testing.assert_allclose(envelope.slice(x_axis, y_axis, fixed, mode=UNION), section.max(axis=0),
+                                   rtol=1e-5)
+        np.testing.assert_allclose(envelope.slice(x_axis, y_axis, fixed, mode=INTERSECTION), section.min(axis=0),
+                                   rtol=1e-5, atol=1e-30)
+
+    single = envelope.tensor("E. coli")
+    np.testing.assert_allclose(single, tensor[envelope.index["E. coli"]])
+
+
+def test_slice_tiles_and_point_values_agree_with_full_slice(envelope):
+    fixed = {RADIATION: 100, PH: 7.2}
+    full = envelope.slice(TEMPERATURE, PRESSURE, fixed, max_chunk_elements=10)
+    np.testing.assert_array_equal(envelope.slice(TEMPERATURE, PRESSURE, fixed, rows=slice(3, 9),
+                                                 columns=slice(None, None, 4)), full[3:9, ::4])
+
+    x, y = np.meshgrid(envelope.grids[TEMPERATURE], envelope.grids[PRESSURE])
+    for mode in (UNION, INTERSECTION):
+        np.testing.assert_allclose(envelope.point_values(TEMPERATURE, PRESSURE, fixed, x, y, mode=mode,
+                                                         max_chunk_elements=5),
+                                   envelope.slice(TEMPERATURE, PRESSURE, fixed, mode=mode), rtol=1e-5, atol=1e-30)
+    data = ORGANISMS["Thermococcus gammatolerans"]
+    values = envelope.point_values(TEMPERATURE, PRESSURE, fixed, [70.5], [3.25],
+                                   organism="Thermococcus gammatolerans")
+    assert values[0] == pytest.approx(survival(data, 70.5, 3.25, 100, 7.2), rel=1e-12)
+
+    with pytest.raises(ValueError):
+        envelope.slice(PH, PH, fixed)
+    with pytest.raises(KeyError):
+        envelope.axis_factors("salinity", [1.0])
+
+
+def test_boundary_points_lie_on_threshold(envelope):
+    fixed = {RADIATION: 10, PH: 7}
+    trace = envelope.boundary(TEMPERATURE, PRESSURE, fixed, 0.5, organism="Niesporczak")
+    points = np.concatenate([np.asarray(polyline) for polyline in trace.polylines])
+    values = envelope.point_values(TEMPERATURE, PRESSURE, fixed, points[:, 0], points[:, 1],
+                                   organism="Niesporczak")
+    assert len(points) > 10
+    np.testing.assert_allclose(values, 0.5, atol=0.02)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+from PyQt5.QtGui import QColor, QTextCursor
+
+from modules.log_console import LOG_FILTERS, LOG_FLUSH_INTERVAL_MS, LOG_LEVELS, MAX_LOG_LINES, LogConsole
+
+
+@pytest.fixture
+def console(qapp):
+    console = LogConsole()
+    console.flush()
+    yield console
+    console.flush_timer.stop()
+    console.deleteLater()
+
+
+def lines(console):
+    """Wiersze konsoli bez znacznika czasu"""
+    text = console.log_text.toPlainText()
+    return [line.split("] ", 1)[1] for line in text.split("\n")] if text else []
+
+
+def wait_until(qapp, condition, timeout=2.0):
+    """Obsługa zdarzeń Qt do spełnienia warunku"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+
+def test_messages_are_batched_until_flush(qapp, console):
+    assert lines(console) == ["[INFO] Aplikacja uruchomiona"]
+    console.add_log("Pierwszy", "success")
+    console.add_log("Drugi", "warning")
+    console.add_log("Trzeci", "nieznany")
+    # Dokument zmieniany dopiero przy dopisaniu porcji
+    assert len(lines(console)) == 1
+    assert console.flush_timer.isActive()
+    assert wait_until(qapp, lambda: len(lines(console)) == 4)
+    assert lines(console)[1:] == ["[SUKCES] Pierwszy", "[OSTRZEŻENIE] Drugi", "[INFO] Trzeci"]
+    # Pusta kolejka - zegar zatrzymany
+    assert wait_until(qapp, lambda: not console.flush_timer.isActive(), 5 * LOG_FLUSH_INTERVAL_MS / 1000)
+
+
+def test_level_colours(console):
+    for level in LOG_LEVELS:
+        console.add_log(level, level)
+    console.flush()
+    document = console.log_text.document()
+    for row, level in enumerate(LOG_LEVELS, start=1):
+        cursor = QTextCursor(document.findBlockByNumber(row))
+        cursor.movePosition(QTextCursor.EndOfBlock)
+        assert cursor.charFormat().foreground().color() == QColor(LOG_LEVELS[level][2])
+
+
+def test_repeated_messages_are_summarised(console):
+    for _ in range(100):
+        console.add_log("Powtórzenie", "error")
+    console.add_log("Inny", "info")
+    console.flush()
+    assert lines(console)[1:] == ["[BŁĄD] Powtórzenie", "[BŁĄD] Pominięto 99 powtórzeń poprzedniego komunikatu",
+                                  "[INFO] Inny"]
+
+    # Powtórzenia bez zmiany komunikatu - podsumowanie po odstępie bez nowych powtórzeń
+    for _ in range(5):
+        console.add_log("Inny", "info")
+    console.flush()
+    assert len(lines(console)) == 4
+    console.flush()
+    assert lines(console)[-1] == "[INFO] Pominięto 5 powtórzeń poprzedniego komunikatu"
+    console.flush()
+    assert len(lines(console)) == 5
+
+
+def test_queue_and_console_are_bounded(console):
+    count = MAX_LOG_LINES + 250
+    for index in range(count):
+        console.add_log(f"Komunikat {index}")
+    console.flush()
+    result = lines(console)
+    assert len(result) == console.log_text.blockCount() == MAX_LOG_LINES
+    assert result[0] == "[OSTRZEŻENIE] Pominięto 251 starszych komunikatów (przepełniona kolejka)"
+    assert result[1] == f"[INFO] Komunikat {count - MAX_LOG_LINES + 1}"
+    assert result[-1] == f"[INFO] Komunikat {count - 1}"
+    assert len(console.history) == MAX_LOG_LINES
+
+
+def test_level_filter_rebuilds_from_history(console):
+    for level in ("info", "success", "warning", "error", "info"):
+        console.add_log(level, level)
+    console.flush()
+    for index, (_, weight) in enumerate(LOG_FILTERS):
+        console.level_filter.setCurrentIndex(index)
+        expected = [f"{LOG_LEVELS[level][1]}{message}" for _, level, message in console.history
+                    if LOG_LEVELS[level][0] >= weight]
+        assert lines(console) == expected
+    # Nowe komunikaty też przechodzą przez filtr
+    console.add_log("ukryty", "warning")
+    console.add_log("widoczny", "error")
+    console.flush()
+    assert lines(console) == ["[BŁĄD] error", "[BŁĄD] widoczny"]
+
+    console.level_filter.setCurrentIndex(0)
+    assert len(lines(console)) == 8
+
+
+def test_messages_from_worker_threads(qapp, console):
+    def worker(name):
+        for index in range(200):
+            console.add_log(f"{name} {index}")
+
+    threads = [threading.Thread(target=worker, args=(f"Wątek {number}",)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert wait_until(qapp, lambda: len(lines(console)) == 801)
+    for number in range(4):
+        messages = [line for line in lines(console) if line.startswith(f"[INFO] Wątek {number} ")]
+        # Kolejność komunikatów jednego wątku zachowana
+        assert messages == [f"[INFO] Wątek {number} {index}" for index in range(200)]
+
+
+def test_clear_logs(console):
+    console.add_log("Powtórzenie")
+    console.add_log("Powtórzenie")
+    console.clear_logs()
+    console.flush()
+    assert lines(console) == ["[INFO] Konsola wyczyszczona"]
+    assert [message for _, _, message in console.history] == ["Konsola wyczyszczona"]
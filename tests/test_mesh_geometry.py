@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+from pyqtgraph.opengl import MeshData
+
+from modules.mesh_geometry import GeometryCache, SphereMeshData, icosahedron, subdivide, unit_sphere
+
+
+def loop_sphere(rows, cols):
+    """Siatka UV sfery budowana pętlami (wzorzec wersji wektorowej)"""
+    vertices = []
+    for i in range(rows + 1):
+        phi = np.pi * i / rows
+        for j in range(cols):
+            theta = 2 * np.pi * j / cols
+            vertices.append([np.sin(phi) * np.cos(theta), np.sin(phi) * np.sin(theta), np.cos(phi)])
+    faces = []
+    for i in range(rows):
+        for j in range(cols):
+            p1 = i * cols + j
+            p2 = i * cols + (j + 1) % cols
+            p3 = (i + 1) * cols + j
+            p4 = (i + 1) * cols + (j + 1) % cols
+            faces.append([p1, p2, p3])
+            faces.append([p2, p4, p3])
+    return np.array(vertices), np.array(faces)
+
+
+def edge_counts(faces):
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    return counts
+
+
+@pytest.mark.parametrize("rows, cols", [(1, 3), (10, 20), (7, 13), (40, 40)])
+def test_unit_sphere_matches_loop_construction(rows, cols):
+    vertices, faces = unit_sphere(rows, cols)
+    expected_vertices, expected_faces = loop_sphere(rows, cols)
+    assert vertices.dtype == np.float32 and faces.dtype == np.uint32
+    np.testing.assert_allclose(vertices, expected_vertices, atol=1e-6)
+    np.testing.assert_array_equal(faces, expected_faces)
+
+
+@pytest.mark.parametrize("level", [0, 1, 2, 4])
+def test_icosphere_is_closed_oriented_unit_mesh(level):
+    vertices, faces = icosahedron()
+    for _ in range(level):
+        vertices, faces = subdivide(vertices, faces)
+    assert len(vertices) == 10 * 4 ** level + 2
+    assert len(faces) == 20 * 4 ** level
+    np.testing.assert_allclose(np.linalg.norm(vertices, axis=1), 1, rtol=1e-12)
+    # Każda krawędź należy do dokładnie dwóch trójkątów, a każdy wierzchołek jest użyty
+    assert (edge_counts(faces) == 2).all()
+    assert len(np.unique(faces)) == len(vertices)
+    # Wszystkie trójkąty skierowane na zewnątrz sfery
+    a, b, c = (vertices[faces[:, corner]] for corner in range(3))
+    assert (np.einsum('ij,ij->i', np.cross(b - a, c - a), a + b + c) > 0).all()
+
+
+def test_subdivision_shares_edge_midpoints():
+    vertices, faces = subdivide(*icosahedron())
+    original, _ = icosahedron()
+    np.testing.assert_array_equal(vertices[:12], original)
+    # Nowy wierzchołek to rzut środka krawędzi - kąt do jej końców jest jednakowy
+    new = vertices[12:]
+    nearest = np.sort(new @ original.T, axis=1)[:, -2:]
+    np.testing.assert_allclose(nearest[:, 0], nearest[:, 1], rtol=1e-12)
+
+
+def test_cache_shares_read_only_geometry():
+    cache = GeometryCache()
+    vertices, faces = cache.sphere(12, 24)
+    assert cache.sphere(12.0, 24)[0] is vertices
+    assert not vertices.flags.writeable and not faces.flags.writeable
+    with pytest.raises(ValueError):
+        vertices[0, 0] = 2
+
+    fine = cache.icosphere(3)
+    coarse = cache.icosphere(1)
+    assert fine[0].dtype == np.float32 and not fine[1].flags.writeable
+    assert cache.icosphere(3) is fine
+    assert len(coarse[1]) == 20 * 4
+    assert len(cache) == 3
+    cache.clear()
+    assert len(cache) == 0 and cache.sphere(12, 24)[0] is not vertices
+
+
+def test_sphere_mesh_normals_equal_vertices():
+    vertices, faces = GeometryCache().icosphere(3)
+    mesh = SphereMeshData(vertices, faces)
+    np.testing.assert_array_equal(mesh.vertexNormals(), vertices)
+    np.testing.assert_array_equal(mesh.vertexNormals(indexed='faces'), vertices[faces])
+    # Normalne liczone przez MeshData z trójkątów są bliskie wierzchołkom sfery
+    computed = MeshData(vertexes=vertices, faces=faces).vertexNormals()
+    np.testing.assert_allclose(computed, vertices, atol=0.02)
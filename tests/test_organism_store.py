@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+import numpy as np
+import pytest
+
+from modules.biological_module import VIABILITY_SERIES, BiologicalModule, viability_summary
+from modules.habitability_map import PH, PRESSURE, RADIATION, TEMPERATURE, ToleranceEnvelope, habitability_maps
+from modules.organism_store import DEFAULT_ORGANISMS, OrganismStore, ToleranceIndex
+
+
+def random_strains(n_strains, seed):
+    """Szczepy o losowych przedziałach tolerancji (także z powtarzającymi się granicami)"""
+    rng = np.random.default_rng(seed)
+    columns = {"name": [f"szczep-{number}" for number in range(n_strains)]}
+    for lower, upper, low, high in (("temp_min", "temp_max", 0, 150), ("pressure_min", "pressure_max", 0, 60),
+                                    ("ph_min", "ph_max", 0, 14)):
+        bounds = np.sort(np.round(rng.uniform(low, high, (n_strains, 2)), 1), axis=1)
+        columns[lower], columns[upper] = bounds[:, 0], bounds[:, 1]
+    columns["radiation_tolerance"] = np.round(rng.lognormal(5, 2, n_strains))
+    for column in ("water", "protein", "lipids", "nucleic_acids", "other"):
+        columns[column] = rng.uniform(0, 100, n_strains)
+    return OrganismStore(columns)
+
+
+def brute_force(store, box):
+    """Przegląd wszystkich szczepów - wzorzec dla zapytań indeksu"""
+    bounds = {TEMPERATURE: (store.temp_min, store.temp_max), PRESSURE: (store.pressure_min, store.pressure_max),
+              RADIATION: (None, store.radiation_tolerance), PH: (store.ph_min, store.ph_max)}
+    mask = np.ones(len(store), dtype=bool)
+    for axis, (low, high) in box.items():
+        lower, upper = bounds[axis]
+        if lower is not None:
+            mask &= lower <= low
+        mask &= upper >= high
+    return np.flatnonzero(mask)
+
+
+def test_index_matches_brute_force_scan():
+    store = random_strains(5000, seed=4)
+    index = ToleranceIndex(store)
+    rng = np.random.default_rng(8)
+    for _ in range(200):
+        point = {TEMPERATURE: rng.uniform(0, 150), PRESSURE: rng.uniform(0, 60),
+                 RADIATION: rng.lognormal(4, 2), PH: rng.uniform(0, 14)}
+        # Losowy podzbiór osi - pozostałe parametry są dowolne
+        point = {axis: value for axis, value in point.items() if rng.random() < 0.7}
+        rows = index.survivors(temperature=point.get(TEMPERATURE), pressure=point.get(PRESSURE),
+                               radiation=point.get(RADIATION), ph=point.get(PH))
+        np.testing.assert_array_equal(rows, brute_force(store, {axis: (value, value)
+                                                                for axis, value in point.items()}))
+
+        box = {TEMPERATURE: tuple(sorted(rng.uniform(0, 150, 2))), PH: tuple(sorted(rng.uniform(0, 14, 2)))}
+        np.testing.assert_array_equal(index.survivors_in_box(box), brute_force(store, box))
+
+
+def test_index_handles_bounds_ties_and_empty_queries():
+    store = OrganismStore.from_records([
+        {"name": "A", "temp_min": 10, "temp_max": 20, "pressure_min": 1, "pressure_max": 1,
+         "radiation_tolerance": 5, "ph_min": 7, "ph_max": 7},
+        {"name": "B", "temp_min": 20, "temp_max": 30, "pressure_min": 0, "pressure_max": 2,
+         "radiation_tolerance": 5, "ph_min": 6, "ph_max": 8},
+    ])
+    index = ToleranceIndex(store)
+    assert index.names(index.survivors(temperature=20)) == ["A", "B"]
+    assert index.names(index.survivors(temperature=20, pressure=1, radiation=5, ph=7)) == ["A", "B"]
+    assert index.names(index.survivors(pressure=1.5)) == ["B"]
+    assert index.names(index.survivors(radiation=5.01)) == []
+    assert index.survivors().tolist() == [0, 1]
+    with pytest.raises(KeyError):
+        index.survivors_in_box({"salinity": (0, 1)})
+
+
+def test_dict_interface_round_trips_default_organisms():
+    store = OrganismStore.default()
+    assert list(store.keys()) == list(DEFAULT_ORGANISMS)
+    for name, data in DEFAULT_ORGANISMS.items():
+        assert name in store
+        assert store[name]["temp_range"] == data["temp_range"]
+        assert store[name]["pH_range"] == data["pH_range"]
+        assert store[name]["radiation_tolerance"] == data["radiation_tolerance"]
+        assert store[name]["cell_composition"] == data["cell_composition"]
+
+
+def test_habitability_maps_accept_columnar_store():
+    store = OrganismStore.default()
+    temperatures = np.linspace(0, 150, 12)
+    pressures = np.linspace(0, 20, 9)
+    np.testing.assert_array_equal(habitability_maps(store, temperatures, pressures),
+                                  habitability_maps(DEFAULT_ORGANISMS, temperatures, pressures))
+    envelope = ToleranceEnvelope.regular(store, 5)
+    reference = ToleranceEnvelope.regular(DEFAULT_ORGANISMS, 5)
+    np.testing.assert_array_equal(envelope.tensor(), reference.tensor())
+
+
+def test_viability_matches_envelope_point_values():
+    store = random_strains(300, seed=5)
+    index = ToleranceIndex(store)
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        envelope = ToleranceEnvelope.regular(store, 3)
+    points = [(20.0, 1.0, 5.0, 7.0), (95.5, 30.0, 0.5, 2.5), (140.0, 59.0, 1e4, 13.0)]
+
+    # Szczepy o zerowej szerokości zakresu lub tolerancji - czynniki graniczne jak w obwiedni
+    with np.errstate(divide='ignore', over='ignore'):
+        viability = index.viability(*np.array(points).T)
+    assert viability.shape == (len(store), len(points))
+    for column, point in enumerate(points):
+        with np.errstate(divide='ignore', over='ignore'):
+            reference = [100 * envelope.value(name, *point) for name in store.keys()]
+            single = index.viability(*point)
+        np.testing.assert_allclose(viability[:, column], reference, rtol=1e-12, atol=1e-300)
+        np.testing.assert_array_equal(single[:, 0], viability[:, column])
+
+
+def test_simulation_keeps_viability_aggregates(qapp):
+    module = BiologicalModule()
+    for step, temperature in enumerate((280.0, 300.0, 320.0)):
+        module.update_simulation_data(step, 50.0, temperature, 1.0, 2.0, 7.0)
+
+    viability = module.tolerance_index.viability([280.0, 300.0, 320.0], 1.0, 2.0, 7.0)
+    histories = [history.values() for history in module.simulation_viability.values()]
+    assert list(module.simulation_viability) == list(VIABILITY_SERIES)
+    for history, expected in zip(histories, viability_summary(viability)):
+        np.testing.assert_allclose(history, expected, rtol=1e-6)
+    np.testing.assert_allclose(histories[0], viability.mean(axis=0), rtol=1e-6)
+    np.testing.assert_array_equal(histories[2], 100 * (viability >= 50).mean(axis=0))
+
+    module.show_simulation_results()
+    module.show_simulation_results()
+    axes = module.simulation_canvas.figure.axes
+    assert len(axes) == 2 and len(axes[1].lines) == len(VIABILITY_SERIES)
+
+
+def test_file_formats_and_cache(tmp_path):
+    dat_path = tmp_path / "strains.dat"
+    dat_path.write_text("name;temp_min;temp_max;pressure_min;pressure_max;radiation_tolerance;pH_min;pH_max;water\n"
+                        "Halobacterium;20;50;1;3;30;6;9;70\n"
+                        "Psychrobacter;-10;25;1;2;;6.5;8;\n", encoding="utf-8")
+    store = OrganismStore.load(str(dat_path))
+    assert store.name.tolist() == ["Halobacterium", "Psychrobacter"]
+    np.testing.assert_array_equal(store.ph_max, [9, 8])
+    assert np.isnan(store.radiation_tolerance[1]) and np.isnan(store.water[1])
+    assert (tmp_path / "strains.dat.cache.npz").exists()
+    np.testing.assert_array_equal(OrganismStore.load(str(dat_path)).temp_min, store.temp_min)
+
+    keyed_path = tmp_path / "organisms.json"
+    keyed_path.write_text(json.dumps(DEFAULT_ORGANISMS), encoding="utf-8")
+    flat_path = tmp_path / "flat.json"
+    flat_path.write_text(json.dumps([dict(data, name=name) for name, data in DEFAULT_ORGANISMS.items()]),
+                         encoding="utf-8")
+    keyed = OrganismStore.load(str(keyed_path), use_cache=False)
+    flat = OrganismStore.load(str(flat_path), use_cache=False)
+    for column in ("temp_min", "pressure_max", "radiation_tolerance", "ph_min", "protein"):
+        np.testing.assert_array_equal(getattr(keyed, column), getattr(flat, column))
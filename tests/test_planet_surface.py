@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+import pytest
+
+from modules.mesh_geometry import GeometryCache
+from modules.planet_surface import (DEFAULT_SURFACE_CONDITIONS, EQUATOR_POLE_CONTRAST, HABITABILITY_LUT,
+                                    SUBSTELLAR_CONTRAST, atmosphere_appearance, habitability_colors,
+                                    habitability_field, surface_colors, surface_temperature, vertex_coordinates)
+from modules.simulation_thread import habitability_model
+
+CONDITIONS = {'temperature': 290, 'pressure': 1.5, 'radiation': 3, 'ph': 6.5, 'oxygen': 18, 'nitrogen': 75,
+              'co2': 2}
+
+
+def scalar_field(latitude, longitude, conditions):
+    """Indeks habitabilności w jednym punkcie powierzchni liczony wprost"""
+    temperature = (conditions['temperature'] + EQUATOR_POLE_CONTRAST * (math.cos(latitude) ** 2 - 2 / 3) +
+                   SUBSTELLAR_CONTRAST * math.cos(longitude) * math.cos(latitude))
+    return float(habitability_model(temperature, conditions['pressure'], conditions['radiation'], conditions['ph'],
+                                    conditions['oxygen'], conditions['nitrogen'], conditions['co2']))
+
+
+def test_vertex_coordinates_of_reference_points():
+    vertices = np.array([[1, 0, 0], [0, 1, 0], [-1, 0, 0], [0, 0, 1], [0, 0, -1],
+                         [0.5, 0.5, math.sqrt(0.5)]])
+    latitudes, longitudes = vertex_coordinates(vertices)
+    np.testing.assert_allclose(latitudes, [0, 0, 0, math.pi / 2, -math.pi / 2, math.pi / 4], atol=1e-12)
+    np.testing.assert_allclose(longitudes[[0, 1, 2, 5]], [0, math.pi / 2, math.pi, math.pi / 4], atol=1e-12)
+
+
+def test_surface_temperature_preserves_planet_mean():
+    # Kwadratura na siatce szerokości × długości z wagami cos(szerokości)
+    latitudes = np.linspace(-math.pi / 2, math.pi / 2, 721)[:, None]
+    longitudes = np.linspace(-math.pi, math.pi, 1440, endpoint=False)[None, :]
+    temperatures = surface_temperature(latitudes, longitudes, 288.0)
+    weights = np.broadcast_to(np.cos(latitudes), temperatures.shape)
+    assert np.average(temperatures, weights=weights) == pytest.approx(288.0, abs=1e-3)
+    assert surface_temperature(0.0, 0.0, 288.0) == pytest.approx(288 + EQUATOR_POLE_CONTRAST / 3 +
+                                                                 SUBSTELLAR_CONTRAST)
+    assert surface_temperature(math.pi / 2, 1.0, 288.0) == pytest.approx(288 - 2 * EQUATOR_POLE_CONTRAST / 3)
+
+
+def test_field_matches_pointwise_model():
+    vertices, _ = GeometryCache().icosphere(2)
+    latitudes, longitudes = vertex_coordinates(vertices.astype(np.float64))
+    field = habitability_field(latitudes, longitudes, CONDITIONS)
+    assert field.dtype == np.float32 and field.shape == (len(vertices),)
+    expected = [scalar_field(latitude, longitude, CONDITIONS) for latitude, longitude in zip(latitudes, longitudes)]
+    np.testing.assert_allclose(field, expected, rtol=1e-6, atol=1e-4)
+
+    # Brakujące warunki uzupełniane wartościami domyślnymi
+    np.testing.assert_array_equal(habitability_field(latitudes, longitudes, {}),
+                                  habitability_field(latitudes, longitudes, DEFAULT_SURFACE_CONDITIONS))
+
+
+def test_field_broadcasts_over_frames():
+    latitudes, longitudes = vertex_coordinates(GeometryCache().icosphere(1)[0])
+    temperatures = np.array([250.0, 300.0, 340.0])
+    frames = habitability_field(latitudes, longitudes, dict(CONDITIONS, temperature=temperatures[:, None]))
+    assert frames.shape == (3, len(latitudes))
+    for row, temperature in enumerate(temperatures):
+        np.testing.assert_array_equal(frames[row],
+                                      habitability_field(latitudes, longitudes, dict(CONDITIONS,
+                                                                                     temperature=temperature)))
+    # Pole niezależne od położenia (stała temperatura siatki klimatu) ma kształt współrzędnych
+    uniform = habitability_field(latitudes, longitudes, CONDITIONS, np.full((4, 8), 300.0))
+    assert uniform.shape == latitudes.shape
+    np.testing.assert_allclose(uniform, habitability_field(0.0, 0.0, dict(CONDITIONS, temperature=300.0 -
+                                                                          EQUATOR_POLE_CONTRAST / 3 -
+                                                                          SUBSTELLAR_CONTRAST)), rtol=1e-6)
+
+
+def test_colors_follow_lookup_table():
+    assert HABITABILITY_LUT.shape == (256, 4) and not HABITABILITY_LUT.flags.writeable
+    colors = habitability_colors(np.array([-5, 0, 35, 60, 100, 130]))
+    assert colors.dtype == np.uint8 and colors.shape == (6, 4)
+    np.testing.assert_array_equal(colors[0], colors[1])
+    np.testing.assert_array_equal(colors[1], [115, 31, 20, 255])
+    np.testing.assert_array_equal(colors[4], [38, 166, 64, 255])
+    np.testing.assert_array_equal(colors[4], colors[5])
+    # Węzły skali barw leżą między wpisami tablicy - kolor najbliższego wpisu
+    np.testing.assert_allclose(colors[2, :3], [204, 115, 38], atol=2)
+    np.testing.assert_allclose(colors[3, :3], [217, 191, 77], atol=2)
+
+
+def test_surface_colors_of_mesh_vertices():
+    vertices, _ = GeometryCache().icosphere(3)
+    colors = surface_colors(vertices, CONDITIONS)
+    assert colors.shape == (len(vertices), 4)
+    latitudes, longitudes = vertex_coordinates(vertices)
+    np.testing.assert_array_equal(colors, habitability_colors(habitability_field(latitudes, longitudes,
+                                                                                 CONDITIONS)))
+
+
+def test_atmosphere_appearance_matches_scalar_formula():
+    colors, radii = atmosphere_appearance([21, 0, 100], [78, 100, 0], [0.04, 0, 50], [1, 100, 0])
+    for row, (oxygen, nitrogen, co2, pressure) in enumerate(((21, 78, 0.04, 1), (0, 100, 0, 100), (100, 0, 50, 0))):
+        expected = (0.6 + 0.4 * co2 / 100, 0.6 + 0.4 * oxygen / 100, 0.6 + 0.4 * nitrogen / 100, 0.3)
+        np.testing.assert_allclose(colors[row], expected)
+        assert radii[row] == pytest.approx(12 + pressure / 50)
+    color, radius = atmosphere_appearance(21, 78, 0, 50)
+    assert color.shape == (4,) and radius == 13
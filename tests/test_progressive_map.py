@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from modules import progressive_map
+from modules.habitability_map import INTERSECTION, PH, PRESSURE, RADIATION, TEMPERATURE, UNION, ToleranceEnvelope
+from modules.organism_store import DEFAULT_ORGANISMS
+from modules.progressive_map import MapRefinementThread, coarse_map, coarse_step, map_preview, tile_order
+
+FIXED = {RADIATION: 1, PH: 7}
+
+
+@pytest.fixture(scope="module")
+def envelope():
+    grids = {TEMPERATURE: np.linspace(0, 150, 203), PRESSURE: np.linspace(0, 60, 149),
+             RADIATION: np.linspace(0, 5000, 4), PH: np.linspace(0, 14, 4)}
+    return ToleranceEnvelope(DEFAULT_ORGANISMS, grids)
+
+
+def assemble(shape, tiles):
+    """Złożenie mapy z kafelków (wiersz, kolumna, wartości), sprawdzając brak nakładania"""
+    result = np.full(shape, np.nan)
+    for row, column, values in tiles:
+        target = result[row:row + values.shape[0], column:column + values.shape[1]]
+        assert np.isnan(target).all()
+        target[...] = values
+    return result
+
+
+def test_coarse_preview_samples_exact_map(envelope):
+    exact = envelope.slice(TEMPERATURE, PRESSURE, FIXED, mode=INTERSECTION)
+    preview, coarse = coarse_map(envelope, TEMPERATURE, PRESSURE, FIXED, mode=INTERSECTION, step=8)
+    assert preview.shape == exact.shape
+    np.testing.assert_array_equal(coarse, exact[::8, ::8])
+    # Każdy punkt podglądu ma wartość najbliższego policzonego węzła (lewy górny róg bloku)
+    rows, columns = np.indices(exact.shape)
+    np.testing.assert_array_equal(preview, coarse[rows // 8, columns // 8])
+
+
+def test_map_preview_is_exact_for_small_maps(envelope, monkeypatch):
+    exact = envelope.slice(TEMPERATURE, PRESSURE, FIXED, organism="Escherichia coli")
+    preview, coarse, step = map_preview(envelope, TEMPERATURE, PRESSURE, FIXED, organism="Escherichia coli")
+    assert coarse is None and step == 1
+    np.testing.assert_array_equal(preview, exact)
+
+    monkeypatch.setattr(progressive_map, "PROGRESSIVE_MIN_ELEMENTS", 1000)
+    preview, coarse, step = map_preview(envelope, TEMPERATURE, PRESSURE, FIXED, organism="Escherichia coli")
+    assert step == progressive_map.COARSE_STEP
+    np.testing.assert_array_equal(coarse, exact[::step, ::step])
+
+
+def test_coarse_step_grows_with_map_size():
+    assert coarse_step(100) == progressive_map.COARSE_STEP
+    step = coarse_step(4000 * 4000, 50)
+    assert 4000 * 4000 * 50 / step ** 2 <= progressive_map.COARSE_MAX_ELEMENTS
+
+
+def test_tile_order_covers_map_and_starts_at_boundary():
+    shape = (300, 500)
+    rows, columns = np.indices(shape)
+    # Ostra granica w kolumnie 420 - reszta mapy stała
+    exact = (columns >= 420).astype(float)
+    coarse = exact[::8, ::8]
+    tiles = tile_order(coarse, shape, step=8, tile_size=100)
+    assert sorted(tiles) == [(row, column) for row in range(0, 300, 100) for column in range(0, 500, 100)]
+    assert {column for _, column in tiles[:3]} == {400}
+
+
+def test_refinement_tiles_reassemble_exact_map(envelope):
+    exact = envelope.slice(TEMPERATURE, PRESSURE, FIXED, mode=UNION)
+    _, coarse = coarse_map(envelope, TEMPERATURE, PRESSURE, FIXED, step=8)
+    thread = MapRefinementThread(3, envelope, TEMPERATURE, PRESSURE, FIXED, coarse, step=8, tile_size=64)
+    tiles = []
+    finished = []
+    thread.tile_ready.connect(lambda generation, row, column, values: tiles.append((row, column, values)))
+    thread.refinement_finished.connect(finished.append)
+    # Przebieg w bieżącym wątku - sygnały dostarczane są od razu
+    thread.run()
+
+    assert len(tiles) == len(thread.tiles) == 3 * 4
+    np.testing.assert_array_equal(assemble(exact.shape, tiles), exact)
+    assert finished == [3]
+
+
+def test_refinement_thread_delivers_tiles_and_can_be_cancelled(envelope, qapp):
+    _, coarse = coarse_map(envelope, PH, RADIATION, {TEMPERATURE: 30, PRESSURE: 2}, step=1)
+    thread = MapRefinementThread(7, envelope, PH, RADIATION, {TEMPERATURE: 30, PRESSURE: 2}, coarse, step=1,
+                                 tile_size=2)
+    received = []
+    thread.tile_ready.connect(lambda generation, row, column, values: received.append(generation))
+    thread.start()
+    assert thread.wait(5000)
+    qapp.processEvents()
+    assert received == [7] * len(thread.tiles)
+
+    _, coarse = coarse_map(envelope, TEMPERATURE, PRESSURE, FIXED, step=8)
+    cancelled = MapRefinementThread(8, envelope, TEMPERATURE, PRESSURE, FIXED, coarse, step=8, tile_size=16)
+    finished = []
+    cancelled.refinement_finished.connect(finished.append)
+    cancelled.cancel()
+    cancelled.run()
+    assert finished == []
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+import pytest
+
+from modules.sensitivity_analysis import (INPUTS, MIN_HALF_WIDTH, PARAMETER_LIMITS, SensitivityThread,
+                                          evaluate_batches, evaluate_model, regime_bounds, saltelli_design,
+                                          saltelli_matrices, sobol_analysis, sobol_estimates)
+
+ISHIGAMI_A = 7.0
+ISHIGAMI_B = 0.1
+
+PARAMS = {"temperature": 290, "pressure": 1, "radiation": 2, "ph": 7, "oxygen": 21, "nitrogen": 78, "co2": 0.04}
+
+
+def ishigami(samples):
+    x1, x2, x3 = samples.T
+    return np.sin(x1) + ISHIGAMI_A * np.sin(x2) ** 2 + ISHIGAMI_B * x3 ** 4 * np.sin(x1)
+
+
+def ishigami_indices():
+    """Analityczne indeksy Sobola funkcji Ishigami (pierwszego rzędu, całkowite)"""
+    a, b, pi = ISHIGAMI_A, ISHIGAMI_B, math.pi
+    v1 = 0.5 * (1 + b * pi ** 4 / 5) ** 2
+    v2 = a ** 2 / 8
+    v13 = b ** 2 * pi ** 8 * (1 / 18 - 1 / 50)
+    variance = v1 + v2 + v13
+    return np.array([v1, v2, 0]) / variance, np.array([v1 + v13, v2, v13]) / variance
+
+
+def model_values(function, A, B):
+    values = function(saltelli_design(A, B)).reshape(A.shape[1] + 2, len(A))
+    return values[0], values[1], values[2:]
+
+
+def test_design_replaces_one_column_per_block():
+    A, B = saltelli_matrices([[0, 1], [10, 20], [-5, 5]], n_base=100, seed=1)
+    assert A.shape == B.shape == (128, 3)
+    assert (A[:, 1] >= 10).all() and (A[:, 1] <= 20).all()
+    design = saltelli_design(A, B).reshape(5, 128, 3)
+    np.testing.assert_array_equal(design[0], A)
+    np.testing.assert_array_equal(design[1], B)
+    for column in range(3):
+        expected = A.copy()
+        expected[:, column] = B[:, column]
+        np.testing.assert_array_equal(design[2 + column], expected)
+
+
+def test_ishigami_indices_match_analytic_values():
+    bounds = np.array([[-math.pi, math.pi]] * 3)
+    A, B = saltelli_matrices(bounds, n_base=2 ** 15, seed=3)
+    first, total = sobol_estimates(*model_values(ishigami, A, B))
+    expected_first, expected_total = ishigami_indices()
+    np.testing.assert_allclose(first, expected_first, atol=0.02)
+    np.testing.assert_allclose(total, expected_total, atol=0.02)
+
+
+def test_additive_linear_model_has_equal_first_order_and_total_indices():
+    coefficients = np.array([3.0, 1.0, 0.5, 0.0])
+    bounds = np.array([[0, 1], [0, 2], [-1, 1], [0, 1]])
+    A, B = saltelli_matrices(bounds, n_base=2 ** 13, seed=5)
+    first, total = sobol_estimates(*model_values(lambda samples: samples @ coefficients, A, B))
+    # Wariancja składnika c·U(a, b) to c²(b - a)²/12
+    variances = coefficients ** 2 * (bounds[:, 1] - bounds[:, 0]) ** 2 / 12
+    np.testing.assert_allclose(first, variances / variances.sum(), atol=0.01)
+    np.testing.assert_allclose(total, variances / variances.sum(), atol=0.01)
+    assert total[3] == 0 and first[3] == 0
+
+
+def test_unit_bootstrap_weights_reproduce_point_estimates():
+    A, B = saltelli_matrices(np.array([[-math.pi, math.pi]] * 3), n_base=512, seed=8)
+    f_A, f_B, f_AB = model_values(ishigami, A, B)
+    first, total = sobol_estimates(f_A, f_B, f_AB)
+    weighted_first, weighted_total = sobol_estimates(f_A, f_B, f_AB, np.ones((3, len(f_A))))
+    np.testing.assert_allclose(weighted_first, np.tile(first, (3, 1)), rtol=1e-12)
+    np.testing.assert_allclose(weighted_total, np.tile(total, (3, 1)), rtol=1e-12)
+    # Stały model - brak wariancji, indeksy nieokreślone
+    constant = np.ones(8)
+    first, total = sobol_estimates(constant, constant, np.ones((2, 8)))
+    assert np.isnan(first).all() and np.isnan(total).all()
+
+
+def test_regime_bounds_respect_limits_and_minimum_width():
+    bounds = regime_bounds(dict(PARAMS, ph=13.9, co2=0))
+    position = dict(zip(INPUTS, range(len(INPUTS))))
+    np.testing.assert_allclose(bounds[position["temperature"]], [232, 348])
+    assert bounds[position["ph"]][1] == PARAMETER_LIMITS["ph"][1]
+    np.testing.assert_allclose(bounds[position["co2"]], [0, MIN_HALF_WIDTH["co2"]])
+    np.testing.assert_allclose(bounds[position["pressure"]], [0.8, 1.2])
+
+
+def test_batched_evaluation_matches_single_call():
+    A, _ = saltelli_matrices(regime_bounds(PARAMS), n_base=1000, seed=2)
+    np.testing.assert_array_equal(evaluate_batches(A, batch_rows=100), evaluate_model(A))
+
+
+def test_habitability_analysis_result():
+    bounds = regime_bounds(PARAMS)
+    # Azot ustalony - jego indeksy muszą być zerowe
+    nitrogen = INPUTS.index("nitrogen")
+    bounds[nitrogen] = PARAMS["nitrogen"]
+    result = sobol_analysis(bounds, n_base=1024, n_bootstrap=100, seed=4)
+    assert result.n_evaluations == 1024 * (len(INPUTS) + 2)
+    assert result.first_order[nitrogen] == 0 and result.total[nitrogen] == 0
+    totals = [result.total[INPUTS.index(name)] for name in result.ranking()]
+    assert totals == sorted(totals, reverse=True)
+    low, high = result.total_interval.T
+    assert (low <= result.total + 1e-12).all() and (result.total <= high + 1e-12).all()
+    assert len(result.summary_lines()) == len(INPUTS)
+
+    without_bootstrap = sobol_analysis(bounds, n_base=256, n_bootstrap=0, seed=4)
+    np.testing.assert_array_equal(without_bootstrap.total_interval[:, 0], without_bootstrap.total)
+
+
+def test_thread_reports_result_and_failure():
+    thread = SensitivityThread(PARAMS, n_base=128, n_bootstrap=10)
+    results, errors = [], []
+    thread.analysis_finished.connect(results.append)
+    thread.analysis_failed.connect(errors.append)
+    thread.run()
+    assert len(results) == 1 and errors == []
+    assert results[0].inputs == INPUTS
+
+    broken = SensitivityThread({"temperature": 300}, n_base=128, n_bootstrap=0)
+    broken.analysis_failed.connect(errors.append)
+    broken.run()
+    assert len(errors) == 1 and "KeyError" in errors[0]
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_fixed_seed_is_reproducible(seed):
+    bounds = regime_bounds(PARAMS)
+    first = sobol_analysis(bounds, n_base=128, n_bootstrap=20, seed=seed)
+    second = sobol_analysis(bounds, n_base=128, n_bootstrap=20, seed=seed)
+    np.testing.assert_array_equal(first.total, second.total)
+    np.testing.assert_array_equal(first.first_order_interval, second.first_order_interval)
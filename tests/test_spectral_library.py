@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from modules.spectral_library import (SpectralLibrary, import_directory, main, read_spectrum_file)
+
+PLANETS = ("Kepler-22b", "TRAPPIST-1e", "Proxima b")
+INSTRUMENTS = ("JWST-NIRSpec", "ELT-HIRES")
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    """Biblioteka z widmami o różnej długości (także krótszymi i dłuższymi niż fragment)"""
+    rng = np.random.default_rng(7)
+    records = []
+    path = str(tmp_path / "library.sqlite")
+    with SpectralLibrary(path, chunk_size=64) as library:
+        for number, n_points in enumerate((10, 64, 65, 200, 333, 1000, 3, 150)):
+            start = rng.uniform(300, 500)
+            wavelengths = np.sort(start + rng.uniform(0, 600, n_points))
+            intensities = rng.normal(1, 0.2, n_points)
+            record = {
+                "planet": PLANETS[number % 3],
+                "instrument": INSTRUMENTS[number % 2],
+                "date": f"2025-0{number + 1}-15",
+                "snr": 5.0 * (number + 1),
+            }
+            spectrum_id = library.add_spectrum(wavelengths, intensities, **record)
+            records.append((spectrum_id, wavelengths, intensities, record))
+    return path, records
+
+
+def test_chunked_read_returns_stored_spectrum(catalogue):
+    path, records = catalogue
+    with SpectralLibrary(path, readonly=True) as library:
+        assert len(library) == len(records)
+        for spectrum_id, wavelengths, intensities, _ in records:
+            read_wavelengths, read_intensities = library.read_spectrum(spectrum_id)
+            assert read_wavelengths.dtype == np.float32
+            np.testing.assert_array_equal(read_wavelengths, wavelengths.astype(np.float32))
+            np.testing.assert_array_equal(read_intensities, intensities.astype(np.float32))
+
+
+def test_window_read_equals_masked_full_spectrum(catalogue):
+    path, records = catalogue
+    with SpectralLibrary(path, readonly=True) as library:
+        for spectrum_id, wavelengths, _, _ in records:
+            full_wavelengths, full_intensities = library.read_spectrum(spectrum_id)
+            for low, high in ((350, 420), (wavelengths[1], wavelengths[-2]), (2000, 3000)):
+                mask = (full_wavelengths >= low) & (full_wavelengths <= high)
+                window_wavelengths, window_intensities = library.read_window(spectrum_id, low, high)
+                np.testing.assert_array_equal(window_wavelengths, full_wavelengths[mask])
+                np.testing.assert_array_equal(window_intensities, full_intensities[mask])
+
+
+def test_query_matches_metadata_filter(catalogue):
+    path, records = catalogue
+
+    def expected(planet=None, date_from=None, min_snr=None, wavelength_min=None, wavelength_max=None):
+        return [spectrum_id for spectrum_id, wavelengths, _, record in records
+                if (planet is None or record["planet"] == planet)
+                and (date_from is None or record["date"] >= date_from)
+                and (min_snr is None or record["snr"] >= min_snr)
+                and (wavelength_min is None or np.float32(wavelengths[0]) <= wavelength_min)
+                and (wavelength_max is None or np.float32(wavelengths[-1]) >= wavelength_max)]
+
+    with SpectralLibrary(path, readonly=True) as library:
+        for filters in ({"planet": "Proxima b"}, {"date_from": "2025-04-01", "min_snr": 20},
+                        {"wavelength_min": 480, "wavelength_max": 700}, {}):
+            assert [row["id"] for row in library.query(**filters)] == expected(**filters)
+        assert len(library.query(limit=3)) == 3
+        with pytest.raises(KeyError):
+            library.get_metadata(10**6)
+
+
+def test_readonly_library_sees_new_spectra_and_rejects_writes(catalogue):
+    path, records = catalogue
+    with SpectralLibrary(path, readonly=True) as reader:
+        with SpectralLibrary(path) as writer:
+            new_id = writer.add_spectrum([1.0, 2.0], [3.0, 4.0], planet="Mars")
+        assert len(reader) == len(records) + 1
+        assert reader.get_metadata(new_id)["planet"] == "Mars"
+        with pytest.raises(sqlite3.OperationalError):
+            reader.add_spectrum([1.0, 2.0], [3.0, 4.0])
+
+
+def test_iter_spectra_resumes_after_last_id(catalogue):
+    path, records = catalogue
+    with SpectralLibrary(path, readonly=True) as library:
+        seen = [int(i) for ids, _ in library.iter_spectra(batch_size=3) for i in ids]
+        assert seen == [record[0] for record in records]
+        newer = [int(i) for ids, _ in library.iter_spectra(batch_size=3, min_id=records[4][0]) for i in ids]
+        assert newer == [record[0] for record in records[5:]]
+
+
+def test_readonly_open_handles_special_characters_in_path(tmp_path):
+    directory = tmp_path / "widma #1 ?50%"
+    directory.mkdir()
+    path = str(directory / "library.sqlite")
+    with SpectralLibrary(path) as writer:
+        spectrum_id = writer.add_spectrum([1.0, 2.0], [3.0, 4.0])
+    with SpectralLibrary(path, readonly=True) as reader:
+        assert len(reader) == 1
+        np.testing.assert_array_equal(reader.read_spectrum(spectrum_id)[1], [3.0, 4.0])
+
+
+def test_unsorted_spectrum_is_stored_in_wavelength_order(tmp_path):
+    rng = np.random.default_rng(3)
+    wavelengths = rng.permutation(np.arange(300.0, 500.0))
+    intensities = wavelengths / 100
+    with SpectralLibrary(str(tmp_path / "library.sqlite"), chunk_size=16) as library:
+        spectrum_id = library.add_spectrum(wavelengths, intensities)
+        metadata = library.get_metadata(spectrum_id)
+        assert (metadata["wavelength_min"], metadata["wavelength_max"]) == (300.0, 499.0)
+        read_wavelengths, read_intensities = library.read_spectrum(spectrum_id)
+        np.testing.assert_array_equal(read_wavelengths, np.arange(300.0, 500.0))
+        np.testing.assert_allclose(read_intensities, read_wavelengths / 100, rtol=1e-6)
+        window_wavelengths, _ = library.read_window(spectrum_id, 350, 360)
+        np.testing.assert_array_equal(window_wavelengths, np.arange(350.0, 361.0))
+
+
+def test_read_spectrum_file_parses_header_metadata_and_separators(tmp_path):
+    path = tmp_path / "spectrum.dat"
+    path.write_text("# planet: Kepler-22b\n"
+                    "# snr: 35.5\n"
+                    "# observer: ignored\n"
+                    "wavelength;intensity\n"
+                    "520;0.5\n"
+                    "500;0.25\n"
+                    "\n"
+                    "510\t0.75\n", encoding="utf-8")
+    wavelengths, intensities, metadata = read_spectrum_file(str(path))
+    np.testing.assert_array_equal(wavelengths, [500, 510, 520])
+    np.testing.assert_array_equal(intensities, [0.25, 0.75, 0.5])
+    assert metadata == {"planet": "Kepler-22b", "snr": 35.5}
+
+    path.write_text("wavelength\n500\n510\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_spectrum_file(str(path))
+
+
+def test_import_directory_and_command_line(tmp_path):
+    directory = tmp_path / "spectra"
+    directory.mkdir()
+    for number in range(3):
+        header = "# planet: Gliese 581g\n" if number == 1 else ""
+        rows = "\n".join(f"{400 + step},{number + step / 10}" for step in range(5))
+        (directory / f"spectrum_{number}.csv").write_text(header + rows, encoding="utf-8")
+    (directory / "notes.txt").write_text("nie widmo", encoding="utf-8")
+
+    path = str(tmp_path / "library.sqlite")
+    with SpectralLibrary(path) as library:
+        spectrum_ids = import_directory(library, str(directory), planet="Kepler-22b", snr=12)
+        planets = [library.get_metadata(spectrum_id)["planet"] for spectrum_id in spectrum_ids]
+        assert planets == ["Kepler-22b", "Gliese 581g", "Kepler-22b"]
+        assert library.get_metadata(spectrum_ids[0])["snr"] == 12
+        np.testing.assert_allclose(library.read_spectrum(spectrum_ids[2])[1], [2.0, 2.1, 2.2, 2.3, 2.4], rtol=1e-6)
+
+    assert len(main([path, str(directory), "--instrument", "HARPS", "--no-index"])) == 3
+    with SpectralLibrary(path, readonly=True) as library:
+        assert len(library) == 6
+        assert len(library.query(instrument="HARPS")) == 3
+    assert not (tmp_path / "library.index.npz").exists()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+import pytest
+
+from modules.spectral_library import SpectralLibrary
+from modules.spectral_search import (IncrementalPCA, SpectralSearchIndex, index_path_for, resample_spectra,
+                                     update_search_index)
+
+
+def synthetic_spectrum(rng, n_points=180):
+    """Widmo z kilkoma liniami absorpcyjnymi na nierównej siatce długości fal"""
+    wavelengths = np.sort(rng.uniform(300, 1000, n_points))
+    intensities = np.ones(n_points)
+    for center in rng.uniform(350, 950, 3):
+        intensities -= rng.uniform(0.2, 0.8) * np.exp(-0.5 * ((wavelengths - center) / rng.uniform(5, 30)) ** 2)
+    return wavelengths, intensities
+
+
+@pytest.fixture
+def library(tmp_path):
+    rng = np.random.default_rng(11)
+    with SpectralLibrary(str(tmp_path / "spectra.sqlite")) as library:
+        for _ in range(120):
+            library.add_spectrum(*synthetic_spectrum(rng), commit=False)
+        library.commit()
+        yield library
+
+
+def test_resample_spectra_normalises_rows():
+    grid = np.linspace(0, 10, 50)
+    spectra = [(np.array([0.0, 10.0]), np.array([1.0, 3.0])),
+               (np.array([0.0, 10.0]), np.array([2.0, 2.0]))]
+    resampled = resample_spectra(spectra, grid)
+    np.testing.assert_allclose(resampled.mean(axis=1), 0, atol=1e-12)
+    np.testing.assert_allclose(np.linalg.norm(resampled[0]), 1)
+    # Widmo płaskie nie ma kształtu - zostaje wektorem zerowym zamiast NaN
+    np.testing.assert_array_equal(resampled[1], 0)
+
+
+def test_incremental_pca_matches_batch_pca():
+    rng = np.random.default_rng(3)
+    samples = rng.normal(size=(500, 12)) @ rng.normal(size=(12, 12)) + rng.normal(size=12)
+
+    pca = IncrementalPCA(n_components=4)
+    for batch in np.array_split(samples, 7):
+        pca.partial_fit(batch)
+    pca.finalize()
+
+    eigenvalues, eigenvectors = np.linalg.eigh(np.cov(samples, rowvar=False))
+    np.testing.assert_allclose(pca.mean, samples.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(pca.explained_variance, eigenvalues[::-1][:4], rtol=1e-9)
+    # Składowe główne są wyznaczone z dokładnością do znaku
+    overlap = np.abs(np.sum(pca.components * eigenvectors[:, ::-1][:, :4].T, axis=1))
+    np.testing.assert_allclose(overlap, 1, atol=1e-9)
+
+    with pytest.raises(ValueError):
+        IncrementalPCA(2).partial_fit(samples[:1]).finalize()
+
+
+def test_query_with_all_partitions_is_exact(library):
+    index = SpectralSearchIndex(n_components=8, n_partitions=6).fit(library, batch_size=32)
+    spectra = [spectrum for _, batch in library.iter_spectra() for spectrum in batch]
+    embeddings = index.embed(spectra).astype(np.float64)
+
+    rng = np.random.default_rng(5)
+    for _ in range(10):
+        wavelengths, intensities = synthetic_spectrum(rng)
+        query = index.embed([(wavelengths, intensities)])[0].astype(np.float64)
+        brute_force = np.sqrt(((embeddings - query) ** 2).sum(axis=1))
+        expected = np.argsort(brute_force)[:5] + 1
+
+        matches = index.query(wavelengths, intensities, k=5, n_probe=6)
+        assert [spectrum_id for spectrum_id, _ in matches] == list(expected)
+        np.testing.assert_allclose([distance for _, distance in matches], brute_force[expected - 1],
+                                   rtol=1e-4, atol=1e-5)
+
+
+def test_probing_fewer_partitions_searches_a_subset(library):
+    index = SpectralSearchIndex(n_components=8, n_partitions=6).fit(library)
+    wavelengths, intensities = library.read_spectrum(17)
+    exact = index.query(wavelengths, intensities, k=10, n_probe=6)
+    approximate = index.query(wavelengths, intensities, k=10, n_probe=1)
+    assert approximate[0][0] == exact[0][0] == 17
+    assert approximate[0][1] == pytest.approx(0, abs=1e-5)
+    assert {spectrum_id for spectrum_id, _ in approximate} <= set(index.ids.tolist())
+
+
+def test_update_from_library_and_save_round_trip(library, tmp_path):
+    index = SpectralSearchIndex(n_components=8, n_partitions=4).fit(library)
+    rng = np.random.default_rng(21)
+    new_spectrum = synthetic_spectrum(rng)
+    new_id = library.add_spectrum(*new_spectrum)
+
+    assert index.update_from_library(library) == 1
+    assert index.update_from_library(library) == 0
+    assert index.query(*new_spectrum, k=1, n_probe=4)[0][0] == new_id
+
+    path = str(tmp_path / "spectra.index.npz")
+    index.save(path)
+    loaded = SpectralSearchIndex.load(path)
+    np.testing.assert_array_equal(loaded.ids, index.ids)
+    query = synthetic_spectrum(rng)
+    assert loaded.query(*query, k=7, n_probe=2) == index.query(*query, k=7, n_probe=2)
+
+
+def test_update_search_index_builds_then_appends(library):
+    index_path = index_path_for(library.path)
+    assert index_path.endswith("spectra.index.npz")
+
+    index, added = update_search_index(library, index_path)
+    assert added == len(library) == len(index.ids)
+    assert os.path.exists(index_path)
+
+    modified = os.path.getmtime(index_path)
+    _, added = update_search_index(library, index_path)
+    assert added == 0
+    assert os.path.getmtime(index_path) == modified
+
+    rng = np.random.default_rng(99)
+    for _ in range(3):
+        library.add_spectrum(*synthetic_spectrum(rng))
+    index, added = update_search_index(library, index_path)
+    assert added == 3
+    assert index.ids.tolist() == list(range(1, len(library) + 1))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import socket
+import time
+
+import numpy as np
+import pytest
+from scipy.ndimage import gaussian_filter
+from scipy.signal import medfilt
+
+from modules.spectral_stream import (FileTailSource, LineStreamSource, SocketSource, SpectralStream,
+                                     create_stream_filter, open_stream_source)
+
+
+def kalman_reference(samples, kalman_gain=0.75):
+    """Rekurencja filtra Kalmana jak w SpectralModule.apply_filter"""
+    filtered = np.zeros(len(samples))
+    filtered[0] = samples[0]
+    for i in range(1, len(samples)):
+        filtered[i] = filtered[i - 1] + kalman_gain * (samples[i] - filtered[i - 1])
+    return filtered
+
+
+BATCH_FILTERS = {
+    "Filtr Kalmana": kalman_reference,
+    "Filtr Gaussa": lambda samples: gaussian_filter(samples, sigma=2),
+    "Filtr medianowy": lambda samples: medfilt(samples, kernel_size=5),
+    "Brak": lambda samples: samples,
+}
+
+
+def run_in_chunks(stream_filter, samples, chunk_sizes):
+    outputs = []
+    start = 0
+    for size in chunk_sizes:
+        outputs.append(stream_filter.process(samples[start:start + size]))
+        start += size
+    outputs.append(stream_filter.process(samples[start:]))
+    outputs.append(stream_filter.flush())
+    return np.concatenate(outputs)
+
+
+@pytest.mark.parametrize("filter_type", sorted(BATCH_FILTERS))
+def test_streaming_filter_matches_batch_filter(filter_type):
+    rng = np.random.default_rng(len(filter_type))
+    samples = np.cumsum(rng.normal(size=257)) + rng.normal(0, 3, 257)
+    chunk_sizes = [1, 0, 3, 17, 2, 64, 5, 9, 1, 40]
+
+    streamed = run_in_chunks(create_stream_filter(filter_type), samples, chunk_sizes)
+    np.testing.assert_allclose(streamed, BATCH_FILTERS[filter_type](samples), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("filter_type", ["Filtr Gaussa", "Filtr medianowy"])
+def test_window_filter_holds_samples_until_flush(filter_type):
+    samples = np.sin(np.arange(6.0))
+    stream_filter = create_stream_filter(filter_type)
+    # Strumień krótszy niż nakładka - całość wychodzi dopiero przy zakończeniu
+    held = stream_filter.process(samples[:2])
+    rest = stream_filter.process(samples[2:])
+    flushed = stream_filter.flush()
+    assert len(held) + len(rest) < len(samples)
+    np.testing.assert_allclose(np.concatenate([held, rest, flushed]), BATCH_FILTERS[filter_type](samples),
+                               atol=1e-12)
+    assert len(stream_filter.flush()) == 0
+
+
+def write_samples(path, numbers, wavelengths, intensities, mode="a", partial_tail=""):
+    with open(path, mode) as stream_file:
+        for number, wavelength, intensity in zip(numbers, wavelengths, intensities):
+            stream_file.write(f"{number},{float(wavelength)!r},{float(intensity)!r},0\n")
+        stream_file.write(partial_tail)
+
+
+def test_stream_from_file_matches_batch_filter_after_stop(tmp_path):
+    path = str(tmp_path / "spectrometer.log")
+    rng = np.random.default_rng(2)
+    wavelengths = np.linspace(400, 800, 120)
+    intensities = rng.normal(10, 1, 120)
+    write_samples(path, range(0, 50), wavelengths[:50], intensities[:50], mode="w",
+                  partial_tail=f"50,{float(wavelengths[50])!r},")
+
+    stream = SpectralStream(FileTailSource(path), "Filtr Gaussa")
+    parts = [stream.poll()]
+    assert len(parts[0][0]) == 50 - 8
+    with open(path, "a") as stream_file:
+        stream_file.write(f"{float(intensities[50])!r},0\n")
+    write_samples(path, range(51, 120), wavelengths[51:], intensities[51:])
+    parts.append(stream.poll())
+    parts.append(stream.poll())
+    parts.append(stream.flush())
+    stream.close()
+
+    streamed_wavelengths, raw, filtered = (np.concatenate(column) for column in zip(*parts))
+    np.testing.assert_allclose(streamed_wavelengths, wavelengths.astype(np.float32))
+    np.testing.assert_allclose(raw, intensities.astype(np.float32))
+    np.testing.assert_allclose(filtered, gaussian_filter(intensities, sigma=2), rtol=1e-6)
+    assert stream.stats()['samples_received'] == 120
+    assert stream.stats()['samples_dropped'] == 0
+    # Znacznik czasu 0 (epoka) - opóźnienie jest liczone od akwizycji
+    assert stream.mean_latency > 1e9
+
+
+def test_stream_counts_sequence_gaps_and_backlog_overflow(tmp_path):
+    path = str(tmp_path / "spectrometer.log")
+    write_samples(path, [10, 11, 14, 15, 20], np.arange(5.0), np.ones(5), mode="w")
+    stream = SpectralStream(FileTailSource(path), "Filtr Kalmana", max_backlog=3)
+
+    wavelengths, _, _ = stream.poll()
+    # Luki 12-13 i 16-19 oraz dwie najstarsze próbki ponad limit kolejki
+    assert stream.samples_dropped == 2 + 4 + 2
+    np.testing.assert_array_equal(wavelengths, [2, 3, 4])
+
+    write_samples(path, [22], [5.0], [1.0])
+    stream.poll()
+    assert stream.samples_dropped == 9
+    assert stream.samples_received == 4
+
+
+def test_file_tail_source_restarts_after_truncation(tmp_path):
+    path = str(tmp_path / "spectrometer.log")
+    write_samples(path, range(5), np.arange(5.0), np.zeros(5), mode="w")
+    source = FileTailSource(path, from_start=False)
+    assert len(source.read()[0]) == 0
+
+    write_samples(path, [7], [1.0], [2.0], mode="w")
+    sequence, wavelengths, intensities, _ = source.read()
+    np.testing.assert_array_equal(sequence, [7])
+    np.testing.assert_array_equal(intensities, [2.0])
+
+
+def test_line_source_parses_crlf_and_blank_lines(tmp_path):
+    path = tmp_path / "spectrometer.log"
+    path.write_bytes(b"1,500.0,0.5,0\r\n\r\n2, 501.0, 0.25, 0\n3,502.0")
+    source = FileTailSource(str(path))
+    sequence, wavelengths, intensities, _ = source.read()
+    np.testing.assert_array_equal(sequence, [1, 2])
+    np.testing.assert_array_equal(wavelengths, [500.0, 501.0])
+    np.testing.assert_array_equal(intensities, [0.5, 0.25])
+    assert not source.ended
+
+    with pytest.raises(TypeError):
+        LineStreamSource()
+
+
+def test_socket_source_reports_end_of_stream():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    try:
+        stream = SpectralStream(SocketSource("127.0.0.1", server.getsockname()[1]), "Brak")
+        connection, _ = server.accept()
+        connection.sendall(b"1,500.0,0.5,0\n2,501.0,0.25,0\n3,502.0,")
+        connection.close()
+
+        received = []
+        for _ in range(200):
+            received.extend(stream.poll()[0])
+            if stream.ended:
+                break
+            time.sleep(0.01)
+        assert stream.ended
+        # Niepełny rekord po zamknięciu połączenia jest odrzucany
+        np.testing.assert_array_equal(received, [500.0, 501.0])
+        assert stream.source.socket.fileno() == -1
+        assert len(stream.poll()[0]) == 0
+        stream.close()
+    finally:
+        server.close()
+
+
+def test_open_stream_source_picks_socket_or_file(tmp_path):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    port = server.getsockname()[1]
+    try:
+        source = open_stream_source(f" 127.0.0.1:{port} ")
+        assert isinstance(source, SocketSource)
+        connection, _ = server.accept()
+        connection.sendall(b"1,500.0,0.5,0\n2,501.0,")
+        connection.close()
+
+        # Gniazdo jest nieblokujące - dane mogą dotrzeć po kilku odczytach
+        sequence = []
+        for _ in range(200):
+            sequence.extend(source.read()[0])
+            if sequence:
+                break
+            time.sleep(0.01)
+        assert sequence == [1]
+        source.close()
+    finally:
+        server.close()
+
+    named_like_address = tmp_path / "localhost:5555"
+    named_like_address.write_text("")
+    assert isinstance(open_stream_source(str(named_like_address)), FileTailSource)
+    assert isinstance(open_stream_source(str(tmp_path / "missing.log")), FileTailSource)
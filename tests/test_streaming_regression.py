@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from modules.biological_module import OBSERVATIONS_PARAMETER, BiologicalModule
+from modules.streaming_regression import (ReservoirSample, RegressionAccumulator, accumulate_files, csv_columns,
+                                          iter_csv_chunks, regression_with_sample, statistics_with_sample)
+
+
+def synthetic_data(n_rows, n_parameters, seed, offset=0.0):
+    """Dane z wielomianu drugiego stopnia każdego parametru (względem offset) z szumem"""
+    rng = np.random.default_rng(seed)
+    u = rng.uniform(-3, 3, (n_rows, n_parameters))
+    y = 4.0 + sum((parameter + 1) * u[:, parameter] - 0.5 * u[:, parameter] ** 2 for parameter in range(n_parameters))
+    return offset + u, y + rng.normal(0, 0.3, n_rows)
+
+
+def least_squares(x, y, degree):
+    """Dopasowanie wzorcowe: pełna macierz cech i np.linalg.lstsq"""
+    design = np.hstack([np.ones((len(x), 1))] + [x[:, [parameter]] ** np.arange(1, degree + 1)
+                                                  for parameter in range(x.shape[1])])
+    beta, *_ = np.linalg.lstsq(design, y, rcond=None)
+    residual = y - design @ beta
+    r_squared = 1 - residual @ residual / ((y - y.mean()) @ (y - y.mean()))
+    return beta, residual @ residual / (len(y) - design.shape[1]), r_squared, design
+
+
+@pytest.mark.parametrize("degree", [1, 2, 3])
+def test_single_parameter_matches_polyfit(degree):
+    x, y = synthetic_data(5000, 1, seed=degree)
+    accumulator = RegressionAccumulator(1, degree)
+    for start in range(0, len(y), 700):
+        accumulator.update(x[start:start + 700], y[start:start + 700])
+    result = accumulator.fit()
+    np.testing.assert_allclose(result.coefficients, np.polyfit(x[:, 0], y, degree), rtol=1e-9, atol=1e-11)
+    _, variance, r_squared, _ = least_squares(x, y, degree)
+    assert result.r_squared == pytest.approx(r_squared, rel=1e-10)
+    assert result.residual_variance == pytest.approx(variance, rel=1e-8)
+    np.testing.assert_allclose(result.predict(x[:5]), np.polyval(np.polyfit(x[:, 0], y, degree), x[:5, 0]),
+                               rtol=1e-10)
+
+
+def test_multiple_parameters_and_statistics_match_direct_computation():
+    x, y = synthetic_data(3000, 3, seed=11)
+    accumulator = RegressionAccumulator(3, 2).update(x, y)
+    result = accumulator.fit()
+    beta, _, r_squared, _ = least_squares(x, y, 2)
+    intercept, powers = result.coefficients
+    assert intercept == pytest.approx(beta[0], rel=1e-10)
+    np.testing.assert_allclose(powers, beta[1:].reshape(3, 2), rtol=1e-9, atol=1e-12)
+    assert result.r_squared == pytest.approx(r_squared, rel=1e-10)
+
+    data = np.column_stack([x, y])
+    np.testing.assert_allclose(accumulator.covariance(), np.cov(data, rowvar=False), rtol=1e-10)
+    np.testing.assert_allclose(result.correlation, np.corrcoef(data, rowvar=False)[:-1, -1], rtol=1e-10)
+
+
+@pytest.mark.parametrize("offset", [0.0, 1e6])
+def test_merged_partials_equal_single_pass(offset):
+    x, y = synthetic_data(6000, 2, seed=5, offset=offset)
+    single = RegressionAccumulator(2, 3).update(x, y)
+
+    # Porcje o różnych rozkładach - każdy akumulator ma własną bazę cech
+    order = np.argsort(x[:, 0])
+    parts = np.array_split(order, [500, 3500])
+    merged = RegressionAccumulator(2, 3)
+    for part in parts:
+        merged.merge(RegressionAccumulator(2, 3).update(x[part], y[part]))
+
+    assert merged.count == single.count
+    np.testing.assert_allclose(merged.mean, single.mean, rtol=1e-12)
+    # Współmomenty porównywane po unormowaniu - ich skale różnią się o wiele rzędów
+    np.testing.assert_allclose(np.diag(merged.comoment), np.diag(single.comoment), rtol=1e-9)
+    np.testing.assert_allclose(merged.correlation(), single.correlation(), atol=1e-9)
+    expected, fitted = single.fit(), merged.fit()
+    assert fitted.r_squared == pytest.approx(expected.r_squared, rel=1e-9)
+    assert fitted.residual_variance == pytest.approx(expected.residual_variance, rel=1e-6)
+    np.testing.assert_allclose(fitted.predict(x[:50]), expected.predict(x[:50]), rtol=1e-9)
+
+
+def test_confidence_band_matches_ordinary_least_squares_formula():
+    x, y = synthetic_data(200, 1, seed=3)
+    result = RegressionAccumulator(1, 2).update(x, y).fit()
+    _, variance, _, design = least_squares(x, y, 2)
+    points = np.array([[-2.5], [0.0], [1.7]])
+    features = np.hstack([np.ones((3, 1)), points ** np.arange(1, 3)])
+    standard_error = np.sqrt(np.einsum('ij,jk,ik->i', features, np.linalg.inv(design.T @ design), features)
+                             * variance)
+    prediction, lower, upper = result.confidence_band(points, level=0.95)
+    # Kwantyl t dla 197 stopni swobody
+    np.testing.assert_allclose(upper - prediction, 1.9720790337785026 * standard_error, rtol=1e-6)
+    np.testing.assert_allclose(prediction - lower, upper - prediction, rtol=1e-12)
+
+
+def test_invalid_rows_and_arguments():
+    x, y = synthetic_data(100, 1, seed=1)
+    dirty_x = np.concatenate([x[:, 0], [np.nan, 1.0]])
+    dirty_y = np.concatenate([y, [2.0, np.inf]])
+    accumulator = RegressionAccumulator(1, 1).update(dirty_x, dirty_y)
+    assert accumulator.count == 100
+    np.testing.assert_allclose(accumulator.fit().coefficients, np.polyfit(x[:, 0], y, 1), rtol=1e-10)
+
+    with pytest.raises(ValueError):
+        RegressionAccumulator(1, 4)
+    with pytest.raises(ValueError):
+        RegressionAccumulator(1, 3).update([1.0, 2.0], [1.0, 2.0]).fit()
+    with pytest.raises(ValueError):
+        RegressionAccumulator(1, 1).merge(RegressionAccumulator(2, 1).update(x[:, :1].repeat(2, axis=1), y))
+
+
+def test_reservoir_sample_keeps_fixed_size_subset():
+    rows = np.arange(10000, dtype=float).reshape(-1, 1)
+    sample = ReservoirSample(size=100, seed=2)
+    for start in range(0, len(rows), 777):
+        sample.update(rows[start:start + 777])
+    assert sample.rows.shape == (100, 1)
+    assert len(np.unique(sample.rows)) == 100
+    # Próbka jednostajna - średnia bliska średniej całości
+    assert abs(sample.rows.mean() - rows.mean()) < 1000
+
+
+def write_csv(path, x, y):
+    lines = ["a,b,wynik"] + [f"{first!r},{second!r},{value!r}" for first, second, value in
+                             zip(x[:, 0].tolist(), x[:, 1].tolist(), y.tolist())]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_csv_files_accumulate_like_in_memory_data(tmp_path, max_workers):
+    x, y = synthetic_data(900, 2, seed=7)
+    paths = []
+    for number, part in enumerate(np.array_split(np.arange(900), 3)):
+        path = tmp_path / f"dane-{number}.csv"
+        write_csv(path, x[part], y[part])
+        paths.append(str(path))
+
+    chunks = list(iter_csv_chunks(paths[0], ["a", "b"], "wynik", chunk_rows=128))
+    assert [len(chunk_y) for _, chunk_y in chunks] == [128, 128, 44]
+
+    total = accumulate_files(paths, ["a", "b"], "wynik", degree=2, max_workers=max_workers, chunk_rows=100)
+    expected = RegressionAccumulator(2, 2).update(x, y).fit()
+    np.testing.assert_allclose(total.fit().predict(x[:20]), expected.predict(x[:20]), rtol=1e-9)
+
+    result, sample_x, sample_y = regression_with_sample(paths[1], ["a", "b"], "wynik", sample_size=50)
+    assert sample_x.shape == (50, 2) and sample_y.shape == (50,)
+    assert result.count == 300
+
+
+@pytest.mark.parametrize("n_parameters", [1, 2])
+def test_lower_degree_fit_reuses_statistics(n_parameters):
+    x, y = synthetic_data(700, n_parameters, seed=11, offset=50.0)
+    accumulator = RegressionAccumulator(n_parameters, 3).update(x[:300], y[:300]).update(x[300:], y[300:])
+    for degree in (1, 2, 3):
+        expected = RegressionAccumulator(n_parameters, degree).update(x, y).fit()
+        result = accumulator.fit(degree)
+        assert result.degree == degree
+        np.testing.assert_allclose(result.predict(x[:25]), expected.predict(x[:25]), rtol=1e-9)
+        np.testing.assert_allclose(result.confidence_band(x[:5])[1], expected.confidence_band(x[:5])[1], rtol=1e-8)
+        assert result.r_squared == pytest.approx(expected.r_squared, rel=1e-9)
+    with pytest.raises(ValueError):
+        RegressionAccumulator(1, 2).update(x[:, 0], y).fit(3)
+
+
+def test_observation_file_statistics_drive_correlation_plot(tmp_path, qapp):
+    x, y = synthetic_data(500, 1, seed=4)
+    path = tmp_path / "obserwacje.csv"
+    path.write_text("czas,a,wynik\n" + "".join(f"{i},{a},{b}\n" for i, (a, b) in enumerate(zip(x[:, 0], y))),
+                    encoding="utf-8")
+    assert csv_columns(str(path)) == ["czas", "a", "wynik"]
+    accumulator, sample_x, sample_y = statistics_with_sample(str(path), ["a"], "wynik", sample_size=40)
+    assert accumulator.degree == 3 and accumulator.count == 500 and sample_x.shape == (40, 1)
+
+    module = BiologicalModule()
+    module.degree_spin.setValue(2)
+    module.observation_regression_ready((("a", "wynik", str(path)), (accumulator, sample_x, sample_y)))
+    assert module.parameter_combo.currentText() == OBSERVATIONS_PARAMETER
+    trend = module.correlation_canvas.axes.lines[0]
+    expected = RegressionAccumulator(1, 2).update(x[:, 0], y).fit()
+    np.testing.assert_allclose(trend.get_ydata(), expected.predict(trend.get_xdata()), rtol=1e-9)
+
+    # Parametr środowiskowy - krzywa modelu tolerancji bez losowego szumu
+    module.parameter_combo.setCurrentText("Temperatura")
+    module.analyze_correlation()
+    first = module.correlation_canvas.axes.collections[0].get_offsets().copy()
+    module.analyze_correlation()
+    np.testing.assert_array_equal(module.correlation_canvas.axes.collections[0].get_offsets(), first)
+    assert first[:, 1].max() == pytest.approx(100, rel=0.01)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+from modules.surface_zones import find_hotspots, find_zones, grid_coordinates, label_spherical
+
+SHAPE = (30, 60)
+
+
+def flood_fill(mask):
+    """Etykietowanie przeszukiwaniem wszerz z zawinięciem długości i połączeniem w biegunach (wzorzec)"""
+    rows, columns = mask.shape
+    labels = np.zeros(mask.shape, dtype=int)
+    count = 0
+    for start in zip(*np.nonzero(mask)):
+        if labels[start]:
+            continue
+        count += 1
+        labels[start] = count
+        queue = deque([start])
+        while queue:
+            row, column = queue.popleft()
+            neighbours = [(row, (column - 1) % columns), (row, (column + 1) % columns)]
+            neighbours += [(row + step, column) for step in (-1, 1) if 0 <= row + step < rows]
+            if row in (0, rows - 1):
+                # Komórki skrajnego pasa stykają się w biegunie
+                neighbours += [(row, other) for other in range(columns)]
+            for neighbour in neighbours:
+                if mask[neighbour] and not labels[neighbour]:
+                    labels[neighbour] = count
+                    queue.append(neighbour)
+    return labels, count
+
+
+def same_partition(labels, expected):
+    """Etykiety wyznaczają ten sam podział komórek (z dokładnością do numeracji)"""
+    pairs = np.unique(np.stack([labels.ravel(), expected.ravel()], axis=1), axis=0)
+    return len(np.unique(pairs[:, 0])) == len(np.unique(pairs[:, 1])) == len(pairs)
+
+
+def unit_vector(latitude, longitude):
+    return np.array([np.cos(latitude) * np.cos(longitude), np.cos(latitude) * np.sin(longitude), np.sin(latitude)])
+
+
+def cap_field(center_latitude, center_longitude, shape=SHAPE):
+    """Pole równe cosinusowi odległości kątowej od punktu (czapy sferyczne wokół niego)"""
+    latitudes, longitudes = grid_coordinates(shape)
+    return np.einsum('i,i...->...', unit_vector(center_latitude, center_longitude),
+                     unit_vector(latitudes, longitudes))
+
+
+@pytest.mark.parametrize("seed, density", [(0, 0.3), (1, 0.5), (2, 0.6), (3, 0.45)])
+def test_labels_match_flood_fill_on_random_masks(seed, density):
+    mask = np.random.default_rng(seed).random(SHAPE) < density
+    labels, count = label_spherical(mask)
+    expected, expected_count = flood_fill(mask)
+    assert count == expected_count
+    assert same_partition(labels, expected)
+    np.testing.assert_array_equal(labels > 0, mask)
+    assert set(np.unique(labels)) == set(range(count + 1))
+
+
+def test_longitude_wrap_and_poles_join_regions():
+    mask = np.zeros(SHAPE, dtype=bool)
+    mask[10:14, :3] = True
+    mask[11:13, -2:] = True
+    mask[0, 5] = mask[0, 40] = True
+    mask[-1, 1] = True
+    labels, count = label_spherical(mask)
+    assert count == 3
+    assert labels[10, 0] == labels[11, -1]
+    assert labels[0, 5] == labels[0, 40] != labels[-1, 1]
+
+
+def test_frames_are_labelled_independently():
+    rng = np.random.default_rng(5)
+    masks = rng.random((3,) + SHAPE) < 0.4
+    masks[1] = True
+    labels, count = label_spherical(masks)
+    assert labels.shape == masks.shape
+    assert len(np.unique(labels[1])) == 1
+    counts = [flood_fill(mask)[1] for mask in masks]
+    assert count == sum(counts)
+    for frame in range(3):
+        assert same_partition(labels[frame], flood_fill(masks[frame])[0])
+    # Etykiety nie powtarzają się między klatkami
+    assert not (set(np.unique(labels[0])) - {0}) & (set(np.unique(labels[2])) - {0})
+
+
+@pytest.mark.parametrize("latitude, longitude", [(0.3, 1.0), (-0.2, np.pi - 0.01), (1.5, 0.4), (-1.4, -2.0)])
+def test_cap_zone_centroid_and_area(latitude, longitude):
+    # Czapa o promieniu kątowym 30° (także przez południk ±180° i biegun)
+    field = cap_field(latitude, longitude, (180, 360))
+    zones = find_zones(field, np.cos(np.radians(30)))
+    assert len(zones) == 1
+    np.testing.assert_allclose(zones.centroids[0], unit_vector(latitude, longitude), atol=2e-3)
+    assert zones.areas[0] == pytest.approx((1 - np.cos(np.radians(30))) / 2, rel=0.02)
+    assert zones.mean_values[0] == pytest.approx(field[field >= np.cos(np.radians(30))].mean())
+    assert zones.latitudes[0] == pytest.approx(latitude, abs=5e-3)
+
+
+def test_zones_sorted_by_area_and_filtered():
+    field = np.maximum(cap_field(0.5, 0.0) - 0.1, cap_field(-0.5, 3.0))
+    zones = find_zones(field, 0.7)
+    assert len(zones) == 2
+    assert zones.areas[0] > zones.areas[1]
+    np.testing.assert_allclose(zones.longitudes, [3.0, 0.0], atol=0.06)
+    assert len(find_zones(field, 0.7, min_area=zones.areas[0])) == 1
+
+    below = find_zones(field, -0.5, above=False)
+    assert (below.mean_values < -0.5).all()
+
+
+def test_band_around_planet_uses_field_extreme():
+    latitudes, longitudes = grid_coordinates(SHAPE)
+    # Pas wokół równika - średni wektor bliski zeru, środek w maksimum pola
+    field = np.cos(latitudes) ** 8 + 1e-6 * np.cos(longitudes - 2.0)
+    zones = find_zones(field, 0.9)
+    assert len(zones) == 1
+    peak = np.unravel_index(np.argmax(field), SHAPE)
+    np.testing.assert_allclose(zones.centroids[0], unit_vector(latitudes[peak], longitudes[peak]), atol=1e-12)
+
+
+def test_hotspots_per_frame():
+    fields = np.stack([10 * cap_field(0.2, 1.0), np.full(SHAPE, 50.0), 40 + 30 * cap_field(-0.6, -1.0)])
+    zones = find_hotspots(fields)
+    np.testing.assert_array_equal(np.unique(zones.frames), [0, 2])
+    assert len(zones.frame(1)) == 0
+    for frame in (0, 2):
+        single = find_hotspots(fields[frame])
+        selected = zones.frame(frame)
+        np.testing.assert_allclose(selected.centroids, single.centroids)
+        np.testing.assert_allclose(selected.areas, single.areas)
+    np.testing.assert_allclose(zones.frame(2).longitudes, [-1.0], atol=0.06)
+
+
+def test_band_extreme_ties_pick_first_grid_cell():
+    latitudes, longitudes = grid_coordinates(SHAPE)
+    # Pole symetryczne względem równika i długości - maksimum w kilku komórkach o równej wartości
+    field = np.cos(latitudes) ** 8 + 1e-3 * np.cos(longitudes) ** 2
+    zones = find_zones(field, 0.9)
+    assert len(zones) == 1
+    peaks = np.flatnonzero(field.ravel() == field.max())
+    assert len(peaks) > 1
+    np.testing.assert_allclose(zones.centroids[0], unit_vector(latitudes.ravel()[peaks[0]],
+                                                               longitudes.ravel()[peaks[0]]), atol=1e-12)
+
+
+def test_band_extreme_ties_do_not_depend_on_batch():
+    latitudes, longitudes = grid_coordinates(SHAPE)
+    field = np.cos(latitudes) ** 8 + 1e-3 * np.cos(longitudes) ** 2
+    fields = np.stack([field + shift for shift in np.linspace(0, 1, 12)])
+    single = find_zones(field, 0.9)
+    batched = find_zones(fields, 0.9)
+    assert len(single) == 1 and len(batched) == 12
+    for frame in range(12):
+        np.testing.assert_array_equal(batched.frame(frame).centroids, single.centroids)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from modules import timeline_playback
+from modules.climate_model import ClimateModel
+from modules.mesh_geometry import GEOMETRY_CACHE
+from modules.planet_surface import atmosphere_appearance, habitability_field, surface_colors, zone_marker_states
+from modules.surface_zones import find_hotspots, grid_coordinates
+from modules.timeline_playback import (DEFAULT_FRAME_DURATION, KeyframeDeltaStore, PlaybackTimeline,
+                                       SimulationRecorder, build_timeline)
+
+ZONE_SHAPE = (18, 36)
+
+
+def changing_frames(n_frames, shape, seed):
+    """Klatki z rzadkimi zmianami wierszy, powtórzeniami i pełnymi zmianami"""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 255, shape, dtype=np.uint8)
+    frames = []
+    for _ in range(n_frames):
+        kind = rng.random()
+        frame = frame.copy()
+        if kind < 0.3:
+            pass
+        elif kind < 0.9:
+            rows = rng.choice(shape[0], rng.integers(1, shape[0] // 10), replace=False)
+            frame[rows] = rng.integers(0, 255, (len(rows),) + shape[1:], dtype=np.uint8)
+        else:
+            frame = rng.integers(0, 255, shape, dtype=np.uint8)
+        frames.append(frame)
+    return frames
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_store_reproduces_original_frames_in_any_order(seed):
+    frames = changing_frames(120, (200, 4), seed)
+    store = KeyframeDeltaStore((200, 4), np.uint8)
+    for frame in frames:
+        store.append(frame)
+    assert len(store) == len(frames)
+
+    order = list(range(len(frames))) + list(range(len(frames)))[::-1]
+    order += np.random.default_rng(seed).permutation(len(frames)).tolist()
+    for index in order:
+        np.testing.assert_array_equal(store.frame(index), frames[index])
+
+    # Wersja to numer pierwszej klatki z tą samą zawartością w ciągu powtórzeń
+    for index in range(1, len(frames)):
+        if np.array_equal(frames[index], frames[index - 1]):
+            assert store.version(index) == store.version(index - 1)
+        else:
+            assert store.version(index) == index
+
+
+def test_store_memory_grows_with_changes_not_length():
+    frame = np.zeros((1000, 4), dtype=np.uint8)
+    store = KeyframeDeltaStore(frame.shape, np.uint8)
+    for _ in range(500):
+        store.append(frame)
+    assert store.nbytes == frame.nbytes and len(store.keyframes) == 1
+
+    # Zmiany jednego wiersza - zmiany od klatki kluczowej nigdy nie przekraczają pełnej klatki
+    for index in range(500):
+        frame = frame.copy()
+        frame[index % 1000] = index % 251
+        store.append(frame)
+    assert store.nbytes <= len(store.keyframes) * 2 * frame.nbytes
+    assert len(store.keyframes) < 10
+    np.testing.assert_array_equal(store.frame(999), frame)
+
+
+def test_store_returns_independent_copies():
+    store = KeyframeDeltaStore((3, 2), np.float32)
+    for value in range(4):
+        store.append(np.full((3, 2), value))
+    frame = store.frame(2)
+    frame[:] = -1
+    np.testing.assert_array_equal(store.frame(2), np.full((3, 2), 2))
+    np.testing.assert_array_equal(store.frame(3), np.full((3, 2), 3))
+
+
+def record(n_frames, seed, climate=False, times=None):
+    rng = np.random.default_rng(seed)
+    recorder = SimulationRecorder()
+    model = ClimateModel(latitude_bands=12, longitude_bands=4) if climate else None
+    for index in range(n_frames):
+        values = {'habitability_index': rng.uniform(0, 100), 'temperature': 280 + 2 * index,
+                  'pressure': 1 + (index // 3), 'radiation': 1, 'ph': 7, 'oxygen': 21, 'nitrogen': 78,
+                  'co2': index % 4}
+        temperatures = model.step(5.0).copy() if climate else None
+        recorder.append(10 + index * 0.5 if times is None else times[index], values, temperatures)
+    return recorder
+
+
+def test_recorder_snapshot_and_clear():
+    recorder = record(5, 0, climate=True)
+    snapshot = recorder.snapshot()
+    assert len(recorder) == 5
+    assert snapshot['climate'].shape == (5, 12, 4)
+    np.testing.assert_allclose(snapshot['temperature'], [280, 282, 284, 286, 288])
+    # Kopia niezależna od dalszego zapisu
+    recorder.append(20, {name: 1 for name in timeline_playback.RECORDED_COLUMNS[1:]})
+    assert len(snapshot['time']) == 5
+    assert recorder.snapshot()['climate'] is None
+    recorder.clear()
+    assert len(recorder) == 0
+
+
+@pytest.mark.parametrize("climate", [False, True])
+def test_timeline_frames_match_direct_computation(climate):
+    recording = record(9, 3, climate=climate).snapshot()
+    timeline = PlaybackTimeline(recording, zone_grid_shape=ZONE_SHAPE)
+    np.testing.assert_allclose(timeline.times, np.arange(9) * 0.5)
+    assert timeline.duration == 4.0
+
+    latitudes, longitudes = grid_coordinates(ZONE_SHAPE)
+    vertices, _ = GEOMETRY_CACHE.icosphere(2)
+    store = timeline.surface_store(2)
+    for index in range(9):
+        conditions = {name: float(recording[name][index]) for name in timeline_playback.SURFACE_COLUMNS}
+        temperatures = recording['climate'][index] if climate else None
+        color, radius = atmosphere_appearance(recording['oxygen'][index], recording['nitrogen'][index],
+                                              recording['co2'][index], recording['pressure'][index])
+        np.testing.assert_allclose(timeline.atmosphere_colors[index], color)
+        assert timeline.atmosphere_radii[index] == pytest.approx(radius)
+        field = habitability_field(latitudes, longitudes, conditions, temperatures)
+        assert timeline.zone_states[index] == zone_marker_states(find_hotspots(field))
+        np.testing.assert_array_equal(store.frame(index), surface_colors(vertices, conditions, temperatures))
+    assert timeline.surface_store(2) is store
+
+
+def test_chunked_preparation_does_not_change_frames(monkeypatch):
+    recording = record(7, 4, climate=True).snapshot()
+    reference = PlaybackTimeline(recording, zone_grid_shape=ZONE_SHAPE)
+    monkeypatch.setattr(timeline_playback, 'CHUNK_ELEMENTS', 700)
+    chunked = PlaybackTimeline(recording, zone_grid_shape=ZONE_SHAPE)
+    assert chunked.zone_states == reference.zone_states
+    for index in range(7):
+        np.testing.assert_array_equal(chunked.surface_store(1).frame(index), reference.surface_store(1).frame(index))
+
+
+def test_frame_lookup_and_invalid_times():
+    timeline = PlaybackTimeline(record(4, 5, times=[0.0, 1.0, 1.5, 4.0]).snapshot(), zone_grid_shape=ZONE_SHAPE)
+    assert [timeline.frame_at(point) for point in (-1, 0, 0.99, 1.0, 1.7, 3.99, 4.0, 10)] == [0, 0, 0, 1, 2, 2, 3, 3]
+
+    # Czas malejący - klatki o stałej długości
+    backwards = PlaybackTimeline(record(4, 5, times=[5.0, 4.0, 3.0, 2.0]).snapshot(), zone_grid_shape=ZONE_SHAPE)
+    np.testing.assert_allclose(backwards.times, np.arange(4) * DEFAULT_FRAME_DURATION)
+
+    with pytest.raises(ValueError):
+        PlaybackTimeline(SimulationRecorder().snapshot())
+
+
+def test_supported_level_respects_budget(monkeypatch):
+    built = build_timeline(record(3, 7).snapshot(), [6, 2, 6])
+    assert sorted(built._surface_stores) == [2, 6]
+
+    timeline = PlaybackTimeline(record(10, 6).snapshot(), zone_grid_shape=ZONE_SHAPE)
+    assert timeline.supported_level(7) == 7
+    monkeypatch.setattr(timeline_playback, 'SURFACE_EVALUATION_BUDGET', 10 * (10 * 4 ** 4 + 2))
+    assert timeline.supported_level(7) == 4
+    assert timeline.supported_level(2) == 2
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+import numpy as np
+import pytest
+from pyqtgraph.opengl.items.GLMeshItem import DirtyFlag
+
+from modules import timeline_playback
+from modules.climate_model import ClimateModel
+from modules.mesh_geometry import GEOMETRY_CACHE
+from modules.planet_surface import MAX_CRITICAL_ZONES, PLANET_RADIUS, atmosphere_appearance, surface_colors
+from modules.timeline_playback import PlaybackTimeline, SimulationRecorder, build_timeline
+from modules.visualization_3d import SURFACE_LOD_LEVELS, SURFACE_TEMPERATURE_TOLERANCE, Visualization3DModule
+
+ATMOSPHERE = {'oxygen': 21, 'nitrogen': 78, 'co2': 0.04}
+
+
+@pytest.fixture
+def module(qapp):
+    module = Visualization3DModule()
+    yield module
+    module.deleteLater()
+
+
+def transform_scale(item):
+    """Skala jednorodna z macierzy transformacji obiektu sceny"""
+    return item.transform().column(0).toVector3D().length()
+
+
+def test_spheres_share_cached_unit_geometry(module):
+    sphere = module.create_sphere(radius=4, rows=10, cols=10)
+    marker = module.zone_pool[0]['mesh']
+    vertices, _ = GEOMETRY_CACHE.sphere(10, 10)
+    assert sphere.opts['meshdata'].vertexes() is vertices
+    assert marker.opts['meshdata'].vertexes() is vertices
+    assert transform_scale(sphere) == pytest.approx(4)
+
+
+def test_simulation_steps_update_persistent_meshes_in_place(module):
+    planet, atmosphere = module.planet_mesh, module.atmosphere_mesh
+    for step, pressure in enumerate((1, 1, 50, 200)):
+        module.update_simulation_data(step * 10, 70, 280 + step, pressure, 1, dict(ATMOSPHERE, co2=step))
+        assert module.planet_mesh is planet and module.atmosphere_mesh is atmosphere
+        assert planet in module.view_3d.items and atmosphere in module.view_3d.items
+        color, radius = atmosphere_appearance(21, 78, step, pressure)
+        # Promień atmosfery nadaje transformacja - geometria sfery jednostkowej bez zmian
+        assert transform_scale(atmosphere) == pytest.approx(radius)
+        np.testing.assert_allclose(atmosphere.opts['color'], color)
+        assert np.linalg.norm(atmosphere.opts['meshdata'].vertexes(), axis=1).max() == pytest.approx(1, rel=1e-6)
+
+
+def test_unchanged_state_skips_mesh_updates(module, monkeypatch):
+    module.update_simulation_data(10, 70, 290, 1, 1, ATMOSPHERE)
+    calls = []
+    monkeypatch.setattr(module.atmosphere_mesh, 'setColor', lambda color: calls.append('color'))
+    monkeypatch.setattr(module.atmosphere_mesh, 'setTransform', lambda transform: calls.append('transform'))
+    monkeypatch.setattr(module.planet_mesh, 'set_vertex_colors', lambda colors: calls.append('surface'))
+    monkeypatch.setattr(module.planet_mesh, 'setMeshData', lambda **kwargs: calls.append('mesh'))
+
+    # Zmienia się tylko postęp i indeks - scena bez zmian
+    for progress in range(20, 60, 10):
+        module.update_simulation_data(progress, 71, 290, 1, 1, ATMOSPHERE)
+    assert calls == []
+
+    # Zmiana ciśnienia - nowy promień atmosfery i kolory powierzchni, bez nowej geometrii
+    module.update_simulation_data(60, 71, 290, 5, 1, ATMOSPHERE)
+    assert sorted(calls) == ['surface', 'transform']
+    calls.clear()
+    module.update_simulation_data(70, 71, 290, 5, 1, dict(ATMOSPHERE, co2=3))
+    assert sorted(calls) == ['color', 'surface']
+
+
+def zone_states(count, shift=0.0):
+    colors = ((0.0, 0.8, 0.0, 0.7), (0.8, 0.8, 0.0, 0.7), (0.8, 0.0, 0.0, 0.7))
+    return [((10.0 + shift, number * 3.0, 0.0), 1.5 + number, colors[number], f"Strefa {number}")
+            for number in range(count)]
+
+
+def visible_markers(module):
+    return [marker['mesh'].visible() for marker in module.zone_pool]
+
+
+def test_zone_markers_are_reused_from_pool(module):
+    items = list(module.view_3d.items)
+    meshes = [marker['mesh'] for marker in module.zone_pool]
+    assert len(meshes) == MAX_CRITICAL_ZONES
+
+    module.show_zone_markers(zone_states(3))
+    assert visible_markers(module) == [True, True, True]
+    assert [zone['mesh'] for zone in module.critical_zones] == meshes
+    marker = module.zone_pool[2]
+    assert transform_scale(marker['mesh']) == pytest.approx(3.5)
+    np.testing.assert_allclose(marker['mesh'].opts['color'], (0.8, 0.0, 0.0, 0.7))
+    assert marker['label'].text == "Strefa 2" and marker['label'].visible()
+
+    module.show_zone_markers(zone_states(1, shift=2.0))
+    assert visible_markers(module) == [True, False, False]
+    assert not module.zone_pool[1]['label'].visible()
+    module.clear_critical_zones()
+    assert visible_markers(module) == [False, False, False]
+    assert module.view_3d.items == items
+
+    with pytest.raises(IndexError):
+        module.show_zone_markers(zone_states(3) + zone_states(1))
+
+
+def test_unchanged_marker_states_are_not_resent(module):
+    module.show_zone_markers(zone_states(3))
+    updates = module.debug_counters['zone_marker_updates']
+    module.show_zone_markers(zone_states(3))
+    assert module.debug_counters['zone_marker_updates'] == updates
+    module.show_zone_markers(zone_states(2, shift=1.0))
+    assert module.debug_counters['zone_marker_updates'] == updates + 2
+
+
+def test_scene_item_count_is_constant_over_long_run(module):
+    # Siatka, planeta, atmosfera, 3 osie i ich etykiety oraz pula znaczników z etykietami
+    expected = 9 + 2 * MAX_CRITICAL_ZONES
+    assert module.scene_item_count() == expected == 15
+    module.update_surface_level(1000)
+    rng = np.random.default_rng(0)
+    conditions = (rng.uniform(-20, 60, 400) + 273.15, rng.uniform(0.5, 5, 400), rng.uniform(0, 50, 400))
+    for step in range(10000):
+        # Warunki (powierzchnia, atmosfera, strefy) zmieniane co 25 kroków, postęp w każdym kroku
+        temperature, pressure, co2 = (values[step // 25] for values in conditions)
+        module.update_simulation_data(step // 100, 50 + step % 7, temperature, pressure, 1,
+                                      dict(ATMOSPHERE, co2=co2))
+        assert module.scene_item_count() == expected
+    assert module.debug_counters['scene_items_peak'] == expected
+    assert module.debug_counters['zone_marker_updates'] > 0
+    assert len(module.critical_zones) <= MAX_CRITICAL_ZONES
+
+
+def test_surface_level_follows_camera_distance(module):
+    levels = [module.surface_level_for_distance(distance * PLANET_RADIUS) for distance in (1.5, 3, 4, 8, 15, 50)]
+    assert levels == [7, 7, 6, 5, 4, 3]
+
+    module.update_surface_level(8 * PLANET_RADIUS)
+    assert module.surface_level == 5
+    meshdata = module.planet_mesh.opts['meshdata']
+    vertices, _ = GEOMETRY_CACHE.icosphere(5)
+    assert len(meshdata.vertexes()) == len(vertices) == 10 * 4 ** 5 + 2
+    np.testing.assert_array_equal(meshdata.vertexColors(),
+                                  surface_colors(vertices, module.surface_conditions))
+    # Ten sam poziom - siatka nie jest wymieniana
+    module.update_surface_level(9 * PLANET_RADIUS)
+    assert module.planet_mesh.opts['meshdata'] is meshdata
+
+
+def test_field_change_uploads_only_vertex_colors(module):
+    mesh = module.planet_mesh
+    mesh.parseMeshData()
+    vertices, faces = mesh.vertexes, mesh.faces
+    assert mesh.parseMeshData() == DirtyFlag(0)
+
+    module.set_surface_conditions({'temperature': 330})
+    assert mesh.parseMeshData() == DirtyFlag.COLOR
+    assert mesh.vertexes is vertices and mesh.faces is faces
+    expected = surface_colors(GEOMETRY_CACHE.icosphere(module.surface_level)[0], module.surface_conditions)
+    np.testing.assert_array_equal(mesh.colors, expected)
+
+    # Te same warunki - bez nowych kolorów
+    module.set_surface_conditions({'temperature': 330})
+    assert mesh.parseMeshData() == DirtyFlag(0)
+
+
+def test_vertex_colors_fall_back_to_full_mesh_update(module, monkeypatch):
+    # pyqtgraph bez DirtyFlag - kolory trafiają do siatki przez setMeshData
+    monkeypatch.setattr('modules.visualization_3d.DirtyFlag', None)
+    mesh = module.planet_mesh
+    mesh.parseMeshData()
+    module.set_surface_conditions({'temperature': 250})
+    assert mesh.vertexes is None and not mesh.colors_changed
+    mesh.parseMeshData()
+    expected = surface_colors(GEOMETRY_CACHE.icosphere(module.surface_level)[0], module.surface_conditions)
+    np.testing.assert_array_equal(mesh.colors, expected)
+
+
+def test_climate_temperatures_recolour_surface_above_tolerance(module):
+    mesh = module.planet_mesh
+    mesh.parseMeshData()
+    model = ClimateModel(latitude_bands=18, longitude_bands=4)
+    model.run(50, dt=5)
+    module.update_planet_model({'temperatures': model.temperatures})
+    assert mesh.parseMeshData() == DirtyFlag.COLOR
+    vertices, _ = GEOMETRY_CACHE.icosphere(module.surface_level)
+    np.testing.assert_array_equal(mesh.colors, surface_colors(vertices, module.surface_conditions,
+                                                              model.temperatures))
+
+    # Zmiany poniżej tolerancji i brak temperatur - kolory bez zmian
+    module.update_planet_model({'temperatures': model.temperatures + SURFACE_TEMPERATURE_TOLERANCE / 2})
+    module.update_planet_model({})
+    assert mesh.parseMeshData() == DirtyFlag(0)
+    module.update_planet_model({'temperatures': model.temperatures + 1})
+    assert mesh.parseMeshData() == DirtyFlag.COLOR
+
+
+def test_simulation_step_with_climate_recomputes_surface_once(module, monkeypatch):
+    model = ClimateModel(latitude_bands=18, longitude_bands=4)
+    model.run(20, dt=5)
+    module.update_planet_model({'temperatures': model.temperatures})
+    module.update_simulation_data(10, 70, model.mean_temperature(), 1, 1, ATMOSPHERE)
+    calls = []
+    original = module.surface_field_changed
+    monkeypatch.setattr(module, 'surface_field_changed', lambda: (calls.append('field'), original()))
+
+    # Krok symulacji jak w oknie głównym: nowe temperatury klimatu, potem warunki ze średnią temperaturą
+    for step in range(1, 4):
+        temperatures = model.temperatures + 2 * step
+        module.update_planet_model({'temperatures': temperatures})
+        module.update_simulation_data(20, 70, float(temperatures.mean()), 1, 1, ATMOSPHERE)
+    assert calls == ['field'] * 3
+    assert module.surface_conditions['temperature'] == float(temperatures.mean())
+
+    # Zmiana innego warunku nadal przelicza pole
+    module.update_simulation_data(30, 70, float(temperatures.mean()), 5, 1, ATMOSPHERE)
+    assert calls == ['field'] * 4
+
+
+def playback_recording(n_frames):
+    """Zapis symulacji z warunkami zmienianymi co kilka klatek"""
+    recorder = SimulationRecorder()
+    for index in range(n_frames):
+        values = dict(ATMOSPHERE, habitability_index=50 + index, temperature=270 + 5 * (index // 4),
+                      pressure=1 + index // 6, radiation=1, ph=7, co2=0.04 * (1 + index // 5))
+        recorder.append(index * 0.2, values)
+    return recorder.snapshot()
+
+
+def test_playback_reads_prepared_frames(module, monkeypatch):
+    timeline = PlaybackTimeline(playback_recording(20))
+    uploads = []
+    original = module.planet_mesh.set_vertex_colors
+    monkeypatch.setattr(module.planet_mesh, 'set_vertex_colors', lambda colors: (uploads.append(1), original(colors)))
+
+    module.load_timeline(timeline)
+    # Po załadowaniu widoczny jest stan końcowy, odtwarzanie zaczyna się od początku
+    assert module.playback_frame == 19 and not module.playback_panel.isHidden()
+    assert module.playback_slider.value() == 19 and module.playback_position == timeline.duration
+    module.toggle_playback()
+    assert module.playback_position == 0.0 and module.playback_timer.isActive()
+    module.toggle_playback()
+    store = timeline.surface_store(module.surface_level)
+    for index in list(range(20)) + list(range(19, -1, -3)):
+        uploads.clear()
+        previous_version = module.playback_surface_version
+        module.show_playback_frame(index)
+        np.testing.assert_array_equal(module.planet_mesh.opts['meshdata'].vertexColors(), store.frame(index))
+        # Kolory wysyłane tylko przy zmianie zawartości klatki
+        assert len(uploads) == (store.version(index) != previous_version)
+        assert module.atmosphere_color == tuple(timeline.atmosphere_colors[index].tolist())
+        assert transform_scale(module.atmosphere_mesh) == pytest.approx(timeline.atmosphere_radii[index])
+        assert [(zone['pos'], zone['radius'], zone['color'], zone['label'])
+                for zone in module.critical_zones] == timeline.zone_states[index]
+        assert module.playback_position == timeline.times[index]
+        assert module.playback_slider.value() == index
+        assert module.scene_item_count() == 15
+
+    # Zegar odtwarzania wybiera klatkę według pozycji w czasie
+    module.playback_position = 1.05
+    module.playback_clock = time.monotonic()
+    module.advance_playback()
+    assert module.playback_frame == timeline.frame_at(module.playback_position) >= 5
+
+
+def test_zoom_during_playback_reads_prebuilt_levels(module, monkeypatch):
+    levels = [subdivisions for _, subdivisions in SURFACE_LOD_LEVELS]
+    timeline = build_timeline(playback_recording(8), levels)
+    module.load_timeline(timeline)
+    module.show_playback_frame(5)
+
+    # Zmiana przybliżenia nie liczy pola w wątku interfejsu
+    def fail(*args, **kwargs):
+        raise AssertionError("pole liczone w trakcie odtwarzania")
+
+    monkeypatch.setattr(timeline_playback, 'habitability_field', fail)
+    for distance in (50, 15, 8, 4, 1.5):
+        module.update_surface_level(distance * PLANET_RADIUS)
+        assert module.surface_level == timeline.supported_level(module.surface_level_for_distance(
+            distance * PLANET_RADIUS))
+        np.testing.assert_array_equal(module.planet_mesh.opts['meshdata'].vertexColors(),
+                                      timeline.surface_store(module.surface_level).frame(5))
+
+
+def test_stop_playback_restores_current_state(module):
+    module.update_simulation_data(10, 60, 300, 2, 1, dict(ATMOSPHERE, co2=1.0))
+    colors = module.planet_mesh.opts['meshdata'].vertexColors().copy()
+    atmosphere = (module.atmosphere_color, module.atmosphere_radius)
+    zones = [(zone['pos'], zone['label']) for zone in module.critical_zones]
+
+    module.load_timeline(PlaybackTimeline(playback_recording(12)))
+    module.show_playback_frame(11)
+    module.stop_playback()
+    assert module.playback is None and module.playback_panel.isHidden()
+    np.testing.assert_array_equal(module.planet_mesh.opts['meshdata'].vertexColors(), colors)
+    assert (module.atmosphere_color, module.atmosphere_radius) == atmosphere
+    assert [(zone['pos'], zone['label']) for zone in module.critical_zones] == zones
+    assert module.scene_item_count() == 15
+    # Bez załadowanego zapisu przewijanie nic nie zmienia
+    module.show_playback_frame(3)
+    assert module.playback_frame is None
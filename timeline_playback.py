@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from modules.dtype_policy import HistoryBuffer, as_storage
+from modules.mesh_geometry import GEOMETRY_CACHE
+from modules.planet_surface import (atmosphere_appearance, habitability_colors, habitability_field,
+                                   vertex_coordinates, zone_marker_states)
+from modules.surface_zones import ZONE_GRID_SHAPE, find_hotspots, grid_coordinates
+
+# Kolumny zapisu symulacji (oprócz temperatur siatki klimatu)
+RECORDED_COLUMNS = ('time', 'habitability_index', 'temperature', 'pressure', 'radiation',
+                    'ph', 'oxygen', 'nitrogen', 'co2')
+
+# Warunki pola habitabilności powierzchni odtwarzane z zapisu
+SURFACE_COLUMNS = ('temperature', 'pressure', 'radiation', 'ph', 'oxygen', 'nitrogen', 'co2')
+
+# Czas (s) klatki, gdy zapis nie ma rosnących znaczników czasu
+DEFAULT_FRAME_DURATION = 0.1
+
+# Największa liczba obliczeń pola (klatki × wierzchołki) przy przygotowaniu
+# kolorów jednego poziomu szczegółowości - wyżej odtwarzanie używa niższego poziomu
+SURFACE_EVALUATION_BUDGET = 3 * 10**7
+
+# Największa liczba elementów (klatki × wierzchołki lub komórki) liczonych naraz
+CHUNK_ELEMENTS = 2**22
+
+
+class SimulationRecorder:
+    """Zapis kolejnych kroków symulacji do późniejszego odtworzenia"""
+
+    def __init__(self):
+        self.columns = {name: HistoryBuffer() for name in RECORDED_COLUMNS}
+        self.climate = []
+
+    def append(self, time_point, values, climate_temperatures=None):
+        """
+        Dodanie kroku symulacji
+
+        Parametry:
+        - time_point: czas symulacji (s)
+        - values: słownik wartości kolumn RECORDED_COLUMNS (bez time)
+        - climate_temperatures: temperatury siatki klimatu w tym kroku (opcjonalnie)
+        """
+        self.columns['time'].append(time_point)
+        for name in RECORDED_COLUMNS[1:]:
+            self.columns[name].append(values[name])
+        if climate_temperatures is not None:
+            climate_temperatures = as_storage(climate_temperatures, 'maps')
+        self.climate.append(climate_temperatures)
+
+    def clear(self):
+        """Wyczyszczenie zapisu"""
+        for column in self.columns.values():
+            column.clear()
+        self.climate = []
+
+    def snapshot(self):
+        """
+        Kopia zapisu (do obliczeń w wątku roboczym)
+
+        Zwraca słownik kolumn (tablice) z kluczem climate - stos temperatur
+        siatki klimatu (klatki × pasy) lub None, gdy nie wszystkie kroki je mają
+        """
+        recording = {name: column.values().copy() for name, column in self.columns.items()}
+        climate = None
+        if self.climate and all(frame is not None for frame in self.climate):
+            if len({frame.shape for frame in self.climate}) == 1:
+                climate = np.stack(self.climate)
+        recording['climate'] = climate
+        return recording
+
+    def __len__(self):
+        return len(self.columns['time'].values())
+
+
+class KeyframeDeltaStore:
+    """
+    Klatki tablic o stałym kształcie zapisane jako klatki kluczowe i zmiany
+
+    Klatka różniąca się od poprzedniej zapisywana jest jako lista zmienionych
+    wierszy (indeksy i nowe wartości), a klatka bez zmian nie zajmuje pamięci.
+    Nowa klatka kluczowa powstaje, gdy zmiany od ostatniej klatki kluczowej
+    zajęłyby więcej niż pełna klatka - pamięć rośnie z ilością zmian, a nie
+    z długością zapisu, a odtworzenie klatki kosztuje najwyżej tyle, co
+    przepisanie dwóch pełnych klatek.
+    """
+
+    def __init__(self, frame_shape, dtype):
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.keyframes = []
+        self.keyframe_starts = []
+        self.keyframe_of = []
+        self.deltas = []
+        self.versions = []
+        self._previous = None
+        self._delta_bytes = 0
+        self._cached_index = None
+        self._cached_frame = None
+
+    def append(self, frame):
+        """Dodanie klatki na koniec zapisu"""
+        frame = np.asarray(frame, dtype=self.dtype).reshape(self.frame_shape)
+        rows = frame.reshape(len(frame), -1)
+        index = len(self.versions)
+        if self._previous is None:
+            self._add_keyframe(frame)
+            self.deltas.append(None)
+            self.versions.append(index)
+            self._previous = rows
+            return
+
+        changed = np.flatnonzero(np.any(rows != self._previous, axis=1)).astype(np.uint32)
+        if len(changed) == 0:
+            self.keyframe_of.append(self.keyframe_of[-1])
+            self.deltas.append(None)
+            self.versions.append(self.versions[-1])
+        else:
+            values = rows[changed]
+            size = changed.nbytes + values.nbytes
+            if self._delta_bytes + size >= frame.nbytes:
+                self._add_keyframe(frame)
+                self.deltas.append(None)
+            else:
+                self.keyframe_of.append(self.keyframe_of[-1])
+                self.deltas.append((changed, values.copy()))
+                self._delta_bytes += size
+            self.versions.append(index)
+        self._previous = rows
+
+    def _add_keyframe(self, frame):
+        self.keyframe_starts.append(len(self.versions))
+        self.keyframes.append(frame.copy())
+        self.keyframe_of.append(len(self.keyframes) - 1)
+        self._delta_bytes = 0
+
+    def frame(self, index):
+        """Odtworzenie klatki (kopia) - kolejne klatki liczone od poprzedniej"""
+        keyframe = self.keyframe_of[index]
+        cached = self._cached_index
+        if cached is not None and cached <= index and self.keyframe_of[cached] == keyframe:
+            start = cached + 1
+        else:
+            start = self.keyframe_starts[keyframe]
+            self._cached_frame = self.keyframes[keyframe].copy()
+        rows = self._cached_frame.reshape(len(self._cached_frame), -1)
+        for delta in self.deltas[start:index + 1]:
+            if delta is not None:
+                rows[delta[0]] = delta[1]
+        self._cached_index = index
+        return self._cached_frame.copy()
+
+    def version(self, index):
+        """Numer pierwszej klatki o tej samej zawartości (do pomijania niezmienionych klatek)"""
+        return self.versions[index]
+
+    @property
+    def nbytes(self):
+        """Pamięć zajęta przez klatki kluczowe i zmiany (bajty)"""
+        keyframe_bytes = sum(keyframe.nbytes for keyframe in self.keyframes)
+        delta_bytes = sum(delta[0].nbytes + delta[1].nbytes for delta in self.deltas if delta is not None)
+        return keyframe_bytes + delta_bytes
+
+    def __len__(self):
+        return len(self.versions)
+
+
+class PlaybackTimeline:
+    """
+    Przebieg symulacji przygotowany do odtwarzania
+
+    Wszystkie bufory klatek liczone są od razu, wektorowo dla wielu klatek:
+    kolumny wykresów, kolory i promienie atmosfery, stany znaczników stref
+    oraz kolory wierzchołków powierzchni (dla każdego poziomu szczegółowości,
+    zapisane jako klatki kluczowe i zmiany). Odtwarzanie, przewijanie, zmiana
+    prędkości i przybliżenia to tylko odczyt gotowych klatek.
+    """
+
+    def __init__(self, recording, zone_grid_shape=ZONE_GRID_SHAPE):
+        """
+        Parametry:
+        - recording: zapis symulacji (SimulationRecorder.snapshot())
+        - zone_grid_shape: rozmiar siatki wyznaczania stref
+        """
+        self.frame_count = len(recording['time'])
+        if self.frame_count == 0:
+            raise ValueError("Zapis symulacji jest pusty")
+
+        times = np.asarray(recording['time'], dtype=float)
+        if self.frame_count > 1 and (np.any(np.diff(times) < 0) or times[-1] <= times[0]):
+            times = np.arange(self.frame_count) * DEFAULT_FRAME_DURATION
+        self.times = times - times[0]
+        self.habitability_indices = np.asarray(recording['habitability_index'], dtype=float)
+        self.temperatures = np.asarray(recording['temperature'], dtype=float)
+        self.surface_conditions = {name: np.asarray(recording[name], dtype=float) for name in SURFACE_COLUMNS}
+        self.climate = recording.get('climate')
+
+        # Atmosfera - kolory i promienie wszystkich klatek naraz
+        self.atmosphere_colors, self.atmosphere_radii = atmosphere_appearance(
+            recording['oxygen'], recording['nitrogen'], recording['co2'], recording['pressure'])
+
+        self.zone_states = self._zone_states(zone_grid_shape)
+        self._surface_stores = {}
+
+    def __len__(self):
+        return self.frame_count
+
+    @property
+    def duration(self):
+        """Czas trwania zapisu (s)"""
+        return float(self.times[-1])
+
+    def frame_at(self, time_point):
+        """Numer klatki wyświetlanej w chwili time_point (s od początku zapisu)"""
+        index = int(np.searchsorted(self.times, time_point, side='right')) - 1
+        return min(max(index, 0), self.frame_count - 1)
+
+    def _conditions(self, frames, extra_axes):
+        """Warunki pola dla zakresu klatek jako kolumny rozgłaszane ze współrzędnymi"""
+        shape = (-1,) + (1,) * extra_axes
+        return {name: values[frames].reshape(shape) for name, values in self.surface_conditions.items()}
+
+    def _climate(self, frames):
+        return self.climate[frames] if self.climate is not None else None
+
+    def _chunks(self, elements_per_frame):
+        """Zakresy klatek liczonych naraz (ograniczenie pamięci obliczeń)"""
+        step = max(1, CHUNK_ELEMENTS // max(1, elements_per_frame))
+        for start in range(0, self.frame_count, step):
+            yield slice(start, min(start + step, self.frame_count))
+
+    def _zone_states(self, grid_shape):
+        """Stany znaczników stref wszystkich klatek (strefy liczone dla wielu klatek naraz)"""
+        latitudes, longitudes = grid_coordinates(grid_shape)
+        states = []
+        for frames in self._chunks(latitudes.size):
+            field = habitability_field(latitudes, longitudes, self._conditions(frames, 2), self._climate(frames))
+            zones = find_hotspots(field)
+            states.extend(zone_marker_states(zones.frame(i)) for i in range(len(field)))
+        return states
+
+    def supported_level(self, level):
+        """Najwyższy poziom szczegółowości nie wyższy niż level, mieszczący się w budżecie obliczeń"""
+        while level > 0 and self.frame_count * (10 * 4**level + 2) > SURFACE_EVALUATION_BUDGET:
+            level -= 1
+        return level
+
+    def surface_store(self, level):
+        """Kolory wierzchołków ikosfery poziomu level dla wszystkich klatek (liczone raz)"""
+        store = self._surface_stores.get(level)
+        if store is None:
+            vertices, _ = GEOMETRY_CACHE.icosphere(level)
+            latitudes, longitudes = vertex_coordinates(vertices)
+            store = KeyframeDeltaStore((len(vertices), 4), np.uint8)
+            for frames in self._chunks(len(vertices)):
+                field = habitability_field(latitudes, longitudes, self._conditions(frames, 1), self._climate(frames))
+                for colors in habitability_colors(field):
+                    store.append(colors)
+            self._surface_stores[level] = store
+        return store
+
+
+def build_timeline(recording, levels):
+    """
+    Przygotowanie odtwarzania zapisu (funkcja dla wątku roboczego)
+
+    Parametry:
+    - recording: zapis symulacji (SimulationRecorder.snapshot())
+    - levels: poziomy szczegółowości powierzchni - kolory klatek wszystkich
+      poziomów (lub najbliższych poziomów w budżecie) liczone są od razu,
+      więc zmiana przybliżenia w trakcie odtwarzania tylko odczytuje klatki
+
+    Zwraca obiekt PlaybackTimeline
+    """
+    timeline = PlaybackTimeline(recording)
+    for level in sorted({timeline.supported_level(level) for level in levels}):
+        timeline.surface_store(level)
+    return timeline
@@ -1,12 +1,116 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSlider, QComboBox
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QMatrix4x4, QVector3D
+import time
 import numpy as np
 import pyqtgraph as pg
 import pyqtgraph.opengl as gl
+try:
+    # Flagi buforów GLMeshItem (pyqtgraph >= 0.14) - przesyłanie samego bufora kolorów
+    from pyqtgraph.opengl.items.GLMeshItem import DirtyFlag
+except ImportError:
+    DirtyFlag = None
+
+from modules.frame_scheduler import DEFAULT_MAX_FPS, FrameScheduler
+from modules.mesh_geometry import GEOMETRY_CACHE, SphereMeshData
+from modules.planet_surface import (DEFAULT_SURFACE_CONDITIONS, MAX_CRITICAL_ZONES, PLANET_RADIUS,
+                                   atmosphere_appearance, habitability_field, surface_colors,
+                                   zone_marker_states)
+from modules.surface_zones import find_hotspots, grid_coordinates
+
+# Poziomy szczegółowości powierzchni: (maksymalna odległość kamery w promieniach planety,
+# liczba podziałów ikosfery) - od 163842 wierzchołków z bliska do 642 z daleka
+SURFACE_LOD_LEVELS = (
+    (3.0, 7),
+    (5.0, 6),
+    (10.0, 5),
+    (20.0, 4),
+    (float('inf'), 3)
+)
+
+# Zmiana temperatury siatki klimatu (K), poniżej której kolory powierzchni nie są przeliczane
+SURFACE_TEMPERATURE_TOLERANCE = 0.01
+
+# Zmiana pola habitabilności (punkty indeksu), poniżej której strefy nie są przeliczane
+ZONE_FIELD_TOLERANCE = 1.0
+
+# Odstęp (ms) kroków zegara odtwarzania i dostępne prędkości odtwarzania
+PLAYBACK_TICK_MS = 33
+PLAYBACK_SPEEDS = (0.5, 1, 2, 4, 8, 16)
+
+
+class SurfaceMeshItem(gl.GLMeshItem):
+    """
+    Siatka powierzchni planety z wymianą samych kolorów wierzchołków
+    
+    Po zmianie kolorów do karty graficznej wysyłany jest tylko bufor kolorów
+    (4 bajty na wierzchołek) - wierzchołki, normalne i trójkąty zostają
+    w buforach z poprzedniego przesłania. Starsze wersje pyqtgraph (bez
+    DirtyFlag) przetwarzają po zmianie kolorów całą siatkę (setMeshData).
+    """
+    
+    def __init__(self, **kwds):
+        super().__init__(**kwds)
+        self.colors_changed = False
+        
+    def set_vertex_colors(self, colors):
+        """Zamiana kolorów wierzchołków bez ponownego przesyłania geometrii"""
+        meshdata = self.opts['meshdata']
+        meshdata.setVertexColors(colors)
+        if DirtyFlag is None:
+            self.setMeshData(meshdata=meshdata)
+            return
+        if self.vertexes is not None:
+            # Siatka już przetworzona - oznaczenie do przesłania tylko bufora kolorów
+            self.colors = meshdata.vertexColors()
+            self.colors_changed = True
+        self.update()
+        
+    def parseMeshData(self):
+        dirty_bits = super().parseMeshData()
+        if self.colors_changed:
+            self.colors_changed = False
+            dirty_bits |= DirtyFlag.COLOR
+        return dirty_bits
+
+
+class PlanetView(gl.GLViewWidget):
+    """
+    Widok OpenGL z rysowaniem na żądanie
+    
+    Odświeżenia zgłaszane przez obiekty sceny (update()) są łączone przez
+    FrameScheduler w jedną klatkę na interwał limitu fps. Widok zgłasza też
+    zmianę odległości kamery (wybór poziomu szczegółowości).
+    """
+    
+    camera_distance_changed = pyqtSignal(float)
+    
+    def __init__(self, parent=None, max_fps=DEFAULT_MAX_FPS):
+        self.frame_scheduler = None
+        super().__init__(parent)
+        self.last_distance = None
+        self.frame_scheduler = FrameScheduler(super().update, max_fps, self)
+        
+    def update(self):
+        """Zgłoszenie zmiany sceny - rysowanie w najbliższej klatce dozwolonej przez limit"""
+        if self.frame_scheduler is None:
+            super().update()
+            return
+        self.frame_scheduler.request_frame()
+        
+    def paintGL(self, *args, **kwargs):
+        # Sprawdzenie przed rysowaniem - zmiana siatki trafia już do tej klatki
+        distance = float(self.opts['distance'])
+        if distance != self.last_distance:
+            self.last_distance = distance
+            self.camera_distance_changed.emit(distance)
+        start = time.perf_counter()
+        super().paintGL(*args, **kwargs)
+        self.frame_scheduler.record_frame_time((time.perf_counter() - start) * 1000)
+
 
 class Visualization3DModule(QWidget):
     """Moduł wizualizacji 3D planet i ich atmosfer"""
@@ -17,6 +121,34 @@ class Visualization3DModule(QWidget):
         self.planet_mesh = None
         self.atmosphere_mesh = None
         self.critical_zones = []
+        self.zone_pool = []
+        
+        # Liczniki diagnostyczne: największa liczba obiektów sceny i liczba zmian znaczników stref
+        self.debug_counters = {'scene_items_peak': 0, 'zone_marker_updates': 0}
+        
+        # Powierzchnia planety: bieżący poziom szczegółowości, warunki pola habitabilności,
+        # temperatury z modelu klimatu i kolory wierzchołków policzone dla tych danych
+        # (dla każdego poziomu osobno)
+        self.surface_level = None
+        self.surface_conditions = dict(DEFAULT_SURFACE_CONDITIONS)
+        self.surface_temperatures = None
+        
+        # Siatka powierzchni do wyznaczania stref i pole, z którego policzono bieżące strefy
+        self.zone_grid = grid_coordinates()
+        self.zone_field = None
+        self.surface_level_colors = {}
+        
+        # Ostatnio ustawiony stan siatek (niezmieniony stan nie jest wysyłany ponownie)
+        self.atmosphere_color = None
+        self.atmosphere_radius = None
+        
+        # Odtwarzanie zapisanej symulacji: przebieg (PlaybackTimeline), pozycja (s),
+        # wyświetlana klatka i wersja kolorów powierzchni obecnych w buforze siatki
+        self.playback = None
+        self.playback_position = 0.0
+        self.playback_frame = None
+        self.playback_surface_version = None
+        self.playback_clock = None
         
         # Inicjalizacja interfejsu
         self.init_ui()
@@ -42,15 +174,85 @@ class Visualization3DModule(QWidget):
         main_layout.addLayout(control_layout)
         
         # Widżet OpenGL do renderowania 3D
-        self.view_3d = gl.GLViewWidget()
+        self.view_3d = PlanetView()
+        self.view_3d.camera_distance_changed.connect(self.update_surface_level)
+        # Rysowanie wstrzymane do czasu pokazania karty (showEvent)
+        self.view_3d.frame_scheduler.set_paused(True)
         main_layout.addWidget(self.view_3d)
         
+        # Panel odtwarzania zapisanej symulacji (widoczny po załadowaniu przebiegu)
+        self.playback_panel = QWidget()
+        playback_layout = QVBoxLayout(self.playback_panel)
+        playback_layout.setContentsMargins(0, 0, 0, 0)
+        
+        playback_controls = QHBoxLayout()
+        self.play_button = QPushButton("Odtwórz")
+        self.play_button.clicked.connect(self.toggle_playback)
+        playback_controls.addWidget(self.play_button)
+        
+        self.playback_slider = QSlider(Qt.Horizontal)
+        self.playback_slider.valueChanged.connect(self.show_playback_frame)
+        playback_controls.addWidget(self.playback_slider)
+        
+        self.playback_speed_combo = QComboBox()
+        self.playback_speed_combo.addItems([f"{speed:g}×" for speed in PLAYBACK_SPEEDS])
+        self.playback_speed_combo.setCurrentIndex(PLAYBACK_SPEEDS.index(1))
+        playback_controls.addWidget(self.playback_speed_combo)
+        
+        self.playback_label = QLabel("")
+        playback_controls.addWidget(self.playback_label)
+        
+        close_button = QPushButton("Zamknij odtwarzanie")
+        close_button.clicked.connect(self.stop_playback)
+        playback_controls.addWidget(close_button)
+        playback_layout.addLayout(playback_controls)
+        
+        # Wykres indeksu habitabilności zapisu z kursorem bieżącej klatki
+        self.playback_plot = pg.PlotWidget()
+        self.playback_plot.setMaximumHeight(150)
+        self.playback_plot.setLabel('left', 'Indeks habitabilności')
+        self.playback_plot.setLabel('bottom', 'Czas', units='s')
+        self.playback_curve = self.playback_plot.plot(pen=pg.mkPen('g', width=2))
+        self.playback_cursor = pg.InfiniteLine(angle=90, movable=False, pen=pg.mkPen('y', width=1))
+        self.playback_plot.addItem(self.playback_cursor)
+        playback_layout.addWidget(self.playback_plot)
+        
+        self.playback_panel.hide()
+        main_layout.addWidget(self.playback_panel)
+        
+        # Zegar odtwarzania - przesuwa pozycję o upływ czasu razy prędkość
+        self.playback_timer = QTimer(self)
+        self.playback_timer.setInterval(PLAYBACK_TICK_MS)
+        self.playback_timer.timeout.connect(self.advance_playback)
+        
         # Ustawienie głównego układu
         self.setLayout(main_layout)
         
         # Inicjalizacja sceny 3D
         self.init_3d_scene()
         
+    def showEvent(self, event):
+        """Wznowienie rysowania po pokazaniu karty"""
+        super().showEvent(event)
+        self.view_3d.frame_scheduler.set_paused(False)
+        
+    def hideEvent(self, event):
+        """Wstrzymanie rysowania, gdy karta jest niewidoczna"""
+        super().hideEvent(event)
+        self.view_3d.frame_scheduler.set_paused(True)
+        
+    def set_frame_rate_limit(self, max_fps):
+        """Zmiana limitu klatek na sekundę widoku 3D (None lub 0 - bez limitu)"""
+        self.view_3d.frame_scheduler.set_max_fps(max_fps)
+        
+    def frame_report(self):
+        """Podsumowanie rysowania widoku 3D (liczniki i histogram czasów klatek)"""
+        return self.view_3d.frame_scheduler.summary_lines()
+        
+    def reset_frame_statistics(self):
+        """Wyzerowanie statystyk rysowania widoku 3D"""
+        self.view_3d.frame_scheduler.reset_statistics()
+        
     def init_3d_scene(self):
         """Inicjalizacja sceny 3D z planetą i atmosferą"""
         # Ustawienie kamery
@@ -62,14 +264,16 @@ class Visualization3DModule(QWidget):
         grid.setSpacing(10, 10)
         self.view_3d.addItem(grid)
         
-        # Tworzenie planety (sfera)
-        planet_radius = 10
-        self.planet_mesh = self.create_sphere(radius=planet_radius, rows=20, cols=20, color=(0.5, 0.5, 1.0, 1.0))
+        # Tworzenie planety (ikosfera barwiona polem habitabilności) - obiekt trwały,
+        # poziom szczegółowości dobierany do odległości kamery
+        self.planet_mesh = self.create_planet_surface(radius=PLANET_RADIUS)
         self.view_3d.addItem(self.planet_mesh)
         
-        # Tworzenie atmosfery (półprzezroczysta sfera)
-        atmosphere_radius = 12
-        self.atmosphere_mesh = self.create_sphere(radius=atmosphere_radius, rows=20, cols=20, color=(0.6, 0.8, 1.0, 0.3))
+        # Tworzenie atmosfery (półprzezroczysta sfera) - promień zmieniany transformacją
+        self.atmosphere_radius = 12
+        self.atmosphere_color = (0.6, 0.8, 1.0, 0.3)
+        self.atmosphere_mesh = self.create_sphere(radius=self.atmosphere_radius, rows=20, cols=20,
+                                                  color=self.atmosphere_color)
         self.view_3d.addItem(self.atmosphere_mesh)
         
         # Dodanie osi
@@ -85,148 +289,390 @@ class Visualization3DModule(QWidget):
         self.add_text_label("Y", pos=(0, 21, 0), color=(0, 255, 0, 255))
         self.add_text_label("Z", pos=(0, 0, 21), color=(0, 0, 255, 255))
         
-        # Dodanie przykładowych stref krytycznych
-        self.add_critical_zone(pos=(5, 5, 8), radius=2, color=(1, 0, 0, 0.7), label="Strefa A")
-        self.add_critical_zone(pos=(-7, 3, 5), radius=1.5, color=(1, 0.5, 0, 0.7), label="Strefa B")
+        # Pula znaczników stref krytycznych (tworzone raz, ukryte do czasu użycia)
+        self.zone_pool = [self.create_zone_marker() for _ in range(MAX_CRITICAL_ZONES)]
+        
+        # Strefy krytyczne z pola habitabilności powierzchni
+        self.update_surface_zones()
         
     def create_sphere(self, radius=10, rows=10, cols=20, color=(1.0, 1.0, 1.0, 1.0)):
-        """Tworzenie siatki sferycznej dla planety lub atmosfery"""
-        # Generowanie wierzchołków i kolorów
-        vertices = []
-        colors = []
-        
-        for i in range(rows+1):
-            phi = np.pi * i / rows
-            for j in range(cols):
-                theta = 2 * np.pi * j / cols
-                
-                x = radius * np.sin(phi) * np.cos(theta)
-                y = radius * np.sin(phi) * np.sin(theta)
-                z = radius * np.cos(phi)
-                
-                vertices.append([x, y, z])
-                colors.append(color)
-        
-        # Generowanie indeksów dla trójkątów
-        indices = []
-        for i in range(rows):
-            for j in range(cols):
-                p1 = i * cols + j
-                p2 = i * cols + (j + 1) % cols
-                p3 = (i + 1) * cols + j
-                p4 = (i + 1) * cols + (j + 1) % cols
-                
-                # Dwa trójkąty tworzące czworokąt
-                indices.append([p1, p2, p3])
-                indices.append([p2, p4, p3])
-        
-        # Tworzenie siatki
+        """
+        Tworzenie siatki sferycznej dla planety lub atmosfery
+        
+        Geometria sfery jednostkowej pochodzi z pamięci podręcznej (wspólna
+        dla wszystkich sfer o tej samej liczbie segmentów), promień nadaje
+        transformacja obiektu. Jednolity kolor przekazywany jest jako kolor
+        domyślny siatki - jedna wartość dla wszystkich ścian zamiast tablicy
+        kolorów ścian.
+        """
+        vertices, faces = GEOMETRY_CACHE.sphere(rows, cols)
         mesh = gl.GLMeshItem(
-            vertexes=np.array(vertices),
-            faces=np.array(indices),
-            faceColors=np.array([color for _ in range(len(indices))]),
+            meshdata=SphereMeshData(vertices, faces),
+            color=color,
             smooth=True,
             drawEdges=False,
             shader='shaded'
         )
+        mesh.scale(radius, radius, radius)
         
         return mesh
     
+    def create_planet_surface(self, radius=PLANET_RADIUS):
+        """
+        Tworzenie siatki powierzchni planety
+        
+        Geometria wszystkich poziomów szczegółowości jest przygotowywana od razu
+        (pamięć podręczna geometrii), a siatka startowa odpowiada bieżącej
+        odległości kamery.
+        """
+        for _, subdivisions in SURFACE_LOD_LEVELS:
+            GEOMETRY_CACHE.icosphere(subdivisions)
+            
+        mesh = SurfaceMeshItem(smooth=True, drawEdges=False, shader='shaded')
+        mesh.scale(radius, radius, radius)
+        self.planet_mesh = mesh
+        self.update_surface_level(self.view_3d.opts['distance'])
+        
+        return mesh
+        
+    def surface_level_for_distance(self, distance):
+        """Liczba podziałów ikosfery dla odległości kamery"""
+        relative_distance = distance / PLANET_RADIUS
+        for max_distance, subdivisions in SURFACE_LOD_LEVELS:
+            if relative_distance <= max_distance:
+                return subdivisions
+        return SURFACE_LOD_LEVELS[-1][1]
+        
+    def update_surface_level(self, distance):
+        """
+        Zmiana poziomu szczegółowości powierzchni (tylko gdy zmienia się liczba podziałów)
+        
+        W trakcie odtwarzania poziom jest ograniczony do poziomów, dla których
+        przebieg ma przygotowane kolory klatek.
+        """
+        level = self.surface_level_for_distance(distance)
+        if self.playback is not None:
+            level = self.playback.supported_level(level)
+        if level != self.surface_level:
+            self.set_surface_level(level)
+            
+    def set_surface_level(self, level):
+        """Zamiana siatki powierzchni na ikosferę poziomu level z bieżącymi kolorami"""
+        vertices, faces = GEOMETRY_CACHE.icosphere(level)
+        meshdata = SphereMeshData(vertices, faces)
+        if self.playback is not None and self.playback_frame is not None:
+            store = self.playback.surface_store(level)
+            meshdata.setVertexColors(store.frame(self.playback_frame))
+            self.playback_surface_version = store.version(self.playback_frame)
+        else:
+            meshdata.setVertexColors(self.level_colors(level))
+        self.planet_mesh.setMeshData(meshdata=meshdata)
+        self.surface_level = level
+        
+    def level_colors(self, level):
+        """Kolory wierzchołków poziomu szczegółowości dla bieżących warunków (liczone raz)"""
+        colors = self.surface_level_colors.get(level)
+        if colors is None:
+            vertices, _ = GEOMETRY_CACHE.icosphere(level)
+            colors = surface_colors(vertices, self.surface_conditions, self.surface_temperatures)
+            self.surface_level_colors[level] = colors
+        return colors
+        
+    def surface_field_changed(self):
+        """Przeliczenie kolorów powierzchni (przesyłany sam bufor kolorów) i stref krytycznych"""
+        self.surface_level_colors = {}
+        if self.playback is not None:
+            # W trakcie odtwarzania scena pokazuje klatki zapisu - stan bieżący przywraca stop_playback
+            return
+        self.planet_mesh.set_vertex_colors(self.level_colors(self.surface_level))
+        self.update_surface_zones()
+        
+    def set_surface_conditions(self, conditions):
+        """
+        Zmiana warunków pola habitabilności powierzchni
+        
+        Kolory są przeliczane i przesyłane tylko przy zmianie warunków,
+        a do karty graficznej trafia wyłącznie bufor kolorów. Przy temperaturach
+        z modelu klimatu średnia temperatura nie wpływa na pole (zmianę
+        temperatur obsługuje update_planet_model), więc nie jest porównywana.
+        """
+        conditions = {**DEFAULT_SURFACE_CONDITIONS, **conditions}
+        previous = self.surface_conditions
+        self.surface_conditions = conditions
+        if self.surface_temperatures is not None:
+            conditions, previous = ({key: value for key, value in values.items() if key != 'temperature'}
+                                    for values in (conditions, previous))
+        if conditions != previous:
+            self.surface_field_changed()
+        
+    def update_surface_zones(self):
+        """
+        Wyznaczenie stref krytycznych ze spójnych obszarów pola habitabilności
+        
+        Pole liczone jest na siatce sferycznej, progowane (górna część zakresu
+        pola, find_hotspots) i dzielone na spójne obszary (z zawinięciem
+        długości); największe obszary stają się strefami, kolor zależy od
+        średniego indeksu.
+        Strefy są przeliczane tylko wtedy, gdy pole zmieniło się o więcej niż
+        ZONE_FIELD_TOLERANCE, a znaczniki z puli zmieniają się tylko przy
+        zmianie położenia, rozmiaru, koloru lub etykiety.
+        """
+        latitudes, longitudes = self.zone_grid
+        field = habitability_field(latitudes, longitudes, self.surface_conditions, self.surface_temperatures)
+        if self.zone_field is not None and np.max(np.abs(field - self.zone_field)) <= ZONE_FIELD_TOLERANCE:
+            return
+        self.zone_field = field
+        
+        self.show_zone_markers(zone_marker_states(find_hotspots(field), len(self.zone_pool)))
+        
+    def show_zone_markers(self, states):
+        """Wyświetlenie stref o podanych stanach na znacznikach z puli (nadmiarowe - ukryte)"""
+        self.critical_zones = []
+        for pos, radius, color, label in states:
+            self.add_critical_zone(pos=pos, radius=radius, color=color, label=label)
+        self.hide_unused_zone_markers()
+        
     def add_text_label(self, text, pos, color=(255, 255, 255, 255)):
         """Dodanie etykiety tekstowej do sceny 3D"""
         text_item = gl.GLTextItem(pos=pos, text=text, color=color)
         self.view_3d.addItem(text_item)
+        return text_item
         
-    def add_critical_zone(self, pos, radius=1.0, color=(1.0, 0.0, 0.0, 0.7), label=None):
-        """Dodanie strefy krytycznej do sceny 3D"""
-        # Dodanie sfery reprezentującej strefę krytyczną
-        sphere = self.create_sphere(radius=radius, rows=10, cols=10, color=color)
-        sphere.translate(pos[0], pos[1], pos[2])
+    def create_zone_marker(self):
+        """Utworzenie ukrytego znacznika strefy krytycznej (sfera z etykietą) dla puli"""
+        sphere = self.create_sphere(radius=1, rows=10, cols=10)
+        sphere.hide()
         self.view_3d.addItem(sphere)
+        label_item = self.add_text_label("", (0, 0, 0))
+        label_item.hide()
+        return {'mesh': sphere, 'label': label_item, 'state': None}
+        
+    def add_critical_zone(self, pos, radius=1.0, color=(1.0, 0.0, 0.0, 0.7), label=None):
+        """Wyświetlenie strefy krytycznej na pierwszym wolnym znaczniku z puli"""
+        slot = len(self.critical_zones)
+        if slot >= len(self.zone_pool):
+            raise IndexError(f"Przekroczono liczbę znaczników stref krytycznych ({len(self.zone_pool)})")
+        marker = self.zone_pool[slot]
+        
+        # Przesunięcie, skalowanie i zmiana koloru w miejscu - tylko gdy stan znacznika się zmienił
+        state = (tuple(pos), radius, tuple(color), label)
+        if marker['state'] != state:
+            transform = QMatrix4x4()
+            transform.translate(pos[0], pos[1], pos[2])
+            transform.scale(radius)
+            marker['mesh'].setTransform(transform)
+            marker['mesh'].setColor(color)
+            if label:
+                marker['label'].setData(pos=(pos[0], pos[1], pos[2] + radius + 0.5), text=label)
+            marker['state'] = state
+            self.debug_counters['zone_marker_updates'] += 1
+        self.set_marker_visible(marker, True, bool(label))
         
-        # Dodanie etykiety dla strefy
-        if label:
-            self.add_text_label(label, (pos[0], pos[1], pos[2] + radius + 0.5))
-            
         # Zapisanie strefy do listy
         self.critical_zones.append({
-            'mesh': sphere,
+            'mesh': marker['mesh'],
             'pos': pos,
             'radius': radius,
             'color': color,
             'label': label
         })
         
-        return sphere
+        return marker['mesh']
+        
+    def clear_critical_zones(self):
+        """Ukrycie wszystkich stref krytycznych (znaczniki zostają w puli)"""
+        self.critical_zones = []
+        self.hide_unused_zone_markers()
+        
+    def hide_unused_zone_markers(self):
+        """Ukrycie znaczników z puli niewykorzystanych przez bieżące strefy"""
+        for marker in self.zone_pool[len(self.critical_zones):]:
+            self.set_marker_visible(marker, False, False)
             
-    def update_planet_model(self, planet_data):
-        """Aktualizacja modelu planety na podstawie danych"""
-        # Ta metoda byłaby używana do aktualizacji modelu 3D na podstawie danych z symulacji
-        # W rzeczywistej aplikacji byłaby bardziej rozbudowana
-        pass
+    def set_marker_visible(self, marker, visible, label_visible):
+        """Pokazanie lub ukrycie znacznika i jego etykiety (bez zbędnego odświeżania)"""
+        if marker['mesh'].visible() != visible:
+            marker['mesh'].setVisible(visible)
+        if marker['label'].visible() != label_visible:
+            marker['label'].setVisible(label_visible)
+            
+    def scene_item_count(self):
+        """Liczba obiektów w scenie 3D (do diagnostyki - stała w trakcie symulacji)"""
+        return len(self.view_3d.items)
+        
+    def set_atmosphere(self, color, radius):
+        """Zmiana koloru i promienia atmosfery (promień przez transformację, bez nowej geometrii)"""
+        if color != self.atmosphere_color:
+            self.atmosphere_color = color
+            self.atmosphere_mesh.setColor(color)
+        if radius != self.atmosphere_radius:
+            self.atmosphere_radius = radius
+            transform = QMatrix4x4()
+            transform.scale(radius)
+            self.atmosphere_mesh.setTransform(transform)
+            
+    def load_timeline(self, timeline):
+        """
+        Załadowanie zapisanej symulacji do odtwarzania
+        
+        Parametry:
+        - timeline: przebieg z gotowymi buforami klatek (PlaybackTimeline)
+        
+        Odtwarzanie i przewijanie tylko odczytuje gotowe klatki - kolory
+        powierzchni, atmosferę i znaczniki stref - więc scena ma stałą liczbę
+        obiektów, a do karty graficznej trafia tylko bufor kolorów. Po
+        załadowaniu wyświetlana jest ostatnia klatka (stan końcowy symulacji),
+        odtwarzanie od początku uruchamia przycisk "Odtwórz".
+        """
+        self.playback_timer.stop()
+        self.playback = timeline
+        self.playback_frame = None
+        self.playback_surface_version = None
+        
+        self.playback_curve.setData(timeline.times, timeline.habitability_indices)
+        self.playback_slider.blockSignals(True)
+        self.playback_slider.setRange(0, len(timeline) - 1)
+        self.playback_slider.setValue(len(timeline) - 1)
+        self.playback_slider.blockSignals(False)
+        self.play_button.setText("Odtwórz")
+        self.playback_panel.show()
+        
+        # Poziom szczegółowości w budżecie przygotowanych kolorów klatek
+        level = timeline.supported_level(self.surface_level_for_distance(self.view_3d.opts['distance']))
+        if level != self.surface_level:
+            self.set_surface_level(level)
+        self.show_playback_frame(len(timeline) - 1)
+        
+    def toggle_playback(self):
+        """Wznowienie lub wstrzymanie odtwarzania"""
+        if self.playback is None:
+            return
+        if self.playback_timer.isActive():
+            self.playback_timer.stop()
+            self.play_button.setText("Odtwórz")
+            return
+        if self.playback_position >= self.playback.duration:
+            self.playback_position = 0.0
+        self.playback_clock = time.monotonic()
+        self.playback_timer.start()
+        self.play_button.setText("Pauza")
+        
+    def advance_playback(self):
+        """Krok zegara odtwarzania - pozycja przesuwana o rzeczywisty upływ czasu razy prędkość"""
+        now = time.monotonic()
+        speed = PLAYBACK_SPEEDS[self.playback_speed_combo.currentIndex()]
+        self.playback_position += (now - self.playback_clock) * speed
+        self.playback_clock = now
+        if self.playback_position >= self.playback.duration:
+            self.playback_position = self.playback.duration
+            self.playback_timer.stop()
+            self.play_button.setText("Odtwórz")
+        frame = self.playback.frame_at(self.playback_position)
+        if frame != self.playback_frame:
+            self.show_playback_frame(frame, seek=False)
+            
+    def show_playback_frame(self, index, seek=True):
+        """
+        Wyświetlenie klatki zapisu
+        
+        Parametry:
+        - index: numer klatki
+        - seek: True - przewinięcie (pozycja odtwarzania przenoszona na początek klatki)
+        """
+        if self.playback is None:
+            return
+        timeline = self.playback
+        self.playback_frame = index
+        if seek:
+            self.playback_position = float(timeline.times[index])
+            
+        # Kolory powierzchni wysyłane tylko przy zmianie zawartości klatki
+        store = timeline.surface_store(self.surface_level)
+        version = store.version(index)
+        if version != self.playback_surface_version:
+            self.playback_surface_version = version
+            self.planet_mesh.set_vertex_colors(store.frame(index))
+        self.set_atmosphere(tuple(timeline.atmosphere_colors[index].tolist()), float(timeline.atmosphere_radii[index]))
+        self.show_zone_markers(timeline.zone_states[index])
+        
+        self.playback_cursor.setValue(timeline.times[index])
+        if self.playback_slider.value() != index:
+            self.playback_slider.blockSignals(True)
+            self.playback_slider.setValue(index)
+            self.playback_slider.blockSignals(False)
+        self.playback_label.setText(f"Klatka {index + 1}/{len(timeline)} - "
+                                    f"{timeline.times[index]:.1f} s - "
+                                    f"Indeks: {timeline.habitability_indices[index]:.1f}")
+        
+    def stop_playback(self):
+        """Zakończenie odtwarzania i powrót do bieżącego stanu symulacji"""
+        self.playback_timer.stop()
+        if self.playback is None:
+            return
+        self.playback = None
+        self.playback_frame = None
+        self.playback_surface_version = None
+        self.playback_panel.hide()
+        
+        # Przywrócenie bieżących kolorów, stref, atmosfery i poziomu szczegółowości
+        level = self.surface_level_for_distance(self.view_3d.opts['distance'])
+        if level != self.surface_level:
+            self.set_surface_level(level)
+        else:
+            self.planet_mesh.set_vertex_colors(self.level_colors(level))
+        conditions = self.surface_conditions
+        color, radius = atmosphere_appearance(conditions['oxygen'], conditions['nitrogen'],
+                                              conditions['co2'], conditions['pressure'])
+        self.set_atmosphere(tuple(color.tolist()), float(radius))
+        self.zone_field = None
+        self.update_surface_zones()
         
-    def update_simulation_data(self, progress, habitability_index, temperature, pressure, radiation, atmosphere_data):
+    def update_planet_model(self, planet_data):
+        """
+        Aktualizacja modelu planety na podstawie danych modelu klimatu
+        
+        Parametry:
+        - planet_data: słownik z kluczem temperatures - temperatury siatki
+          klimatu (pasy szerokości × pasy długości, K)
+        
+        Kolory powierzchni są przeliczane tylko wtedy, gdy któraś temperatura
+        zmieniła się o więcej niż SURFACE_TEMPERATURE_TOLERANCE.
+        """
+        temperatures = planet_data.get('temperatures')
+        if temperatures is None:
+            return
+        temperatures = np.array(temperatures, dtype=float)
+        previous = self.surface_temperatures
+        if (previous is not None and previous.shape == temperatures.shape and
+                np.allclose(previous, temperatures, rtol=0, atol=SURFACE_TEMPERATURE_TOLERANCE)):
+            return
+        self.surface_temperatures = temperatures
+        self.surface_field_changed()
+        
+    def update_simulation_data(self, progress, habitability_index, temperature, pressure, radiation, atmosphere_data,
+                               ph=7.0):
         """Aktualizacja wizualizacji 3D na podstawie danych symulacji"""
         # Aktualizacja etykiety statusu
         self.simulation_status_label.setText(f"Status symulacji: {progress}% - Indeks habitabilności: {habitability_index}")
         
-        # Aktualizacja koloru planety na podstawie temperatury
-        if temperature < 200:
-            planet_color = (0.2, 0.2, 0.8, 1.0)  # Zimna (niebieska)
-        elif temperature < 300:
-            planet_color = (0.5, 0.5, 1.0, 1.0)  # Umiarkowana (jasnoniebieska)
-        elif temperature < 400:
-            planet_color = (0.8, 0.8, 0.2, 1.0)  # Ciepła (żółta)
-        else:
-            planet_color = (0.8, 0.2, 0.2, 1.0)  # Gorąca (czerwona)
-            
-        # Aktualizacja koloru atmosfery na podstawie składu
+        # Aktualizacja koloru i rozmiaru atmosfery na podstawie składu i ciśnienia
         oxygen = atmosphere_data.get('oxygen', 21)
         nitrogen = atmosphere_data.get('nitrogen', 78)
         co2 = atmosphere_data.get('co2', 0)
+        atmosphere_color, atmosphere_radius = atmosphere_appearance(oxygen, nitrogen, co2, pressure)
+        
+        # Aktualizacja trwałych siatek tylko przy zmianie stanu (bez ponownego tworzenia buforów);
+        # strefy krytyczne są przeliczane razem z polem habitabilności powierzchni
+        self.set_surface_conditions({
+            'temperature': temperature,
+            'pressure': pressure,
+            'radiation': radiation,
+            'ph': ph,
+            'oxygen': oxygen,
+            'nitrogen': nitrogen,
+            'co2': co2
+        })
+        self.set_atmosphere(tuple(atmosphere_color.tolist()), float(atmosphere_radius))
         
-        # Kolor atmosfery zależny od składu
-        r = 0.6 + 0.4 * (co2 / 100)  # Więcej CO2 = bardziej czerwona
-        g = 0.6 + 0.4 * (oxygen / 100)  # Więcej tlenu = bardziej zielona
-        b = 0.6 + 0.4 * (nitrogen / 100)  # Więcej azotu = bardziej niebieska
-        
-        atmosphere_color = (r, g, b, 0.3)
-        
-        # Aktualizacja rozmiaru atmosfery na podstawie ciśnienia
-        atmosphere_radius = 12 + pressure / 50  # Większe ciśnienie = większa atmosfera
-        
-        # Usunięcie starych modeli
-        if self.planet_mesh is not None:
-            self.view_3d.removeItem(self.planet_mesh)
-        if self.atmosphere_mesh is not None:
-            self.view_3d.removeItem(self.atmosphere_mesh)
-            
-        # Utworzenie nowych modeli
-        self.planet_mesh = self.create_sphere(radius=10, rows=20, cols=20, color=planet_color)
-        self.atmosphere_mesh = self.create_sphere(radius=atmosphere_radius, rows=20, cols=20, color=atmosphere_color)
-        
-        # Dodanie nowych modeli do sceny
-        self.view_3d.addItem(self.planet_mesh)
-        self.view_3d.addItem(self.atmosphere_mesh)
-        
-        # Aktualizacja stref krytycznych na podstawie habitabilności
-        # Usunięcie starych stref
-        for zone in self.critical_zones:
-            self.view_3d.removeItem(zone['mesh'])
-        self.critical_zones = []
-        
-        # Dodanie nowych stref w zależności od habitabilności
-        if habitability_index < 30:
-            # Niski indeks habitabilności - dodaj strefy niebezpieczne
-            self.add_critical_zone(pos=(5, 5, 8), radius=3, color=(0.8, 0.0, 0.0, 0.7), label="Strefa niebezpieczna")
-            self.add_critical_zone(pos=(-7, 3, 5), radius=2.5, color=(0.8, 0.0, 0.0, 0.7), label="Strefa niebezpieczna")
-            self.add_critical_zone(pos=(0, -6, 7), radius=2, color=(0.8, 0.0, 0.0, 0.7), label="Strefa niebezpieczna")
-        elif habitability_index < 70:
-            # Średni indeks habitabilności - dodaj strefy umiarkowane
-            self.add_critical_zone(pos=(5, 5, 8), radius=2, color=(0.8, 0.8, 0.0, 0.7), label="Strefa umiarkowana")
-            self.add_critical_zone(pos=(-7, 3, 5), radius=1.5, color=(0.8, 0.8, 0.0, 0.7), label="Strefa umiarkowana")
-        else:
-            # Wysoki indeks habitabilności - dodaj strefy bezpieczne
-            self.add_critical_zone(pos=(5, 5, 8), radius=2, color=(0.0, 0.8, 0.0, 0.7), label="Strefa bezpieczna")
-            self.add_critical_zone(pos=(-7, 3, 5), radius=1.5, color=(0.0, 0.8, 0.0, 0.7), label="Strefa bezpieczna")
-            self.add_critical_zone(pos=(0, -6, 7), radius=2, color=(0.0, 0.8, 0.0, 0.7), label="Strefa bezpieczna")
+        self.debug_counters['scene_items_peak'] = max(self.debug_counters['scene_items_peak'],
+                                                      self.scene_item_count())